@@ -0,0 +1,251 @@
+"""
+JavaScriptAnalyzer パターン解析のベンチマーク
+
+バンドルされた数MBのJavaScriptを生成し、従来の行ごとの
+re.search照合と、候補行を絞り込むコンパイル済みスキャナを比較する。
+両者の出力が一致することも確認する。
+
+使用例:
+    python benchmarks/bench_js_patterns.py --size-mb 8
+"""
+
+import argparse
+import re
+import statistics
+import time
+from typing import Callable
+
+from devbuddy.analyzers.js_analyzer import JavaScriptAnalyzer
+from devbuddy.core.models import Issue
+
+# webpack出力風のモジュール本体（大半の行はルールに該当しない）
+MODULE_TEMPLATE = """\
+/***/ "./src/components/widget_{n}.js":
+/*!**************************************!*\\
+  !*** ./src/components/widget_{n}.js ***!
+  \\**************************************/
+/***/ (function(module, __webpack_exports__, __webpack_require__) {{
+
+"use strict";
+__webpack_require__.r(__webpack_exports__);
+/* harmony export */ __webpack_require__.d(__webpack_exports__, {{
+/* harmony export */   "Widget{n}": function() {{ return Widget{n}; }}
+/* harmony export */ }});
+const DEFAULT_OPTIONS_{n} = {{ width: 100, height: 200, label: "w{n}" }};
+function Widget{n}(props) {{
+  const options = Object.assign({{}}, DEFAULT_OPTIONS_{n}, props);
+  const element = document.createElement("div");
+  element.className = "widget widget-" + options.label;
+  element.style.width = options.width + "px";
+  element.style.height = options.height + "px";
+  if (options.title === undefined) {{
+    options.title = "Untitled";
+  }}
+  for (let i = 0; i < options.items.length; i += 1) {{
+    const child = document.createElement("span");
+    child.textContent = options.items[i];
+    element.appendChild(child);
+  }}
+  return element;
+}}
+{extra}
+/***/ }}),
+"""
+
+# 一部のモジュールに混ぜるルール該当行
+EXTRA_LINES = [
+    "console.log('widget', DEFAULT_OPTIONS_{n});",
+    "if (value == 0) {{ reset(); }}",
+    "var legacy_{n} = true;",
+    "try {{ init(); }} catch (e) {{}}",
+    "// TODO: remove widget {n}",
+    "node.innerHTML = html_{n};",
+    "db.query(`SELECT * FROM t WHERE id = ${{id}}`);",
+]
+
+
+def legacy_analyze_patterns(code: str) -> list[Issue]:
+    """従来実装（行ごとに各ルールをre.searchで照合）"""
+    issues = []
+    lines = code.split("\n")
+
+    for i, line in enumerate(lines, 1):
+        stripped = line.strip()
+
+        # console.log検出
+        if re.search(r"\bconsole\.(log|debug|info)\s*\(", stripped):
+            issues.append(
+                Issue(
+                    level="info",
+                    line=i,
+                    message="console.log found",
+                    suggestion="Remove console.log before production",
+                )
+            )
+
+        # debugger検出
+        if re.search(r"^\s*debugger\s*;?\s*$", stripped):
+            issues.append(
+                Issue(
+                    level="warning",
+                    line=i,
+                    message="debugger statement found",
+                    suggestion="Remove debugger before production",
+                )
+            )
+
+        # eval検出
+        if re.search(r"\beval\s*\(", stripped):
+            issues.append(
+                Issue(
+                    level="bug",
+                    line=i,
+                    message="Potentially dangerous eval() usage",
+                    suggestion="Avoid eval() with untrusted input",
+                )
+            )
+
+        # == vs === 検出（非null/undefined比較）
+        if re.search(r"[^!=]==[^=]", stripped):
+            # null/undefined比較は許可
+            if not re.search(r"==\s*(null|undefined)", stripped):
+                issues.append(
+                    Issue(
+                        level="style",
+                        line=i,
+                        message="Non-strict equality (==) used",
+                        suggestion="Use strict equality (===) instead",
+                    )
+                )
+
+        # var検出
+        if re.search(r"^\s*var\s+", stripped):
+            issues.append(
+                Issue(
+                    level="style",
+                    line=i,
+                    message="var keyword used",
+                    suggestion="Use let or const instead of var",
+                )
+            )
+
+        # 空のcatchブロック検出
+        if re.search(r"catch\s*\([^)]*\)\s*\{\s*\}", stripped):
+            issues.append(
+                Issue(
+                    level="warning",
+                    line=i,
+                    message="Empty catch block detected",
+                    suggestion="Handle or log the error in catch block",
+                )
+            )
+
+        # TODO/FIXME検出
+        if re.search(r"\b(TODO|FIXME|XXX)\b", stripped, re.IGNORECASE):
+            issues.append(
+                Issue(
+                    level="info",
+                    line=i,
+                    message="TODO/FIXME comment found",
+                    suggestion="Address the TODO/FIXME before merging",
+                )
+            )
+
+        # 潜在的なXSS - innerHTML
+        if re.search(r"\.innerHTML\s*=", stripped):
+            issues.append(
+                Issue(
+                    level="warning",
+                    line=i,
+                    message="innerHTML assignment detected",
+                    suggestion="Consider using textContent or "
+                    "sanitize input to prevent XSS",
+                )
+            )
+
+        # 潜在的なSQLインジェクション
+        if re.search(r"(query|execute)\s*\(\s*[`'\"].*\$\{", stripped):
+            issues.append(
+                Issue(
+                    level="bug",
+                    line=i,
+                    message="Potential SQL injection vulnerability",
+                    suggestion="Use parameterized queries",
+                )
+            )
+
+        # any型の使用（TypeScript）
+        if re.search(r":\s*any\b", stripped):
+            issues.append(
+                Issue(
+                    level="style",
+                    line=i,
+                    message="TypeScript 'any' type used",
+                    suggestion="Consider using a more specific type",
+                )
+            )
+
+    return issues
+
+
+def build_bundle(size_mb: float) -> str:
+    """指定サイズのバンドルを生成"""
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    total = 0
+    n = 0
+    while total < target:
+        extra = EXTRA_LINES[n % len(EXTRA_LINES)] if n % 5 == 0 else ""
+        module = MODULE_TEMPLATE.format(n=n, extra=extra.format(n=n))
+        parts.append(module)
+        total += len(module)
+        n += 1
+    return "".join(parts)
+
+
+def measure(func: Callable[[str], list[Issue]], code: str, repeat: int):
+    """実行時間を計測"""
+    timings = []
+    result: list[Issue] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(code)
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    code = build_bundle(args.size_mb)
+    analyzer = JavaScriptAnalyzer()
+    print(
+        f"bundle: {len(code) / 1024 / 1024:.1f} MB, "
+        f"{code.count(chr(10)) + 1} lines"
+    )
+
+    legacy, legacy_times = measure(
+        legacy_analyze_patterns, code, args.repeat
+    )
+    scanned, scanned_times = measure(
+        analyzer._analyze_patterns, code, args.repeat
+    )
+
+    if legacy != scanned:
+        raise SystemExit("output mismatch between implementations")
+
+    for label, timings in (
+        ("per-line re.search", legacy_times),
+        ("compiled scanner", scanned_times),
+    ):
+        print(
+            f"{label:>20}: median {statistics.median(timings) * 1000:8.1f} ms"
+        )
+    print(f"issues: {len(scanned)} (identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+LLMClient 呼び出しオーバーヘッドのベンチマーク
+
+ローカルのスタブHTTPサーバー（Anthropic Messages API互換）に対して、
+呼び出しごとにSDKクライアントを生成する方式と、
+LLMClientが保持するプール済みクライアントを再利用する方式を比較する。
+
+使用例:
+    python benchmarks/bench_llm_client.py --calls 200
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from devbuddy.llm.client import LLMClient
+
+RESPONSE_BODY = json.dumps({
+    "id": "msg_bench",
+    "type": "message",
+    "role": "assistant",
+    "model": "bench-model",
+    "content": [{"type": "text", "text": "[INFO] Line 1: ok"}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """固定レスポンスを返すスタブ"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE_BODY)))
+        self.end_headers()
+        self.wfile.write(RESPONSE_BODY)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def measure(label: str, calls: int, fn: Callable[[], str]) -> None:
+    """呼び出しごとの所要時間を計測して表示"""
+    fn()  # ウォームアップ
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<22} mean={statistics.mean(samples):7.3f}ms "
+        f"p50={statistics.median(samples):7.3f}ms p95={p95:7.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    import anthropic
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def per_call_client() -> str:
+        # 変更前の挙動: 呼び出しごとにクライアントを生成
+        client = anthropic.Anthropic(api_key="sk-ant-bench", base_url=base_url)
+        message = client.messages.create(
+            model="bench-model",
+            max_tokens=16,
+            messages=[{"role": "user", "content": "hi"}],
+        )
+        client.close()
+        return str(message.content[0].text)
+
+    pooled = LLMClient(api_key="sk-ant-bench", model="bench-model")
+    sdk_client = pooled._get_claude_client()
+    pooled._sdk_client = sdk_client.with_options(base_url=base_url)
+
+    try:
+        measure("per-call client", args.calls, per_call_client)
+        measure("pooled LLMClient", args.calls, lambda: pooled.complete("hi"))
+    finally:
+        pooled.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from devbuddy.core.reviewer import Issue
+from devbuddy.core.models import Issue
 
 
 @dataclass
@@ -24,6 +24,134 @@ class JSAnalysisConfig:
     eslint_config: Optional[str] = None
 
 
+@dataclass(frozen=True)
+class _PatternRule:
+    """パターンベース解析のルール"""
+
+    pattern: "re.Pattern[str]"
+    level: str
+    message: str
+    suggestion: str
+    unless: Optional["re.Pattern[str]"] = None  # マッチしたら除外
+
+
+# 行（前後の空白を除去したもの）に適用するルール。出力順はこの順序
+_PATTERN_RULES = (
+    # console.log検出
+    _PatternRule(
+        re.compile(r"\bconsole\.(log|debug|info)\s*\("),
+        "info",
+        "console.log found",
+        "Remove console.log before production",
+    ),
+    # debugger検出
+    _PatternRule(
+        re.compile(r"^\s*debugger\s*;?\s*$"),
+        "warning",
+        "debugger statement found",
+        "Remove debugger before production",
+    ),
+    # eval検出
+    _PatternRule(
+        re.compile(r"\beval\s*\("),
+        "bug",
+        "Potentially dangerous eval() usage",
+        "Avoid eval() with untrusted input",
+    ),
+    # == vs === 検出（null/undefined比較は許可）
+    _PatternRule(
+        re.compile(r"[^!=]==[^=]"),
+        "style",
+        "Non-strict equality (==) used",
+        "Use strict equality (===) instead",
+        unless=re.compile(r"==\s*(null|undefined)"),
+    ),
+    # var検出
+    _PatternRule(
+        re.compile(r"^\s*var\s+"),
+        "style",
+        "var keyword used",
+        "Use let or const instead of var",
+    ),
+    # 空のcatchブロック検出
+    _PatternRule(
+        re.compile(r"catch\s*\([^)]*\)\s*\{\s*\}"),
+        "warning",
+        "Empty catch block detected",
+        "Handle or log the error in catch block",
+    ),
+    # TODO/FIXME検出
+    _PatternRule(
+        re.compile(r"\b(TODO|FIXME|XXX)\b", re.IGNORECASE),
+        "info",
+        "TODO/FIXME comment found",
+        "Address the TODO/FIXME before merging",
+    ),
+    # 潜在的なXSS - innerHTML
+    _PatternRule(
+        re.compile(r"\.innerHTML\s*="),
+        "warning",
+        "innerHTML assignment detected",
+        "Consider using textContent or sanitize input to prevent XSS",
+    ),
+    # 潜在的なSQLインジェクション
+    _PatternRule(
+        re.compile(r"(query|execute)\s*\(\s*[`'\"].*\$\{"),
+        "bug",
+        "Potential SQL injection vulnerability",
+        "Use parameterized queries",
+    ),
+    # any型の使用（TypeScript）
+    _PatternRule(
+        re.compile(r":\s*any\b"),
+        "style",
+        "TypeScript 'any' type used",
+        "Consider using a more specific type",
+    ),
+)
+
+# いずれかのルールがマッチする行が必ず含む文字列（候補行の絞り込み用）。
+# 単純なリテラル検索はreの高速検索が効くため、選択(|)でまとめずに個別に走査する
+_CANDIDATE_LITERALS = tuple(
+    re.compile(re.escape(literal))
+    for literal in (
+        "console.", "debugger", "eval", "==", "var", "catch",
+        ".innerHTML", "query", "execute", "any",
+    )
+)
+_CANDIDATE_NOCASE = tuple(
+    re.compile(literal) for literal in ("todo", "fixme", "xxx")
+)
+_CANDIDATE_NOCASE_PATTERN = re.compile(r"todo|fixme|xxx", re.IGNORECASE)
+
+
+def _candidate_lines(code: str) -> list[int]:
+    """ルールがマッチし得る行番号（1始まり）を昇順に返す"""
+    offsets: list[int] = []
+    for pattern in _CANDIDATE_LITERALS:
+        offsets.extend(m.start() for m in pattern.finditer(code))
+
+    # ASCIIなら小文字化しても位置が変わらないのでリテラル検索できる
+    if code.isascii():
+        lowered = code.lower()
+        for pattern in _CANDIDATE_NOCASE:
+            offsets.extend(m.start() for m in pattern.finditer(lowered))
+    else:
+        offsets.extend(
+            m.start() for m in _CANDIDATE_NOCASE_PATTERN.finditer(code)
+        )
+
+    lines: list[int] = []
+    line = 1
+    pos = 0
+    for offset in sorted(offsets):
+        line += code.count("\n", pos, offset)
+        pos = offset
+        if not lines or lines[-1] != line:
+            lines.append(line)
+    return lines
+
+
 class JavaScriptAnalyzer:
     """JavaScript/TypeScript静的解析エンジン"""
 
@@ -63,123 +191,28 @@ class JavaScriptAnalyzer:
         return file_path.suffix in (".ts", ".tsx")
 
     def _analyze_patterns(self, code: str) -> list[Issue]:
-        """パターンベース解析"""
+        """パターンベース解析
+
+        ルールが必ず含む文字列ごとにファイル全体を走査して候補行を
+        絞り込み（_candidate_lines）、候補行だけに各ルールを適用する。
+        """
         issues = []
         lines = code.split("\n")
 
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-
-            # console.log検出
-            if re.search(r"\bconsole\.(log|debug|info)\s*\(", stripped):
-                issues.append(
-                    Issue(
-                        level="info",
-                        line=i,
-                        message="console.log found",
-                        suggestion="Remove console.log before production",
-                    )
-                )
-
-            # debugger検出
-            if re.search(r"^\s*debugger\s*;?\s*$", stripped):
-                issues.append(
-                    Issue(
-                        level="warning",
-                        line=i,
-                        message="debugger statement found",
-                        suggestion="Remove debugger before production",
-                    )
-                )
-
-            # eval検出
-            if re.search(r"\beval\s*\(", stripped):
-                issues.append(
-                    Issue(
-                        level="bug",
-                        line=i,
-                        message="Potentially dangerous eval() usage",
-                        suggestion="Avoid eval() with untrusted input",
-                    )
-                )
-
-            # == vs === 検出（非null/undefined比較）
-            if re.search(r"[^!=]==[^=]", stripped):
-                # null/undefined比較は許可
-                if not re.search(r"==\s*(null|undefined)", stripped):
-                    issues.append(
-                        Issue(
-                            level="style",
-                            line=i,
-                            message="Non-strict equality (==) used",
-                            suggestion="Use strict equality (===) instead",
-                        )
-                    )
-
-            # var検出
-            if re.search(r"^\s*var\s+", stripped):
-                issues.append(
-                    Issue(
-                        level="style",
-                        line=i,
-                        message="var keyword used",
-                        suggestion="Use let or const instead of var",
-                    )
-                )
-
-            # 空のcatchブロック検出
-            if re.search(r"catch\s*\([^)]*\)\s*\{\s*\}", stripped):
-                issues.append(
-                    Issue(
-                        level="warning",
-                        line=i,
-                        message="Empty catch block detected",
-                        suggestion="Handle or log the error in catch block",
-                    )
-                )
-
-            # TODO/FIXME検出
-            if re.search(r"\b(TODO|FIXME|XXX)\b", stripped, re.IGNORECASE):
-                issues.append(
-                    Issue(
-                        level="info",
-                        line=i,
-                        message="TODO/FIXME comment found",
-                        suggestion="Address the TODO/FIXME before merging",
-                    )
-                )
-
-            # 潜在的なXSS - innerHTML
-            if re.search(r"\.innerHTML\s*=", stripped):
-                issues.append(
-                    Issue(
-                        level="warning",
-                        line=i,
-                        message="innerHTML assignment detected",
-                        suggestion="Consider using textContent or "
-                        "sanitize input to prevent XSS",
-                    )
-                )
-
-            # 潜在的なSQLインジェクション
-            if re.search(r"(query|execute)\s*\(\s*[`'\"].*\$\{", stripped):
-                issues.append(
-                    Issue(
-                        level="bug",
-                        line=i,
-                        message="Potential SQL injection vulnerability",
-                        suggestion="Use parameterized queries",
-                    )
-                )
+        for i in _candidate_lines(code):
+            stripped = lines[i - 1].strip()
 
-            # any型の使用（TypeScript）
-            if re.search(r":\s*any\b", stripped):
+            for rule in _PATTERN_RULES:
+                if not rule.pattern.search(stripped):
+                    continue
+                if rule.unless is not None and rule.unless.search(stripped):
+                    continue
                 issues.append(
                     Issue(
-                        level="style",
+                        level=rule.level,
                         line=i,
-                        message="TypeScript 'any' type used",
-                        suggestion="Consider using a more specific type",
+                        message=rule.message,
+                        suggestion=rule.suggestion,
                     )
                 )
 
@@ -0,0 +1,238 @@
+"""
+MypyDaemon - mypyデーモン（dmypy）管理
+
+リポジトリごとにdmypyを1つ起動し、devbuddyの複数回の実行で
+使い回す。2回目以降の型チェックは差分のみ再検査されるため、
+コールドなmypy実行より大幅に速い。
+"""
+
+import json
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# dmypyのデフォルトと同じステータスファイル名
+DEFAULT_STATUS_FILE = ".dmypy.json"
+
+# 最後の要求からデーモンが自動終了するまでの秒数
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+# devbuddyが出力を解析するためのmypyオプション
+MYPY_FLAGS = ["--show-column-numbers", "--no-error-summary"]
+
+# デーモンが既に存在しないことを示すdmypyのエラー
+_DEAD_MARKERS = (
+    "Connection refused",
+    "No such file or directory",
+    "Daemon has died",
+)
+
+
+@dataclass
+class DaemonStatus:
+    """デーモンの状態"""
+
+    state: str  # running, stopped, stale
+    pid: Optional[int] = None
+    message: str = ""
+
+    @property
+    def running(self) -> bool:
+        return self.state == "running"
+
+
+class MypyDaemon:
+    """dmypyのライフサイクル管理
+
+    状態はステータスファイル（デフォルト: <root>/.dmypy.json）で
+    共有されるため、別プロセスのdevbuddyからも同じデーモンを使える。
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        status_file: Optional[Path] = None,
+        idle_timeout: int = DEFAULT_IDLE_TIMEOUT,
+    ):
+        """
+        Args:
+            root: デーモンの作業ディレクトリ（デフォルト: カレント）
+            status_file: ステータスファイルのパス
+            idle_timeout: 無操作で自動終了するまでの秒数
+        """
+        self.root = (root or Path.cwd()).resolve()
+        self.status_file = status_file or self.root / DEFAULT_STATUS_FILE
+        self.idle_timeout = idle_timeout
+
+    def status(self) -> DaemonStatus:
+        """デーモンの状態を取得"""
+        if not self.status_file.exists():
+            return DaemonStatus(state="stopped")
+
+        info = self._read_status_file()
+        pid = info.get("pid") if info else None
+
+        try:
+            result = self._dmypy(["status"], timeout=10)
+        except subprocess.TimeoutExpired:
+            # 接続はできたが応答がない（処理中）
+            return DaemonStatus(state="running", pid=pid, message="busy")
+        except FileNotFoundError as e:
+            return DaemonStatus(state="stopped", pid=pid, message=str(e))
+
+        message = (result.stdout + result.stderr).strip()
+        if result.returncode == 0:
+            return DaemonStatus(state="running", pid=pid, message=message)
+        if info is None or _looks_dead(pid, message):
+            return DaemonStatus(state="stale", pid=pid, message=message)
+        return DaemonStatus(state="stopped", pid=pid, message=message)
+
+    def start(self) -> bool:
+        """デーモンを起動（起動済みなら何もしない）
+
+        Returns:
+            bool: デーモンが稼働中になったか
+        """
+        self.cleanup_stale()
+        if self.status().running:
+            return True
+
+        try:
+            result = self._dmypy(
+                ["start", "--timeout", str(self.idle_timeout), "--"]
+                + MYPY_FLAGS,
+                timeout=60,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return False
+        return result.returncode == 0
+
+    def stop(self) -> bool:
+        """デーモンを停止
+
+        Returns:
+            bool: 停止したか（もともと停止していた場合もTrue）
+        """
+        if self.cleanup_stale() or not self.status_file.exists():
+            return True
+
+        try:
+            result = self._dmypy(["stop"], timeout=30)
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return False
+        if result.returncode == 0:
+            return True
+
+        # 応答しないデーモンは強制終了
+        try:
+            result = self._dmypy(["kill"], timeout=30)
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return False
+        return result.returncode == 0
+
+    def cleanup_stale(self) -> bool:
+        """異常終了したデーモンのステータスファイルとソケットを削除
+
+        Returns:
+            bool: 削除したか
+        """
+        status = self.status()
+        if status.state != "stale":
+            return False
+
+        info = self._read_status_file()
+        connection = info.get("connection_name") if info else None
+        if isinstance(connection, str) and os.path.exists(connection):
+            try:
+                os.unlink(connection)
+                os.rmdir(os.path.dirname(connection))
+            except OSError:
+                pass
+
+        try:
+            self.status_file.unlink()
+        except OSError:
+            return False
+        return True
+
+    def check(self, file_paths: list[Path]) -> Optional[str]:
+        """デーモンで型チェックを実行
+
+        デーモンが未起動なら起動する（dmypy run）。異常終了した
+        デーモンの残骸で失敗した場合は削除して1回だけ再試行する。
+
+        Returns:
+            Optional[str]: mypy形式の出力（デーモンが使えない場合None）
+        """
+        args = (
+            ["run", "--timeout", str(self.idle_timeout), "--"]
+            + MYPY_FLAGS
+            + [str(p) for p in file_paths]
+        )
+
+        for _ in range(2):
+            try:
+                result = self._dmypy(args, timeout=120 + len(file_paths))
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                return None
+
+            # 0: 問題なし, 1: 型エラーあり, 2: デーモンの異常
+            if result.returncode in (0, 1):
+                return result.stdout
+            if not self.cleanup_stale():
+                return None
+
+        return None
+
+    def _dmypy(
+        self,
+        args: list[str],
+        timeout: float,
+    ) -> "subprocess.CompletedProcess[str]":
+        """dmypyコマンドを実行"""
+        return subprocess.run(
+            ["dmypy", "--status-file", str(self.status_file)] + args,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=self.root,
+        )
+
+    def _read_status_file(self) -> Optional[dict]:
+        """ステータスファイルを読み込む（壊れていればNone）"""
+        try:
+            with open(self.status_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+
+def _looks_dead(pid: object, message: str) -> bool:
+    """dmypy statusの失敗がデーモンの消失によるものか
+
+    プロセスが無い、またはソケットに接続できない（待ち受けが
+    無い）場合に真。処理中のデーモンは接続自体は受け付ける。
+    """
+    if isinstance(pid, int) and not _pid_alive(pid):
+        return True
+    return any(marker in message for marker in _DEAD_MARKERS)
+
+
+def _pid_alive(pid: int) -> bool:
+    """プロセスが存在するか
+
+    Windowsでは安全に確認できないため常に存在するとみなす
+    （自動削除は行わず、dmypy自身の判定に任せる）。
+    """
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -5,12 +5,21 @@ flake8、mypy等の静的解析ツールと統合。
 """
 
 import ast
+import re
 import subprocess
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-from devbuddy.core.reviewer import Issue
+from devbuddy.analyzers.python_ast import RuleVisitor, parse_cached
+from devbuddy.analyzers.mypy_daemon import MYPY_FLAGS, MypyDaemon
+from devbuddy.analyzers.python_lint import InProcessLinter
+from devbuddy.core.models import Issue
+
+
+FLAKE8_BACKENDS = ("subprocess", "inprocess")
+MYPY_BACKENDS = ("subprocess", "daemon")
 
 
 @dataclass
@@ -22,6 +31,99 @@ class AnalysisConfig:
     use_pylint: bool = False
     max_line_length: int = 120
     ignore_codes: list[str] | None = None
+    flake8_jobs: Optional[int] = None  # Noneならflake8の既定（auto）
+    # flake8の実行方式: subprocess（flake8コマンド）/ inprocess（API直接）
+    flake8_backend: str = "subprocess"
+    # mypyの実行方式: subprocess（毎回起動）/ daemon（dmypyを再利用）
+    mypy_backend: str = "subprocess"
+
+    def __post_init__(self) -> None:
+        if self.flake8_backend not in FLAKE8_BACKENDS:
+            raise ValueError(
+                f"Unknown flake8_backend: {self.flake8_backend} "
+                f"(choose from {', '.join(FLAKE8_BACKENDS)})"
+            )
+        if self.mypy_backend not in MYPY_BACKENDS:
+            raise ValueError(
+                f"Unknown mypy_backend: {self.mypy_backend} "
+                f"(choose from {', '.join(MYPY_BACKENDS)})"
+            )
+
+
+# flake8/mypyのバッチ出力を行単位で分解する正規表現
+_FLAKE8_LINE = re.compile(r"^(.+?):(\d+):(\d+):([A-Z]+\d+):(.*)$")
+_MYPY_LINE = re.compile(r"^(.+?):(\d+):(?:\d+:)? error: (.*)$")
+
+# 同名のモジュールが複数あり、mypyが検査せずに終了したことを示す出力
+_MYPY_DUPLICATE_MODULE = "Duplicate module named"
+
+# 1回のコマンドラインに渡すパス文字数の上限（Windowsの制限を考慮）
+_MAX_ARGV_CHARS = 30000
+
+
+DEFAULT_RULES = RuleVisitor()
+
+
+@DEFAULT_RULES.register(ast.ExceptHandler)
+def _check_bare_except(node: ast.ExceptHandler) -> Iterator[Issue]:
+    """bare except検出"""
+    if node.type is None:
+        yield Issue(
+            level="warning",
+            line=node.lineno,
+            message="Bare except clause detected",
+            suggestion="Specify exception type (e.g., except Exception:)",
+        )
+
+
+@DEFAULT_RULES.register(ast.FunctionDef)
+def _check_mutable_default(node: ast.FunctionDef) -> Iterator[Issue]:
+    """mutable default argument検出"""
+    for default in node.args.defaults:
+        if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+            yield Issue(
+                level="warning",
+                line=node.lineno,
+                message=f"Mutable default argument in function '{node.name}'",
+                suggestion="Use None as default "
+                "and initialize inside function",
+            )
+
+
+@DEFAULT_RULES.register(ast.Assert)
+def _check_assert(node: ast.Assert) -> Iterator[Issue]:
+    """assert in non-test code"""
+    yield Issue(
+        level="info",
+        line=node.lineno,
+        message="Assert statement found",
+        suggestion="Consider using proper error handling "
+        "in production code",
+    )
+
+
+@DEFAULT_RULES.register(ast.Global)
+def _check_global(node: ast.Global) -> Iterator[Issue]:
+    """global statement検出"""
+    yield Issue(
+        level="style",
+        line=node.lineno,
+        message="Global statement used",
+        suggestion="Consider using class attributes "
+        "or function parameters instead",
+    )
+
+
+@DEFAULT_RULES.register(ast.Call)
+def _check_exec_eval(node: ast.Call) -> Iterator[Issue]:
+    """exec/eval検出"""
+    if isinstance(node.func, ast.Name) and node.func.id in ("exec", "eval"):
+        yield Issue(
+            level="bug",
+            line=node.lineno,
+            message=f"Potentially dangerous {node.func.id}() usage",
+            suggestion="Avoid exec/eval with untrusted input",
+        )
 
 
 class PythonAnalyzer:
@@ -29,6 +131,13 @@ class PythonAnalyzer:
 
     def __init__(self, config: Optional[AnalysisConfig] = None):
         self.config = config or AnalysisConfig()
+        # インスタンスごとにルールを追加できるよう既定ルールを複製
+        self.rules = DEFAULT_RULES.copy()
+        # prefetch_external()で事前に取得した外部ツールの結果
+        self._prefetched: dict[Path, tuple[int, list[Issue]]] = {}
+        self._prefetch_lock = threading.Lock()
+        self._linter: Optional[InProcessLinter] = None
+        self._mypy_daemon: Optional[MypyDaemon] = None
 
     def analyze(
         self,
@@ -37,6 +146,9 @@ class PythonAnalyzer:
     ) -> list[Issue]:
         """コードを解析してIssueリストを返す
 
+        flake8_backendがinprocessの場合、flake8相当の検査はcodeに
+        対して行うため、file_pathが無い（未保存のバッファ）場合も動作する。
+
         Args:
             code: ソースコード
             file_path: ファイルパス（外部ツール用）
@@ -49,21 +161,128 @@ class PythonAnalyzer:
         # AST解析
         issues.extend(self._analyze_ast(code))
 
+        if self._use_inprocess_flake8:
+            issues.extend(self._run_flake8_inprocess(code, file_path))
+
         # 外部ツール解析（ファイルがある場合）
         if file_path and file_path.exists():
-            if self.config.use_flake8:
-                issues.extend(self._run_flake8(file_path))
-            if self.config.use_mypy:
-                issues.extend(self._run_mypy(file_path))
+            prefetched = self._take_prefetched(file_path)
+            if prefetched is not None:
+                issues.extend(prefetched)
+            else:
+                if self._use_subprocess_flake8:
+                    issues.extend(self._run_flake8(file_path))
+                if self.config.use_mypy:
+                    issues.extend(self._run_mypy(file_path))
 
         return issues
 
-    def _analyze_ast(self, code: str) -> list[Issue]:
-        """AST解析"""
-        issues = []
+    def analyze_files(
+        self,
+        file_paths: list[Path],
+    ) -> dict[Path, list[Issue]]:
+        """複数ファイルをまとめて解析
+
+        flake8/mypyはファイル数によらずそれぞれ1回だけ起動し、
+        出力をファイルごとに振り分ける。
+
+        Args:
+            file_paths: 解析対象ファイル
+
+        Returns:
+            dict[Path, list[Issue]]: ファイルごとの検出結果
+        """
+        external = self._run_external_batch(file_paths)
+        results: dict[Path, list[Issue]] = {}
+
+        for file_path in file_paths:
+            try:
+                code = file_path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                results[file_path] = []
+                continue
+            issues = self._analyze_ast(code)
+            if self._use_inprocess_flake8:
+                issues.extend(self._run_flake8_inprocess(code, file_path))
+            issues.extend(external.get(file_path, []))
+            results[file_path] = issues
+
+        return results
+
+    def prefetch_external(self, file_paths: list[Path]) -> None:
+        """外部ツールをまとめて実行し、結果を保持
+
+        以降のanalyze()は該当ファイルについてサブプロセスを
+        起動せず、保持した結果を使う（ファイルが変更されていれば
+        破棄して通常どおり実行）。
+        """
+        existing = [p for p in file_paths if p.exists()]
+        if not existing:
+            return
+        if not (self._use_subprocess_flake8 or self.config.use_mypy):
+            return
+
+        # タイムアウト等で検査できなかったファイルは保持せず、
+        # analyze()で個別に実行させる
+        external = self._run_external_batch(existing)
+        with self._prefetch_lock:
+            for file_path, issues in external.items():
+                try:
+                    mtime = file_path.stat().st_mtime_ns
+                except OSError:
+                    continue
+                self._prefetched[file_path.resolve()] = (mtime, issues)
+
+    def _take_prefetched(self, file_path: Path) -> Optional[list[Issue]]:
+        """事前取得した結果を取り出す（未取得・変更済みならNone）"""
+        if not self._prefetched:
+            return None
+        key = file_path.resolve()
+        with self._prefetch_lock:
+            entry = self._prefetched.pop(key, None)
+        if entry is None:
+            return None
+        mtime, issues = entry
+        try:
+            if file_path.stat().st_mtime_ns != mtime:
+                return None
+        except OSError:
+            return None
+        return issues
+
+    def _run_external_batch(
+        self,
+        file_paths: list[Path],
+    ) -> dict[Path, list[Issue]]:
+        """flake8/mypyを一括実行してファイルごとに振り分け
 
+        Returns:
+            dict[Path, list[Issue]]: 有効なツールがすべて検査できた
+            ファイルの結果（タイムアウト等で失敗したファイルは含まない）
+        """
+        results: dict[Path, list[Issue]] = {p: [] for p in file_paths}
+        if not file_paths:
+            return results
+
+        batches = []
+        if self._use_subprocess_flake8:
+            batches.append(self._run_flake8_batch(file_paths))
+        if self.config.use_mypy:
+            batches.append(self._run_mypy_batch(file_paths))
+
+        for batch in batches:
+            for path in list(results):
+                if path in batch:
+                    results[path].extend(batch[path])
+                else:
+                    del results[path]
+
+        return results
+
+    def _analyze_ast(self, code: str) -> list[Issue]:
+        """AST解析（登録済みルールを1回の走査で実行）"""
         try:
-            tree = ast.parse(code)
+            tree = parse_cached(code)
         except SyntaxError as e:
             return [
                 Issue(
@@ -73,166 +292,194 @@ class PythonAnalyzer:
                 )
             ]
 
-        for node in ast.walk(tree):
-            # bare except検出
-            if isinstance(node, ast.ExceptHandler) and node.type is None:
-                issues.append(
-                    Issue(
-                        level="warning",
-                        line=node.lineno,
-                        message="Bare except clause detected",
-                        suggestion="Specify exception type "
-                        "(e.g., except Exception:)",
-                    )
-                )
+        return self.rules.run(tree)
 
-            # mutable default argument検出
-            if isinstance(node, ast.FunctionDef):
-                for default in node.args.defaults:
-                    if isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                        issues.append(
-                            Issue(
-                                level="warning",
-                                line=node.lineno,
-                                message=f"Mutable default argument "
-                                f"in function '{node.name}'",
-                                suggestion="Use None as default "
-                                "and initialize inside function",
-                            )
-                        )
-
-            # assert in non-test code
-            if isinstance(node, ast.Assert):
-                issues.append(
-                    Issue(
-                        level="info",
-                        line=node.lineno,
-                        message="Assert statement found",
-                        suggestion="Consider using proper error handling "
-                        "in production code",
-                    )
-                )
+    @property
+    def _use_subprocess_flake8(self) -> bool:
+        return (
+            self.config.use_flake8
+            and self.config.flake8_backend == "subprocess"
+        )
 
-            # global statement検出
-            if isinstance(node, ast.Global):
-                issues.append(
-                    Issue(
-                        level="style",
-                        line=node.lineno,
-                        message="Global statement used",
-                        suggestion="Consider using class attributes "
-                        "or function parameters instead",
-                    )
-                )
-
-            # exec/eval検出
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in ("exec", "eval"):
-                        issues.append(
-                            Issue(
-                                level="bug",
-                                line=node.lineno,
-                                message=f"Potentially dangerous "
-                                f"{node.func.id}() usage",
-                                suggestion="Avoid exec/eval "
-                                "with untrusted input",
-                            )
-                        )
+    @property
+    def _use_inprocess_flake8(self) -> bool:
+        return (
+            self.config.use_flake8
+            and self.config.flake8_backend == "inprocess"
+        )
 
+    def _run_flake8_inprocess(
+        self,
+        code: str,
+        file_path: Optional[Path] = None,
+    ) -> list[Issue]:
+        """flake8相当の検査をプロセス内で実行"""
+        linter = self._linter
+        if (
+            linter is None
+            or linter.max_line_length != self.config.max_line_length
+        ):
+            linter = InProcessLinter(self.config.max_line_length)
+            self._linter = linter
+
+        filename = str(file_path) if file_path else "stdin"
+        issues: list[Issue] = []
+        for message in linter.check(code, filename):
+            # 無視リストチェック
+            if self.config.ignore_codes:
+                if message.code in self.config.ignore_codes:
+                    continue
+            issues.append(
+                Issue(
+                    level=self._flake8_code_to_level(message.code),
+                    line=message.line,
+                    message=f"[{message.code}] {message.text}",
+                )
+            )
         return issues
 
     def _run_flake8(self, file_path: Path) -> list[Issue]:
         """flake8を実行"""
-        issues: list[Issue] = []
+        return self._run_flake8_batch([file_path]).get(file_path, [])
 
-        try:
-            result = subprocess.run(
-                [
-                    "flake8",
-                    str(file_path),
-                    f"--max-line-length={self.config.max_line_length}",
-                    "--format=%(row)d:%(col)d:%(code)s:%(text)s",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return issues
+    def _run_flake8_batch(
+        self,
+        file_paths: list[Path],
+    ) -> dict[Path, list[Issue]]:
+        """flake8を複数ファイルに対して1回で実行
 
-        for line in result.stdout.strip().split("\n"):
-            if not line:
+        Returns:
+            dict[Path, list[Issue]]: 検査できたファイルの結果
+            （タイムアウトしたファイルは含まない）
+        """
+        results: dict[Path, list[Issue]] = {}
+        lookup = _path_lookup(file_paths)
+
+        cmd = [
+            "flake8",
+            f"--max-line-length={self.config.max_line_length}",
+            "--format=%(path)s:%(row)d:%(col)d:%(code)s:%(text)s",
+        ]
+        if self.config.flake8_jobs is not None:
+            cmd.append(f"--jobs={self.config.flake8_jobs}")
+
+        for chunk in _argv_chunks(file_paths):
+            try:
+                result = subprocess.run(
+                    cmd + [str(p) for p in chunk],
+                    capture_output=True,
+                    text=True,
+                    timeout=30 + len(chunk),
+                )
+            except (subprocess.TimeoutExpired, FileNotFoundError):
                 continue
+            results.update((checked, []) for checked in chunk)
 
-            try:
-                parts = line.split(":", 3)
-                if len(parts) >= 4:
-                    row = int(parts[0])
-                    code = parts[2]
-                    text = parts[3]
-
-                    # コードに基づいてレベル判定
-                    level = self._flake8_code_to_level(code)
-
-                    # 無視リストチェック
-                    if self.config.ignore_codes:
-                        if code in self.config.ignore_codes:
-                            continue
-
-                    issues.append(
-                        Issue(
-                            level=level,
-                            line=row,
-                            message=f"[{code}] {text}",
-                        )
+            for line in result.stdout.splitlines():
+                match = _FLAKE8_LINE.match(line)
+                if not match:
+                    continue
+
+                path = _resolve_output_path(match.group(1), lookup)
+                if path is None or path not in results:
+                    continue
+
+                code = match.group(4)
+                text = match.group(5)
+
+                # 無視リストチェック
+                if self.config.ignore_codes:
+                    if code in self.config.ignore_codes:
+                        continue
+
+                results[path].append(
+                    Issue(
+                        # コードに基づいてレベル判定
+                        level=self._flake8_code_to_level(code),
+                        line=int(match.group(2)),
+                        message=f"[{code}] {text}",
                     )
-            except (ValueError, IndexError):
-                continue
+                )
 
-        return issues
+        return results
 
     def _run_mypy(self, file_path: Path) -> list[Issue]:
         """mypyを実行"""
-        issues: list[Issue] = []
+        return self._run_mypy_batch([file_path]).get(file_path, [])
 
-        try:
-            result = subprocess.run(
-                [
-                    "mypy",
-                    str(file_path),
-                    "--no-error-summary",
-                    "--show-column-numbers",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return issues
+    def _run_mypy_batch(
+        self,
+        file_paths: list[Path],
+    ) -> dict[Path, list[Issue]]:
+        """mypyを複数ファイルに対して1回で実行
 
-        for line in result.stdout.strip().split("\n"):
-            if not line or "error:" not in line:
-                continue
+        パッケージ外に同名のファイル（複数のconftest.py等）があると
+        mypyは何も検査せずに終了するため、ディレクトリごと、
+        さらにファイルごとに分けて実行し直す。
 
+        Returns:
+            dict[Path, list[Issue]]: 検査できたファイルの結果
+            （タイムアウト等で失敗したファイルは含まない）
+        """
+        output: Optional[str] = None
+        base: Optional[Path] = None
+        if self.config.mypy_backend == "daemon":
+            daemon = self._get_mypy_daemon()
+            output = daemon.check(file_paths)
+            base = daemon.root
+
+        # デーモンが使えない場合は通常のmypyで実行
+        if output is None:
             try:
-                # 形式: file.py:line:col: error: message
-                parts = line.split(":", 4)
-                if len(parts) >= 5:
-                    row = int(parts[1])
-                    message = parts[4].strip()
-
-                    issues.append(
-                        Issue(
-                            level="warning",
-                            line=row,
-                            message=f"[mypy] {message}",
-                        )
-                    )
-            except (ValueError, IndexError):
+                result = subprocess.run(
+                    ["mypy", *[str(p) for p in file_paths], *MYPY_FLAGS],
+                    capture_output=True,
+                    text=True,
+                    timeout=60 + len(file_paths),
+                )
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                return {}
+            output = result.stdout
+            base = None
+
+        if _MYPY_DUPLICATE_MODULE in output:
+            if len(file_paths) == 1:
+                return {}
+            groups = _group_by_directory(file_paths)
+            if len(groups) == 1:
+                groups = [[path] for path in file_paths]
+            split: dict[Path, list[Issue]] = {}
+            for group in groups:
+                split.update(self._run_mypy_batch(group))
+            return split
+
+        results: dict[Path, list[Issue]] = {p: [] for p in file_paths}
+        lookup = _path_lookup(file_paths)
+        for line in output.splitlines():
+            # 形式: file.py:line:col: error: message
+            match = _MYPY_LINE.match(line)
+            if not match:
                 continue
 
-        return issues
+            path = _resolve_output_path(match.group(1), lookup, base)
+            if path is None:
+                continue
+
+            results[path].append(
+                Issue(
+                    level="warning",
+                    line=int(match.group(2)),
+                    message=f"[mypy] {match.group(3).strip()}",
+                )
+            )
+
+        return results
+
+    def _get_mypy_daemon(self) -> MypyDaemon:
+        """dmypy管理オブジェクトを取得（遅延初期化）"""
+        if self._mypy_daemon is None:
+            self._mypy_daemon = MypyDaemon()
+        return self._mypy_daemon
 
     def _flake8_code_to_level(self, code: str) -> str:
         """flake8エラーコードをレベルに変換"""
@@ -258,7 +505,7 @@ class PythonAnalyzer:
             tuple[bool, Optional[str]]: (有効か, エラーメッセージ)
         """
         try:
-            ast.parse(code)
+            parse_cached(code)
             return True, None
         except SyntaxError as e:
             return False, f"Line {e.lineno}: {e.msg}"
@@ -266,7 +513,7 @@ class PythonAnalyzer:
     def get_functions(self, code: str) -> list[str]:
         """コード内の関数名を取得"""
         try:
-            tree = ast.parse(code)
+            tree = parse_cached(code)
         except SyntaxError:
             return []
 
@@ -280,7 +527,7 @@ class PythonAnalyzer:
     def get_classes(self, code: str) -> list[str]:
         """コード内のクラス名を取得"""
         try:
-            tree = ast.parse(code)
+            tree = parse_cached(code)
         except SyntaxError:
             return []
 
@@ -290,3 +537,60 @@ class PythonAnalyzer:
                 classes.append(node.name)
 
         return classes
+
+
+def _path_lookup(file_paths: list[Path]) -> dict[str, Path]:
+    """ツール出力のパス表記から入力Pathを引く辞書を作成"""
+    lookup: dict[str, Path] = {}
+    for path in file_paths:
+        lookup[str(path)] = path
+        try:
+            lookup[str(path.resolve())] = path
+        except OSError:
+            pass
+    return lookup
+
+
+def _resolve_output_path(
+    raw: str,
+    lookup: dict[str, Path],
+    base: Optional[Path] = None,
+) -> Optional[Path]:
+    """ツール出力のパスを入力Pathに対応付ける
+
+    baseはツールの作業ディレクトリ（相対パス出力の基準）。
+    """
+    path = lookup.get(raw)
+    if path is not None:
+        return path
+    raw_path = Path(raw)
+    if base is not None and not raw_path.is_absolute():
+        raw_path = base / raw_path
+    try:
+        return lookup.get(str(raw_path.resolve()))
+    except OSError:
+        return None
+
+
+def _group_by_directory(file_paths: list[Path]) -> list[list[Path]]:
+    """ファイルを親ディレクトリごとにまとめる（入力順を保つ）"""
+    groups: dict[Path, list[Path]] = {}
+    for path in file_paths:
+        groups.setdefault(path.parent, []).append(path)
+    return list(groups.values())
+
+
+def _argv_chunks(file_paths: list[Path]) -> Iterator[list[Path]]:
+    """コマンドライン長の上限を超えないようにファイルを分割"""
+    chunk: list[Path] = []
+    size = 0
+    for path in file_paths:
+        length = len(str(path)) + 1
+        if chunk and size + length > _MAX_ARGV_CHARS:
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(path)
+        size += length
+    if chunk:
+        yield chunk
@@ -0,0 +1,156 @@
+"""
+Python AST共通基盤
+
+構文木のキャッシュと、ノード型ごとにルールを登録して
+1回の走査で全ルールを実行するビジターを提供する。
+"""
+
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, TypeVar, Union, cast
+
+from devbuddy.core.models import Issue
+
+# キャッシュする構文木の最大数
+DEFAULT_TREE_CACHE_SIZE = 256
+
+Rule = Callable[[ast.AST], Iterable[Issue]]
+
+# ルールが受け取るノード型（登録したノード型に一致する）
+NodeT = TypeVar("NodeT", bound=ast.AST)
+
+
+class TreeCache:
+    """ソース内容のハッシュをキーにした構文木キャッシュ（LRU）
+
+    同じ内容のソースは一度だけパースする。構文エラーも
+    キャッシュし、同じ例外を再送出する。返す構文木は共有されるため、
+    呼び出し側で変更してはならない。
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TREE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Union[ast.Module, SyntaxError]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, code: str) -> ast.Module:
+        """キャッシュ経由でパース
+
+        Raises:
+            SyntaxError: 構文エラーの場合
+        """
+        key = hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if entry is None:
+            try:
+                entry = ast.parse(code)
+            except SyntaxError as e:
+                entry = e
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        if isinstance(entry, SyntaxError):
+            raise entry
+        return entry
+
+    def clear(self) -> None:
+        """キャッシュを全削除"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_tree_cache = TreeCache()
+
+
+def parse_cached(code: str) -> ast.Module:
+    """プロセス共有のキャッシュ経由でパース
+
+    Raises:
+        SyntaxError: 構文エラーの場合
+    """
+    return _tree_cache.parse(code)
+
+
+def get_tree_cache() -> TreeCache:
+    """プロセス共有の構文木キャッシュを取得"""
+    return _tree_cache
+
+
+class RuleVisitor:
+    """ノード型ディスパッチ式のルール実行器
+
+    ルールはノード型ごとに登録し、ast.walkの1回の走査で
+    該当する型のルールだけを呼び出す。
+    """
+
+    def __init__(self) -> None:
+        self._rules: dict[type, list[Rule]] = {}
+
+    def register(
+        self, *node_types: type[NodeT]
+    ) -> Callable[
+        [Callable[[NodeT], Iterable[Issue]]],
+        Callable[[NodeT], Iterable[Issue]],
+    ]:
+        """ルール登録デコレータ
+
+        Args:
+            node_types: ルールを適用するASTノード型
+        """
+        def decorator(
+            rule: Callable[[NodeT], Iterable[Issue]]
+        ) -> Callable[[NodeT], Iterable[Issue]]:
+            self.add_rule(rule, *node_types)
+            return rule
+
+        return decorator
+
+    def add_rule(
+        self,
+        rule: Callable[[NodeT], Iterable[Issue]],
+        *node_types: type[NodeT],
+    ) -> None:
+        """ルールを登録"""
+        # runは登録した型のノードだけを渡すので、任意のノードを
+        # 受け取るルールとして保持できる
+        for node_type in node_types:
+            self._rules.setdefault(node_type, []).append(cast(Rule, rule))
+
+    def copy(self) -> "RuleVisitor":
+        """登録済みルールを引き継いだ複製を作成"""
+        visitor = RuleVisitor()
+        visitor._rules = {k: list(v) for k, v in self._rules.items()}
+        return visitor
+
+    def run(self, tree: ast.AST) -> list[Issue]:
+        """全ルールを1回の走査で実行"""
+        issues: list[Issue] = []
+        rules = self._rules
+        if not rules:
+            return issues
+
+        for node in ast.walk(tree):
+            node_rules: Optional[list[Rule]] = rules.get(type(node))
+            if node_rules:
+                for rule in node_rules:
+                    issues.extend(rule(node))
+
+        return issues
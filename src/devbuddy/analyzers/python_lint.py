@@ -0,0 +1,172 @@
+"""
+インプロセスlintエンジン
+
+flake8が内部で使うpyflakes（Fコード）とpycodestyle（E/Wコード）を
+プロセス内で直接呼び出す。ソース文字列をそのまま検査するため、
+一時ファイルや出力テキストの解析が不要で、未保存のバッファにも使える。
+"""
+
+import ast
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from devbuddy.analyzers.python_ast import parse_cached
+
+# flake8互換の # noqa コメント
+_NOQA = re.compile(
+    r"#\s*noqa(?::[\s]?(?P<codes>[A-Z][0-9]+(?:[,\s]+[A-Z][0-9]+)*))?",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class LintMessage:
+    """lint検出結果"""
+
+    line: int
+    col: int
+    code: str
+    text: str
+
+
+def _pyflakes_codes() -> dict[str, str]:
+    """pyflakesのメッセージクラス名→flake8コードの対応"""
+    try:
+        from flake8.plugins.pyflakes import FLAKE8_PYFLAKES_CODES
+    except ImportError:
+        return {}
+    return dict(FLAKE8_PYFLAKES_CODES)
+
+
+class InProcessLinter:
+    """pyflakes/pycodestyleをプロセス内で実行するlinter
+
+    どちらかのパッケージが未インストールの場合、そのチェックは
+    行わない（subprocessバックエンドでflake8が無い場合と同様）。
+    """
+
+    def __init__(self, max_line_length: int = 79):
+        self.max_line_length = max_line_length
+        self._style_options: Any = None
+        self._codes: Optional[dict[str, str]] = None
+
+    def check(
+        self,
+        code: str,
+        filename: str = "stdin",
+    ) -> list[LintMessage]:
+        """ソース文字列を検査
+
+        Args:
+            code: ソースコード
+            filename: 表示用ファイル名
+
+        Returns:
+            list[LintMessage]: 行・列順の検出結果（構文エラー時は空）
+        """
+        try:
+            parse_cached(code)
+        except SyntaxError:
+            return []
+
+        lines = code.splitlines(True)
+        messages = self._run_pyflakes(code, filename)
+        messages.extend(self._run_pycodestyle(lines, filename))
+        messages = [m for m in messages if not _is_noqa(m, lines)]
+        messages.sort(key=lambda m: (m.line, m.col))
+        return messages
+
+    def _run_pyflakes(
+        self,
+        code: str,
+        filename: str,
+    ) -> list[LintMessage]:
+        """pyflakesで未使用・未定義名などを検出
+
+        pyflakesは渡された構文木の各ノードに属性を書き込むため、
+        TreeCacheの共有の構文木ではなく専用にパースした木を渡す。
+        """
+        try:
+            from pyflakes import checker
+        except ImportError:
+            return []
+
+        if self._codes is None:
+            self._codes = _pyflakes_codes()
+
+        tree = ast.parse(code, filename=filename)
+        result = checker.Checker(tree, filename=filename)
+        return [
+            LintMessage(
+                line=message.lineno,
+                col=getattr(message, "col", 0) + 1,
+                code=self._codes.get(type(message).__name__, "F"),
+                text=message.message % message.message_args,
+            )
+            for message in result.messages
+        ]
+
+    def _run_pycodestyle(
+        self,
+        lines: list[str],
+        filename: str,
+    ) -> list[LintMessage]:
+        """pycodestyleでスタイル違反を検出"""
+        try:
+            import pycodestyle
+        except ImportError:
+            return []
+
+        if self._style_options is None:
+            self._style_options = pycodestyle.StyleGuide(
+                max_line_length=self.max_line_length,
+                quiet=True,
+            ).options
+
+        collected: list[LintMessage] = []
+
+        class _CollectingReport(pycodestyle.BaseReport):  # type: ignore
+            def error(
+                self,
+                line_number: int,
+                offset: int,
+                text: str,
+                check: Any,
+            ) -> Optional[str]:
+                code: Optional[str] = super().error(
+                    line_number, offset, text, check
+                )
+                if code:
+                    collected.append(
+                        LintMessage(
+                            line=line_number,
+                            col=offset + 1,
+                            code=code,
+                            text=text[5:],
+                        )
+                    )
+                return code
+
+        options = self._style_options
+        pycodestyle.Checker(
+            filename,
+            lines=lines,
+            options=options,
+            report=_CollectingReport(options),
+        ).check_all()
+        return collected
+
+
+def _is_noqa(message: LintMessage, lines: list[str]) -> bool:
+    """# noqa コメントで抑制された検出か"""
+    if not 0 < message.line <= len(lines):
+        return False
+    match = _NOQA.search(lines[message.line - 1])
+    if match is None:
+        return False
+    codes = match.group("codes")
+    if not codes:
+        return True
+    listed = tuple(c.upper() for c in re.split(r"[,\s]+", codes) if c)
+    return message.code.upper().startswith(listed)
@@ -11,7 +11,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from devbuddy.core.reviewer import Issue
+from devbuddy.core.models import Issue
 
 
 @dataclass
@@ -9,16 +9,29 @@ DevBuddyAI CLI - コマンドラインインターフェース
 
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import click
 
 from devbuddy import __version__
+from devbuddy.analyzers.mypy_daemon import MypyDaemon
+from devbuddy.analyzers.python_analyzer import FLAKE8_BACKENDS, MYPY_BACKENDS
 from devbuddy.core.reviewer import CodeReviewer
 from devbuddy.core.generator import CodeTestGenerator
 from devbuddy.core.fixer import BugFixer
+from devbuddy.core.cache import ReviewCache
+from devbuddy.core.batcher import BATCH_FILES_DISABLED, DEFAULT_BATCH_TOKENS
+from devbuddy.core.chunker import DEFAULT_CHUNK_TOKENS
+from devbuddy.core.discovery import (
+    FileFilter,
+    discover_files,
+    split_patterns,
+)
 from devbuddy.core.formatters import get_formatter
+from devbuddy.core.models import Issue, ReviewResult
+from devbuddy.core.scheduler import DEFAULT_JOBS, ReviewScheduler
 from devbuddy.core.licensing import LicenseManager, LicenseError, Plan
 from devbuddy.core.billing import (
     BillingClient,
@@ -26,12 +39,18 @@ from devbuddy.core.billing import (
     PRICE_CONFIG,
     get_price_info,
 )
-from devbuddy.llm.client import LLMClient
+from devbuddy.llm.client import LLMClient, TokenUsage
 
 
 def get_api_key() -> str:
-    """環境変数からAPIキーを取得"""
+    """環境変数からAPIキーを取得
+
+    カセットの再生中（DEVBUDDY_CASSETTE_MODE=replay）はAPIに
+    接続しないため不要。
+    """
     api_key = os.environ.get("DEVBUDDY_API_KEY")
+    if not api_key and _cassette_mode() == "replay":
+        return ""
     if not api_key:
         click.echo(
             click.style(
@@ -50,26 +69,178 @@ def get_api_key() -> str:
 
 def get_config_value(key: str, default: str = "") -> str:
     """設定ファイルから値を取得"""
+    value = _lookup_config(key)
+    return str(value) if value is not None else default
+
+
+def _lookup_config(key: str) -> Any:
+    """設定ファイルからドット区切りのキーの値を取得（無ければNone）"""
     config_path = Path(".devbuddy.yaml")
     if not config_path.exists():
-        return default
+        return None
 
     try:
         import yaml  # type: ignore[import-untyped]
         with open(config_path, encoding="utf-8") as f:
             cfg = yaml.safe_load(f) or {}
     except Exception:
-        return default
+        return None
 
     # ドット区切りのキーを解決
-    keys = key.split(".")
     value = cfg
-    for k in keys:
+    for k in key.split("."):
         if isinstance(value, dict) and k in value:
             value = value[k]
         else:
-            return default
-    return str(value) if value is not None else default
+            return None
+    return value
+
+
+def _config_patterns(key: str) -> list[str]:
+    """設定ファイルのglobパターン（リスト、またはカンマ区切りの文字列）"""
+    value = _lookup_config(key)
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value if v is not None]
+    return split_patterns([str(value)])
+
+
+def _format_issue(issue: Issue) -> str:
+    """Issueを色付きの1行に整形"""
+    color = {
+        "bug": "red",
+        "warning": "yellow",
+        "style": "blue",
+        "info": "green",
+    }.get(issue.level, "white")
+    return (
+        f"[{click.style(issue.level.upper(), fg=color)}] "
+        f"Line {issue.line}: {issue.message}"
+    )
+
+
+def _config_int(key: str, default: int) -> int:
+    """設定ファイルから正の整数値を取得"""
+    try:
+        value = int(get_config_value(key, str(default)))
+    except ValueError:
+        return default
+    return value if value >= 1 else default
+
+
+def _cassette_mode() -> Optional[str]:
+    """カセットの動作モード（DEVBUDDY_CASSETTE未設定ならNone）"""
+    if not os.environ.get("DEVBUDDY_CASSETTE"):
+        return None
+    return os.environ.get("DEVBUDDY_CASSETTE_MODE", "replay")
+
+
+def _create_rate_limiter() -> Any:
+    """設定（llm.requests_per_minute, llm.tokens_per_minute）から
+    RateLimiterを生成（どちらも未設定ならNone）
+    """
+    rpm = _config_int("llm.requests_per_minute", 0)
+    tpm = _config_int("llm.tokens_per_minute", 0)
+    if not rpm and not tpm:
+        return None
+
+    from devbuddy.llm.rate_limit import RateLimiter
+
+    return RateLimiter(
+        requests_per_minute=rpm or None,
+        tokens_per_minute=tpm or None,
+        max_concurrency=_config_int("llm.max_concurrency", 16),
+    )
+
+
+def _create_llm_client(
+    api_key: str,
+    model: Optional[str] = None,
+    cassette: Any = None,
+    limiter: Any = None,
+) -> Any:
+    """LLMクライアントを生成
+
+    設定でRPM/TPMの上限（llm.requests_per_minute, llm.tokens_per_minute）が
+    指定されていれば、レート制御付きのクライアントで包む。
+    環境変数DEVBUDDY_CASSETTEが指定されていれば、応答をカセットに記録
+    （DEVBUDDY_CASSETTE_MODE=record）、またはカセットから再生する。
+    cassetteを渡すと、ファイルを読み直さずにそのカセットを共有する。
+    limiterを渡すと、設定から作らずにそのリミッターを共有する。
+    """
+    mode = _cassette_mode()
+    if mode is not None:
+        from devbuddy.llm.cassette import CassetteLLMClient
+
+        cassette_path = (
+            os.environ["DEVBUDDY_CASSETTE"] if cassette is None else cassette
+        )
+        if mode == "replay":
+            return CassetteLLMClient(
+                cassette_path,
+                latency=os.environ.get("DEVBUDDY_CASSETTE_LATENCY", "none"),
+                model=model,
+            )
+
+    client: Any = LLMClient(api_key=api_key, model=model)
+    if mode == "record":
+        client = CassetteLLMClient(cassette_path, client=client)
+    if limiter is None:
+        limiter = _create_rate_limiter()
+    if limiter is None:
+        return client
+
+    from devbuddy.llm.rate_limit import RateLimitedClient
+
+    return RateLimitedClient(client, limiter)
+
+
+def _create_model_router(
+    api_key: str,
+    client: Any,
+    limiter: Any = None,
+) -> Any:
+    """設定（llm.routing.*）に従ってモデルのルーターを生成
+
+    llm.routing.fast_model が未設定ならNone（すべてclientで処理）。
+    limiterを渡すと、各モデルのクライアントでRPM/TPMと同時実行数を
+    共有する（モデルごとに上限まで送らないように）。
+    """
+    fast_model = get_config_value("llm.routing.fast_model", "")
+    if not fast_model:
+        return None
+
+    from devbuddy.llm.routing import (
+        DEFAULT_MAX_FAST_COMPLEXITY,
+        DEFAULT_MAX_FAST_LINES,
+        ModelRouter,
+        RoutingPolicy,
+    )
+
+    strong_model = get_config_value("llm.routing.strong_model", client.model)
+    policy = RoutingPolicy(
+        fast_model=fast_model,
+        strong_model=strong_model,
+        max_fast_lines=_config_int(
+            "llm.routing.max_fast_lines", DEFAULT_MAX_FAST_LINES
+        ),
+        max_fast_complexity=_config_int(
+            "llm.routing.max_fast_complexity", DEFAULT_MAX_FAST_COMPLEXITY
+        ),
+    )
+
+    # 記録中に同じファイルへ別々に追記しないよう、カセットは共有する
+    cassette = getattr(client, "cassette", None)
+
+    def create(model: str) -> Any:
+        if model == client.model:
+            return client
+        return _create_llm_client(
+            api_key, model, cassette=cassette, limiter=limiter
+        )
+
+    return ModelRouter(policy, create)
 
 
 @click.group()
@@ -83,8 +254,17 @@ def cli() -> None:
 
 
 @cli.command()
-@click.argument("path", type=click.Path(exists=True))
+@click.argument("path", type=click.Path(exists=True, allow_dash=True))
 @click.option("--diff", is_flag=True, help="git diffのみをレビュー")
+@click.option(
+    "--since", "--base", "since", metavar="REF", default=None,
+    help="REF（とのマージベース）からの変更ファイルのみをレビュー"
+    "（--diffと併用すると変更された関数のみ）",
+)
+@click.option(
+    "--exclude", multiple=True,
+    help="除外するglob（ignore_patternsに追加、カンマ区切り・複数指定可）",
+)
 @click.option(
     "--severity",
     type=click.Choice(["low", "medium", "high"]),
@@ -98,26 +278,108 @@ def cli() -> None:
     default=None,
     help="出力形式（設定ファイルでデフォルト指定可）",
 )
+@click.option(
+    "--jobs", "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="並列レビュー数（設定ファイルでデフォルト指定可）",
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=None,
+    help="同時LLMリクエスト数の上限（デフォルト: --jobsと同じ）",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="レビュー結果キャッシュを使用しない"
+)
+@click.option(
+    "--stream", is_flag=True,
+    help="検出した問題を逐次表示（text出力時のみ）",
+)
+@click.option(
+    "--flake8-backend",
+    type=click.Choice(list(FLAKE8_BACKENDS)),
+    default=None,
+    help="flake8の実行方式（PATHが - の場合のデフォルト: inprocess）",
+)
+@click.option(
+    "--stdin-filename",
+    default="stdin.py",
+    show_default=True,
+    help="PATHが - の場合に結果に表示するファイル名",
+)
+@click.option(
+    "--require-ai", is_flag=True,
+    help="AIレビューが実行できなかったファイルがあれば終了コード2で終了",
+)
 def review(
     path: str,
     diff: bool,
+    since: Optional[str],
+    exclude: tuple[str, ...],
     severity: Optional[str],
     output: Optional[str],
     output_format: Optional[str],
+    jobs: Optional[int],
+    max_in_flight: Optional[int],
+    no_cache: bool,
+    stream: bool,
+    flake8_backend: Optional[str],
+    stdin_filename: str,
+    require_ai: bool,
 ) -> None:
     """コードをレビューしてバグ、スタイル問題、改善点を指摘
 
-    PATH: レビュー対象のファイルまたはディレクトリ
+    PATH: レビュー対象のファイルまたはディレクトリ（- で標準入力）
     """
     # 設定ファイルからデフォルト値を取得
     if severity is None:
         severity = get_config_value("review.severity", "medium")
     if output_format is None:
         output_format = get_config_value("output.format", "text")
+    if jobs is None:
+        jobs = _config_int("review.jobs", DEFAULT_JOBS)
+    if max_in_flight is None:
+        max_in_flight = _config_int("review.max_in_flight", jobs)
+
+    use_cache = not no_cache and (
+        get_config_value("review.cache", "true").lower() != "false"
+    )
 
     api_key = get_api_key()
-    client = LLMClient(api_key=api_key)
-    reviewer = CodeReviewer(client=client)
+    limiter = _create_rate_limiter()
+    client = _create_llm_client(api_key, limiter=limiter)
+    router = _create_model_router(api_key, client, limiter=limiter)
+    cache = ReviewCache() if use_cache else None
+    reviewer = CodeReviewer(
+        client=client,
+        cache=cache,
+        router=router,
+        chunk_tokens=_config_int("review.chunk_tokens", DEFAULT_CHUNK_TOKENS),
+        structured_output=(
+            get_config_value("review.structured_output", "false").lower()
+            == "true"
+        ),
+    )
+
+    # 標準入力（未保存のバッファ）はflake8コマンドに渡せないため
+    # デフォルトでインプロセス実行
+    from_stdin = path == "-"
+    if flake8_backend is None:
+        flake8_backend = get_config_value(
+            "review.flake8_backend",
+            "inprocess" if from_stdin else "subprocess",
+        )
+    if flake8_backend in FLAKE8_BACKENDS:
+        reviewer.analyzer.config.flake8_backend = flake8_backend
+
+    # mypy（daemonならdmypyを起動して実行間で再利用）
+    if get_config_value("review.mypy", "false").lower() == "true":
+        reviewer.analyzer.config.use_mypy = True
+    mypy_backend = get_config_value("review.mypy_backend", "subprocess")
+    if mypy_backend in MYPY_BACKENDS:
+        reviewer.analyzer.config.mypy_backend = mypy_backend
 
     # JSON出力時は進捗表示を抑制
     quiet = output_format == "json"
@@ -128,10 +390,29 @@ def review(
 
     target_path = Path(path)
 
-    if target_path.is_file():
+    file_filter = FileFilter(
+        languages=("python",),
+        include=_config_patterns("include_patterns"),
+        exclude=_config_patterns("ignore_patterns") + list(exclude),
+    )
+
+    if diff and not from_stdin:
+        # 変更を含む関数だけをレビュー
+        all_results = _review_git_diff(
+            reviewer, target_path, severity, file_filter, since
+        )
+        files = [result.file_path for result in all_results]
+    elif from_stdin:
+        code = sys.stdin.read()
+        files = [Path(stdin_filename)]
+    elif since is not None:
+        # 変更されたファイルだけをレビュー（削除されたファイルは除く）
+        files = _changed_files(target_path, since, file_filter)
+    elif target_path.is_file():
         files = [target_path]
     else:
-        files = list(target_path.rglob("*.py"))
+        # Gitリポジトリ内はgit ls-files、それ以外は.gitignoreを解釈して走査
+        files = discover_files(target_path, file_filter)
 
     if not files:
         if output_format == "json":
@@ -146,16 +427,43 @@ def review(
             click.echo(click.style("No Python files found", fg="yellow"))
         return
 
-    all_results = []
-    if quiet:
-        for file_path in files:
-            result = reviewer.review_file(file_path, severity=severity)
-            all_results.append(result)
+    scheduler = ReviewScheduler(
+        reviewer,
+        jobs=jobs,
+        max_in_flight=max_in_flight,
+        batch_files=_config_int("review.batch_files", BATCH_FILES_DISABLED),
+        batch_tokens=_config_int("review.batch_tokens", DEFAULT_BATCH_TOKENS),
+    )
+    stream = stream and output_format == "text"
+    if diff and not from_stdin:
+        stream = False
+    elif from_stdin:
+        stream = False
+        all_results = [
+            reviewer.review_code(code, files[0], severity=severity)
+        ]
+    elif stream:
+        echo_lock = threading.Lock()
+
+        def echo_issue(file_path: Path, issue: Issue) -> None:
+            with echo_lock:
+                click.echo(f"{file_path}:{_format_issue(issue)}")
+
+        click.echo()
+        all_results = scheduler.run(
+            files, severity=severity, on_issue=echo_issue
+        )
+    elif quiet:
+        all_results = scheduler.run(files, severity=severity)
     else:
-        with click.progressbar(files, label="Reviewing files") as bar:
-            for file_path in bar:
-                result = reviewer.review_file(file_path, severity=severity)
-                all_results.append(result)
+        with click.progressbar(
+            length=len(files), label="Reviewing files"
+        ) as bar:
+            all_results = scheduler.run(
+                files,
+                severity=severity,
+                on_complete=lambda _result: bar.update(1),
+            )
 
     # フォーマッターで出力生成
     formatter = get_formatter(output_format)
@@ -172,27 +480,18 @@ def review(
         total_issues = {"bug": 0, "warning": 0, "style": 0, "info": 0}
 
         for result in all_results:
-            if result.issues:
+            if result.issues and not stream:
                 click.echo(
                     click.style(f"\n{result.file_path}", fg="white", bold=True)
                 )
-                for issue in result.issues:
-                    color = {
-                        "bug": "red",
-                        "warning": "yellow",
-                        "style": "blue",
-                        "info": "green",
-                    }.get(issue.level, "white")
-
-                    click.echo(
-                        f"  [{click.style(issue.level.upper(), fg=color)}] "
-                        f"Line {issue.line}: {issue.message}"
-                    )
+            for issue in result.issues:
+                if not stream:
+                    click.echo(f"  {_format_issue(issue)}")
                     if issue.suggestion:
                         click.echo(f"    Suggestion: {issue.suggestion}")
 
-                    count = total_issues.get(issue.level, 0) + 1
-                    total_issues[issue.level] = count
+                count = total_issues.get(issue.level, 0) + 1
+                total_issues[issue.level] = count
 
         # サマリー
         click.echo("\n" + "-" * 50)
@@ -202,6 +501,15 @@ def review(
         click.echo(
             f"Summary: {bugs} bugs, {warnings} warnings, {styles} style issues"
         )
+        if cache is not None:
+            click.echo(
+                f"Cache: {cache.stats.hits} hits, "
+                f"{cache.stats.misses} misses"
+            )
+        _echo_token_usage(
+            [client, *(router.clients.values() if router else [])]
+        )
+        _echo_ai_unavailable(all_results)
     else:
         # JSON/Markdown出力
         click.echo(formatted_output)
@@ -213,6 +521,129 @@ def review(
         if not quiet:
             click.echo(f"\nResults saved to: {output}")
 
+    if require_ai and not all(r.ai_available for r in all_results):
+        sys.exit(2)
+
+
+def _git_scope(target_path: Path) -> tuple[Path, Optional[list[str]]]:
+    """target_pathを含むリポジトリのルートと、ルートからの対象パス"""
+    target = target_path.resolve()
+    root = next(
+        (p for p in [target, *target.parents] if (p / ".git").exists()),
+        None,
+    )
+    if root is None:
+        click.echo(
+            click.style(f"Not a git repository: {target_path}", fg="red"),
+            err=True,
+        )
+        sys.exit(1)
+
+    paths = [target.relative_to(root).as_posix()] if target != root else None
+    return root, paths
+
+
+def _merge_base(git: Any, ref: str) -> str:
+    """refとHEADの共通祖先（refがHEADの祖先ならref自身）"""
+    base = git.get_merge_base(ref)
+    if base is None:
+        click.echo(
+            click.style(f"Unknown revision: {ref}", fg="red"), err=True
+        )
+        sys.exit(1)
+    return str(base)
+
+
+def _review_git_diff(
+    reviewer: CodeReviewer,
+    target_path: Path,
+    severity: str,
+    file_filter: FileFilter,
+    since: Optional[str] = None,
+) -> list[ReviewResult]:
+    """git diffのうちtarget_path配下の変更された関数をレビュー
+
+    sinceを指定した場合はそのリビジョンとのマージベースからの変更、
+    省略時は作業ツリーの未ステージの変更。
+    """
+    from devbuddy.integrations.git import GitOperations
+
+    root, paths = _git_scope(target_path)
+    with GitOperations(root) as git:
+        base = _merge_base(git, since) if since else None
+        file_diffs = git.iter_diff(commit=base, paths=paths)
+        return reviewer.review_diff_hunks(
+            (f for f in file_diffs if file_filter.accepts(f.path)),
+            severity=severity,
+            repo_root=Path(os.path.relpath(root)),
+        )
+
+
+def _changed_files(
+    target_path: Path,
+    since: str,
+    file_filter: FileFilter,
+) -> list[Path]:
+    """sinceとのマージベースから変更されたファイル（削除済みを除く）"""
+    from devbuddy.integrations.git import GitOperations
+
+    root, paths = _git_scope(target_path)
+    with GitOperations(root) as git:
+        changed = git.get_changed_files(
+            commit=_merge_base(git, since),
+            detect_renames=True,
+            exclude_deleted=True,
+            paths=paths,
+        )
+
+    rel_root = Path(os.path.relpath(root))
+    return [
+        rel_root / path for path in changed
+        if file_filter.accepts(path) and (root / path).is_file()
+    ]
+
+
+def _echo_token_usage(clients: list[Any]) -> None:
+    """プロバイダが報告した入力トークン（キャッシュ内訳付き）を表示"""
+    usage = TokenUsage()
+    seen: set[int] = set()
+    for client in clients:
+        client_usage = getattr(client, "usage", None)
+        if id(client) in seen or not isinstance(client_usage, TokenUsage):
+            continue
+        seen.add(id(client))
+        usage.requests += client_usage.requests
+        usage.input_tokens += client_usage.input_tokens
+        usage.cache_write_tokens += client_usage.cache_write_tokens
+        usage.cache_read_tokens += client_usage.cache_read_tokens
+        usage.output_tokens += client_usage.output_tokens
+    if not usage.requests:
+        return
+    click.echo(
+        f"Tokens: {usage.total_input_tokens} input "
+        f"({usage.cache_read_tokens} cached, "
+        f"{usage.cache_write_tokens} cache writes, "
+        f"{usage.input_tokens} uncached), "
+        f"{usage.output_tokens} output"
+    )
+
+
+def _echo_ai_unavailable(results: list[ReviewResult]) -> None:
+    """AIレビューが実行できなかったファイルを警告表示"""
+    failed = [r for r in results if r.success and not r.ai_available]
+    if not failed:
+        return
+    click.echo(
+        click.style(
+            f"AI review unavailable for {len(failed)} file(s) "
+            "(static analysis only):",
+            fg="yellow",
+        ),
+        err=True,
+    )
+    for result in failed:
+        click.echo(f"  {result.file_path}: {result.ai_error}", err=True)
+
 
 @cli.command()
 @click.argument("path", type=click.Path(exists=True))
@@ -250,7 +681,7 @@ def testgen(
         output_format = get_config_value("output.format", "text")
 
     api_key = get_api_key()
-    client = LLMClient(api_key=api_key)
+    client = _create_llm_client(api_key)
     generator = CodeTestGenerator(client=client)
 
     quiet = output_format == "json"
@@ -345,7 +776,7 @@ def fix(
         output_format = get_config_value("output.format", "text")
 
     api_key = get_api_key()
-    client = LLMClient(api_key=api_key)
+    client = _create_llm_client(api_key)
     fixer = BugFixer(client=client)
 
     quiet = output_format == "json"
@@ -563,6 +994,23 @@ output:
             ("review.include_suggestions", "改善提案を含める（true/false）"),
             ("review.security_check", "セキュリティチェック（true/false）"),
             ("review.performance_check", "パフォーマンスチェック（true/false）"),
+            ("review.jobs", "並列レビュー数（整数）"),
+            ("review.cache", "レビュー結果キャッシュ（true/false）"),
+            ("review.max_in_flight", "同時LLMリクエスト数の上限（整数）"),
+            ("review.flake8_backend", "flake8の実行方式（subprocess, inprocess）"),
+            ("review.chunk_tokens", "大きなファイルを分割する単位（トークン数）"),
+            ("review.batch_files", "まとめてレビューする小ファイル数（既定1で無効、推奨8）"),
+            ("review.batch_tokens", "まとめるファイルの合計トークン数"),
+            ("review.structured_output", "AIにJSON形式で回答させる（true/false）"),
+            ("review.mypy", "mypyによる型チェック（true/false）"),
+            ("review.mypy_backend", "mypyの実行方式（subprocess, daemon）"),
+            ("llm.requests_per_minute", "1分あたりのLLMリクエスト数上限（整数）"),
+            ("llm.tokens_per_minute", "1分あたりのLLM入力トークン数上限（整数）"),
+            ("llm.max_concurrency", "レート制御時の同時リクエスト数上限（整数）"),
+            ("llm.routing.fast_model", "単純なファイルに使うモデル（設定で振り分け有効）"),
+            ("llm.routing.strong_model", "複雑なファイルに使うモデル"),
+            ("llm.routing.max_fast_lines", "高速モデルに送るファイルの最大行数"),
+            ("llm.routing.max_fast_complexity", "高速モデルに送る最大の複雑度"),
             ("testgen.framework", "テストフレームワーク（pytest, unittest）"),
             ("testgen.coverage_target", "カバレッジ目標（%）"),
             ("testgen.edge_cases", "エッジケース生成（true/false）"),
@@ -954,6 +1402,57 @@ def billing_cancel() -> None:
     click.echo("  devbuddy billing upgrade pro")
 
 
+@cli.group("mypy-daemon")
+def mypy_daemon() -> None:
+    """mypyデーモン（dmypy）管理
+
+    review.mypy_backend: daemon の場合、reviewは自動でデーモンを起動します。
+    """
+    pass
+
+
+@mypy_daemon.command("start")
+def mypy_daemon_start() -> None:
+    """デーモンを起動"""
+    daemon = MypyDaemon()
+    if daemon.start():
+        status = daemon.status()
+        click.echo(click.style("mypy daemon is running", fg="green"))
+        if status.pid:
+            click.echo(f"PID: {status.pid}")
+    else:
+        click.echo(click.style("Failed to start mypy daemon", fg="red"))
+        click.echo("Install mypy with: pip install mypy")
+        sys.exit(1)
+
+
+@mypy_daemon.command("status")
+def mypy_daemon_status() -> None:
+    """デーモンの状態を表示"""
+    status = MypyDaemon().status()
+    if status.running:
+        click.echo(click.style("running", fg="green"))
+        if status.pid:
+            click.echo(f"PID: {status.pid}")
+    elif status.state == "stale":
+        click.echo(click.style(
+            "stale (daemon process has exited)", fg="yellow"
+        ))
+        click.echo("Run 'devbuddy mypy-daemon stop' to clean up")
+    else:
+        click.echo("stopped")
+
+
+@mypy_daemon.command("stop")
+def mypy_daemon_stop() -> None:
+    """デーモンを停止（異常終了時のファイルも削除）"""
+    if MypyDaemon().stop():
+        click.echo("mypy daemon stopped")
+    else:
+        click.echo(click.style("Failed to stop mypy daemon", fg="red"))
+        sys.exit(1)
+
+
 @cli.group()
 def server() -> None:
     """Webhookサーバー管理
@@ -0,0 +1,139 @@
+"""
+ReviewBatcher - 小さなファイルのまとめレビュー
+
+`__init__.py` や数十行のヘルパーのような小さなファイルを
+トークン予算内でまとめ、1回のLLMリクエストでレビューする。
+応答の `[LEVEL] File X Line N:` 形式の行（構造化出力モードでは
+fileキー付きのJSON）をファイルごとに振り分ける。
+"""
+
+import re
+from typing import Optional
+
+from devbuddy.core.models import Issue
+from devbuddy.core.structured_output import issue_from_dict, parse_json_items
+
+# まとめレビューは既定では無効（review.batch_files: 1）
+BATCH_FILES_DISABLED = 1
+
+# まとめレビューを有効にする場合の1バッチあたりの最大ファイル数
+DEFAULT_BATCH_FILES = 8
+
+# 1バッチあたりのコードのトークン予算（これ以下のファイルをまとめる）
+DEFAULT_BATCH_TOKENS = 3000
+
+_BATCH_ISSUE_LINE = re.compile(
+    r"^\[(?P<level>\w+)\]\s*File\s+[`'\"]?(?P<file>.+?)[`'\"]?"
+    r"\s*,?\s+Line\s+(?P<line>\d+)\s*:\s*(?P<message>.*)$"
+)
+
+
+def pack_batches(
+    sizes: list[int],
+    max_files: int = DEFAULT_BATCH_FILES,
+    max_tokens: int = DEFAULT_BATCH_TOKENS,
+) -> list[list[int]]:
+    """ファイルをトークン予算内のバッチに詰める（First Fit Decreasing）
+
+    予算を単独で超えるファイルは1ファイルのバッチになる。
+
+    Args:
+        sizes: 各ファイルの推定トークン数
+        max_files: 1バッチあたりの最大ファイル数
+        max_tokens: 1バッチあたりのトークン予算
+
+    Returns:
+        list[list[int]]: sizesのインデックスのバッチ（各バッチ内は昇順、
+        バッチは先頭インデックス順）
+    """
+    if max_files < 1:
+        raise ValueError("max_files must be >= 1")
+
+    bins: list[list[int]] = []
+    totals: list[int] = []
+    for index in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+        size = sizes[index]
+        for b, batch in enumerate(bins):
+            if len(batch) < max_files and totals[b] + size <= max_tokens:
+                batch.append(index)
+                totals[b] += size
+                break
+        else:
+            bins.append([index])
+            totals.append(size)
+
+    batches = [sorted(batch) for batch in bins]
+    batches.sort(key=lambda batch: batch[0])
+    return batches
+
+
+def parse_batch_response(
+    response: str,
+    names: list[str],
+    structured: bool = False,
+) -> dict[str, list[Issue]]:
+    """バッチレビューの応答をファイルごとのIssueに振り分ける
+
+    ファイル名は完全一致を優先し、次にパス末尾の一致で照合する。
+    どのファイルにも対応しない行は捨てる。`Suggestion:` 行は
+    直前のIssueに付ける。
+
+    Args:
+        response: LLMの応答
+        names: バッチ内のファイル名
+        structured: JSON形式の応答として解析する（JSONが無ければ
+            テキスト形式として解析）
+
+    Returns:
+        dict[str, list[Issue]]: ファイル名→Issueリスト（全ファイル分のキー）
+    """
+    results: dict[str, list[Issue]] = {name: [] for name in names}
+    items = parse_json_items(response) if structured else None
+    if items is not None:
+        for item in items:
+            issue = issue_from_dict(item)
+            if issue is None:
+                continue
+            name = _match_name(str(item.get("file", "")), names)
+            if name is not None:
+                results[name].append(issue)
+        return results
+
+    last: Optional[Issue] = None
+
+    for raw in response.split("\n"):
+        line = raw.strip()
+        if last is not None and line.startswith("Suggestion:"):
+            last.suggestion = line[len("Suggestion:"):].strip()
+            continue
+
+        match = _BATCH_ISSUE_LINE.match(line)
+        last = None
+        if match is None:
+            continue
+
+        name = _match_name(match.group("file"), names)
+        if name is None:
+            continue
+        last = Issue(
+            level=match.group("level").lower(),
+            line=int(match.group("line")),
+            message=match.group("message").strip(),
+        )
+        results[name].append(last)
+
+    return results
+
+
+def _match_name(reported: str, names: list[str]) -> Optional[str]:
+    """応答中のファイル名をバッチ内のファイル名に対応付け"""
+    reported = reported.strip().replace("\\", "/")
+    if reported in names:
+        return reported
+
+    candidates = [
+        name for name in names
+        if name.replace("\\", "/").endswith("/" + reported)
+        or reported.endswith("/" + name.replace("\\", "/"))
+    ]
+    return candidates[0] if len(candidates) == 1 else None
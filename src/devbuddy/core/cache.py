@@ -0,0 +1,171 @@
+"""
+ReviewCache - レビュー結果キャッシュ
+
+コード内容・重要度・プロンプトバージョン・モデル名をキーに、
+AIレビューで得たIssueリストをディスクに保存する。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from devbuddy.core.models import Issue
+
+# デフォルトのキャッシュ上限（バイト）
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """キャッシュ統計"""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class ReviewCache:
+    """コンテンツアドレス型のレビュー結果キャッシュ
+
+    エントリは1キー1ファイルで保存し、合計サイズがmax_bytesを
+    超えたら最終アクセスが古いものから削除する（LRU）。
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Args:
+            cache_dir: 保存先（デフォルト: ~/.devbuddy/cache/reviews）
+            max_bytes: キャッシュ合計サイズの上限
+        """
+        self.cache_dir = cache_dir or (
+            Path.home() / ".devbuddy" / "cache" / "reviews"
+        )
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        # key -> (size, 最終アクセス時刻)
+        self._index: Optional[dict[str, tuple[int, float]]] = None
+
+    @staticmethod
+    def make_key(
+        code: str,
+        severity: str,
+        prompt_version: str,
+        model: str,
+    ) -> str:
+        """キャッシュキーを生成"""
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        material = "\0".join([code_hash, severity, prompt_version, model])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[list[Issue]]:
+        """キャッシュからIssueリストを取得
+
+        Returns:
+            Optional[list[Issue]]: ヒット時はIssueリスト、ミス時はNone
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            issues = [Issue(**item) for item in data["issues"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock:
+                self.stats.misses += 1
+            return None
+
+        with self._lock:
+            self.stats.hits += 1
+            index = self._load_index()
+            try:
+                os.utime(path)
+                index[key] = (path.stat().st_size, path.stat().st_mtime)
+            except OSError:
+                pass
+        return issues
+
+    def put(self, key: str, issues: list[Issue]) -> None:
+        """Issueリストをキャッシュに保存"""
+        payload = json.dumps(
+            {"issues": [asdict(issue) for issue in issues]},
+            ensure_ascii=False,
+        )
+        path = self._entry_path(key)
+
+        with self._lock:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(
+                    dir=self.cache_dir, suffix=".tmp"
+                )
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp_name, path)
+            except OSError:
+                return
+
+            index = self._load_index()
+            stat = path.stat()
+            index[key] = (stat.st_size, stat.st_mtime)
+            self.stats.writes += 1
+            self._evict(index)
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        with self._lock:
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob("*.json"):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+            self._index = {}
+
+    def size_bytes(self) -> int:
+        """キャッシュ合計サイズを取得"""
+        with self._lock:
+            return sum(size for size, _ in self._load_index().values())
+
+    def _entry_path(self, key: str) -> Path:
+        """エントリのファイルパス"""
+        return self.cache_dir / f"{key}.json"
+
+    def _load_index(self) -> dict[str, tuple[int, float]]:
+        """ディスクからインデックスを構築（ロック取得済みで呼ぶ）"""
+        if self._index is None:
+            self._index = {}
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob("*.json"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    self._index[path.stem] = (stat.st_size, stat.st_mtime)
+        return self._index
+
+    def _evict(self, index: dict[str, tuple[int, float]]) -> None:
+        """上限を超えた分を古い順に削除（ロック取得済みで呼ぶ）"""
+        total = sum(size for size, _ in index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, (size, _) in sorted(index.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_bytes:
+                break
+            try:
+                self._entry_path(key).unlink()
+            except OSError:
+                pass
+            del index[key]
+            total -= size
+            self.stats.evictions += 1
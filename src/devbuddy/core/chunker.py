@@ -0,0 +1,404 @@
+"""
+CodeChunker - 大きなファイルのレビュー用分割
+
+PythonファイルをASTの関数・クラス境界で分割し、トークン予算内の
+チャンクにまとめる。各チャンクにはimportと他の定義のシグネチャを
+共通ヘッダとして付け、LLMの報告行番号を元ファイルの行番号に戻せる
+ようにする。差分レビュー用に、トップレベルの単位ごとの
+フィンガープリントも計算する。
+"""
+
+import ast
+import copy
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from devbuddy.analyzers.python_ast import parse_cached
+
+# 1チャンクあたりのトークン予算（この値を超えるファイルを分割する）
+DEFAULT_CHUNK_TOKENS = 6000
+
+# ヘッダに使うトークンの上限（予算に対する割合）
+_HEADER_BUDGET_RATIO = 0.25
+
+
+def estimate_tokens(text: str) -> int:
+    """トークン数の概算（約4文字で1トークン）"""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class CodeChunk:
+    """レビュー単位のチャンク"""
+
+    code: str  # ヘッダ + 対象コード
+    start_line: int  # 対象コードの元ファイルでの開始行
+    end_line: int  # 対象コードの元ファイルでの終了行
+    header_lines: int  # code先頭のヘッダ行数
+
+    def to_file_line(self, line: int) -> Optional[int]:
+        """チャンク内の行番号を元ファイルの行番号に変換
+
+        ヘッダ部分（他チャンクの定義）の行はNoneを返す。
+        """
+        if line <= self.header_lines:
+            return None
+        file_line = self.start_line + line - self.header_lines - 1
+        if file_line > self.end_line:
+            return self.end_line
+        return file_line
+
+
+@dataclass
+class CodeUnit:
+    """トップレベルのレビュー単位（関数・クラス、またはその間の文）"""
+
+    start_line: int  # 前の単位との間の空行・コメントを含む開始行
+    end_line: int
+    anchor_line: int  # 最初の文（デコレータ）の行
+    fingerprint: str  # 正規化したASTのハッシュ
+
+    def to_relative(self, line: int) -> int:
+        """元ファイルの行番号を最初の文からの相対行番号に変換"""
+        return line - self.anchor_line + 1
+
+    def to_file_line(self, relative: int) -> int:
+        """相対行番号を元ファイルの行番号に変換（範囲内に丸める）"""
+        line = self.anchor_line + relative - 1
+        return min(max(line, self.start_line), self.end_line)
+
+
+def split_units(code: str) -> list[CodeUnit]:
+    """コードをトップレベルのレビュー単位に分割
+
+    関数・クラスはそれぞれ1単位、その間の連続する文（importや
+    代入など）はまとめて1単位とする。文の間の空行・コメントは
+    後続の単位に含める。構文エラーの場合は空リストを返す。
+    """
+    try:
+        tree = parse_cached(code)
+    except SyntaxError:
+        return []
+    if not tree.body:
+        return []
+
+    groups: list[list[ast.stmt]] = []
+    for node in tree.body:
+        if _is_def(node) or not groups or _is_def(groups[-1][-1]):
+            groups.append([node])
+        else:
+            groups[-1].append(node)
+
+    last_line = len(code.split("\n"))
+    units = []
+    for index, group in enumerate(groups):
+        start = 1 if index == 0 else _end_line(groups[index - 1][-1]) + 1
+        end = (
+            last_line if index == len(groups) - 1
+            else _end_line(group[-1])
+        )
+        anchor = _start_line(group[0])
+        units.append(
+            CodeUnit(
+                start_line=start,
+                end_line=end,
+                anchor_line=anchor,
+                fingerprint=_fingerprint(group, anchor),
+            )
+        )
+    return units
+
+
+def split_code(
+    code: str,
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+) -> list[CodeChunk]:
+    """コードをトークン予算内のチャンクに分割
+
+    予算内に収まるコードや構文エラーのコードは分割しない
+    （空リストを返す）。
+
+    Args:
+        code: Pythonソースコード
+        max_tokens: 1チャンクあたりのトークン予算
+
+    Returns:
+        list[CodeChunk]: 行順のチャンク（分割不要なら空）
+    """
+    if estimate_tokens(code) <= max_tokens:
+        return []
+
+    try:
+        tree = parse_cached(code)
+    except SyntaxError:
+        return []
+
+    lines = code.split("\n")
+    units = _split_units(tree.body, 1, len(lines), lines, max_tokens)
+    header = _build_header(tree, int(max_tokens * _HEADER_BUDGET_RATIO))
+    chunks = _pack(header, lines, units, max_tokens)
+    return chunks if len(chunks) > 1 else []
+
+
+def chunk_ranges(
+    code: str,
+    ranges: list[tuple[int, int]],
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+) -> list[CodeChunk]:
+    """指定した行範囲だけをレビューするチャンクを作成
+
+    差分レビューで変更された単位だけをLLMに送るために使う。
+    連続する範囲は予算内で1チャンクにまとめ、ヘッダには
+    ファイル全体のimportとシグネチャを付ける。
+
+    Args:
+        code: Pythonソースコード（構文エラーでないこと）
+        ranges: 行順の(開始行, 終了行)のリスト
+        max_tokens: 1チャンクあたりのトークン予算
+    """
+    tree = parse_cached(code)
+    lines = code.split("\n")
+    header = _build_header(tree, int(max_tokens * _HEADER_BUDGET_RATIO))
+
+    chunks: list[CodeChunk] = []
+    run: list[tuple[int, int]] = []
+    for start, end in ranges:
+        if run and start != run[-1][1] + 1:
+            chunks.extend(_pack(header, lines, run, max_tokens))
+            run = []
+        run.append((start, end))
+    if run:
+        chunks.extend(_pack(header, lines, run, max_tokens))
+    return chunks
+
+
+def enclosing_ranges(
+    code: str,
+    lines: list[int],
+    context: int = 3,
+) -> list[tuple[int, int]]:
+    """変更行を含む関数の行範囲を求める
+
+    関数（メソッド）内の行はその関数全体、関数外の行は行を含む文に
+    前後context行を加えた範囲とする。入れ子の関数は最も外側の関数
+    （メソッド）にまとめる。差分レビューでchunk_rangesに渡す。
+
+    Args:
+        code: Pythonソースコード
+        lines: 変更された行番号
+        context: 関数外の変更に付ける前後の行数
+
+    Returns:
+        list[tuple[int, int]]: 行順の重ならない(開始行, 終了行)のリスト
+        （構文エラーの場合は空）
+    """
+    try:
+        tree = parse_cached(code)
+    except SyntaxError:
+        return []
+
+    last_line = len(code.split("\n"))
+    ranges = []
+    for line in sorted(set(lines)):
+        if not 1 <= line <= last_line:
+            continue
+        ranges.append(_enclosing_range(tree.body, line, context, last_line))
+
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _enclosing_range(
+    body: list[ast.stmt],
+    line: int,
+    context: int,
+    last_line: int,
+) -> tuple[int, int]:
+    """行を含む関数、または文と前後の行の範囲"""
+    for node in body:
+        start, end = _start_line(node), _end_line(node)
+        if not start <= line <= end:
+            continue
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return start, end
+        if isinstance(node, ast.ClassDef) and line > node.lineno:
+            return _enclosing_range(node.body, line, context, last_line)
+        return max(1, start - context), min(last_line, end + context)
+    # 文の間の空行・コメント
+    return max(1, line - context), min(last_line, line + context)
+
+
+def _pack(
+    header: str,
+    lines: list[str],
+    units: list[tuple[int, int]],
+    max_tokens: int,
+) -> list[CodeChunk]:
+    """連続する行範囲を予算内のチャンクに詰める"""
+    body_budget = max(1, max_tokens - estimate_tokens(header))
+
+    chunks: list[CodeChunk] = []
+    start: Optional[int] = None
+    end = 0
+    size = 0
+    for unit_start, unit_end in units:
+        unit_size = estimate_tokens(
+            "\n".join(lines[unit_start - 1:unit_end])
+        )
+        if start is not None and size + unit_size > body_budget:
+            chunks.append(_make_chunk(header, lines, start, end))
+            start = None
+            size = 0
+        if start is None:
+            start = unit_start
+        end = unit_end
+        size += unit_size
+    if start is not None:
+        chunks.append(_make_chunk(header, lines, start, end))
+
+    return chunks
+
+
+def _split_units(
+    body: list[ast.stmt],
+    first_line: int,
+    last_line: int,
+    lines: list[str],
+    max_tokens: int,
+) -> list[tuple[int, int]]:
+    """文の境界で行範囲を分割
+
+    文の間の空行・コメント・デコレータは後続の文に含め、
+    予算を超えるクラスはメソッド境界でさらに分割する。
+    """
+    if not body:
+        return [(first_line, last_line)]
+
+    units: list[tuple[int, int]] = []
+    for index, node in enumerate(body):
+        start = first_line if index == 0 else _end_line(body[index - 1]) + 1
+        end = last_line if index == len(body) - 1 else _end_line(node)
+
+        text = "\n".join(lines[start - 1:end])
+        if (
+            isinstance(node, ast.ClassDef)
+            and len(node.body) > 1
+            and estimate_tokens(text) > max_tokens
+        ):
+            # クラス行と最初の文（docstring等）を1単位とし、残りを分割
+            head_end = _end_line(node.body[0])
+            units.append((start, head_end))
+            units.extend(
+                _split_units(
+                    node.body[1:], head_end + 1, end, lines, max_tokens
+                )
+            )
+        else:
+            units.append((start, end))
+
+    return units
+
+
+def _end_line(node: ast.stmt) -> int:
+    return node.end_lineno or node.lineno
+
+
+def _start_line(node: ast.stmt) -> int:
+    """デコレータを含む文の開始行"""
+    if isinstance(
+        node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+    ) and node.decorator_list:
+        return min(node.lineno, *(d.lineno for d in node.decorator_list))
+    return node.lineno
+
+
+def _is_def(node: ast.stmt) -> bool:
+    return isinstance(
+        node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+    )
+
+
+def _fingerprint(nodes: list[ast.stmt], anchor: int) -> str:
+    """単位の正規化フィンガープリント
+
+    位置情報を除いたASTダンプに、最初の文からの相対行番号を加えて
+    ハッシュする。単位がファイル内で移動しても値は変わらないが、
+    単位内の行構成が変われば（キャッシュした行番号がずれるため）変わる。
+    """
+    digest = hashlib.sha256()
+    for node in nodes:
+        digest.update(ast.dump(node).encode("utf-8"))
+        for child in ast.walk(node):
+            lineno = getattr(child, "lineno", None)
+            if lineno is not None:
+                digest.update(b"%d," % (lineno - anchor))
+    return digest.hexdigest()
+
+
+def _stub(node: ast.stmt) -> Optional[ast.stmt]:
+    """本体を省略した関数・クラス定義（元のノードは変更しない）"""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        func = copy.copy(node)
+        func.decorator_list = []
+        func.body = [ast.Expr(ast.Constant(...))]
+        return func
+
+    if isinstance(node, ast.ClassDef):
+        cls = copy.copy(node)
+        cls.decorator_list = []
+        methods: list[ast.stmt] = [
+            stub for stub in (_stub(child) for child in node.body)
+            if isinstance(stub, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
+        cls.body = methods or [ast.Expr(ast.Constant(...))]
+        return cls
+
+    return None
+
+
+def _build_header(tree: ast.Module, max_tokens: int) -> str:
+    """importと定義シグネチャからなる共通ヘッダを作成"""
+    imports = [
+        ast.unparse(node) for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    signatures = [
+        ast.unparse(stub)
+        for stub in (_stub(node) for node in tree.body)
+        if stub is not None
+    ]
+
+    parts = ["# --- context: imports and signatures (not under review) ---"]
+    size = estimate_tokens(parts[0])
+    for part in imports + signatures:
+        part_size = estimate_tokens(part)
+        if size + part_size > max_tokens:
+            break
+        parts.append(part)
+        size += part_size
+
+    return "\n".join(parts)
+
+
+def _make_chunk(
+    header: str,
+    lines: list[str],
+    start: int,
+    end: int,
+) -> CodeChunk:
+    """ヘッダと対象行からチャンクを作成"""
+    marker = f"# --- review target: lines {start}-{end} ---"
+    prefix = f"{header}\n{marker}"
+    body = "\n".join(lines[start - 1:end])
+    return CodeChunk(
+        code=f"{prefix}\n{body}",
+        start_line=start,
+        end_line=end,
+        header_lines=prefix.count("\n") + 1,
+    )
@@ -0,0 +1,330 @@
+"""
+FileDiscovery - レビュー対象ファイルの列挙
+
+Gitリポジトリ内では `git ls-files -z` で追跡中・未追跡（.gitignoreで
+除外されていないもの）のファイルを列挙する。リポジトリ外やgitが
+使えない場合は、.gitignoreを解釈しながらディレクトリを並行して
+走査する。どちらの場合も言語（拡張子）と、設定ファイルの
+include/exclude（ignore_patterns）のglobで絞り込む。
+"""
+
+import fnmatch
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+# 言語ごとの拡張子
+LANGUAGE_EXTENSIONS: dict[str, tuple[str, ...]] = {
+    "python": (".py",),
+    "javascript": (".js", ".jsx", ".mjs", ".cjs"),
+    "typescript": (".ts", ".tsx"),
+    "rust": (".rs",),
+    "go": (".go",),
+}
+
+# .gitignoreが無くても走査しないディレクトリ（リポジトリ外の走査用）
+DEFAULT_SKIP_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".venv", "venv", "node_modules",
+    "__pycache__", ".tox", ".nox", ".mypy_cache", ".pytest_cache",
+    "build", "dist", "target", ".eggs",
+})
+
+# 並行走査のスレッド数
+DEFAULT_WALK_WORKERS = 8
+
+
+def split_patterns(patterns: Iterable[str]) -> list[str]:
+    """globパターンを正規化（カンマ区切りの文字列も分割）"""
+    result = []
+    for pattern in patterns:
+        for part in str(pattern).split(","):
+            part = part.strip()
+            if part.startswith("./"):
+                part = part[2:]
+            if part:
+                result.append(part)
+    return result
+
+
+def match_glob(path: str, pattern: str) -> bool:
+    """相対パスがglobに一致するか
+
+    `/` で始まるパターンはルートからの一致、それ以外は任意の
+    ディレクトリ階層からの一致（`migrations/*` は `app/migrations/x.py`
+    にも一致）とする。`*` は `/` をまたいで一致する。
+    """
+    if pattern.startswith("/"):
+        return fnmatch.fnmatchcase(path, pattern[1:])
+    parts = path.split("/")
+    return any(
+        fnmatch.fnmatchcase("/".join(parts[i:]), pattern)
+        for i in range(len(parts))
+    )
+
+
+@dataclass
+class FileFilter:
+    """言語とinclude/excludeのglobによる絞り込み"""
+
+    languages: tuple[str, ...] = ("python",)
+    include: list[str] = field(default_factory=list)
+    exclude: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        unknown = [
+            lang for lang in self.languages if lang not in LANGUAGE_EXTENSIONS
+        ]
+        if unknown:
+            raise ValueError(f"Unknown language: {', '.join(unknown)}")
+        self.include = split_patterns(self.include)
+        self.exclude = split_patterns(self.exclude)
+        self._extensions = tuple(
+            ext for lang in self.languages for ext in LANGUAGE_EXTENSIONS[lang]
+        )
+
+    def accepts(self, path: str) -> bool:
+        """ルートからの相対パス（/区切り）が対象か"""
+        if not path.endswith(self._extensions):
+            return False
+        if self.include and not any(
+            match_glob(path, pattern) for pattern in self.include
+        ):
+            return False
+        return not any(match_glob(path, pattern) for pattern in self.exclude)
+
+    def prunes(self, directory: str) -> bool:
+        """ディレクトリ全体が除外されるか（`node_modules/*` 等）"""
+        for pattern in self.exclude:
+            for suffix in ("/**", "/*", "/"):
+                if pattern.endswith(suffix):
+                    if match_glob(directory, pattern[:-len(suffix)]):
+                        return True
+                    break
+        return False
+
+
+class GitIgnore:
+    """1つの.gitignoreファイルのパターン"""
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        """
+        Args:
+            base: .gitignoreのあるディレクトリ（ルートからの相対、ルートは空）
+            lines: .gitignoreの各行
+        """
+        self.base = base
+        self._rules: list[tuple[re.Pattern[str], bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            self._rules.append((_gitignore_regex(line), negate, dir_only))
+
+    @classmethod
+    def load(cls, path: Path, base: str) -> Optional["GitIgnore"]:
+        """.gitignoreを読み込む（無ければNone）"""
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        ignore = cls(base, text.splitlines())
+        return ignore if ignore._rules else None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """除外ならTrue、否定パターンで再度含めるならFalse、該当なしはNone
+
+        後に書かれたパターンが優先される。
+        """
+        if self.base:
+            if not path.startswith(self.base + "/"):
+                return None
+            path = path[len(self.base) + 1:]
+        for regex, negate, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negate
+        return None
+
+
+def _gitignore_regex(pattern: str) -> re.Pattern[str]:
+    """.gitignoreのパターンを正規表現に変換"""
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif char == "*":
+            out.append("[^/]*")
+            i += 1
+        elif char == "?":
+            out.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        else:
+            out.append(re.escape(char))
+            i += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(prefix + "".join(out) + r"\Z")
+
+
+def _is_ignored(
+    ignores: list[GitIgnore], path: str, is_dir: bool
+) -> bool:
+    """内側の.gitignoreから順に判定"""
+    for ignore in reversed(ignores):
+        result = ignore.match(path, is_dir)
+        if result is not None:
+            return result
+    return False
+
+
+def discover_files(
+    root: Path,
+    file_filter: Optional[FileFilter] = None,
+    use_git: bool = True,
+    workers: int = DEFAULT_WALK_WORKERS,
+) -> list[Path]:
+    """root配下のレビュー対象ファイルを列挙
+
+    Args:
+        root: 走査するディレクトリ
+        file_filter: 言語・globによる絞り込み（省略時はPythonのみ）
+        use_git: Gitリポジトリ内ならgit ls-filesを使う
+        workers: リポジトリ外を走査するスレッド数
+
+    Returns:
+        list[Path]: root / 相対パスの形のパス（パス順）
+    """
+    file_filter = file_filter or FileFilter()
+    relative = _git_ls_files(root) if use_git else None
+    if relative is None:
+        relative = _walk(root, file_filter, workers)
+        accepted = [path for path in relative if file_filter.accepts(path)]
+    else:
+        accepted = [
+            path for path in relative
+            if file_filter.accepts(path) and (root / path).is_file()
+        ]
+    return sorted(root / path for path in accepted)
+
+
+def _git_ls_files(root: Path) -> Optional[list[str]]:
+    """git ls-filesで列挙（Gitリポジトリ外・gitが無い場合はNone）
+
+    追跡中のファイルと、.gitignoreで除外されていない未追跡ファイルを
+    rootからの相対パスで返す。
+    """
+    try:
+        result = subprocess.run(
+            [
+                "git", "-c", "core.quotepath=false", "ls-files", "-z",
+                "--cached", "--others", "--exclude-standard",
+            ],
+            cwd=root,
+            capture_output=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    names = result.stdout.decode("utf-8", errors="replace").split("\0")
+    # マージ中の競合等で同じパスが複数回出力されることがある
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def _walk(root: Path, file_filter: FileFilter, workers: int) -> list[str]:
+    """.gitignoreを解釈しながらディレクトリを階層ごとに並行走査"""
+    root_ignores = []
+    top = GitIgnore.load(root / ".gitignore", "")
+    if top is not None:
+        root_ignores.append(top)
+
+    files: list[str] = []
+    level: list[tuple[str, list[GitIgnore]]] = [("", root_ignores)]
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers),
+        thread_name_prefix="devbuddy-discover",
+    ) as executor:
+        while level:
+            next_level: list[tuple[str, list[GitIgnore]]] = []
+            for found, subdirs in executor.map(
+                lambda item: _scan(root, item[0], item[1], file_filter),
+                level,
+            ):
+                files.extend(found)
+                next_level.extend(subdirs)
+            level = next_level
+    return files
+
+
+def _scan(
+    root: Path,
+    directory: str,
+    ignores: list[GitIgnore],
+    file_filter: FileFilter,
+) -> tuple[list[str], list[tuple[str, list[GitIgnore]]]]:
+    """1ディレクトリを走査し、ファイルと走査すべきサブディレクトリを返す"""
+    path = root / directory if directory else root
+    if directory:
+        nested = GitIgnore.load(path / ".gitignore", directory)
+        if nested is not None:
+            ignores = ignores + [nested]
+
+    files: list[str] = []
+    subdirs: list[tuple[str, list[GitIgnore]]] = []
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return files, subdirs
+
+    for entry in entries:
+        rel = f"{directory}/{entry.name}" if directory else entry.name
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            if (
+                entry.name in DEFAULT_SKIP_DIRS
+                or _is_ignored(ignores, rel, True)
+                or file_filter.prunes(rel)
+            ):
+                continue
+            subdirs.append((rel, ignores))
+        elif entry.is_file() and not _is_ignored(ignores, rel, False):
+            files.append(rel)
+    return files, subdirs
@@ -5,12 +5,14 @@ BugFixer - AIバグ修正エンジン
 自己検証ループにより、修正の品質を保証。
 """
 
+import asyncio
 import re
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from devbuddy.llm.async_client import acomplete
 from devbuddy.llm.client import LLMClient
 from devbuddy.llm.prompts import PromptTemplates
 from devbuddy.core.licensing import LicenseManager, UsageLimitError
@@ -133,6 +135,64 @@ class BugFixer:
         Returns:
             FixResult: 修正提案
         """
+        lang = language or self.detect_language(test_path)
+        prepared = self._prepare_fix(test_path, source_path, lang)
+        if isinstance(prepared, FixResult):
+            return prepared
+
+        try:
+            response = self.client.complete(prepared)
+        except Exception as e:
+            return FixResult(success=False, error=str(e))
+
+        return self._finish_fix(response, source_path or test_path)
+
+    async def asuggest_fix(
+        self,
+        test_path: Path,
+        source_path: Optional[Path] = None,
+        language: Optional[str] = None,
+    ) -> FixResult:
+        """失敗テストに対する修正を非同期で提案
+
+        テスト実行はスレッドで行い、クライアントがacompleteを持つ場合は
+        イベントループ上でLLMを呼び出す。
+
+        Args:
+            test_path: テストファイルパス
+            source_path: ソースファイルパス（推測可能な場合は省略可）
+            language: プログラミング言語（省略時は自動検出）
+
+        Returns:
+            FixResult: 修正提案
+        """
+        lang = language or self.detect_language(test_path)
+        prepared = await asyncio.to_thread(
+            self._prepare_fix, test_path, source_path, lang
+        )
+        if isinstance(prepared, FixResult):
+            return prepared
+
+        try:
+            response = await acomplete(self.client, prepared)
+        except Exception as e:
+            return FixResult(success=False, error=str(e))
+
+        return await asyncio.to_thread(
+            self._finish_fix, response, source_path or test_path
+        )
+
+    def _prepare_fix(
+        self,
+        test_path: Path,
+        source_path: Optional[Path],
+        lang: str,
+    ) -> "str | FixResult":
+        """ライセンスチェックとテスト実行を行いプロンプトを構築
+
+        Returns:
+            修正が必要な場合はプロンプト文字列、それ以外はFixResult
+        """
         # ライセンスチェック
         if not self._skip_license_check:
             try:
@@ -140,9 +200,6 @@ class BugFixer:
             except UsageLimitError as e:
                 return FixResult(success=False, error=str(e))
 
-        # 言語を検出
-        lang = language or self.detect_language(test_path)
-
         # テストを実行して失敗情報を取得
         try:
             cmd = self.get_test_command(lang, test_path)
@@ -183,15 +240,15 @@ class BugFixer:
         error_context = self._build_error_context(error_output, lang)
 
         # AIに修正提案を依頼
-        prompt = self.prompts.bug_fix(
+        return self.prompts.bug_fix(
             test_code=test_code,
             error_output=error_context,
             source_code=source_code,
         )
 
+    def _finish_fix(self, response: str, path_for_parse: Path) -> FixResult:
+        """レスポンスを解析して利用量を記録"""
         try:
-            response = self.client.complete(prompt)
-            path_for_parse = source_path or test_path
             suggestions = self._parse_fix_response(response, path_for_parse)
         except Exception as e:
             return FixResult(success=False, error=str(e))
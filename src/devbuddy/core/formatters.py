@@ -68,6 +68,7 @@ class TextFormatter(OutputFormatter):
         lines.append(
             f"Summary: {bugs} bugs, {warnings} warnings, {styles} style issues"
         )
+        lines.extend(_ai_warnings(results))
 
         return "\n".join(lines)
 
@@ -144,6 +145,9 @@ class JSONFormatter(OutputFormatter):
                 "file_path": str(result.file_path),
                 "success": result.success,
                 "error": result.error,
+                "ai_status": result.ai_status,
+                "ai_error": result.ai_error,
+                "model": result.model,
                 "issues": issues_list,
             }
             results_list.append(file_data)
@@ -243,6 +247,10 @@ class MarkdownFormatter(OutputFormatter):
         lines.append(f"| 🔵 Style | {total_issues['style']} |")
         lines.append(f"| 🟢 Info | {total_issues['info']} |")
         lines.append("")
+        warnings = _ai_warnings(results)
+        if warnings:
+            lines.extend(f"> ⚠️ {warning}" for warning in warnings)
+            lines.append("")
         lines.append("---")
         lines.append("*Generated by DevBuddyAI*")
 
@@ -330,3 +338,20 @@ def get_formatter(format_type: str) -> OutputFormatter:
 
     formatter_class = formatters.get(format_type.lower(), TextFormatter)
     return formatter_class()
+
+
+def _ai_warnings(results: list[ReviewResult]) -> list[str]:
+    """AIレビューが未実行・一部のみだったファイルの警告行"""
+    warnings = []
+    for result in results:
+        if result.ai_status == "unavailable":
+            warnings.append(
+                f"AI review unavailable for {result.file_path}: "
+                f"{result.ai_error}"
+            )
+        elif result.ai_status == "partial":
+            warnings.append(
+                f"AI review incomplete for {result.file_path}: "
+                f"{result.ai_error}"
+            )
+    return warnings
@@ -6,12 +6,15 @@ CodeTestGenerator - AIテスト生成エンジン
 """
 
 import ast
+import asyncio
 import re
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from devbuddy.analyzers.python_ast import parse_cached
+from devbuddy.llm.async_client import acomplete
 from devbuddy.llm.client import LLMClient
 from devbuddy.llm.prompts import PromptTemplates
 from devbuddy.core.licensing import LicenseManager, UsageLimitError
@@ -96,6 +99,61 @@ class CodeTestGenerator:
         Returns:
             GenerationResult: 生成結果
         """
+        prepared = self._prepare_generation(
+            source_path, function_name, framework
+        )
+        if isinstance(prepared, GenerationResult):
+            return prepared
+
+        try:
+            test_code = self.client.complete(prepared)
+        except Exception as e:
+            return GenerationResult(success=False, error=str(e))
+
+        return self._finish_generation(test_code)
+
+    async def agenerate_tests(
+        self,
+        source_path: Path,
+        function_name: Optional[str] = None,
+        framework: str = "pytest",
+    ) -> GenerationResult:
+        """テストを非同期で生成
+
+        クライアントがacompleteを持つ場合はイベントループ上で呼び出す。
+
+        Args:
+            source_path: ソースファイルパス
+            function_name: 対象関数名（Noneなら全関数）
+            framework: テストフレームワーク (pytest/unittest)
+
+        Returns:
+            GenerationResult: 生成結果
+        """
+        prepared = await asyncio.to_thread(
+            self._prepare_generation, source_path, function_name, framework
+        )
+        if isinstance(prepared, GenerationResult):
+            return prepared
+
+        try:
+            test_code = await acomplete(self.client, prepared)
+        except Exception as e:
+            return GenerationResult(success=False, error=str(e))
+
+        return await asyncio.to_thread(self._finish_generation, test_code)
+
+    def _prepare_generation(
+        self,
+        source_path: Path,
+        function_name: Optional[str],
+        framework: str,
+    ) -> "str | GenerationResult":
+        """ライセンスチェックと関数抽出を行いプロンプトを構築
+
+        Returns:
+            成功時はプロンプト文字列、失敗時はGenerationResult
+        """
         # ライセンスチェック
         if not self._skip_license_check:
             try:
@@ -126,17 +184,15 @@ class CodeTestGenerator:
 
         # テスト生成
         module_name = source_path.stem
-        prompt = self.prompts.test_generation(
+        return self.prompts.test_generation(
             functions=functions,
             module_name=module_name,
             framework=framework,
         )
 
-        try:
-            test_code = self.client.complete(prompt)
-            test_code = self._clean_test_code(test_code)
-        except Exception as e:
-            return GenerationResult(success=False, error=str(e))
+    def _finish_generation(self, raw_response: str) -> GenerationResult:
+        """レスポンスを整形して利用量を記録"""
+        test_code = self._clean_test_code(raw_response)
 
         # テスト数をカウント
         test_count = test_code.count("def test_")
@@ -326,7 +382,7 @@ class CodeTestGenerator:
         functions: list[FunctionInfo] = []
 
         try:
-            tree = ast.parse(source_code)
+            tree = parse_cached(source_code)
         except SyntaxError:
             return functions
 
@@ -7,6 +7,7 @@
 import hashlib
 import json
 import os
+import threading
 import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
@@ -152,6 +153,8 @@ class LicenseManager:
 
         self._license: Optional[License] = None
         self._usage: Optional[UsageRecord] = None
+        # 並列レビュー時の利用量更新を直列化
+        self._usage_lock = threading.RLock()
 
     def activate(self, license_key: str, email: str) -> License:
         """ライセンスをアクティベート
@@ -246,6 +249,11 @@ class LicenseManager:
 
     def get_usage(self) -> UsageRecord:
         """現在の利用量を取得"""
+        with self._usage_lock:
+            return self._load_usage()
+
+    def _load_usage(self) -> UsageRecord:
+        """利用量を読み込み（ロック取得済みで呼ぶ）"""
         if self._usage:
             return self._usage
 
@@ -311,6 +319,35 @@ class LicenseManager:
 
         return True
 
+    def try_reserve_review(self, file_lines: int = 0) -> bool:
+        """レビュー制限をチェックし、利用量を1件分確保
+
+        チェックと記録を1つのロックの中で行うため、並列レビューでも
+        制限を超えない。レビューが失敗した場合はrelease_review()で戻す。
+
+        Args:
+            file_lines: ファイルの行数
+
+        Returns:
+            bool: 確保できたらTrue
+
+        Raises:
+            UsageLimitError: 制限を超えている場合
+        """
+        with self._usage_lock:
+            self.check_review_limit(file_lines)
+            usage = self._load_usage()
+            usage.reviews += 1
+            self._save_usage()
+        return True
+
+    def release_review(self) -> None:
+        """try_reserve_review()で確保した利用量を戻す"""
+        with self._usage_lock:
+            usage = self._load_usage()
+            usage.reviews = max(0, usage.reviews - 1)
+            self._save_usage()
+
     def check_testgen_limit(self) -> bool:
         """テスト生成制限をチェック"""
         limits = self.get_limits()
@@ -355,21 +392,24 @@ class LicenseManager:
 
     def record_review(self) -> None:
         """レビュー実行を記録"""
-        usage = self.get_usage()
-        usage.reviews += 1
-        self._save_usage()
+        with self._usage_lock:
+            usage = self.get_usage()
+            usage.reviews += 1
+            self._save_usage()
 
     def record_testgen(self) -> None:
         """テスト生成を記録"""
-        usage = self.get_usage()
-        usage.testgens += 1
-        self._save_usage()
+        with self._usage_lock:
+            usage = self.get_usage()
+            usage.testgens += 1
+            self._save_usage()
 
     def record_fix(self) -> None:
         """バグ修正提案を記録"""
-        usage = self.get_usage()
-        usage.fixes += 1
-        self._save_usage()
+        with self._usage_lock:
+            usage = self.get_usage()
+            usage.fixes += 1
+            self._save_usage()
 
     def get_usage_summary(self) -> dict:
         """利用状況サマリーを取得"""
@@ -408,8 +448,9 @@ class LicenseManager:
     def reset_usage(self) -> None:
         """利用量をリセット（テスト用）"""
         current_month = datetime.now().strftime("%Y-%m")
-        self._usage = UsageRecord(month=current_month)
-        self._save_usage()
+        with self._usage_lock:
+            self._usage = UsageRecord(month=current_month)
+            self._save_usage()
 
 
 def generate_license_key(plan: Plan, identifier: str) -> str:
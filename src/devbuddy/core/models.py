@@ -29,3 +29,14 @@ class ReviewResult:
     summary: str = ""
     success: bool = True
     error: Optional[str] = None
+    # AIレビューの結果: ok（実行済み）, cached（キャッシュ再利用）,
+    # partial（一部のみ成功）, unavailable（LLMエラーで未実行）
+    ai_status: str = "ok"
+    ai_error: Optional[str] = None
+    # AIレビューに使ったモデル
+    model: Optional[str] = None
+
+    @property
+    def ai_available(self) -> bool:
+        """AIレビューの結果が揃っているか"""
+        return self.ai_status in ("ok", "cached")
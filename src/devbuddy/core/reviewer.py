@@ -4,16 +4,154 @@ CodeReviewer - AIコードレビューエンジン
 コードを解析し、バグ、スタイル問題、改善点を検出。
 """
 
+import asyncio
+import contextlib
+import dataclasses
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, Callable, Iterable, Iterator, Optional, TYPE_CHECKING
 
+from devbuddy.core.batcher import parse_batch_response
+from devbuddy.core.cache import ReviewCache
+from devbuddy.core.chunker import (
+    DEFAULT_CHUNK_TOKENS,
+    CodeChunk,
+    CodeUnit,
+    chunk_ranges,
+    enclosing_ranges,
+    split_code,
+    split_units,
+)
 from devbuddy.core.models import Issue, ReviewResult
+from devbuddy.core.structured_output import (
+    JsonIssueStreamParser,
+    parse_json_issues,
+)
 from devbuddy.core.licensing import LicenseManager, UsageLimitError
+from devbuddy.integrations.diff import FileDiff, parse_unified_diff
+from devbuddy.llm.async_client import acomplete_with_system
 from devbuddy.llm.client import LLMClient
 from devbuddy.llm.prompts import PromptTemplates
 
 if TYPE_CHECKING:
     from devbuddy.analyzers.python_analyzer import PythonAnalyzer
+    from devbuddy.llm.routing import ModelRouter
+
+
+def _parse_issue_line(line: str) -> Optional[Issue]:
+    """1行をIssueに変換（形式外の行はNone）"""
+    line = line.strip()
+
+    # 簡易パース例: [LEVEL] Line N: message
+    if not line.startswith("["):
+        return None
+
+    try:
+        level_end = line.index("]")
+        level = line[1:level_end].lower()
+
+        rest = line[level_end + 1:].strip()
+        if not rest.startswith("Line "):
+            return None
+        line_end = rest.index(":")
+        line_num = int(rest[5:line_end])
+        message = rest[line_end + 1:].strip()
+    except (ValueError, IndexError):
+        return None
+
+    return Issue(level=level, line=line_num, message=message)
+
+
+class IssueStreamParser:
+    """ストリーミング出力を逐次解析するパーサー
+
+    テキスト断片をfeedすると、改行で完成した行から
+    `[LEVEL] Line N: message` 形式のIssueを返す。
+    続く `Suggestion:` 行は返したIssueのsuggestionに設定する。
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._last: Optional[Issue] = None
+
+    def feed(self, chunk: str) -> list[Issue]:
+        """断片を追加し、完成した行のIssueを返す"""
+        self._buffer += chunk
+        if "\n" not in self._buffer:
+            return []
+
+        *lines, self._buffer = self._buffer.split("\n")
+        issues = []
+        for line in lines:
+            issue = self._parse_line(line)
+            if issue is not None:
+                issues.append(issue)
+        return issues
+
+    def close(self) -> list[Issue]:
+        """残りのバッファを解析して返す"""
+        line, self._buffer = self._buffer, ""
+        issue = self._parse_line(line)
+        return [issue] if issue is not None else []
+
+    def _parse_line(self, line: str) -> Optional[Issue]:
+        stripped = line.strip()
+        if self._last is not None and stripped.startswith("Suggestion:"):
+            self._last.suggestion = stripped[len("Suggestion:"):].strip()
+            return None
+
+        issue = _parse_issue_line(stripped)
+        if issue is not None or stripped:
+            self._last = issue
+        return issue
+
+
+def _parse_text_response(response: str) -> list[Issue]:
+    """`[LEVEL] Line N: message` 形式の応答全体をIssueリストに変換"""
+    parser = IssueStreamParser()
+    return parser.feed(response.strip()) + parser.close()
+
+
+def _merge_ai_status(statuses: list[str]) -> str:
+    """複数ファイルのai_statusを1つにまとめる"""
+    if not statuses:
+        return "ok"
+    if all(status == "cached" for status in statuses):
+        return "cached"
+    if all(status in ("ok", "cached") for status in statuses):
+        return "ok"
+    if all(status == "unavailable" for status in statuses):
+        return "unavailable"
+    return "partial"
+
+
+@dataclass
+class _PreparedReview:
+    """LLM呼び出し前後で受け渡すレビュー途中状態"""
+
+    file_path: Path
+    severity: str
+    static_issues: list[Issue]
+    # AIレビューに使うモデル（ModelRouterが選択）
+    model: str = ""
+    # 固定の指示部分（システムプロンプト）とレビュー対象コード部分
+    system: str = ""
+    prompt: str = ""
+    cache_key: Optional[str] = None
+    ai_issues: Optional[list[Issue]] = None
+    # 大きなファイルを分割した場合のチャンクとプロンプト
+    chunks: list[tuple[CodeChunk, str]] = field(default_factory=list)
+    # 差分レビュー: 変更のない単位のキャッシュ済み結果
+    reused_issues: list[Issue] = field(default_factory=list)
+    # 差分レビュー: レビュー後に結果を保存する単位とキャッシュキー
+    pending_units: list[tuple[CodeUnit, str]] = field(default_factory=list)
+    # AIレビューの結果（ReviewResult.ai_status/ai_errorに引き継ぐ）
+    ai_status: str = "ok"
+    ai_error: Optional[str] = None
+    # 利用量を確保済みで、まだ結果を返していない
+    reserved: bool = False
 
 
 class CodeReviewer:
@@ -24,28 +162,84 @@ class CodeReviewer:
         client: LLMClient,
         license_manager: Optional[LicenseManager] = None,
         skip_license_check: bool = False,
+        cache: Optional[ReviewCache] = None,
+        chunk_tokens: Optional[int] = DEFAULT_CHUNK_TOKENS,
+        chunk_workers: int = 4,
+        incremental: bool = True,
+        structured_output: bool = False,
+        router: Optional["ModelRouter"] = None,
     ):
+        """
+        Args:
+            client: LLMクライアント
+            license_manager: ライセンスマネージャー
+            skip_license_check: ライセンスチェックを省略するか
+            cache: AIレビュー結果のキャッシュ
+            chunk_tokens: これを超えるファイルは関数・クラス単位に分割して
+                レビューする（Noneなら分割しない）
+            chunk_workers: 1ファイル内のチャンクを並行レビューする数
+            incremental: キャッシュ使用時、関数・クラス単位で結果を保存し
+                変更された単位だけをLLMに送る
+            structured_output: LLMにJSON形式で回答させ、JSONとして解析する
+                （途中で切れた応答からも完成した指摘を回収する）
+            router: ファイルの複雑さでモデルを振り分ける場合のルーター
+                （Noneならすべてclientで処理）
+        """
         self.client = client
         self._analyzer: Optional["PythonAnalyzer"] = None
         self.prompts = PromptTemplates()
         self._license_manager = license_manager
         self._skip_license_check = skip_license_check
+        self.cache = cache
+        self.chunk_tokens = chunk_tokens
+        self.chunk_workers = max(1, chunk_workers)
+        self.incremental = incremental
+        self.structured_output = structured_output
+        self.router = router
+        # 同時LLMリクエスト数の制限（ReviewSchedulerが設定）
+        self.llm_slots: Optional[threading.BoundedSemaphore] = None
+        self._init_lock = threading.Lock()
 
     @property
     def license_manager(self) -> LicenseManager:
         """ライセンスマネージャーを取得（遅延初期化）"""
         if self._license_manager is None:
-            self._license_manager = LicenseManager()
+            with self._init_lock:
+                if self._license_manager is None:
+                    self._license_manager = LicenseManager()
         return self._license_manager
 
     @property
     def analyzer(self) -> Any:
         """遅延インポートでPythonAnalyzerを取得"""
         if self._analyzer is None:
-            from devbuddy.analyzers.python_analyzer import PythonAnalyzer
-            self._analyzer = PythonAnalyzer()
+            with self._init_lock:
+                if self._analyzer is None:
+                    from devbuddy.analyzers.python_analyzer import (
+                        PythonAnalyzer,
+                    )
+                    self._analyzer = PythonAnalyzer()
         return self._analyzer
 
+    @contextlib.contextmanager
+    def _llm_slot(self) -> Iterator[None]:
+        """LLMリクエスト枠を確保"""
+        slots = self.llm_slots
+        if slots is None:
+            yield
+            return
+        with slots:
+            yield
+
+    def prefetch_static_analysis(self, file_paths: list[Path]) -> None:
+        """複数ファイルの外部静的解析（flake8/mypy）をまとめて実行
+
+        結果はアナライザーに保持され、以降のreview_file()で使われる。
+        """
+        self.analyzer.prefetch_external(
+            [p for p in file_paths if p.suffix == ".py"]
+        )
+
     def review_file(
         self,
         file_path: Path,
@@ -60,6 +254,166 @@ class CodeReviewer:
         Returns:
             ReviewResult: レビュー結果
         """
+        return self._review(file_path, severity)
+
+    def review_file_streaming(
+        self,
+        file_path: Path,
+        on_issue: Callable[[Issue], None],
+        severity: str = "medium",
+    ) -> ReviewResult:
+        """ファイルをレビューし、検出した問題を逐次通知
+
+        静的解析の結果を通知した後、LLMのストリーミング出力から
+        1行完成するごとにIssueを通知する。
+
+        Args:
+            file_path: レビュー対象ファイル
+            on_issue: 重要度フィルタを通過したIssueごとに呼ばれる
+            severity: 重要度フィルタ (low/medium/high)
+
+        Returns:
+            ReviewResult: レビュー結果（review_fileと同じ内容）
+        """
+        return self._review(file_path, severity, on_issue=on_issue)
+
+    def review_batch(
+        self,
+        file_paths: list[Path],
+        severity: str = "medium",
+    ) -> list[ReviewResult]:
+        """小さなファイル群を1回のLLMリクエストでまとめてレビュー
+
+        キャッシュヒットしたファイルはLLMに送らない。分割レビューや
+        差分レビューになったファイルは個別にレビューする。
+
+        Args:
+            file_paths: レビュー対象ファイル（ReviewSchedulerが予算内に詰める）
+            severity: 重要度フィルタ (low/medium/high)
+
+        Returns:
+            list[ReviewResult]: file_pathsと同じ順序のレビュー結果
+        """
+        results: list[Optional[ReviewResult]] = [None] * len(file_paths)
+        prepared_list: list[tuple[int, _PreparedReview, str]] = []
+        try:
+            self._review_batch(file_paths, severity, results, prepared_list)
+        except BaseException:
+            for _, prepared, _ in prepared_list:
+                self._release_review(prepared)
+            raise
+        return [r for r in results if r is not None]
+
+    def _review_batch(
+        self,
+        file_paths: list[Path],
+        severity: str,
+        results: list[Optional[ReviewResult]],
+        prepared_list: list[tuple[int, "_PreparedReview", str]],
+    ) -> None:
+        """review_batchの本体（途中で失敗したら確保済みの利用量を戻す）"""
+        for index, file_path in enumerate(file_paths):
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    code = f.read()
+            except Exception as e:
+                results[index] = ReviewResult(
+                    file_path=file_path,
+                    success=False,
+                    error=f"Failed to read file: {e}",
+                )
+                continue
+
+            prepared = self._prepare_review(file_path, code, severity)
+            if isinstance(prepared, ReviewResult):
+                results[index] = prepared
+            else:
+                prepared_list.append((index, prepared, code))
+
+        batch = [
+            (prepared, code) for _, prepared, code in prepared_list
+            if prepared.ai_issues is None
+            and not prepared.chunks
+            and not prepared.reused_issues
+        ]
+        # まとめレビューの結果は単一ファイルのレビューとは別のキーで
+        # キャッシュし、単一ファイルのレビュー結果としては使わない
+        if self.cache is not None:
+            pending = []
+            for prepared, code in batch:
+                cached = self.cache.get(self._batch_cache_key(prepared, code))
+                if cached is None:
+                    pending.append((prepared, code))
+                else:
+                    self._store_ai_issues(prepared, cached, cacheable=False)
+                    prepared.ai_status = "cached"
+            batch = pending
+        # モデルが異なるファイルは同じリクエストにまとめない
+        by_model: dict[str, list[tuple[_PreparedReview, str]]] = {}
+        for prepared, code in batch:
+            by_model.setdefault(prepared.model, []).append((prepared, code))
+        for group in by_model.values():
+            if len(group) > 1:
+                self._run_batch_review(group, severity)
+
+        for index, prepared, _ in prepared_list:
+            if prepared.ai_issues is None:
+                self._run_ai_review(prepared)
+            results[index] = self._finish_review(prepared)
+
+    def _run_batch_review(
+        self,
+        batch: list[tuple["_PreparedReview", str]],
+        severity: str,
+    ) -> None:
+        """まとめプロンプトでLLMを呼び出し、ファイルごとに結果を設定"""
+        names = [str(prepared.file_path) for prepared, _ in batch]
+        system = self.prompts.code_review_system(
+            language="python",
+            severity=severity,
+            structured=self.structured_output,
+            batch=True,
+        )
+        prompt = self.prompts.batch_review_user(
+            files=[(name, code) for name, (_, code) in zip(names, batch)],
+            language="python",
+        )
+        client = self._client_for(batch[0][0])
+        try:
+            with self._llm_slot():
+                response = client.complete_with_system(system, prompt)
+        except Exception as e:
+            # 静的解析結果のみ返し、AI未実行として結果に記録
+            for prepared, _ in batch:
+                self._set_ai_failure(prepared, [], e)
+            return
+
+        by_name = parse_batch_response(
+            response, names, structured=self.structured_output
+        )
+        for name, (prepared, code) in zip(names, batch):
+            self._store_ai_issues(prepared, by_name[name], cacheable=False)
+            if self.cache is not None:
+                self.cache.put(
+                    self._batch_cache_key(prepared, code), by_name[name]
+                )
+
+    def _batch_cache_key(self, prepared: "_PreparedReview", code: str) -> str:
+        """まとめレビューの結果のキャッシュキー"""
+        return ReviewCache.make_key(
+            code=code,
+            severity=prepared.severity,
+            prompt_version=self._prompt_version(batch=True),
+            model=prepared.model,
+        )
+
+    def _review(
+        self,
+        file_path: Path,
+        severity: str,
+        on_issue: Optional[Callable[[Issue], None]] = None,
+    ) -> ReviewResult:
+        """review_file/review_file_streamingの共通処理"""
         try:
             with open(file_path, encoding="utf-8") as f:
                 code = f.read()
@@ -70,11 +424,335 @@ class CodeReviewer:
                 error=f"Failed to read file: {e}",
             )
 
-        # ライセンスチェック
+        return self._review_code(code, file_path, severity, on_issue)
+
+    def review_code(
+        self,
+        code: str,
+        file_path: Path = Path("stdin"),
+        severity: str = "medium",
+    ) -> ReviewResult:
+        """ディスク上にないコード（未保存のバッファなど）をレビュー
+
+        静的解析はfile_pathのファイルを読まずにcodeに対して行う。
+        flake8相当の検査を含めるにはアナライザーの
+        flake8_backendをinprocessにする。
+
+        Args:
+            code: ソースコード
+            file_path: 結果に表示するパス
+            severity: 重要度フィルタ (low/medium/high)
+
+        Returns:
+            ReviewResult: レビュー結果
+        """
+        return self._review_code(code, file_path, severity, on_disk=False)
+
+    def _review_code(
+        self,
+        code: str,
+        file_path: Path,
+        severity: str,
+        on_issue: Optional[Callable[[Issue], None]] = None,
+        on_disk: bool = True,
+        ranges: Optional[list[tuple[int, int]]] = None,
+    ) -> ReviewResult:
+        """読み込み済みコードのレビュー共通処理"""
+        prepared = self._prepare_review(
+            file_path, code, severity, on_disk=on_disk, ranges=ranges
+        )
+        if isinstance(prepared, ReviewResult):
+            return prepared
+
+        try:
+            if on_issue is None:
+                if prepared.ai_issues is None:
+                    self._run_ai_review(prepared)
+                return self._finish_review(prepared)
+
+            def notify(issues: list[Issue]) -> None:
+                for issue in self._filter_by_severity(issues, severity):
+                    on_issue(issue)
+
+            notify(prepared.static_issues)
+            if prepared.ai_issues is None:
+                notify(prepared.reused_issues)
+                self._run_ai_review(
+                    prepared, on_ai_issue=lambda i: notify([i])
+                )
+            else:
+                notify(prepared.ai_issues)
+            return self._finish_review(prepared)
+        except BaseException:
+            self._release_review(prepared)
+            raise
+
+    def _run_ai_review(
+        self,
+        prepared: "_PreparedReview",
+        on_ai_issue: Optional[Callable[[Issue], None]] = None,
+    ) -> None:
+        """LLMを呼び出してAIレビュー結果を設定
+
+        on_ai_issueが指定された場合はストリーミングで受信し、
+        Issueが1件完成するごとに通知する。
+        """
+        if prepared.chunks:
+            issues, errors = self._review_chunks(prepared, on_ai_issue)
+            self._store_chunk_results(prepared, issues, errors)
+            return
+
+        client = self._client_for(prepared)
+        if on_ai_issue is None:
+            try:
+                with self._llm_slot():
+                    ai_response = client.complete_with_system(
+                        prepared.system, prepared.prompt
+                    )
+                self._store_ai_issues(
+                    prepared, self._parse_ai_response(ai_response)
+                )
+            except Exception as e:
+                # 静的解析結果のみ返し、AI未実行として結果に記録
+                self._set_ai_failure(prepared, [], e)
+            return
+
+        parser = self._stream_parser()
+        received: list[Issue] = []
+        try:
+            with self._llm_slot():
+                stream = client.complete_stream_with_system(
+                    prepared.system, prepared.prompt
+                )
+                for chunk in stream:
+                    for issue in parser.feed(chunk):
+                        received.append(issue)
+                        on_ai_issue(issue)
+            for issue in parser.close():
+                received.append(issue)
+                on_ai_issue(issue)
+            self._store_ai_issues(prepared, received)
+        except Exception as e:
+            # 通知済みの問題は残し、キャッシュには保存しない
+            self._set_ai_failure(prepared, received, e, partial=bool(received))
+
+    def _review_chunks(
+        self,
+        prepared: "_PreparedReview",
+        on_ai_issue: Optional[Callable[[Issue], None]] = None,
+    ) -> tuple[list[Issue], list[Exception]]:
+        """チャンクを並行レビューし、行番号を元ファイルに戻してマージ
+
+        Returns:
+            tuple[list[Issue], list[Exception]]: (チャンク順の結果,
+            失敗したチャンクのエラー)
+        """
+        client = self._client_for(prepared)
+        chunks = prepared.chunks
+
+        def review_chunk(chunk: CodeChunk, prompt: str) -> list[Issue]:
+            with self._llm_slot():
+                response = client.complete_with_system(
+                    prepared.system, prompt
+                )
+            return self._remap_chunk_issues(
+                chunk, self._parse_ai_response(response)
+            )
+
+        results: list[Optional[list[Issue]]] = [None] * len(chunks)
+        errors: list[Exception] = []
+        with ThreadPoolExecutor(
+            max_workers=min(self.chunk_workers, len(chunks)),
+            thread_name_prefix="devbuddy-chunk",
+        ) as executor:
+            futures = {
+                executor.submit(review_chunk, chunk, prompt): index
+                for index, (chunk, prompt) in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                try:
+                    issues = future.result()
+                except Exception as e:
+                    # AIエラーのチャンクは結果なしとして続行
+                    errors.append(e)
+                    continue
+                results[futures[future]] = issues
+                if on_ai_issue is not None:
+                    for issue in issues:
+                        on_ai_issue(issue)
+
+        merged = [issue for issues in results if issues for issue in issues]
+        return merged, errors
+
+    async def _areview_chunks(
+        self,
+        prepared: "_PreparedReview",
+    ) -> tuple[list[Issue], list[Exception]]:
+        """チャンクを非同期で並行レビュー（_review_chunksの非同期版）"""
+        client = self._client_for(prepared)
+
+        async def review_chunk(chunk: CodeChunk, prompt: str) -> list[Issue]:
+            response = await acomplete_with_system(
+                client, prepared.system, prompt
+            )
+            return self._remap_chunk_issues(
+                chunk, self._parse_ai_response(response)
+            )
+
+        results = await asyncio.gather(
+            *(
+                review_chunk(chunk, prompt)
+                for chunk, prompt in prepared.chunks
+            ),
+            return_exceptions=True,
+        )
+        merged = [
+            issue for issues in results if isinstance(issues, list)
+            for issue in issues
+        ]
+        errors = [e for e in results if isinstance(e, Exception)]
+        return merged, errors
+
+    def _store_chunk_results(
+        self,
+        prepared: "_PreparedReview",
+        issues: list[Issue],
+        errors: list[Exception],
+    ) -> None:
+        """チャンクレビューの結果を設定（失敗があればキャッシュしない）"""
+        if not errors:
+            self._store_ai_issues(prepared, issues)
+            return
+        partial = len(errors) < len(prepared.chunks)
+        self._set_ai_failure(prepared, issues, errors[0], partial=partial)
+
+    def _remap_chunk_issues(
+        self,
+        chunk: CodeChunk,
+        issues: list[Issue],
+    ) -> list[Issue]:
+        """チャンク内の行番号を元ファイルの行番号に変換
+
+        共通ヘッダ（他チャンクの定義）への指摘は除外する。
+        """
+        remapped = []
+        for issue in issues:
+            line = chunk.to_file_line(issue.line)
+            if line is not None:
+                remapped.append(dataclasses.replace(issue, line=line))
+        return remapped
+
+    async def areview_file(
+        self,
+        file_path: Path,
+        severity: str = "medium",
+    ) -> ReviewResult:
+        """ファイルを非同期でレビュー
+
+        クライアントがacompleteを持つ場合はイベントループ上で
+        LLMを呼び出し、ファイル読み込みと静的解析はスレッドで実行する。
+
+        Args:
+            file_path: レビュー対象ファイル
+            severity: 重要度フィルタ (low/medium/high)
+
+        Returns:
+            ReviewResult: レビュー結果
+        """
+        try:
+            code = await asyncio.to_thread(
+                file_path.read_text, encoding="utf-8"
+            )
+        except Exception as e:
+            return ReviewResult(
+                file_path=file_path,
+                success=False,
+                error=f"Failed to read file: {e}",
+            )
+
+        prepared = await asyncio.to_thread(
+            self._prepare_review, file_path, code, severity
+        )
+        if isinstance(prepared, ReviewResult):
+            return prepared
+
+        try:
+            if prepared.ai_issues is None and prepared.chunks:
+                issues, errors = await self._areview_chunks(prepared)
+                self._store_chunk_results(prepared, issues, errors)
+            elif prepared.ai_issues is None:
+                try:
+                    ai_response = await acomplete_with_system(
+                        self._client_for(prepared),
+                        prepared.system,
+                        prepared.prompt,
+                    )
+                    self._store_ai_issues(
+                        prepared, self._parse_ai_response(ai_response)
+                    )
+                except Exception as e:
+                    # 静的解析結果のみ返し、AI未実行として結果に記録
+                    self._set_ai_failure(prepared, [], e)
+
+            return await asyncio.to_thread(self._finish_review, prepared)
+        except BaseException:
+            # キャンセル等で結果を返せなかった分の利用量を戻す
+            self._release_review(prepared)
+            raise
+
+    async def areview_files(
+        self,
+        files: list[Path],
+        severity: str = "medium",
+        concurrency: int = 100,
+    ) -> list[ReviewResult]:
+        """複数ファイルを1つのイベントループで並行レビュー
+
+        Args:
+            files: レビュー対象ファイル
+            severity: 重要度フィルタ (low/medium/high)
+            concurrency: 同時に処理するファイル数の上限
+
+        Returns:
+            list[ReviewResult]: filesと同じ順序のレビュー結果
+        """
+        if len(files) > 1:
+            await asyncio.to_thread(self.prefetch_static_analysis, files)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def review_one(file_path: Path) -> ReviewResult:
+            async with semaphore:
+                return await self.areview_file(file_path, severity)
+
+        return list(
+            await asyncio.gather(*(review_one(f) for f in files))
+        )
+
+    def _prepare_review(
+        self,
+        file_path: Path,
+        code: str,
+        severity: str,
+        on_disk: bool = True,
+        ranges: Optional[list[tuple[int, int]]] = None,
+    ) -> "_PreparedReview | ReviewResult":
+        """ライセンスチェック・静的解析・キャッシュ参照を実行
+
+        rangesを指定した場合（差分レビュー）はその行範囲だけを
+        チャンクにしてレビューし、静的解析の結果も範囲内に絞る。
+
+        利用量はここで確保し（チェックと記録を同時に行うため並列でも
+        上限を超えない）、レビューが失敗したら_release_reviewで戻す。
+
+        Returns:
+            ライセンス制限時はReviewResult、それ以外は_PreparedReview
+        """
+        reserved = False
         if not self._skip_license_check:
             try:
                 file_lines = len(code.splitlines())
-                self.license_manager.check_review_limit(file_lines)
+                reserved = self.license_manager.try_reserve_review(file_lines)
             except UsageLimitError as e:
                 return ReviewResult(
                     file_path=file_path,
@@ -82,97 +760,405 @@ class CodeReviewer:
                     error=str(e),
                 )
 
-        # 静的解析を実行
-        static_issues = self.analyzer.analyze(code, file_path)
+        try:
+            prepared = self._analyze_for_review(
+                file_path, code, severity, on_disk, ranges
+            )
+        except BaseException:
+            if reserved:
+                self.license_manager.release_review()
+            raise
+        prepared.reserved = reserved
+        return prepared
+
+    def _analyze_for_review(
+        self,
+        file_path: Path,
+        code: str,
+        severity: str,
+        on_disk: bool,
+        ranges: Optional[list[tuple[int, int]]],
+    ) -> "_PreparedReview":
+        """静的解析・キャッシュ参照・プロンプト作成"""
+        # 静的解析を実行（ディスク上にないコードは外部ツールに渡さない）
+        static_issues = self.analyzer.analyze(
+            code, file_path if on_disk else None
+        )
+        if ranges is not None:
+            static_issues = [
+                issue for issue in static_issues
+                if any(start <= issue.line <= end for start, end in ranges)
+            ]
 
-        # AIレビューを実行
-        prompt = self.prompts.code_review(
-            code=code,
-            language="python",
+        prepared = _PreparedReview(
+            file_path=file_path,
             severity=severity,
+            static_issues=static_issues,
+            model=(
+                self.router.choose(code) if self.router is not None
+                else self._model_name()
+            ),
         )
 
-        try:
-            ai_response = self.client.complete(prompt)
-            ai_issues = self._parse_ai_response(ai_response)
-        except Exception:
-            # AIエラーは無視して静的解析結果のみ返す
-            ai_issues = []
+        if ranges is not None:
+            # 差分レビュー: 変更された関数だけを送る
+            chunks = chunk_ranges(
+                code, ranges, self.chunk_tokens or DEFAULT_CHUNK_TOKENS
+            )
+        else:
+            # 大きなファイルは関数・クラス境界で分割
+            chunks = (
+                split_code(code, self.chunk_tokens)
+                if self.chunk_tokens else []
+            )
 
-        # 結果をマージ
-        all_issues = static_issues + ai_issues
-        filtered_issues = self._filter_by_severity(all_issues, severity)
+        # キャッシュヒット時はAIレビューをスキップ
+        if self.cache is not None:
+            prompt_version = self._prompt_version()
+            if ranges is not None:
+                prompt_version += "+diff" + ",".join(
+                    f"{start}-{end}" for start, end in ranges
+                )
+            if chunks:
+                prompt_version += f"+chunks{self.chunk_tokens}"
+            prepared.cache_key = ReviewCache.make_key(
+                code=code,
+                severity=severity,
+                prompt_version=prompt_version,
+                model=prepared.model,
+            )
+            prepared.ai_issues = self.cache.get(prepared.cache_key)
+            if prepared.ai_issues is not None:
+                prepared.ai_status = "cached"
 
-        # 利用量を記録
-        if not self._skip_license_check:
-            self.license_manager.record_review()
+            # ファイル全体のミス時は単位ごとのキャッシュを参照
+            if (
+                prepared.ai_issues is None
+                and self.incremental
+                and ranges is None
+            ):
+                changed = self._lookup_units(prepared, code, severity)
+                if changed is not None:
+                    chunks = changed
+                    if not chunks:
+                        # 全単位がヒット（移動・コメント変更のみ）
+                        self._store_ai_issues(prepared, [])
+                        prepared.ai_status = "cached"
 
-        return ReviewResult(
-            file_path=file_path,
+        if prepared.ai_issues is None:
+            # 指示部分はシステムプロンプトとして送り、プロバイダ側で
+            # キャッシュさせる（ファイル・チャンク間で共通）
+            prepared.system = self.prompts.code_review_system(
+                language="python",
+                severity=severity,
+                structured=self.structured_output,
+            )
+            if chunks:
+                prepared.chunks = [
+                    (chunk, self.prompts.code_review_user(chunk.code))
+                    for chunk in chunks
+                ]
+            else:
+                prepared.prompt = self.prompts.code_review_user(code)
+
+        return prepared
+
+    def _lookup_units(
+        self,
+        prepared: "_PreparedReview",
+        code: str,
+        severity: str,
+    ) -> Optional[list[CodeChunk]]:
+        """単位ごとのキャッシュを参照し、変更された単位のチャンクを作成
+
+        変更のない単位の結果は現在の行番号にずらしてreused_issuesに
+        設定する。
+
+        Returns:
+            Optional[list[CodeChunk]]: 変更された単位のチャンク
+            （全単位がヒットなら空）。ヒットが無い場合は通常どおり
+            ファイル全体をレビューするためNone
+        """
+        assert self.cache is not None
+        units = split_units(code)
+        if len(units) < 2:
+            return None
+
+        prompt_version = f"{self._prompt_version()}+unit"
+        reused: list[Issue] = []
+        pending: list[tuple[CodeUnit, str]] = []
+        for unit in units:
+            key = ReviewCache.make_key(
+                code=unit.fingerprint,
+                severity=severity,
+                prompt_version=prompt_version,
+                model=prepared.model,
+            )
+            cached = self.cache.get(key)
+            if cached is None:
+                pending.append((unit, key))
+            else:
+                reused.extend(
+                    dataclasses.replace(
+                        issue, line=unit.to_file_line(issue.line)
+                    )
+                    for issue in cached
+                )
+
+        prepared.pending_units = pending
+        if len(pending) == len(units):
+            return None
+
+        prepared.reused_issues = reused
+        ranges = [(unit.start_line, unit.end_line) for unit, _ in pending]
+        if not ranges:
+            return []
+        return chunk_ranges(
+            code, ranges, self.chunk_tokens or DEFAULT_CHUNK_TOKENS
+        )
+
+    def _set_ai_failure(
+        self,
+        prepared: "_PreparedReview",
+        issues: list[Issue],
+        error: Exception,
+        partial: bool = False,
+    ) -> None:
+        """LLMエラー時の結果を設定（得られた分だけ残し、キャッシュしない）"""
+        self._store_ai_issues(prepared, issues, cacheable=False)
+        prepared.ai_status = "partial" if partial else "unavailable"
+        prepared.ai_error = str(error) or type(error).__name__
+
+    def _store_ai_issues(
+        self,
+        prepared: "_PreparedReview",
+        ai_issues: list[Issue],
+        cacheable: bool = True,
+    ) -> None:
+        """AIレビュー結果を設定してキャッシュに保存
+
+        差分レビューの場合は再利用した結果とマージし、
+        レビューした単位ごとの結果も保存する。
+        """
+        if prepared.reused_issues:
+            prepared.ai_issues = sorted(
+                prepared.reused_issues + ai_issues,
+                key=lambda issue: issue.line,
+            )
+        else:
+            prepared.ai_issues = ai_issues
+
+        if not cacheable or self.cache is None:
+            return
+        if prepared.cache_key is not None:
+            self.cache.put(prepared.cache_key, prepared.ai_issues)
+        for unit, key in prepared.pending_units:
+            self.cache.put(
+                key,
+                [
+                    dataclasses.replace(
+                        issue, line=unit.to_relative(issue.line)
+                    )
+                    for issue in ai_issues
+                    if unit.start_line <= issue.line <= unit.end_line
+                ],
+            )
+
+    def _finish_review(self, prepared: "_PreparedReview") -> ReviewResult:
+        """結果をマージ（確保済みの利用量を確定）"""
+        all_issues = prepared.static_issues + (prepared.ai_issues or [])
+        filtered_issues = self._filter_by_severity(
+            all_issues, prepared.severity
+        )
+
+        result = ReviewResult(
+            file_path=prepared.file_path,
             issues=filtered_issues,
             summary=self._generate_summary(filtered_issues),
+            ai_status=prepared.ai_status,
+            ai_error=prepared.ai_error,
+            model=prepared.model or None,
         )
+        prepared.reserved = False
+        return result
+
+    def _release_review(self, prepared: "_PreparedReview") -> None:
+        """結果を返せなかったレビューの利用量を戻す"""
+        if prepared.reserved:
+            prepared.reserved = False
+            self.license_manager.release_review()
+
+    def review_diff(
+        self,
+        diff_content: "str | Iterable[FileDiff]",
+        severity: str = "medium",
+        repo_root: Optional[Path] = None,
+        read_source: Optional[Callable[[str], str]] = None,
+    ) -> ReviewResult:
+        """git diffの変更箇所をレビューし、1つの結果にまとめる
 
-    def review_diff(self, diff_content: str) -> ReviewResult:
-        """git diffをレビュー
+        review_diff_hunksのファイルごとの結果を統合する。
+        各指摘のメッセージには対象ファイルのパスを前置する。
 
         Args:
-            diff_content: diff内容
+            diff_content: unified diff（git diffの出力）、または
+                GitOperations.iter_diffで解析済みのファイルごとの差分
+            severity: 重要度フィルタ (low/medium/high)
+            repo_root: diff内のパスの基準ディレクトリ
+            read_source: diff内のパスから変更後のコードを返す関数
 
         Returns:
-            ReviewResult: レビュー結果
+            ReviewResult: diff全体のレビュー結果
+        """
+        root = repo_root or Path(".")
+        results = self.review_diff_hunks(
+            diff_content, severity, root, read_source
+        )
+
+        issues: list[Issue] = []
+        for result in results:
+            path = result.file_path.relative_to(root)
+            issues.extend(
+                dataclasses.replace(issue, message=f"{path}: {issue.message}")
+                for issue in result.issues
+            )
+        errors = [
+            f"{r.file_path.relative_to(root)}: {r.error}"
+            for r in results if r.error
+        ]
+        ai_status = _merge_ai_status(
+            [r.ai_status for r in results if r.success]
+        )
+        ai_errors = [r.ai_error for r in results if r.ai_error]
+        models = {r.model for r in results if r.model}
+        return ReviewResult(
+            file_path=Path("diff"),
+            issues=issues,
+            success=not errors,
+            error="; ".join(errors) or None,
+            ai_status=ai_status,
+            ai_error=ai_errors[0] if ai_errors else None,
+            model=models.pop() if len(models) == 1 else None,
+        )
+
+    def review_diff_hunks(
+        self,
+        diff_content: "str | Iterable[FileDiff]",
+        severity: str = "medium",
+        repo_root: Optional[Path] = None,
+        read_source: Optional[Callable[[str], str]] = None,
+    ) -> list[ReviewResult]:
+        """git diffの変更箇所をファイルごとにレビュー
+
+        diffをファイル・ハンクに分解し、変更後のコードで各ハンクを
+        含む関数だけをLLMに送る。ファイルごとに並行してレビューし、
+        指摘は実際のファイルパスと変更後の行番号で返す。
+        削除されたファイル・バイナリ・Python以外のファイルは対象外。
+
+        Args:
+            diff_content: unified diff（git diffの出力）、または
+                GitOperations.iter_diffで解析済みのファイルごとの差分
+            severity: 重要度フィルタ (low/medium/high)
+            repo_root: diff内のパスの基準ディレクトリ
+            read_source: diff内のパスから変更後のコードを返す関数
+                （省略時はrepo_root配下の作業ツリーから読む）
+
+        Returns:
+            list[ReviewResult]: diff内の順序のファイルごとの結果
         """
-        prompt = self.prompts.diff_review(diff=diff_content)
+        root = repo_root or Path(".")
+        file_diffs = (
+            parse_unified_diff(diff_content)
+            if isinstance(diff_content, str) else diff_content
+        )
+        targets = [
+            file_diff for file_diff in file_diffs
+            if file_diff.hunks
+            and not file_diff.is_deleted
+            and not file_diff.binary
+            and file_diff.path.endswith(".py")
+        ]
+        if not targets:
+            return []
+
+        def review_one(file_diff: FileDiff) -> ReviewResult:
+            return self._review_file_diff(
+                file_diff, root, severity, read_source
+            )
 
+        with ThreadPoolExecutor(
+            max_workers=min(self.chunk_workers, len(targets)),
+            thread_name_prefix="devbuddy-diff",
+        ) as executor:
+            return list(executor.map(review_one, targets))
+
+    def _review_file_diff(
+        self,
+        file_diff: FileDiff,
+        root: Path,
+        severity: str,
+        read_source: Optional[Callable[[str], str]],
+    ) -> ReviewResult:
+        """1ファイル分の差分をレビュー"""
+        file_path = root / file_diff.path
         try:
-            response = self.client.complete(prompt)
-            issues = self._parse_ai_response(response)
+            if read_source is None:
+                code = file_path.read_text(encoding="utf-8")
+            else:
+                code = read_source(file_diff.path)
         except Exception as e:
             return ReviewResult(
-                file_path=Path("diff"),
+                file_path=file_path,
                 success=False,
-                error=str(e),
+                error=f"Failed to read file: {e}",
             )
 
-        return ReviewResult(
-            file_path=Path("diff"),
-            issues=issues,
+        # 構文エラー等で関数を特定できない場合はファイル全体をレビュー
+        ranges = enclosing_ranges(code, file_diff.changed_lines) or None
+        return self._review_code(
+            code,
+            file_path,
+            severity,
+            on_disk=read_source is None,
+            ranges=ranges,
         )
 
-    def _parse_ai_response(self, response: str) -> list[Issue]:
-        """AIレスポンスを解析してIssueリストに変換"""
-        issues = []
+    def _client_for(self, prepared: "_PreparedReview") -> Any:
+        """ファイルに選ばれたモデルのクライアント"""
+        if self.router is not None and prepared.model:
+            return self.router.client_for(prepared.model)
+        return self.client
 
-        lines = response.strip().split("\n")
+    def _model_name(self) -> str:
+        """ルーター未使用時のモデル名（キャッシュキー・結果に記録）"""
+        return str(getattr(self.client, "model", type(self.client).__name__))
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+    def _parse_ai_response(self, response: str) -> list[Issue]:
+        """AIレスポンスを解析してIssueリストに変換
 
-            # 簡易パース例: [LEVEL] Line N: message
-            if line.startswith("["):
-                try:
-                    level_end = line.index("]")
-                    level = line[1:level_end].lower()
-
-                    rest = line[level_end + 1:].strip()
-                    if rest.startswith("Line "):
-                        line_end = rest.index(":")
-                        line_num = int(rest[5:line_end])
-                        message = rest[line_end + 1:].strip()
-
-                        issues.append(
-                            Issue(
-                                level=level,
-                                line=line_num,
-                                message=message,
-                            )
-                        )
-                except (ValueError, IndexError):
-                    continue
+        構造化出力モードではJSONとして解析し、JSONが含まれない応答は
+        テキスト形式として解析する。
+        """
+        if self.structured_output:
+            issues = parse_json_issues(response)
+            if issues is not None:
+                return issues
+        return _parse_text_response(response)
 
-        return issues
+    def _stream_parser(self) -> "IssueStreamParser | JsonIssueStreamParser":
+        """ストリーミング応答用のパーサー"""
+        if self.structured_output:
+            return JsonIssueStreamParser(fallback=_parse_text_response)
+        return IssueStreamParser()
+
+    def _prompt_version(self, batch: bool = False) -> str:
+        """キャッシュキーに使うプロンプトのバージョン"""
+        version = self.prompts.CODE_REVIEW_VERSION
+        if batch:
+            version += f"+batch{self.prompts.BATCH_REVIEW_VERSION}"
+        if self.structured_output:
+            version += "+json"
+        return version
 
     def _filter_by_severity(
         self, issues: list[Issue], severity: str
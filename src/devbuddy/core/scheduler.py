@@ -0,0 +1,202 @@
+"""
+ReviewScheduler - 並列レビュースケジューラ
+
+複数ファイルのレビューを並行実行し、LLM呼び出し・静的解析・
+ファイル読み込みをオーバーラップさせる。
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional
+
+from devbuddy.core.batcher import DEFAULT_BATCH_TOKENS, pack_batches
+from devbuddy.core.models import Issue, ReviewResult
+from devbuddy.core.reviewer import CodeReviewer
+
+DEFAULT_JOBS = 4
+
+
+class ReviewScheduler:
+    """並列レビュースケジューラ
+
+    ワーカー数（jobs）で同時に処理するファイル数を、
+    max_in_flightで同時に発行するLLMリクエスト数を制限する。
+    batch_filesが2以上なら、小さなPythonファイルをまとめて
+    1回のLLMリクエストでレビューする。結果は入力ファイルの順序で返す。
+    """
+
+    def __init__(
+        self,
+        reviewer: CodeReviewer,
+        jobs: int = DEFAULT_JOBS,
+        max_in_flight: Optional[int] = None,
+        batch_files: int = 1,
+        batch_tokens: int = DEFAULT_BATCH_TOKENS,
+    ):
+        """
+        Args:
+            reviewer: レビューエンジン
+            jobs: ワーカースレッド数
+            max_in_flight: 同時LLMリクエスト数の上限（Noneならjobsと同じ）
+            batch_files: 1リクエストにまとめる最大ファイル数（1ならまとめない）
+            batch_tokens: まとめるファイルの合計トークン予算
+        """
+        if jobs < 1:
+            raise ValueError("jobs must be >= 1")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if batch_files < 1:
+            raise ValueError("batch_files must be >= 1")
+
+        self.reviewer = reviewer
+        self.jobs = jobs
+        self.max_in_flight = max_in_flight or jobs
+        self.batch_files = batch_files
+        self.batch_tokens = batch_tokens
+
+    def run(
+        self,
+        files: list[Path],
+        severity: str = "medium",
+        on_complete: Optional[Callable[[ReviewResult], None]] = None,
+        on_issue: Optional[Callable[[Path, Issue], None]] = None,
+    ) -> list[ReviewResult]:
+        """ファイル群をレビュー
+
+        Args:
+            files: レビュー対象ファイル
+            severity: 重要度フィルタ (low/medium/high)
+            on_complete: 1ファイル完了ごとに呼ばれるコールバック
+            on_issue: 問題を検出するたびに呼ばれるコールバック
+                （指定時はストリーミングでレビュー。ワーカースレッドから
+                呼ばれる）
+
+        Returns:
+            list[ReviewResult]: filesと同じ順序のレビュー結果
+        """
+        if not files:
+            return []
+
+        # flake8/mypyはファイルごとに起動せず1回にまとめる
+        if len(files) > 1:
+            self.reviewer.prefetch_static_analysis(files)
+
+        groups = self._plan_groups(files)
+        ordered: list[Optional[ReviewResult]] = [None] * len(files)
+
+        def collect(group: list[int], results: list[ReviewResult]) -> None:
+            for index, result in zip(group, results):
+                ordered[index] = result
+                if on_complete:
+                    on_complete(result)
+
+        if self.jobs == 1:
+            for group in groups:
+                collect(group, self._review_group(
+                    [files[i] for i in group], severity, on_issue
+                ))
+            return [r for r in ordered if r is not None]
+
+        previous_slots = self.reviewer.llm_slots
+        self.reviewer.llm_slots = threading.BoundedSemaphore(
+            self.max_in_flight
+        )
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(self.jobs, len(groups)),
+                thread_name_prefix="devbuddy-review",
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        self._review_group,
+                        [files[i] for i in group],
+                        severity,
+                        on_issue,
+                    ): group
+                    for group in groups
+                }
+                for future in as_completed(futures):
+                    collect(futures[future], future.result())
+        finally:
+            self.reviewer.llm_slots = previous_slots
+
+        return [r for r in ordered if r is not None]
+
+    def _plan_groups(self, files: list[Path]) -> list[list[int]]:
+        """レビュー単位（filesのインデックスのグループ）を決める
+
+        予算以下の小さなPythonファイルはまとめ、それ以外は1ファイルずつ。
+        """
+        if self.batch_files < 2:
+            return [[i] for i in range(len(files))]
+
+        small: list[int] = []
+        sizes: list[int] = []
+        groups: list[list[int]] = []
+        for index, file_path in enumerate(files):
+            try:
+                # 読み込みはレビュー時に行うため、サイズから概算
+                size: Optional[int] = file_path.stat().st_size // 4 + 1
+            except OSError:
+                size = None
+            if (
+                file_path.suffix == ".py"
+                and size is not None
+                and size <= self.batch_tokens
+            ):
+                small.append(index)
+                sizes.append(size)
+            else:
+                groups.append([index])
+
+        for batch in pack_batches(sizes, self.batch_files, self.batch_tokens):
+            groups.append([small[i] for i in batch])
+        groups.sort(key=lambda group: group[0])
+        return groups
+
+    def _review_group(
+        self,
+        file_paths: list[Path],
+        severity: str,
+        on_issue: Optional[Callable[[Path, Issue], None]] = None,
+    ) -> list[ReviewResult]:
+        """1グループをレビュー（例外は失敗結果に変換）"""
+        if len(file_paths) == 1:
+            return [self._review_one(file_paths[0], severity, on_issue)]
+
+        try:
+            results = self.reviewer.review_batch(file_paths, severity)
+        except Exception as e:
+            return [
+                ReviewResult(file_path=p, success=False, error=str(e))
+                for p in file_paths
+            ]
+        if on_issue is not None:
+            for result in results:
+                for issue in result.issues:
+                    on_issue(result.file_path, issue)
+        return results
+
+    def _review_one(
+        self,
+        file_path: Path,
+        severity: str,
+        on_issue: Optional[Callable[[Path, Issue], None]] = None,
+    ) -> ReviewResult:
+        """1ファイルをレビュー（例外は失敗結果に変換）"""
+        try:
+            if on_issue is not None:
+                return self.reviewer.review_file_streaming(
+                    file_path,
+                    on_issue=lambda issue: on_issue(file_path, issue),
+                    severity=severity,
+                )
+            return self.reviewer.review_file(file_path, severity=severity)
+        except Exception as e:
+            return ReviewResult(
+                file_path=file_path,
+                success=False,
+                error=str(e),
+            )
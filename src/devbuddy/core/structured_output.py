@@ -0,0 +1,188 @@
+"""
+StructuredOutput - JSON形式のレビュー応答の解析
+
+構造化出力モードではLLMに
+`{"issues": [{"level": ..., "line": ..., "message": ..., "suggestion": ...}]}`
+の形式で回答させる。まず全体をjson.loadsで解析し、失敗した場合
+（出力が途中で切れた、前後に説明文が付いた等）は配列内の完成した
+オブジェクトだけを1件ずつ取り出す。
+"""
+
+import json
+import re
+from typing import Any, Callable, Optional
+
+from devbuddy.core.models import Issue
+
+# 応答に含まれるレベル
+ISSUE_LEVELS = ("bug", "warning", "style", "info")
+
+_DECODER = json.JSONDecoder()
+_ISSUES_KEY = re.compile(r'"issues"\s*:\s*\[')
+_FENCE = re.compile(r"^```(?:json)?\s*\n?(.*?)\n?```\s*$", re.DOTALL)
+
+
+def issue_from_dict(item: Any) -> Optional[Issue]:
+    """JSONの1要素をIssueに変換（必須項目が欠けていればNone）"""
+    if not isinstance(item, dict):
+        return None
+
+    level = str(item.get("level", "")).strip().lower()
+    message = item.get("message")
+    try:
+        line = int(item["line"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if level not in ISSUE_LEVELS or not isinstance(message, str):
+        return None
+
+    suggestion = item.get("suggestion")
+    if not isinstance(suggestion, str) or not suggestion.strip():
+        suggestion = None
+    return Issue(
+        level=level,
+        line=max(1, line),
+        message=message.strip(),
+        suggestion=suggestion.strip() if suggestion else None,
+    )
+
+
+def scan_issue_objects(text: str, pos: int) -> tuple[list[Any], int, bool]:
+    """配列内の完成したオブジェクトをposから順に取り出す
+
+    Args:
+        text: 応答テキスト
+        pos: 配列の要素の開始位置（`[` の直後）
+
+    Returns:
+        tuple[list, int, bool]: (取り出した要素, 次の走査開始位置,
+        配列の終わり `]` に達したか)
+    """
+    items: list[Any] = []
+    length = len(text)
+    while True:
+        while pos < length and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= length:
+            return items, pos, False
+        if text[pos] == "]":
+            return items, pos + 1, True
+        try:
+            item, end = _DECODER.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            # 途中で切れた要素（続きを待つ）か壊れた要素
+            return items, pos, False
+        items.append(item)
+        pos = end
+
+
+def find_issues_array(text: str) -> Optional[int]:
+    """issues配列の要素の開始位置（見つからなければNone）"""
+    match = _ISSUES_KEY.search(text)
+    if match is not None:
+        return match.end()
+    # issuesキーの無い配列のみの応答（"[BUG] Line ..." のテキスト形式は除く）
+    stripped = text.lstrip()
+    if stripped.startswith("[") and stripped[1:].lstrip()[:1] in ("{", "]"):
+        return len(text) - len(stripped) + 1
+    return None
+
+
+def parse_json_issues(response: str) -> Optional[list[Issue]]:
+    """JSON形式の応答をIssueリストに変換
+
+    Returns:
+        Optional[list[Issue]]: 応答にJSONの問題リストが無ければNone
+        （呼び出し元でテキスト形式として解析する）
+    """
+    items = parse_json_items(response)
+    if items is None:
+        return None
+
+    issues = []
+    for item in items:
+        issue = issue_from_dict(item)
+        if issue is not None:
+            issues.append(issue)
+    return issues
+
+
+def parse_json_items(response: str) -> Optional[list[Any]]:
+    """JSON形式の応答からissues配列の要素を取り出す（変換前の値）
+
+    Returns:
+        Optional[list]: 応答にJSONの問題リストが無ければNone
+    """
+    text = response.strip()
+    fenced = _FENCE.match(text)
+    if fenced is not None:
+        text = fenced.group(1).strip()
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = None
+
+    if isinstance(data, dict) and isinstance(data.get("issues"), list):
+        items = data["issues"]
+    elif isinstance(data, list):
+        items = data
+    else:
+        # 途中で切れた・前後に文章が付いた応答から完成した要素を回収
+        start = find_issues_array(text)
+        if start is None:
+            return None
+        items, _, _ = scan_issue_objects(text, start)
+    return list(items)
+
+
+class JsonIssueStreamParser:
+    """JSON形式のストリーミング出力を逐次解析するパーサー
+
+    IssueStreamParserと同じインターフェースで、issues配列の要素が
+    1件完成するごとにIssueを返す。
+    """
+
+    def __init__(
+        self,
+        fallback: Optional[Callable[[str], list[Issue]]] = None,
+    ) -> None:
+        """
+        Args:
+            fallback: 応答にJSONが無かった場合に全文を解析する関数
+                （指示に従わずテキスト形式で回答された場合）
+        """
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self._done = False
+        self._fallback = fallback
+
+    def feed(self, chunk: str) -> list[Issue]:
+        """断片を追加し、完成した要素のIssueを返す"""
+        self._buffer += chunk
+        if self._done:
+            return []
+        if self._pos is None:
+            self._pos = find_issues_array(self._buffer)
+            if self._pos is None:
+                return []
+
+        items, self._pos, self._done = scan_issue_objects(
+            self._buffer, self._pos
+        )
+        issues = []
+        for item in items:
+            issue = issue_from_dict(item)
+            if issue is not None:
+                issues.append(issue)
+        return issues
+
+    def close(self) -> list[Issue]:
+        """受信終了時の残りのIssueを返す
+
+        途中で切れた要素は捨てる。JSONが見つからなかった応答は
+        fallbackで全文を解析する。
+        """
+        if self._pos is None and self._fallback is not None:
+            return self._fallback(self._buffer)
+        return []
@@ -0,0 +1,249 @@
+"""
+CatFile - 常駐する `git cat-file --batch` によるオブジェクトの読み出し
+
+ファイルごとに `git show` を起動する代わりに、1つの
+`git cat-file --batch` プロセスに要求を送ってblobを読む。
+複数の要求はまとめて書き込み（パイプライン化）、読み出した内容は
+バイト数上限付きのLRUに保持する。
+"""
+
+import re
+import subprocess
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Optional
+
+# LRUに保持するblobの合計バイト数の上限
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# 終了時にプロセスの終了を待つ秒数
+_SHUTDOWN_TIMEOUT = 5.0
+
+# 内容が変わらない指定（オブジェクトIDそのもの、または `<ID>:<パス>`）
+_IMMUTABLE_SPEC = re.compile(r"^(?:[0-9a-f]{40}|[0-9a-f]{64})(?::.*)?$")
+
+
+@dataclass
+class GitObject:
+    """読み出したオブジェクト"""
+
+    oid: str
+    type: str  # blob, tree, commit, tag
+    data: bytes
+
+    @property
+    def size(self) -> int:
+        """内容のバイト数"""
+        return len(self.data)
+
+
+class BlobCache:
+    """合計バイト数で上限を設けたLRU"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, GitObject]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[GitObject]:
+        """キャッシュを参照（ヒットしたら最近使用に移動）"""
+        obj = self._entries.get(key)
+        if obj is not None:
+            self._entries.move_to_end(key)
+        return obj
+
+    def put(self, key: str, obj: GitObject) -> None:
+        """キャッシュに追加し、上限を超えた分を古い順に捨てる
+
+        上限より大きいオブジェクトは保持しない。
+        """
+        if obj.size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old.size
+        self._entries[key] = obj
+        self.size += obj.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+
+def _stop_process(process: "subprocess.Popen[bytes]") -> None:
+    """標準入力を閉じて終了を待ち、応答しなければ強制終了"""
+    for stream in (process.stdin, process.stdout):
+        if stream is not None:
+            try:
+                stream.close()
+            except OSError:
+                pass
+    try:
+        process.wait(timeout=_SHUTDOWN_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+class CatFileReader:
+    """`git cat-file --batch` プロセスを保持してオブジェクトを読む
+
+    プロセスは初回の読み出し時に起動し、close()まで使い続ける
+    （異常終了していれば次の読み出しで起動し直す）。
+    スレッドセーフで、要求はプロセス単位で直列化する。
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        max_cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ):
+        """
+        Args:
+            repo_path: リポジトリのパス
+            max_cache_bytes: LRUに保持するblobの合計バイト数の上限
+                （0でキャッシュしない）
+        """
+        self.repo_path = repo_path
+        self.cache = BlobCache(max_cache_bytes)
+        self.launches = 0  # プロセスを起動した回数
+        self._process: Optional["subprocess.Popen[bytes]"] = None
+        self._finalizer: Optional[weakref.finalize] = None
+        self._lock = threading.Lock()
+
+    def read(self, spec: str) -> Optional[GitObject]:
+        """オブジェクトを読む
+
+        Args:
+            spec: `<リビジョン>:<パス>` やオブジェクトID等の指定
+
+        Returns:
+            Optional[GitObject]: 存在しなければNone
+        """
+        return self.read_many([spec])[0]
+
+    def read_many(self, specs: list[str]) -> list[Optional[GitObject]]:
+        """複数のオブジェクトをまとめて読む
+
+        キャッシュに無い要求をすべて書き込んでから応答を順に読む。
+        書き込みは別スレッドで行い、応答でパイプが詰まっても
+        デッドロックしないようにする。
+
+        Returns:
+            list[Optional[GitObject]]: specsと同じ順序の結果
+        """
+        found: dict[str, Optional[GitObject]] = {}
+        requests: list[str] = []
+        with self._lock:
+            for spec in dict.fromkeys(specs):
+                if not spec or "\n" in spec:
+                    found[spec] = None
+                    continue
+                cached = self.cache.get(spec)
+                if cached is not None:
+                    found[spec] = cached
+                else:
+                    requests.append(spec)
+
+            if requests:
+                found.update(zip(requests, self._request(requests)))
+                for spec in requests:
+                    obj = found[spec]
+                    if obj is not None and _IMMUTABLE_SPEC.match(spec):
+                        self.cache.put(spec, obj)
+
+        return [found[spec] for spec in specs]
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """リビジョン（ブランチ名・HEAD~1等）をコミットIDに解決"""
+        obj = self.read(f"{rev}^{{commit}}")
+        return obj.oid if obj is not None else None
+
+    def close(self) -> None:
+        """プロセスを終了"""
+        with self._lock:
+            if self._finalizer is not None:
+                self._finalizer()
+            self._process = None
+            self._finalizer = None
+
+    def __enter__(self) -> "CatFileReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _request(self, specs: list[str]) -> list[Optional[GitObject]]:
+        """要求を送って応答を読む（ロック保持中に呼ぶ）"""
+        process = self._ensure_process()
+        assert process.stdin is not None and process.stdout is not None
+        payload = "".join(f"{spec}\n" for spec in specs).encode("utf-8")
+
+        writer = threading.Thread(
+            target=_write_requests,
+            args=(process.stdin, payload),
+            name="devbuddy-cat-file",
+            daemon=True,
+        )
+        writer.start()
+        try:
+            return [_read_object(process.stdout) for _ in specs]
+        except BaseException:
+            # 応答の途中で失敗したプロセスは使い回さない
+            if self._finalizer is not None:
+                self._finalizer()
+            self._process = None
+            raise
+        finally:
+            writer.join()
+
+    def _ensure_process(self) -> "subprocess.Popen[bytes]":
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+        if self._finalizer is not None:
+            self._finalizer()
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=self.repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        # close()されずに破棄された場合もプロセスを残さない
+        self._finalizer = weakref.finalize(self, _stop_process, self._process)
+        self.launches += 1
+        return self._process
+
+
+def _write_requests(stdin: IO[bytes], payload: bytes) -> None:
+    try:
+        stdin.write(payload)
+        stdin.flush()
+    except (OSError, ValueError):
+        # プロセスが終了している（読み出し側で異常終了として扱う）
+        pass
+
+
+def _read_object(stdout: IO[bytes]) -> Optional[GitObject]:
+    """1件分の応答を読む
+
+    応答は `<ID> <種類> <サイズ>\\n<内容>\\n`、存在しない場合は
+    `<指定> missing\\n`（曖昧な場合は ambiguous）。
+    """
+    header = stdout.readline()
+    if not header.endswith(b"\n"):
+        raise RuntimeError("git cat-file exited unexpectedly")
+    if header.endswith((b" missing\n", b" ambiguous\n")):
+        return None
+
+    oid, kind, size = header.decode("ascii").split()
+    data = stdout.read(int(size))
+    stdout.read(1)  # 内容の後の改行
+    if len(data) != int(size):
+        raise RuntimeError("git cat-file exited unexpectedly")
+    return GitObject(oid=oid, type=kind, data=data)
@@ -0,0 +1,242 @@
+"""
+Diff - unified diff形式の解析
+
+`git diff` の出力をファイルごと・ハンクごとに分解し、
+変更後（新側）の行番号で変更箇所を参照できるようにする。
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Union
+
+_HUNK_HEADER = re.compile(
+    r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@ ?(.*)$"
+)
+_DIFF_GIT = re.compile(r'^diff --git ("?a/.*"?) ("?b/.*"?)$')
+
+_NULL_PATH = "/dev/null"
+
+
+@dataclass
+class DiffHunk:
+    """1つのハンク（`@@ -a,b +c,d @@` 以降の行）"""
+
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    # `@@` の後ろに付く関数名などの文脈
+    section: str = ""
+    lines: list[str] = field(default_factory=list)
+    # 追加された行の新側の行番号
+    added_lines: list[int] = field(default_factory=list)
+    deletions: int = 0
+
+    @property
+    def insertions(self) -> int:
+        """追加行数"""
+        return len(self.added_lines)
+
+    @property
+    def changed_lines(self) -> list[int]:
+        """変更箇所の新側の行番号
+
+        削除のみのハンクは削除位置（直前の行）を返す。
+        """
+        if self.added_lines:
+            return list(self.added_lines)
+        return [max(1, self.new_start)]
+
+
+@dataclass
+class FileDiff:
+    """1ファイル分の差分"""
+
+    old_path: Optional[str]
+    new_path: Optional[str]
+    hunks: list[DiffHunk] = field(default_factory=list)
+    binary: bool = False
+
+    @property
+    def path(self) -> str:
+        """結果に表示するパス（削除されたファイルは旧パス）"""
+        return self.new_path or self.old_path or ""
+
+    @property
+    def is_new(self) -> bool:
+        """新規ファイルか"""
+        return self.old_path is None
+
+    @property
+    def is_deleted(self) -> bool:
+        """削除されたファイルか"""
+        return self.new_path is None
+
+    @property
+    def is_rename(self) -> bool:
+        """名前が変更されたファイルか"""
+        return (
+            self.old_path is not None
+            and self.new_path is not None
+            and self.old_path != self.new_path
+        )
+
+    @property
+    def insertions(self) -> int:
+        """追加行数"""
+        return sum(hunk.insertions for hunk in self.hunks)
+
+    @property
+    def deletions(self) -> int:
+        """削除行数"""
+        return sum(hunk.deletions for hunk in self.hunks)
+
+    @property
+    def changed_lines(self) -> list[int]:
+        """全ハンクの変更箇所の新側の行番号"""
+        return [
+            line for hunk in self.hunks for line in hunk.changed_lines
+        ]
+
+
+def unquote_path(path: str) -> str:
+    """gitが引用符で囲んだパス（非ASCII・制御文字を含む）を戻す"""
+    if not (len(path) >= 2 and path[0] == '"' and path[-1] == '"'):
+        return path
+    raw = bytearray()
+    body = path[1:-1]
+    escapes = {"n": b"\n", "t": b"\t", '"': b'"', "\\": b"\\",
+               "a": b"\a", "b": b"\b", "f": b"\f", "r": b"\r", "v": b"\v"}
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char != "\\" or i + 1 >= len(body):
+            raw.extend(char.encode("utf-8"))
+            i += 1
+        elif body[i + 1] in "01234567":
+            raw.append(int(body[i + 1:i + 4], 8) & 0xFF)
+            i += 4
+        else:
+            raw.extend(escapes.get(body[i + 1], body[i + 1].encode()))
+            i += 2
+    return raw.decode("utf-8", errors="replace")
+
+
+def _strip_prefix(path: str) -> Optional[str]:
+    """`a/` `b/` の接頭辞を除去（/dev/nullはNone）"""
+    path = unquote_path(path.rstrip("\t").split("\t")[0])
+    if path == _NULL_PATH:
+        return None
+    if path[:2] in ("a/", "b/"):
+        return path[2:]
+    return path
+
+
+def parse_unified_diff(
+    diff: Union[str, Iterable[str]],
+) -> Iterator[FileDiff]:
+    """unified diffをファイルごとに解析
+
+    行のイテラブルを渡すと1ファイル分ずつ読み進めるため、
+    diff全体を保持せずに処理できる。
+
+    Args:
+        diff: diffテキスト、または行のイテラブル
+
+    Yields:
+        FileDiff: ファイルごとの差分
+    """
+    lines = diff.splitlines() if isinstance(diff, str) else diff
+
+    current: Optional[FileDiff] = None
+    hunk: Optional[DiffHunk] = None
+    old_left = new_left = 0
+    new_line = 0
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+
+        if hunk is not None and (old_left > 0 or new_left > 0):
+            tag = line[:1]
+            if tag == "+":
+                hunk.added_lines.append(new_line)
+                new_line += 1
+                new_left -= 1
+            elif tag == "-":
+                hunk.deletions += 1
+                old_left -= 1
+            elif tag == " " or line == "":
+                new_line += 1
+                old_left -= 1
+                new_left -= 1
+            elif tag != "\\":
+                # 行数が合わない壊れたハンク: ヘッダとして読み直す
+                hunk = None
+            if hunk is not None:
+                hunk.lines.append(line)
+                continue
+        elif hunk is not None and line.startswith("\\"):
+            # "\ No newline at end of file"
+            hunk.lines.append(line)
+            continue
+
+        if line.startswith("diff --git "):
+            if current is not None:
+                yield current
+            current = _start_file(line)
+            hunk = None
+            continue
+
+        if current is None:
+            if not line.startswith("--- "):
+                continue
+            # `diff --git` 行の無いdiff（diff -u等）
+            current = FileDiff(old_path=None, new_path=None)
+
+        header = _HUNK_HEADER.match(line)
+        if header is not None:
+            old_start, old_count, new_start, new_count, section = (
+                header.groups()
+            )
+            hunk = DiffHunk(
+                old_start=int(old_start),
+                old_count=1 if old_count is None else int(old_count),
+                new_start=int(new_start),
+                new_count=1 if new_count is None else int(new_count),
+                section=section.strip(),
+            )
+            current.hunks.append(hunk)
+            old_left, new_left = hunk.old_count, hunk.new_count
+            new_line = hunk.new_start
+        elif line.startswith("--- "):
+            if current.hunks:
+                # `diff --git` 行の無いdiffの次のファイル
+                yield current
+                current = FileDiff(old_path=None, new_path=None)
+            current.old_path = _strip_prefix(line[4:])
+        elif line.startswith("+++ "):
+            current.new_path = _strip_prefix(line[4:])
+        elif line.startswith("new file mode"):
+            current.old_path = None
+        elif line.startswith("deleted file mode"):
+            current.new_path = None
+        elif line.startswith("rename from "):
+            current.old_path = unquote_path(line[len("rename from "):])
+        elif line.startswith("rename to "):
+            current.new_path = unquote_path(line[len("rename to "):])
+        elif line.startswith("Binary files ") or line == "GIT binary patch":
+            current.binary = True
+
+    if current is not None:
+        yield current
+
+
+def _start_file(line: str) -> FileDiff:
+    """`diff --git a/x b/y` 行からファイルの差分を開始"""
+    match = _DIFF_GIT.match(line)
+    if match is None:
+        return FileDiff(old_path=None, new_path=None)
+    return FileDiff(
+        old_path=_strip_prefix(match.group(1)),
+        new_path=_strip_prefix(match.group(2)),
+    )
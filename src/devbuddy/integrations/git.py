@@ -4,10 +4,21 @@ GitOperations - Git操作
 ローカルGitリポジトリとの連携を担当。
 """
 
+import itertools
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import IO, Iterator, Optional
+
+from devbuddy.integrations.cat_file import DEFAULT_CACHE_BYTES, CatFileReader
+from devbuddy.integrations.diff import (
+    FileDiff,
+    parse_unified_diff,
+    unquote_path,
+)
+
+# 差分の出力を読むブロックサイズ
+_READ_SIZE = 64 * 1024
 
 
 @dataclass
@@ -20,6 +31,91 @@ class DiffInfo:
     deletions: int
 
 
+@dataclass
+class _NumStat:
+    """`git diff --numstat -z` の1レコード"""
+
+    insertions: Optional[int]  # バイナリはNone
+    deletions: Optional[int]
+    path: str
+    old_path: Optional[str] = None  # 名前変更時の旧パス
+
+    def apply(self, file_diff: FileDiff) -> None:
+        """パッチから解析した差分にバイナリ判定と正確なパスを反映"""
+        file_diff.binary = file_diff.binary or self.insertions is None
+        if self.old_path is not None:
+            file_diff.old_path = self.old_path
+            file_diff.new_path = self.path
+            return
+        # 引用符付きのヘッダより-zの生のパスを優先
+        if file_diff.old_path is not None:
+            file_diff.old_path = self.path
+        if file_diff.new_path is not None:
+            file_diff.new_path = self.path
+
+
+def _parse_count(value: str) -> Optional[int]:
+    return None if value == "-" else int(value)
+
+
+def _parse_numstat(tokens: list[str]) -> list[_NumStat]:
+    """NUL区切りのnumstatを解析
+
+    名前変更は `追加\t削除\t` の後に旧パス・新パスが別の
+    トークンとして続く。
+    """
+    stats: list[_NumStat] = []
+    tokens_iter = iter(tokens)
+    for token in tokens_iter:
+        fields = token.split("\t", 2)
+        if len(fields) != 3:
+            continue
+        added, deleted, path = fields
+        old_path = None
+        if not path:
+            old_path = next(tokens_iter, "")
+            path = next(tokens_iter, "")
+        stats.append(_NumStat(
+            insertions=_parse_count(added),
+            deletions=_parse_count(deleted),
+            path=path,
+            old_path=old_path,
+        ))
+    return stats
+
+
+def _read_numstat(stream: IO[bytes]) -> tuple[list[_NumStat], list[bytes]]:
+    """出力先頭のnumstat部分を読み、続くパッチの読み出し済みの行を返す
+
+    Returns:
+        tuple[list[_NumStat], list[bytes]]: (numstat,
+        パッチの先頭の行。最後の行は改行まで読み足す)
+    """
+    buffer = b""
+    while True:
+        block = stream.read1(_READ_SIZE)  # type: ignore[attr-defined]
+        if not block:
+            # パッチの無いdiff（変更なし・モード変更のみ等）
+            return _parse_numstat(_decode(buffer).split("\0")), []
+        start = max(0, len(buffer) - 1)
+        buffer += block
+        end = buffer.find(b"\0\0", start)
+        if end != -1:
+            break
+
+    numstat, rest = buffer[:end], buffer[end + 2:]
+    if rest and not rest.endswith(b"\n"):
+        rest += stream.readline()
+    return (
+        _parse_numstat(_decode(numstat).split("\0")),
+        rest.splitlines(keepends=True),
+    )
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
 @dataclass
 class CommitInfo:
     """コミット情報"""
@@ -31,14 +127,40 @@ class CommitInfo:
 
 
 class GitOperations:
-    """Git操作クラス"""
+    """Git操作クラス
 
-    def __init__(self, repo_path: Optional[Path] = None):
+    ファイル内容の読み出しには常駐する `git cat-file --batch`
+    プロセスを使う。使い終わったらclose()するか、with文で使う。
+    """
+
+    def __init__(
+        self,
+        repo_path: Optional[Path] = None,
+        max_cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ):
+        """
+        Args:
+            repo_path: リポジトリのパス（省略時はカレントディレクトリ）
+            max_cache_bytes: 読み出したファイル内容を保持する
+                LRUの合計バイト数の上限
+        """
         self.repo_path = repo_path or Path.cwd()
 
         if not self._is_git_repo():
             raise ValueError(f"Not a git repository: {self.repo_path}")
 
+        self.objects = CatFileReader(self.repo_path, max_cache_bytes)
+
+    def close(self) -> None:
+        """cat-fileプロセスを終了"""
+        self.objects.close()
+
+    def __enter__(self) -> "GitOperations":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     def _is_git_repo(self) -> bool:
         """Gitリポジトリかどうかを確認"""
         git_dir = self.repo_path / ".git"
@@ -62,73 +184,142 @@ class GitOperations:
         self,
         staged: bool = False,
         commit: Optional[str] = None,
+        paths: Optional[list[str]] = None,
     ) -> DiffInfo:
         """diffを取得
 
         Args:
             staged: ステージ済み変更のみ
             commit: 特定コミットとの比較
+            paths: 対象を限定するパス（リポジトリルートからの相対）
 
         Returns:
             DiffInfo: diff情報
         """
-        args = ["diff"]
-        if staged:
-            args.append("--cached")
-        if commit:
-            args.append(commit)
-
-        result = self._run_git(args)
-        content = result.stdout
-
-        # 統計情報を取得
-        stat_args = args + ["--stat"]
-        stat_result = self._run_git(stat_args)
-
-        # 統計をパース
-        lines = stat_result.stdout.strip().split("\n")
-        files_changed = 0
-        insertions = 0
-        deletions = 0
-
-        if lines:
-            last_line = lines[-1]
-            # "3 files changed, 10 insertions(+), 5 deletions(-)"
-            if "file" in last_line:
-                parts = last_line.split(",")
-                for part in parts:
-                    part = part.strip()
-                    if "file" in part:
-                        files_changed = int(part.split()[0])
-                    elif "insertion" in part:
-                        insertions = int(part.split()[0])
-                    elif "deletion" in part:
-                        deletions = int(part.split()[0])
+        # 統計とパッチを1回のgit diffで取得（-zで統計部分はNUL区切り、
+        # 空のレコードの後にパッチが続く）
+        result = self._run_git(self._diff_args(staged, commit, paths))
+        numstat, _, content = str(result.stdout).partition("\0\0")
+        stats = _parse_numstat(numstat.split("\0"))
 
         return DiffInfo(
             content=content,
-            files_changed=files_changed,
-            insertions=insertions,
-            deletions=deletions,
+            files_changed=len(stats),
+            insertions=sum(stat.insertions or 0 for stat in stats),
+            deletions=sum(stat.deletions or 0 for stat in stats),
         )
 
+    def iter_diff(
+        self,
+        staged: bool = False,
+        commit: Optional[str] = None,
+        paths: Optional[list[str]] = None,
+    ) -> Iterator[FileDiff]:
+        """diffをファイルごとに逐次取得
+
+        `git diff --numstat -p -z` を1回だけ実行し、出力を読み進めながら
+        ファイルごとの差分を返す。diff全体を保持しないため、巨大な
+        diffでもメモリ使用量はファイル1つ分程度に収まる。
+        途中で反復をやめるとgitプロセスを終了する。
+
+        Args:
+            staged: ステージ済み変更のみ
+            commit: 特定コミットとの比較
+            paths: 対象を限定するパス（リポジトリルートからの相対）
+
+        Yields:
+            FileDiff: ファイルごとの差分（バイナリ判定とパスは
+            numstatの値を使う）
+        """
+        process = subprocess.Popen(
+            ["git"] + self._diff_args(staged, commit, paths),
+            cwd=self.repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        assert process.stdout is not None
+        try:
+            stats, head = _read_numstat(process.stdout)
+            lines = (
+                line.decode("utf-8", errors="replace")
+                for line in itertools.chain(head, process.stdout)
+            )
+            for index, file_diff in enumerate(parse_unified_diff(lines)):
+                if index < len(stats):
+                    stats[index].apply(file_diff)
+                yield file_diff
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+    def _diff_args(
+        self,
+        staged: bool,
+        commit: Optional[str],
+        paths: Optional[list[str]],
+    ) -> list[str]:
+        """統計付きdiffのgit引数"""
+        args = ["diff", "--numstat", "-p", "-z", "--no-color"]
+        if staged:
+            args.append("--cached")
+        if commit:
+            args.append(commit)
+        if paths:
+            args.append("--")
+            args.extend(paths)
+        return args
+
     def get_changed_files(
         self,
         staged: bool = False,
         commit: Optional[str] = None,
+        detect_renames: bool = False,
+        exclude_deleted: bool = False,
+        paths: Optional[list[str]] = None,
     ) -> list[str]:
-        """変更されたファイルリストを取得"""
+        """変更されたファイルリストを取得
+
+        Args:
+            staged: ステージ済み変更のみ
+            commit: 特定コミットとの比較
+            detect_renames: 名前変更を検出する（変更後のパスだけを返す）
+            exclude_deleted: 削除されたファイルを除く
+            paths: 対象を限定するパス（リポジトリルートからの相対）
+        """
         args = ["diff", "--name-only"]
+        if detect_renames:
+            args.append("--find-renames")
+        if exclude_deleted:
+            args.append("--diff-filter=d")
         if staged:
             args.append("--cached")
         if commit:
             args.append(commit)
+        if paths:
+            args.append("--")
+            args.extend(paths)
 
         result = self._run_git(args)
         raw_files = result.stdout.strip().split("\n")
-        files = [f.strip() for f in raw_files if f.strip()]
+        files = [unquote_path(f.strip()) for f in raw_files if f.strip()]
         return files
 
+    def get_merge_base(
+        self,
+        ref: str,
+        other: str = "HEAD",
+    ) -> Optional[str]:
+        """2つのリビジョンの共通祖先のコミットIDを取得
+
+        refがotherの祖先（HEAD~3等）ならref自身のコミットIDになる。
+        """
+        result = self._run_git(["merge-base", ref, other])
+        if result.returncode != 0:
+            return None
+        return str(result.stdout).strip() or None
+
     def get_file_diff(
         self,
         file_path: str,
@@ -191,12 +382,45 @@ class GitOperations:
         file_path: str,
         commit: str = "HEAD",
     ) -> Optional[str]:
-        """特定コミット時点のファイル内容を取得"""
-        result = self._run_git(["show", f"{commit}:{file_path}"])
+        """特定コミット時点のファイル内容を取得
+
+        commitに空文字を指定するとインデックス（ステージ済み）の内容。
+        """
+        return self.get_files_at_commit([file_path], commit)[file_path]
+
+    def get_files_at_commit(
+        self,
+        file_paths: list[str],
+        commit: str = "HEAD",
+    ) -> dict[str, Optional[str]]:
+        """複数ファイルの特定コミット時点の内容をまとめて取得
+
+        リビジョンをコミットIDに解決してからcat-fileにまとめて
+        要求するため、同じコミットの内容は2回目以降LRUから返す。
 
-        if result.returncode == 0:
-            return str(result.stdout)
-        return None
+        Args:
+            file_paths: リポジトリルートからの相対パス
+            commit: リビジョン（空文字ならインデックス）
+
+        Returns:
+            dict[str, Optional[str]]: パス→内容（存在しなければNone）
+        """
+        rev: Optional[str] = commit
+        if commit:
+            rev = self.objects.resolve(commit)
+        if rev is None:
+            return {path: None for path in file_paths}
+
+        objects = self.objects.read_many(
+            [f"{rev}:{path}" for path in file_paths]
+        )
+        return {
+            path: (
+                obj.data.decode("utf-8", errors="replace")
+                if obj is not None and obj.type == "blob" else None
+            )
+            for path, obj in zip(file_paths, objects)
+        }
 
     def get_blame(self, file_path: str) -> list[dict]:
         """ファイルのblame情報を取得"""
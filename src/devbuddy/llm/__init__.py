@@ -1,6 +1,7 @@
 """DevBuddyAI LLM - LLM APIクライアント"""
 
+from devbuddy.llm.async_client import AsyncLLMClient
 from devbuddy.llm.client import LLMClient
 from devbuddy.llm.prompts import PromptTemplates
 
-__all__ = ["LLMClient", "PromptTemplates"]
+__all__ = ["LLMClient", "AsyncLLMClient", "PromptTemplates"]
@@ -0,0 +1,267 @@
+"""
+AsyncLLMClient - 非同期LLM APIクライアント
+
+asyncioイベントループ上でClaude/OpenAI APIを呼び出す。
+1つのイベントループで多数のリクエストを並行処理できる。
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+from devbuddy.llm.client import MockLLMClient, _ProviderSettings
+from devbuddy.llm.coalesce import prompt_key
+from devbuddy.llm.resilience import Resilience
+
+
+class BaseAsyncLLMClient(ABC):
+    """非同期LLMクライアント基底クラス"""
+
+    @abstractmethod
+    async def acomplete(self, prompt: str) -> str:
+        """プロンプトを送信してレスポンスを取得"""
+        pass
+
+    async def acomplete_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        """システムプロンプト付きで呼び出し
+
+        システムプロンプト非対応のクライアントでは連結して送る。
+        """
+        return await self.acomplete(f"{system_prompt}\n\n{user_prompt}")
+
+
+class AsyncLLMClient(_ProviderSettings, BaseAsyncLLMClient):
+    """非同期LLM APIクライアント
+
+    SDKの非同期クライアント（AsyncAnthropic/AsyncOpenAI）を使用。
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        timeout: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        resilience: Optional[Resilience] = None,
+    ):
+        """
+        Args:
+            api_key: APIキー（省略時は環境変数 DEVBUDDY_API_KEY）
+            model: モデル名（省略時は環境変数 DEVBUDDY_MODEL）
+            timeout: 1回の試行のタイムアウト秒
+            max_connections: HTTPコネクションプールの上限
+            resilience: 再試行・サーキットブレーカー設定
+        """
+        self._init_settings(
+            api_key, model, timeout, max_connections, resilience
+        )
+        # SDKクライアントを生成したイベントループ
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _loop_client(self, factory: Callable[..., Any]) -> Any:
+        """実行中のイベントループ用のSDKクライアントを取得
+
+        SDKクライアントのコネクションプールは生成したイベントループに
+        結び付くため、別のループ（2回目のasyncio.run等）から呼ばれたら
+        作り直す。以前のループは終了しているので古いプールは閉じずに
+        破棄する。イベントループは単一スレッドなのでロック不要。
+        """
+        loop = asyncio.get_running_loop()
+        if self._sdk_client is None or self._client_loop is not loop:
+            self._http_client = self._build_http_client(asynchronous=True)
+            self._sdk_client = factory(**self._sdk_kwargs())
+            self._client_loop = loop
+        return self._sdk_client
+
+    def _get_claude_client(self) -> Any:
+        """AsyncAnthropicクライアントを取得（遅延初期化）"""
+        try:
+            import anthropic
+        except ImportError:
+            raise ImportError(
+                "anthropic package is required. "
+                "Install with: pip install anthropic"
+            )
+
+        return self._loop_client(anthropic.AsyncAnthropic)
+
+    def _get_openai_client(self) -> Any:
+        """AsyncOpenAIクライアントを取得（遅延初期化）"""
+        try:
+            import openai
+        except ImportError:
+            raise ImportError(
+                "openai package is required. "
+                "Install with: pip install openai"
+            )
+
+        return self._loop_client(openai.AsyncOpenAI)
+
+    async def aclose(self) -> None:
+        """SDKクライアントとコネクションプールを解放
+
+        生成したイベントループ以外から呼ばれた場合は閉じずに破棄する。
+        """
+        if self._client_loop is asyncio.get_running_loop():
+            if self._sdk_client is not None:
+                await self._sdk_client.close()
+            if self._http_client is not None:
+                await self._http_client.aclose()
+        self._http_client = None
+        self._sdk_client = None
+        self._client_loop = None
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def acomplete(self, prompt: str) -> str:
+        """プロンプトを送信してレスポンスを取得
+
+        Args:
+            prompt: プロンプト文字列
+
+        Returns:
+            str: AIのレスポンス
+
+        同じモデル・プロンプトの呼び出しが実行中なら、その結果を共有する。
+        """
+        return await self._acall(None, prompt)
+
+    async def acomplete_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        """システムプロンプト付きで呼び出し
+
+        Args:
+            system_prompt: システムプロンプト
+            user_prompt: ユーザープロンプト
+
+        Returns:
+            str: AIのレスポンス
+        """
+        return await self._acall(system_prompt, user_prompt)
+
+    async def _acall(
+        self,
+        system_prompt: Optional[str],
+        user_prompt: str,
+    ) -> str:
+        """再試行と同時呼び出しの集約を通してAPIを呼び出し"""
+        if self._api_type == "claude":
+            call = self._acomplete_claude
+        else:
+            call = self._acomplete_openai
+        return await self.inflight.ado(
+            prompt_key(self.model, system_prompt, user_prompt),
+            self.resilience.acall, call, system_prompt, user_prompt,
+        )
+
+    async def _acomplete_claude(
+        self,
+        system_prompt: Optional[str],
+        user_prompt: str,
+    ) -> str:
+        """Claude APIを非同期で呼び出し"""
+        client = self._get_claude_client()
+
+        kwargs: dict[str, Any] = {}
+        if system_prompt is not None:
+            kwargs["system"] = self._claude_system(system_prompt)
+
+        message = await client.messages.create(
+            model=self.model,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            messages=[
+                {"role": "user", "content": user_prompt}
+            ],
+            **kwargs,
+        )
+        self._record_usage(getattr(message, "usage", None))
+
+        content = message.content[0]
+        if hasattr(content, "text"):
+            return str(content.text)
+        return ""
+
+    async def _acomplete_openai(
+        self,
+        system_prompt: Optional[str],
+        user_prompt: str,
+    ) -> str:
+        """OpenAI APIを非同期で呼び出し"""
+        client = self._get_openai_client()
+
+        messages = []
+        if system_prompt is not None:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": user_prompt})
+
+        response = await client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            messages=messages,
+        )
+        self._record_usage(getattr(response, "usage", None))
+
+        return response.choices[0].message.content or ""
+
+
+class MockAsyncLLMClient(MockLLMClient, BaseAsyncLLMClient):
+    """テスト用非同期モッククライアント
+
+    MockLLMClientと同じキーワードマッチでレスポンスを返す。
+    """
+
+    def __init__(
+        self,
+        responses: Optional[dict[str, str]] = None,
+        delay: float = 0.0,
+    ):
+        """
+        Args:
+            responses: キーワード→レスポンスの対応
+            delay: 疑似レイテンシ（秒）
+        """
+        super().__init__(responses)
+        self.delay = delay
+
+    async def acomplete(self, prompt: str) -> str:
+        """モックレスポンスを返す"""
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.complete(prompt)
+
+
+async def acomplete(client: Any, prompt: str) -> str:
+    """クライアントを問わず非同期に補完を実行
+
+    acompleteを持つクライアントはそのまま待機し、
+    同期クライアントはスレッドで実行する。
+    """
+    if isinstance(client, BaseAsyncLLMClient):
+        return await client.acomplete(prompt)
+    return str(await asyncio.to_thread(client.complete, prompt))
+
+
+async def acomplete_with_system(
+    client: Any,
+    system_prompt: str,
+    user_prompt: str,
+) -> str:
+    """acompleteのシステムプロンプト付き版"""
+    if isinstance(client, BaseAsyncLLMClient):
+        return await client.acomplete_with_system(system_prompt, user_prompt)
+    return str(await asyncio.to_thread(
+        client.complete_with_system, system_prompt, user_prompt
+    ))
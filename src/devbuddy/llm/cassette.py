@@ -0,0 +1,281 @@
+"""
+Cassette - LLM応答の記録と再生
+
+実際のLLMクライアントを包んでプロンプト→応答の組と応答時間を
+カセットファイル（gzip圧縮のJSON Lines）に記録し、ネットワークの無い
+環境でそのまま再生する。再生時は記録した応答時間を再現できるため、
+レビュー・テスト生成・バグ修正のスループットをオフラインで計測できる。
+
+プロンプトはハッシュのみを保存する（ソースコードはファイルに残らない）。
+"""
+
+import asyncio
+import gzip
+import json
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+from devbuddy.llm.async_client import BaseAsyncLLMClient
+from devbuddy.llm.client import BaseLLMClient
+from devbuddy.llm.coalesce import prompt_key
+
+# 再生時の応答時間の再現方法
+LATENCY_MODES = ("none", "recorded", "sampled")
+
+
+class CassetteMissError(LookupError):
+    """再生時にカセットに記録されていないプロンプトが送られた"""
+
+
+@dataclass
+class Interaction:
+    """記録した1回の呼び出し"""
+
+    key: str
+    response: str
+    latency: float
+    model: str = ""
+
+
+def interaction_key(system_prompt: Optional[str], prompt: str) -> str:
+    """プロンプトから記録のキーを生成（モデルには依存しない）"""
+    return prompt_key("", system_prompt, prompt)
+
+
+class Cassette:
+    """記録した呼び出しの集合
+
+    同じプロンプトが複数回記録されている場合は、再生時に
+    記録順に返す（最後まで返したら先頭に戻る）。
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: カセットファイル（Noneならメモリ上のみ）
+        """
+        self.path = path
+        self.model = ""  # 記録時のモデル
+        self._interactions: dict[str, list[Interaction]] = {}
+        self._cursor: dict[str, int] = {}
+        self._latencies: list[float] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        """カセットファイルを読み込む（存在しなければ空）"""
+        cassette = cls(path)
+        if not path.exists():
+            return cassette
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    cassette._add(Interaction(**json.loads(line)))
+        return cassette
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._latencies)
+
+    @property
+    def latencies(self) -> list[float]:
+        """記録した応答時間（秒）"""
+        with self._lock:
+            return list(self._latencies)
+
+    def record(self, interaction: Interaction) -> None:
+        """呼び出しを追加し、ファイルがあれば追記する
+
+        1件ごとに追記するため、記録中に中断しても記録済みの分は残る。
+        """
+        with self._lock:
+            self._add(interaction)
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(self.path, "at", encoding="utf-8") as f:
+                    f.write(json.dumps(
+                        asdict(interaction),
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    ) + "\n")
+
+    def lookup(self, key: str) -> Interaction:
+        """キーに対応する記録を返す
+
+        Raises:
+            CassetteMissError: 記録されていない場合
+        """
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                raise CassetteMissError(
+                    f"No recorded response for prompt {key[:12]}"
+                )
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = (index + 1) % len(recorded)
+            return recorded[index]
+
+    def _add(self, interaction: Interaction) -> None:
+        if not self.model:
+            self.model = interaction.model
+        self._interactions.setdefault(interaction.key, []).append(
+            interaction
+        )
+        self._latencies.append(interaction.latency)
+
+
+class CassetteLLMClient(BaseLLMClient, BaseAsyncLLMClient):
+    """カセットに記録・再生するLLMクライアント
+
+    clientを渡すと記録モードで、包んだクライアントを呼び出して
+    結果を記録する。clientを省略すると再生モードで、カセットの
+    内容だけで応答する（ネットワークに接続しない）。
+    """
+
+    def __init__(
+        self,
+        cassette: Union[Cassette, Path, str],
+        client: Any = None,
+        latency: str = "none",
+        latency_scale: float = 1.0,
+        model: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            cassette: カセットまたはカセットファイルのパス
+            client: 記録モードで呼び出すLLMクライアント
+            latency: 再生時の応答時間の再現方法
+                none: 待たない / recorded: その応答の記録時間だけ待つ /
+                sampled: 記録全体の分布から無作為に選んだ時間だけ待つ
+            latency_scale: 再現する応答時間の倍率
+            model: 名乗るモデル名（省略時は包んだクライアントか記録時のモデル）
+            clock: 応答時間の計測に使う時計
+            sleep: 同期版の待機関数（テスト用に差し替え可能）
+            rng: sampled用の乱数生成器
+        """
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"latency must be one of {LATENCY_MODES}")
+        if not isinstance(cassette, Cassette):
+            cassette = Cassette.load(Path(cassette))
+        self.cassette = cassette
+        self.client = client
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self._model = model
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    @property
+    def recording(self) -> bool:
+        """記録モードか"""
+        return self.client is not None
+
+    @property
+    def model(self) -> str:
+        """キャッシュキー等に使うモデル名"""
+        if self._model is not None:
+            return self._model
+        if self.client is not None:
+            return str(getattr(self.client, "model", ""))
+        return self.cassette.model or "cassette"
+
+    def complete(self, prompt: str) -> str:
+        """プロンプトを送信してレスポンスを取得"""
+        return self._call(None, prompt)
+
+    def complete_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        """システムプロンプト付きで呼び出し"""
+        return self._call(system_prompt, user_prompt)
+
+    def complete_stream_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> Iterator[str]:
+        """システムプロンプト付きで呼び出し、全文を1回で返す
+
+        記録・再生のキーをcomplete_with_systemと揃えるため、
+        プロンプトを連結せずに_callを通す。
+        """
+        yield self._call(system_prompt, user_prompt)
+
+    async def acomplete(self, prompt: str) -> str:
+        """非同期で呼び出し"""
+        return await self._acall(None, prompt)
+
+    async def acomplete_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        """システムプロンプト付きで非同期に呼び出し"""
+        return await self._acall(system_prompt, user_prompt)
+
+    def _call(self, system_prompt: Optional[str], prompt: str) -> str:
+        key = interaction_key(system_prompt, prompt)
+        if not self.recording:
+            interaction = self.cassette.lookup(key)
+            self._sleep(self._replay_delay(interaction))
+            return interaction.response
+
+        started = self._clock()
+        response = self._call_sync(system_prompt, prompt)
+        self._record(key, response, self._clock() - started)
+        return response
+
+    async def _acall(self, system_prompt: Optional[str], prompt: str) -> str:
+        key = interaction_key(system_prompt, prompt)
+        if not self.recording:
+            interaction = self.cassette.lookup(key)
+            await asyncio.sleep(self._replay_delay(interaction))
+            return interaction.response
+
+        started = self._clock()
+        if hasattr(self.client, "acomplete"):
+            if system_prompt is None:
+                response = await self.client.acomplete(prompt)
+            else:
+                response = await self.client.acomplete_with_system(
+                    system_prompt, prompt
+                )
+        else:
+            response = await asyncio.to_thread(
+                self._call_sync, system_prompt, prompt
+            )
+        self._record(key, str(response), self._clock() - started)
+        return str(response)
+
+    def _call_sync(self, system_prompt: Optional[str], prompt: str) -> str:
+        if system_prompt is None:
+            return str(self.client.complete(prompt))
+        return str(self.client.complete_with_system(system_prompt, prompt))
+
+    def _record(self, key: str, response: str, latency: float) -> None:
+        self.cassette.record(Interaction(
+            key=key,
+            response=response,
+            latency=round(latency, 4),
+            model=self.model,
+        ))
+
+    def _replay_delay(self, interaction: Interaction) -> float:
+        """再生時に待つ秒数"""
+        if self.latency == "recorded":
+            delay = interaction.latency
+        elif self.latency == "sampled":
+            delay = self._rng.choice(self.cassette.latencies)
+        else:
+            return 0.0
+        return max(0.0, delay * self.latency_scale)
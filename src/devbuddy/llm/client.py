@@ -5,10 +5,14 @@ Claude/OpenAI APIとの通信を担当。
 """
 
 import os
+import threading
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
 from abc import ABC, abstractmethod
 
+from devbuddy.llm.coalesce import SingleFlight, prompt_key
+from devbuddy.llm.resilience import CircuitBreaker, Resilience
+
 
 @dataclass
 class LLMConfig:
@@ -19,6 +23,34 @@ class LLMConfig:
     max_tokens: int = 4096
     temperature: float = 0.3
     timeout: int = 60
+    max_connections: int = 10
+    # システムプロンプトをプロバイダ側でキャッシュさせる（Claudeのみ明示指定）
+    prompt_caching: bool = True
+
+
+@dataclass
+class TokenUsage:
+    """プロバイダが報告したトークン使用量の累計"""
+
+    requests: int = 0
+    input_tokens: int = 0  # キャッシュを使わずに処理された入力
+    cache_write_tokens: int = 0  # キャッシュに書き込まれた入力（Claude）
+    cache_read_tokens: int = 0  # キャッシュから読まれた入力
+    output_tokens: int = 0
+
+    @property
+    def total_input_tokens(self) -> int:
+        """入力トークンの合計"""
+        return (
+            self.input_tokens + self.cache_write_tokens
+            + self.cache_read_tokens
+        )
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """入力トークンのうちキャッシュから読まれた割合"""
+        total = self.total_input_tokens
+        return self.cache_read_tokens / total if total else 0.0
 
 
 class BaseLLMClient(ABC):
@@ -29,18 +61,45 @@ class BaseLLMClient(ABC):
         """プロンプトを送信してレスポンスを取得"""
         pass
 
+    def complete_stream(self, prompt: str) -> Iterator[str]:
+        """レスポンスを断片ごとに返す
 
-class LLMClient(BaseLLMClient):
-    """LLM APIクライアント
+        ストリーミング非対応のクライアントでは全文を1回で返す。
+        """
+        yield self.complete(prompt)
 
-    Claude APIまたはOpenAI APIをサポート。
-    """
+    def complete_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        """システムプロンプト付きで呼び出し
 
-    def __init__(
+        システムプロンプト非対応のクライアントでは連結して送る。
+        """
+        return self.complete(f"{system_prompt}\n\n{user_prompt}")
+
+    def complete_stream_with_system(
         self,
-        api_key: Optional[str] = None,
-        model: Optional[str] = None,
-    ):
+        system_prompt: str,
+        user_prompt: str,
+    ) -> Iterator[str]:
+        """システムプロンプト付きでレスポンスを断片ごとに返す"""
+        yield from self.complete_stream(f"{system_prompt}\n\n{user_prompt}")
+
+
+class _ProviderSettings:
+    """同期/非同期クライアント共通の設定処理"""
+
+    def _init_settings(
+        self,
+        api_key: Optional[str],
+        model: Optional[str],
+        timeout: Optional[int],
+        max_connections: Optional[int],
+        resilience: Optional[Resilience] = None,
+    ) -> None:
+        """APIキー・モデル・接続設定を初期化"""
         self.api_key = api_key or os.environ.get("DEVBUDDY_API_KEY", "")
         default_model = "claude-3-opus-20240229"
         self.model = model or os.environ.get("DEVBUDDY_MODEL", default_model)
@@ -52,10 +111,28 @@ class LLMClient(BaseLLMClient):
             api_key=self.api_key,
             model=self.model,
         )
+        if timeout is not None:
+            self.config.timeout = timeout
+        if max_connections is not None:
+            self.config.max_connections = max_connections
 
         # APIタイプを判定
         self._api_type = self._detect_api_type()
 
+        # 再試行とサーキットブレーカー（SDK自身の再試行は無効化する）
+        self.resilience = resilience or Resilience(breaker=CircuitBreaker())
+
+        # 同一プロンプトの同時呼び出しは1回のリクエストにまとめる
+        self.inflight = SingleFlight()
+
+        # プロバイダが報告したトークン使用量（キャッシュ読み書きの内訳付き）
+        self.usage = TokenUsage()
+        self._usage_lock = threading.Lock()
+
+        # SDKクライアントは初回呼び出し時に1度だけ生成して再利用
+        self._sdk_client: Any = None
+        self._http_client: Any = None
+
     def _detect_api_type(self) -> str:
         """APIキーからAPIタイプを判定"""
         if self.api_key.startswith("sk-ant-"):
@@ -66,22 +143,115 @@ class LLMClient(BaseLLMClient):
             # デフォルトはClaudeとして扱う
             return "claude"
 
-    def complete(self, prompt: str) -> str:
-        """プロンプトを送信してレスポンスを取得
+    def _build_http_client(self, asynchronous: bool = False) -> Any:
+        """キープアライブ付きの共有HTTPクライアントを生成
 
-        Args:
-            prompt: プロンプト文字列
+        httpxはanthropic/openai両SDKの依存パッケージなので、
+        SDKのインポート後に呼ぶ。
+        """
+        import httpx
 
-        Returns:
-            str: AIのレスポンス
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_connections,
+        )
+        if asynchronous:
+            return httpx.AsyncClient(
+                limits=limits,
+                timeout=self.config.timeout,
+                follow_redirects=True,
+            )
+        return httpx.Client(
+            limits=limits,
+            timeout=self.config.timeout,
+            follow_redirects=True,
+        )
+
+    def _claude_system(self, system_prompt: str) -> Any:
+        """Claude APIのsystem引数
+
+        プロンプトキャッシュが有効ならcache_control付きのブロックにする
+        （システムプロンプトが最小長に満たない場合はプロバイダが無視する）。
         """
+        if not self.config.prompt_caching:
+            return system_prompt
+        return [{
+            "type": "text",
+            "text": system_prompt,
+            "cache_control": {"type": "ephemeral"},
+        }]
+
+    def _record_usage(self, usage: Any) -> None:
+        """レスポンスのusageをトークン使用量に加算"""
+        if usage is None:
+            return
+
+        def count(obj: Any, name: str) -> int:
+            value = getattr(obj, name, None)
+            return value if isinstance(value, int) else 0
+
         if self._api_type == "claude":
-            return self._complete_claude(prompt)
+            uncached = count(usage, "input_tokens")
+            written = count(usage, "cache_creation_input_tokens")
+            read = count(usage, "cache_read_input_tokens")
+            output = count(usage, "output_tokens")
         else:
-            return self._complete_openai(prompt)
+            # OpenAIは一定長以上のプレフィックスを自動でキャッシュする
+            details = getattr(usage, "prompt_tokens_details", None)
+            read = count(details, "cached_tokens")
+            uncached = max(0, count(usage, "prompt_tokens") - read)
+            written = 0
+            output = count(usage, "completion_tokens")
+
+        with self._usage_lock:
+            self.usage.requests += 1
+            self.usage.input_tokens += uncached
+            self.usage.cache_write_tokens += written
+            self.usage.cache_read_tokens += read
+            self.usage.output_tokens += output
+
+    def _sdk_kwargs(self) -> dict[str, Any]:
+        """SDKクライアント生成時の引数"""
+        kwargs: dict[str, Any] = {
+            "api_key": self.api_key,
+            "timeout": self.config.timeout,
+            "max_retries": 0,
+        }
+        if self._http_client is not None:
+            kwargs["http_client"] = self._http_client
+        return kwargs
+
+
+class LLMClient(_ProviderSettings, BaseLLMClient):
+    """LLM APIクライアント
 
-    def _complete_claude(self, prompt: str) -> str:
-        """Claude APIを呼び出し"""
+    Claude APIまたはOpenAI APIをサポート。
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        timeout: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        resilience: Optional[Resilience] = None,
+    ):
+        """
+        Args:
+            api_key: APIキー（省略時は環境変数 DEVBUDDY_API_KEY）
+            model: モデル名（省略時は環境変数 DEVBUDDY_MODEL）
+            timeout: 1回の試行のタイムアウト秒
+            max_connections: HTTPコネクションプールの上限
+            resilience: 再試行・サーキットブレーカー設定
+                （デフォルト: 3回まで試行、5回連続失敗で30秒遮断）
+        """
+        self._init_settings(
+            api_key, model, timeout, max_connections, resilience
+        )
+        self._client_lock = threading.Lock()
+
+    def _get_claude_client(self) -> Any:
+        """Anthropic SDKクライアントを取得（遅延初期化）"""
         try:
             import anthropic
         except ImportError:
@@ -90,7 +260,172 @@ class LLMClient(BaseLLMClient):
                 "Install with: pip install anthropic"
             )
 
-        client = anthropic.Anthropic(api_key=self.api_key)
+        with self._client_lock:
+            if self._sdk_client is None:
+                self._http_client = self._build_http_client()
+                self._sdk_client = anthropic.Anthropic(**self._sdk_kwargs())
+            return self._sdk_client
+
+    def _get_openai_client(self) -> Any:
+        """OpenAI SDKクライアントを取得（遅延初期化）"""
+        try:
+            import openai
+        except ImportError:
+            raise ImportError(
+                "openai package is required. "
+                "Install with: pip install openai"
+            )
+
+        with self._client_lock:
+            if self._sdk_client is None:
+                self._http_client = self._build_http_client()
+                self._sdk_client = openai.OpenAI(**self._sdk_kwargs())
+            return self._sdk_client
+
+    def close(self) -> None:
+        """SDKクライアントとコネクションプールを解放"""
+        with self._client_lock:
+            if self._sdk_client is not None:
+                self._sdk_client.close()
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._sdk_client = None
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def complete(self, prompt: str) -> str:
+        """プロンプトを送信してレスポンスを取得
+
+        Args:
+            prompt: プロンプト文字列
+
+        Returns:
+            str: AIのレスポンス
+
+        Raises:
+            CircuitOpenError: プロバイダ障害でサーキットが開いている場合
+
+        同じモデル・プロンプトの呼び出しが実行中なら、その結果を共有する。
+        """
+        if self._api_type == "claude":
+            call = self._complete_claude
+        else:
+            call = self._complete_openai
+        return str(self.inflight.do(
+            prompt_key(self.model, None, prompt),
+            self.resilience.call, call, prompt,
+        ))
+
+    def complete_stream(self, prompt: str) -> Iterator[str]:
+        """プロンプトを送信してレスポンスをストリーミングで取得
+
+        Args:
+            prompt: プロンプト文字列
+
+        Yields:
+            str: 生成されたテキストの断片
+
+        最初の断片を受け取るまでの失敗は再試行する
+        （受信開始後の失敗は呼び出し元に送出）。
+        """
+        if self._api_type == "claude":
+            start = self._stream_claude
+        else:
+            start = self._stream_openai
+        yield from self._retry_stream(start, prompt)
+
+    def complete_stream_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> Iterator[str]:
+        """システムプロンプト付きでレスポンスをストリーミングで取得"""
+        if self._api_type == "claude":
+            start = self._stream_claude
+        else:
+            start = self._stream_openai
+        yield from self._retry_stream(start, user_prompt, system_prompt)
+
+    def _retry_stream(
+        self, start: Callable[..., Iterator[str]], *args: Any
+    ) -> Iterator[str]:
+        """最初の断片を受け取るまで再試行してストリームを返す"""
+        def open_stream() -> tuple[Optional[str], Iterator[str]]:
+            stream = start(*args)
+            return next(stream, None), stream
+
+        first, stream = self.resilience.call(open_stream)
+        if first is None:
+            return
+        yield first
+        yield from stream
+
+    def _stream_claude(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Claude APIをストリーミングで呼び出し"""
+        client = self._get_claude_client()
+
+        kwargs: dict[str, Any] = {}
+        if system_prompt is not None:
+            kwargs["system"] = self._claude_system(system_prompt)
+
+        with client.messages.stream(
+            model=self.model,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            **kwargs,
+        ) as stream:
+            for text in stream.text_stream:
+                yield str(text)
+            final = getattr(stream, "get_final_message", None)
+            if callable(final):
+                self._record_usage(getattr(final(), "usage", None))
+
+    def _stream_openai(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+    ) -> Iterator[str]:
+        """OpenAI APIをストリーミングで呼び出し"""
+        client = self._get_openai_client()
+
+        messages = []
+        if system_prompt is not None:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        stream = client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            messages=messages,
+            stream=True,
+            # 最後にusageだけのチャンク（choicesが空）を受け取る
+            stream_options={"include_usage": True},
+        )
+
+        for chunk in stream:
+            if not chunk.choices:
+                self._record_usage(getattr(chunk, "usage", None))
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    def _complete_claude(self, prompt: str) -> str:
+        """Claude APIを呼び出し"""
+        client = self._get_claude_client()
 
         message = client.messages.create(
             model=self.model,
@@ -100,6 +435,7 @@ class LLMClient(BaseLLMClient):
                 {"role": "user", "content": prompt}
             ],
         )
+        self._record_usage(getattr(message, "usage", None))
 
         content = message.content[0]
         if hasattr(content, "text"):
@@ -108,15 +444,7 @@ class LLMClient(BaseLLMClient):
 
     def _complete_openai(self, prompt: str) -> str:
         """OpenAI APIを呼び出し"""
-        try:
-            import openai
-        except ImportError:
-            raise ImportError(
-                "openai package is required. "
-                "Install with: pip install openai"
-            )
-
-        client = openai.OpenAI(api_key=self.api_key)
+        client = self._get_openai_client()
 
         response = client.chat.completions.create(
             model=self.model,
@@ -126,6 +454,7 @@ class LLMClient(BaseLLMClient):
                 {"role": "user", "content": prompt}
             ],
         )
+        self._record_usage(getattr(response, "usage", None))
 
         return response.choices[0].message.content or ""
 
@@ -144,13 +473,13 @@ class LLMClient(BaseLLMClient):
             str: AIのレスポンス
         """
         if self._api_type == "claude":
-            return self._complete_claude_with_system(
-                system_prompt, user_prompt
-            )
+            call = self._complete_claude_with_system
         else:
-            return self._complete_openai_with_system(
-                system_prompt, user_prompt
-            )
+            call = self._complete_openai_with_system
+        return str(self.inflight.do(
+            prompt_key(self.model, system_prompt, user_prompt),
+            self.resilience.call, call, system_prompt, user_prompt,
+        ))
 
     def _complete_claude_with_system(
         self,
@@ -158,22 +487,18 @@ class LLMClient(BaseLLMClient):
         user_prompt: str,
     ) -> str:
         """Claude APIをシステムプロンプト付きで呼び出し"""
-        try:
-            import anthropic
-        except ImportError:
-            raise ImportError("anthropic package is required")
-
-        client = anthropic.Anthropic(api_key=self.api_key)
+        client = self._get_claude_client()
 
         message = client.messages.create(
             model=self.model,
             max_tokens=self.config.max_tokens,
             temperature=self.config.temperature,
-            system=system_prompt,
+            system=self._claude_system(system_prompt),
             messages=[
                 {"role": "user", "content": user_prompt}
             ],
         )
+        self._record_usage(getattr(message, "usage", None))
 
         content = message.content[0]
         if hasattr(content, "text"):
@@ -186,12 +511,7 @@ class LLMClient(BaseLLMClient):
         user_prompt: str,
     ) -> str:
         """OpenAI APIをシステムプロンプト付きで呼び出し"""
-        try:
-            import openai
-        except ImportError:
-            raise ImportError("openai package is required")
-
-        client = openai.OpenAI(api_key=self.api_key)
+        client = self._get_openai_client()
 
         response = client.chat.completions.create(
             model=self.model,
@@ -202,6 +522,7 @@ class LLMClient(BaseLLMClient):
                 {"role": "user", "content": user_prompt},
             ],
         )
+        self._record_usage(getattr(response, "usage", None))
 
         return response.choices[0].message.content or ""
 
@@ -209,9 +530,14 @@ class LLMClient(BaseLLMClient):
 class MockLLMClient(BaseLLMClient):
     """テスト用モッククライアント"""
 
-    def __init__(self, responses: Optional[dict[str, str]] = None):
+    def __init__(
+        self,
+        responses: Optional[dict[str, str]] = None,
+        chunk_size: int = 16,
+    ):
         self.responses = responses or {}
         self.call_history: list[str] = []
+        self.chunk_size = chunk_size
 
     def complete(self, prompt: str) -> str:
         """モックレスポンスを返す"""
@@ -225,6 +551,12 @@ class MockLLMClient(BaseLLMClient):
         # デフォルトレスポンス
         return "[INFO] Line 1: Code looks good\n"
 
+    def complete_stream(self, prompt: str) -> Iterator[str]:
+        """モックレスポンスをchunk_size文字ずつ返す"""
+        response = self.complete(prompt)
+        for i in range(0, len(response), self.chunk_size):
+            yield response[i:i + self.chunk_size]
+
     def set_response(self, keyword: str, response: str) -> None:
         """レスポンスを設定"""
         self.responses[keyword] = response
@@ -0,0 +1,130 @@
+"""
+SingleFlight - 同一リクエストの同時実行の集約
+
+内容が同じファイル（ベンダリングされたコピーや生成コード）を並列に
+レビューすると、同じプロンプトが同時にプロバイダへ送られる。
+プロンプトとモデルのハッシュをキーに実行中の呼び出しを登録し、
+同じキーの呼び出しは先行する呼び出しの完了を待って結果を共有する。
+スレッドとasyncioタスクのどちらからの呼び出しにも対応する。
+"""
+
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def prompt_key(model: str, *parts: Optional[str]) -> str:
+    """モデルとプロンプトから集約キーを生成
+
+    各要素は長さ付きでハッシュするため、区切り位置の違う
+    組み合わせ（system+user と user のみ等）は別のキーになる。
+    """
+    digest = hashlib.sha256(model.encode("utf-8"))
+    for part in parts:
+        if part is None:
+            digest.update(b"-")
+            continue
+        data = part.encode("utf-8")
+        digest.update(f"{len(data)}:".encode("ascii"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class _Call:
+    """実行中の同期呼び出し"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """同じキーの同時呼び出しを1回の実行にまとめる
+
+    完了した結果は保持しない（キャッシュはReviewCacheの役割）。
+    失敗も待っていた全員に共有され、次の呼び出しは再実行される。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._tasks: dict[tuple[int, str], "asyncio.Future[Any]"] = {}
+        self.executed = 0  # 実際に実行した回数
+        self.shared = 0  # 他の呼び出しの結果を共有した回数
+
+    def do(self, key: str, func: Callable[..., T], *args: Any) -> T:
+        """funcを実行する（同じキーが実行中ならその結果を待って返す）
+
+        Raises:
+            Exception: funcが送出した例外（待っていた呼び出しにも送出）
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[no-any-return]
+
+        try:
+            call.result = func(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result  # type: ignore[no-any-return]
+
+    async def ado(
+        self, key: str, func: Callable[..., Awaitable[T]], *args: Any
+    ) -> T:
+        """doの非同期版
+
+        実行は同じイベントループ内で共有する。待っている側が
+        キャンセルされても、共有中の呼び出しは中断しない。
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = asyncio.ensure_future(func(*args))
+                self._tasks[task_key] = task
+                self.executed += 1
+                task.add_done_callback(
+                    lambda t: self._release_task(task_key, t)
+                )
+            else:
+                self.shared += 1
+        return await asyncio.shield(task)  # type: ignore[no-any-return]
+
+    def _release_task(
+        self, task_key: tuple[int, str], task: "asyncio.Future[Any]"
+    ) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        # 待っている側が全員キャンセルされた場合も例外を回収しておく
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        """実行中の呼び出し数"""
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
@@ -13,20 +13,51 @@ if TYPE_CHECKING:
 class PromptTemplates:
     """プロンプトテンプレート集"""
 
+    # code_reviewの内容を変更したら更新する（レビューキャッシュのキーに使用）
+    CODE_REVIEW_VERSION = "2"
+    # batch_reviewの出力形式を変更したら更新する（同上）
+    BATCH_REVIEW_VERSION = "1"
+
     def code_review(
         self,
         code: str,
         language: str = "python",
         severity: str = "medium",
+        structured: bool = False,
+    ) -> str:
+        """コードレビュー用プロンプト（システム部とコード部を連結した1本）"""
+        system = self.code_review_system(language, severity, structured)
+        return f"{system}\n\n{self.code_review_user(code, language)}"
+
+    def code_review_system(
+        self,
+        language: str = "python",
+        severity: str = "medium",
+        structured: bool = False,
+        batch: bool = False,
     ) -> str:
-        """コードレビュー用プロンプト"""
+        """コードレビューの固定部分（システムプロンプト）
+
+        レビュー対象のコードを含まないため、同じ言語・重要度の
+        レビュー間で共通になり、プロバイダのプロンプトキャッシュが効く。
+
+        Args:
+            structured: Trueなら `[LEVEL] Line N:` 形式の代わりに
+                JSONで回答させる
+            batch: Trueなら複数ファイルのまとめレビュー用に、
+                各問題にファイル名を付けさせる
+        """
         severity_desc = {
             "low": "全ての問題（情報レベルも含む）",
             "medium": "バグ、警告、スタイル問題",
             "high": "バグと重大な警告のみ",
         }.get(severity, "バグ、警告、スタイル問題")
 
-        return f"""あなたは経験豊富なシニアエンジニアです。以下の{language}コードをレビューしてください。
+        target = (
+            f"複数の{language}ファイルをそれぞれ" if batch
+            else f"{language}コードを"
+        )
+        return f"""あなたは経験豊富なシニアエンジニアです。ユーザーが送る{target}レビューしてください。
 
 ## レビュー観点
 - バグ（論理エラー、null参照、ゼロ除算など）
@@ -35,7 +66,62 @@ class PromptTemplates:
 - コーディングスタイル（PEP8準拠、命名規則など）
 - ベストプラクティスからの逸脱
 
-## 出力形式
+{self._review_output_format(structured, batch)}
+
+## フィルタ条件
+{severity_desc}を報告してください。
+
+{self._no_issues_instruction(structured)}"""
+
+    def _review_output_format(self, structured: bool, batch: bool) -> str:
+        """コードレビューの出力形式の指示"""
+        if structured and batch:
+            return """## 出力形式
+以下の形式のJSONのみを出力してください（説明文やコードフェンスは不要）。
+fileには「=== File: ... ===」に書かれたファイル名をそのまま書きます：
+{"issues": [
+  {"file": "ファイル名", "level": "bug", "line": 12,
+   "message": "問題の説明", "suggestion": "改善提案"}
+]}
+
+levelは以下のいずれか:
+- bug: 明確なバグ
+- warning: 潜在的な問題
+- style: スタイル/可読性の問題
+- info: 情報/提案
+
+lineはそのファイル内の行番号（整数）、suggestionは省略可能です。"""
+
+        if structured:
+            return """## 出力形式
+以下の形式のJSONのみを出力してください（説明文やコードフェンスは不要）：
+{"issues": [
+  {"level": "bug", "line": 12, "message": "問題の説明",
+   "suggestion": "改善提案"}
+]}
+
+levelは以下のいずれか:
+- bug: 明確なバグ
+- warning: 潜在的な問題
+- style: スタイル/可読性の問題
+- info: 情報/提案
+
+lineはレビュー対象コード内の行番号（整数）、suggestionは省略可能です。"""
+
+        if batch:
+            return """## 出力形式
+各問題を以下の形式で報告してください。File には「=== File: ... ===」に
+書かれたファイル名をそのまま、Line にはそのファイル内の行番号を書きます：
+[LEVEL] File ファイル名 Line N: 問題の説明
+  Suggestion: 改善提案
+
+LEVELは以下のいずれか:
+- BUG: 明確なバグ
+- WARNING: 潜在的な問題
+- STYLE: スタイル/可読性の問題
+- INFO: 情報/提案"""
+
+        return """## 出力形式
 各問題を以下の形式で報告してください：
 [LEVEL] Line N: 問題の説明
   Suggestion: 改善提案
@@ -44,17 +130,51 @@ LEVELは以下のいずれか:
 - BUG: 明確なバグ
 - WARNING: 潜在的な問題
 - STYLE: スタイル/可読性の問題
-- INFO: 情報/提案
+- INFO: 情報/提案"""
 
-## フィルタ条件
-{severity_desc}を報告してください。
+    def _no_issues_instruction(self, structured: bool) -> str:
+        """問題が無い場合の回答の指示"""
+        if structured:
+            return '問題が見つからない場合は {"issues": []} と回答してください。'
+        return "問題が見つからない場合は「No issues found」と回答してください。"
 
-## レビュー対象コード
+    def code_review_user(self, code: str, language: str = "python") -> str:
+        """コードレビューの可変部分（レビュー対象コード）"""
+        return f"""## レビュー対象コード
 ```{language}
 {code}
 ```
+"""
+
+    def batch_review(
+        self,
+        files: list[tuple[str, str]],
+        language: str = "python",
+        severity: str = "medium",
+        structured: bool = False,
+    ) -> str:
+        """複数の小さなファイルをまとめてレビューするプロンプト（1本）
 
-問題が見つからない場合は「No issues found」と回答してください。
+        Args:
+            files: (ファイル名, コード) のリスト
+        """
+        system = self.code_review_system(
+            language, severity, structured, batch=True
+        )
+        return f"{system}\n\n{self.batch_review_user(files, language)}"
+
+    def batch_review_user(
+        self,
+        files: list[tuple[str, str]],
+        language: str = "python",
+    ) -> str:
+        """まとめレビューの可変部分（レビュー対象ファイル）"""
+        sections = "\n\n".join(
+            f"=== File: {name} ===\n```{language}\n{code}\n```"
+            for name, code in files
+        )
+        return f"""## レビュー対象ファイル（{len(files)}個）
+{sections}
 """
 
     def diff_review(self, diff: str) -> str:
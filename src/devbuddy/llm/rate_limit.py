@@ -0,0 +1,480 @@
+"""
+RateLimiter - LLM呼び出しのレート制御
+
+プロバイダのRPM（リクエスト/分）とTPM（トークン/分）をトークンバケットで
+守り、429や過負荷応答に応じて同時実行数をAIMD方式（成功で加算的に増加、
+過負荷で乗算的に減少）で調整する。retry-afterが返された場合は
+その時刻まで全リクエストの送信を止める。
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from devbuddy.llm.async_client import BaseAsyncLLMClient
+from devbuddy.llm.client import BaseLLMClient
+from devbuddy.llm.resilience import Resilience
+
+# 過負荷を示すHTTPステータス（429: レート制限, 503/529: 過負荷）
+OVERLOAD_STATUS_CODES = (429, 503, 529)
+
+# 過負荷による減少を1回とみなす期間（秒）
+_DECREASE_COOLDOWN = 1.0
+
+# 同時実行枠の空き待ちのポーリング間隔（非同期版、秒）
+_ASYNC_POLL_INTERVAL = 0.01
+
+
+class RateLimitError(Exception):
+    """プロバイダがレート制限・過負荷を返した"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_prompt_tokens(prompt: str) -> int:
+    """プロンプトのトークン数の概算（約4文字で1トークン）"""
+    return len(prompt) // 4 + 1
+
+
+def overload_retry_after(error: BaseException) -> Optional[float]:
+    """例外が過負荷応答ならretry-after秒（指定なしは0.0）を返す
+
+    RateLimitError、またはSDKの例外（status_codeが429/503/529）を
+    過負荷とみなす。過負荷でない例外はNone。
+    """
+    if isinstance(error, RateLimitError):
+        return error.retry_after or 0.0
+
+    status = getattr(error, "status_code", None)
+    if status not in OVERLOAD_STATUS_CODES:
+        return None
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class TokenBucket:
+    """連続補充型のトークンバケット
+
+    reserveは残量を先に差し引き（不足分は負の残高になる）、
+    送信してよいまでの待ち時間を返す。予約順に待ち時間が
+    伸びるため、待機中のリクエストは到着順に送信される。
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            per_minute: 1分あたりの補充量
+            capacity: バケット容量（デフォルト: per_minute）
+            clock: 単調増加の時計（テスト用に差し替え可能）
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be > 0")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """amount分を予約し、送信までの待ち時間（秒）を返す
+
+        容量を超える量は容量に丸める（永久に待たないように）。
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    @property
+    def available(self) -> float:
+        """現在の残量"""
+        with self._lock:
+            elapsed = self._clock() - self._updated
+            return min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+class AIMDController:
+    """AIMD方式の同時実行数制御
+
+    成功ごとに1/limitずつ（概ね1往復で+1）増やし、過負荷で
+    decrease_factor倍に減らす。同時に失敗したリクエストで何度も
+    減らさないよう、減少後_DECREASE_COOLDOWN秒は再減少しない。
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("require 1 <= min_limit <= initial <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self._limit = float(initial)
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """現在の同時実行数の上限"""
+        return int(self._limit)
+
+    def on_success(self) -> None:
+        """成功を記録（加算的増加）"""
+        with self._lock:
+            self._limit = min(
+                float(self.max_limit), self._limit + 1.0 / self._limit
+            )
+
+    def on_overload(self) -> bool:
+        """過負荷を記録（乗算的減少）
+
+        Returns:
+            bool: 上限を減らしたか（クールダウン中はFalse）
+        """
+        with self._lock:
+            now = self._clock()
+            if now - self._last_decrease < _DECREASE_COOLDOWN:
+                return False
+            self._last_decrease = now
+            self._limit = max(
+                float(self.min_limit), self._limit * self.decrease_factor
+            )
+            return True
+
+
+@dataclass
+class RateLimiterStats:
+    """レート制御の統計"""
+
+    queue_depth: int = 0  # 送信待ちのリクエスト数
+    in_flight: int = 0  # 送信中のリクエスト数
+    concurrency_limit: int = 0  # 現在の同時実行数の上限
+    requests: int = 0  # 送信したリクエスト数
+    overloads: int = 0  # 429・過負荷応答の数
+    total_wait: float = 0.0  # 送信待ちの合計時間（秒）
+    max_wait: float = 0.0  # 送信待ちの最大時間（秒）
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class RateLimiter:
+    """RPM/TPMと同時実行数を制御する共有リミッター
+
+    複数のクライアント・スレッド・イベントループから共有できる。
+    送信前にslot()（非同期はaslot()）で枠を確保し、応答に応じて
+    report_success()/report_overload()を呼ぶ。
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 16,
+        initial_concurrency: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            requests_per_minute: 1分あたりのリクエスト数上限（Noneなら無制限）
+            tokens_per_minute: 1分あたりの入力トークン数上限（Noneなら無制限）
+            max_concurrency: 同時実行数の上限
+            initial_concurrency: 同時実行数の初期値（デフォルト: 上限と同じ）
+            clock: 単調増加の時計（テスト用に差し替え可能）
+            sleep: 同期版の待機関数（テスト用に差し替え可能）
+        """
+        self.requests = (
+            TokenBucket(requests_per_minute, clock=clock)
+            if requests_per_minute else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute, clock=clock)
+            if tokens_per_minute else None
+        )
+        self.controller = AIMDController(
+            initial=initial_concurrency or max_concurrency,
+            max_limit=max_concurrency,
+            clock=clock,
+        )
+        self._clock = clock
+        self._sleep = sleep
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._paused_until = 0.0
+        self._stats = RateLimiterStats()
+
+    @contextlib.contextmanager
+    def slot(self, prompt_tokens: int = 0) -> Iterator[None]:
+        """送信枠を確保（同期版）
+
+        同時実行数の空き、retry-afterによる停止の解除、RPM/TPMの
+        予算を順に待つ。
+        """
+        started = self._clock()
+        with self._condition:
+            self._waiting += 1
+            while self._in_flight >= self.controller.limit:
+                self._condition.wait()
+            self._waiting -= 1
+            self._in_flight += 1
+
+        try:
+            delay = self._reserve(prompt_tokens)
+            if delay > 0:
+                self._sleep(delay)
+            self._record_wait(self._clock() - started)
+            yield
+        finally:
+            self._release()
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, prompt_tokens: int = 0) -> AsyncIterator[None]:
+        """送信枠を確保（非同期版）"""
+        started = self._clock()
+        with self._condition:
+            self._waiting += 1
+        try:
+            while True:
+                with self._condition:
+                    if self._in_flight < self.controller.limit:
+                        self._in_flight += 1
+                        break
+                await asyncio.sleep(_ASYNC_POLL_INTERVAL)
+        finally:
+            with self._condition:
+                self._waiting -= 1
+
+        try:
+            delay = self._reserve(prompt_tokens)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._record_wait(self._clock() - started)
+            yield
+        finally:
+            self._release()
+
+    def report_success(self) -> None:
+        """成功応答を記録"""
+        self.controller.on_success()
+        with self._condition:
+            self._condition.notify_all()
+
+    def report_overload(self, retry_after: Optional[float] = None) -> None:
+        """429・過負荷応答を記録
+
+        Args:
+            retry_after: プロバイダが指定した再送までの秒数
+        """
+        self.controller.on_overload()
+        with self._condition:
+            self._stats.overloads += 1
+            if retry_after:
+                self._paused_until = max(
+                    self._paused_until, self._clock() + retry_after
+                )
+
+    def stats(self) -> RateLimiterStats:
+        """現在の統計のスナップショット"""
+        with self._condition:
+            return RateLimiterStats(
+                queue_depth=self._waiting,
+                in_flight=self._in_flight,
+                concurrency_limit=self.controller.limit,
+                requests=self._stats.requests,
+                overloads=self._stats.overloads,
+                total_wait=self._stats.total_wait,
+                max_wait=self._stats.max_wait,
+            )
+
+    def _reserve(self, prompt_tokens: int) -> float:
+        """停止期間とバケットから送信までの待ち時間を求める"""
+        with self._condition:
+            delay = max(0.0, self._paused_until - self._clock())
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None and prompt_tokens > 0:
+            delay = max(delay, self.tokens.reserve(prompt_tokens))
+        return delay
+
+    def _record_wait(self, waited: float) -> None:
+        with self._condition:
+            self._stats.requests += 1
+            self._stats.total_wait += waited
+            self._stats.max_wait = max(self._stats.max_wait, waited)
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+
+class RateLimitedClient(BaseLLMClient, BaseAsyncLLMClient):
+    """RateLimiterを通してLLMを呼び出すクライアントラッパー
+
+    同期・非同期どちらのクライアントも包める。過負荷応答は
+    リミッターに報告した上で呼び出し元に送出する。包んだクライアントが
+    内部で再試行する（Resilienceを持つ）場合は、再試行中の過負荷応答も
+    1試行ごとにリミッターへ報告する。
+    model等の属性は包んだクライアントのものを返す。
+    """
+
+    def __init__(self, client: Any, limiter: RateLimiter):
+        self.client = client
+        self.limiter = limiter
+        resilience = _find_resilience(client)
+        # 試行ごとに報告されるなら、最後のエラーを重ねて報告しない
+        self._reports_attempts = resilience is not None
+        if resilience is not None:
+            resilience.add_failure_listener(self._report_overload)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def complete(self, prompt: str) -> str:
+        """プロンプトを送信してレスポンスを取得"""
+        with self.limiter.slot(estimate_prompt_tokens(prompt)):
+            return str(self._call(self.client.complete, prompt))
+
+    def complete_stream(self, prompt: str) -> Iterator[str]:
+        """レスポンスを断片ごとに返す"""
+        yield from self._stream(
+            estimate_prompt_tokens(prompt), self.client.complete_stream, prompt
+        )
+
+    def complete_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        """システムプロンプト付きで呼び出し"""
+        tokens = estimate_prompt_tokens(system_prompt + user_prompt)
+        with self.limiter.slot(tokens):
+            return str(self._call(
+                self.client.complete_with_system, system_prompt, user_prompt
+            ))
+
+    def complete_stream_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> Iterator[str]:
+        """システムプロンプト付きでレスポンスを断片ごとに返す"""
+        yield from self._stream(
+            estimate_prompt_tokens(system_prompt + user_prompt),
+            self.client.complete_stream_with_system,
+            system_prompt, user_prompt,
+        )
+
+    async def acomplete(self, prompt: str) -> str:
+        """非同期で呼び出し（同期クライアントはスレッドで実行）"""
+        return await self._acall(
+            estimate_prompt_tokens(prompt), "complete", prompt
+        )
+
+    async def acomplete_with_system(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        """システムプロンプト付きで非同期に呼び出し"""
+        return await self._acall(
+            estimate_prompt_tokens(system_prompt + user_prompt),
+            "complete_with_system", system_prompt, user_prompt,
+        )
+
+    async def _acall(self, tokens: int, method: str, *args: Any) -> str:
+        """包んだクライアントのa{method}（無ければ{method}をスレッドで）"""
+        async with self.limiter.aslot(tokens):
+            try:
+                async_method = getattr(self.client, f"a{method}", None)
+                if async_method is not None:
+                    response = await async_method(*args)
+                else:
+                    response = await asyncio.to_thread(
+                        getattr(self.client, method), *args
+                    )
+            except Exception as e:
+                self._report_error(e)
+                raise
+            self.limiter.report_success()
+            return str(response)
+
+    def _stream(
+        self,
+        tokens: int,
+        func: Callable[..., Iterator[str]],
+        *args: Any,
+    ) -> Iterator[str]:
+        with self.limiter.slot(tokens):
+            try:
+                yield from func(*args)
+            except Exception as e:
+                self._report_error(e)
+                raise
+            self.limiter.report_success()
+
+    def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        try:
+            result = func(*args)
+        except Exception as e:
+            self._report_error(e)
+            raise
+        self.limiter.report_success()
+        return result
+
+    def _report_error(self, error: Exception) -> None:
+        if not self._reports_attempts:
+            self._report_overload(error)
+
+    def _report_overload(self, error: Exception) -> None:
+        retry_after = overload_retry_after(error)
+        if retry_after is not None:
+            self.limiter.report_overload(retry_after)
+
+
+def _find_resilience(client: Any) -> Optional[Resilience]:
+    """包んだクライアント（カセット等の内側も含む）のResilience"""
+    # __getattr__で属性を委譲するラッパーやモックを辿らないよう、
+    # インスタンス自身の属性だけを見る
+    while client is not None:
+        attributes = getattr(client, "__dict__", {})
+        resilience = attributes.get("resilience")
+        if isinstance(resilience, Resilience):
+            return resilience
+        client = attributes.get("client")
+    return None
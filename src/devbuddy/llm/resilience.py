@@ -0,0 +1,269 @@
+"""
+Resilience - LLM呼び出しのリトライとサーキットブレーカー
+
+一時的なエラー（接続断、タイムアウト、429、5xx）はジッター付きの
+指数バックオフで再試行する。連続して失敗した場合はサーキットを開き、
+一定時間はプロバイダを呼ばずに即座に失敗させる。
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 再試行するHTTPステータス
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504, 529)
+
+# SDKの一時的なエラーのクラス名（anthropic/openai共通）
+_RETRYABLE_ERROR_NAMES = (
+    "APIConnectionError",
+    "APITimeoutError",
+    "InternalServerError",
+    "RateLimitError",
+    "OverloadedError",
+)
+
+
+class CircuitOpenError(Exception):
+    """サーキットが開いているため呼び出しを行わなかった"""
+
+    def __init__(self, retry_in: float):
+        super().__init__(
+            "LLM provider unavailable "
+            f"(circuit open, retry in {retry_in:.0f}s)"
+        )
+        self.retry_in = retry_in
+
+
+@dataclass
+class RetryPolicy:
+    """リトライ設定"""
+
+    max_attempts: int = 3  # 初回を含む試行回数
+    base_delay: float = 0.5  # 初回リトライ前の待ち時間の上限（秒）
+    max_delay: float = 20.0  # 1回の待ち時間の上限（秒）
+    deadline: Optional[float] = 120.0  # 全試行の合計時間の上限（秒）
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """attempt回目の失敗後の待ち時間（フルジッター）"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return rng.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """連続失敗でプロバイダ呼び出しを止めるサーキットブレーカー
+
+    closed: 通常。failure_threshold回連続で失敗するとopenへ。
+    open: reset_timeout秒間は即座に失敗。経過後half_openへ。
+    half_open: 試行を1つだけ通し、成功でclosed、失敗でopenに戻る。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """closed, open, half_open のいずれか"""
+        with self._lock:
+            return self._state()
+
+    def before_call(self) -> None:
+        """呼び出し前の確認
+
+        Raises:
+            CircuitOpenError: サーキットが開いている場合
+        """
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return
+            assert self._opened_at is not None
+            elapsed = self._clock() - self._opened_at
+            raise CircuitOpenError(max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """障害と無関係な失敗で終わった試行の枠を返す"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+
+def is_retryable(error: BaseException) -> bool:
+    """再試行で回復が見込めるエラーか"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    return any(
+        cls.__name__ in _RETRYABLE_ERROR_NAMES for cls in type(error).__mro__
+    )
+
+
+class Resilience:
+    """リトライとサーキットブレーカーをまとめた呼び出しラッパー"""
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            policy: リトライ設定
+            breaker: サーキットブレーカー（Noneなら使わない）
+            clock: 単調増加の時計（テスト用に差し替え可能）
+            sleep: 同期版の待機関数（テスト用に差し替え可能）
+            rng: ジッター用の乱数生成器
+        """
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._listeners: list[Callable[[Exception], None]] = []
+
+    def add_failure_listener(
+        self, listener: Callable[[Exception], None]
+    ) -> None:
+        """試行が失敗するたびに呼ぶ関数を登録
+
+        再試行される失敗も含めて1試行ごとに呼ばれる。レートリミッターが
+        再試行中の429・過負荷を把握するために使う。
+        """
+        self._listeners.append(listener)
+
+    def call(self, func: Callable[..., T], *args: Any) -> T:
+        """funcを再試行付きで呼び出す
+
+        Raises:
+            CircuitOpenError: サーキットが開いている場合
+            Exception: 再試行できないエラー、または再試行を使い切った場合
+                最後のエラー
+        """
+        started = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.breaker is not None:
+                self.breaker.before_call()
+            try:
+                result = func(*args)
+            except Exception as e:
+                delay = self._on_failure(e, attempt, started)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+                continue
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+
+    async def acall(
+        self, func: Callable[..., Awaitable[T]], *args: Any
+    ) -> T:
+        """callの非同期版"""
+        started = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.breaker is not None:
+                self.breaker.before_call()
+            try:
+                result = await func(*args)
+            except Exception as e:
+                delay = self._on_failure(e, attempt, started)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+
+    def _on_failure(
+        self,
+        error: Exception,
+        attempt: int,
+        started: float,
+    ) -> Optional[float]:
+        """失敗を記録し、再試行までの待ち時間を返す（再試行しないならNone）"""
+        for listener in self._listeners:
+            listener(error)
+        retryable = is_retryable(error)
+        if self.breaker is not None:
+            if retryable:
+                self.breaker.record_failure()
+            else:
+                # 入力起因のエラー（400等）はプロバイダ障害として数えない
+                self.breaker.release_probe()
+        if not retryable or attempt >= self.policy.max_attempts:
+            return None
+
+        delay = self.policy.backoff(attempt, self._rng)
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        deadline = self.policy.deadline
+        if deadline is not None:
+            if self._clock() - started + delay > deadline:
+                return None
+        return delay
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """エラーが指定する再試行までの秒数"""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,129 @@
+"""
+ModelRouter - ファイルの複雑さによるモデルの振り分け
+
+小さく単純なファイルは高速・安価なモデルに、大きい・複雑なファイルは
+高性能なモデルに送る。複雑さは行数と構文木の分岐数
+（サイクロマティック複雑度の合計）で判定する。
+"""
+
+import ast
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from devbuddy.analyzers.python_ast import parse_cached
+
+# 高速モデルのデフォルト
+DEFAULT_FAST_MODEL = "claude-3-5-haiku-20241022"
+
+# 高速モデルに送るファイルの上限
+DEFAULT_MAX_FAST_LINES = 150
+DEFAULT_MAX_FAST_COMPLEXITY = 10
+
+# 分岐として数える構文
+_BRANCH_NODES = (
+    ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While,
+    ast.ExceptHandler, ast.With, ast.AsyncWith, ast.Assert,
+    ast.match_case,
+)
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+
+@dataclass(frozen=True)
+class ComplexityScore:
+    """コードの規模と複雑さ"""
+
+    lines: int
+    complexity: int
+    parsed: bool = True  # 構文エラーで解析できなかった場合False
+
+
+def score_code(code: str) -> ComplexityScore:
+    """コードの行数と複雑さを計算
+
+    複雑さは各関数のサイクロマティック複雑度の合計に、
+    モジュール直下の分岐数を足したもの。
+    """
+    lines = len(code.splitlines())
+    try:
+        tree = parse_cached(code)
+    except SyntaxError:
+        return ComplexityScore(lines=lines, complexity=0, parsed=False)
+
+    complexity = 0
+    for node in ast.walk(tree):
+        if isinstance(node, _FUNCTION_NODES):
+            complexity += 1
+        elif isinstance(node, _BRANCH_NODES):
+            complexity += 1
+        elif isinstance(node, ast.BoolOp):
+            complexity += len(node.values) - 1
+        elif isinstance(node, ast.comprehension):
+            complexity += 1 + len(node.ifs)
+    return ComplexityScore(lines=lines, complexity=complexity)
+
+
+@dataclass
+class RoutingPolicy:
+    """モデル振り分けの方針"""
+
+    fast_model: str
+    strong_model: str
+    max_fast_lines: int = DEFAULT_MAX_FAST_LINES
+    max_fast_complexity: int = DEFAULT_MAX_FAST_COMPLEXITY
+
+    def is_simple(self, score: ComplexityScore) -> bool:
+        """高速モデルで十分なコードか（解析できないコードは複雑扱い）"""
+        return (
+            score.parsed
+            and score.lines <= self.max_fast_lines
+            and score.complexity <= self.max_fast_complexity
+        )
+
+    def choose(self, code: str) -> str:
+        """コードをレビューするモデルを選択"""
+        if self.is_simple(score_code(code)):
+            return self.fast_model
+        return self.strong_model
+
+
+class ModelRouter:
+    """方針に従ってモデルを選び、モデルごとのクライアントを返す
+
+    クライアントはモデルごとに初回利用時に生成して再利用する
+    （コネクションプールとレート制御はモデル単位になる）。
+    """
+
+    def __init__(
+        self,
+        policy: RoutingPolicy,
+        client_factory: Callable[[str], Any],
+    ):
+        """
+        Args:
+            policy: 振り分けの方針
+            client_factory: モデル名からLLMクライアントを生成する関数
+        """
+        self.policy = policy
+        self._factory = client_factory
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def choose(self, code: str) -> str:
+        """コードをレビューするモデルを選択"""
+        return self.policy.choose(code)
+
+    def client_for(self, model: str) -> Any:
+        """モデルのクライアントを取得（遅延生成）"""
+        with self._lock:
+            client = self._clients.get(model)
+            if client is None:
+                client = self._factory(model)
+                self._clients[model] = client
+            return client
+
+    @property
+    def clients(self) -> dict[str, Any]:
+        """生成済みのクライアント（モデル名→クライアント）"""
+        with self._lock:
+            return dict(self._clients)
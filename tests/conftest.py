@@ -4,11 +4,33 @@ pytest共通設定・フィクスチャ
 
 import pytest
 from pathlib import Path
+from typing import Iterable, Optional
 from unittest.mock import patch
 
 from devbuddy.llm.client import MockLLMClient
 
 
+class FakeClock:
+    """sleepで進む疑似時計（時計・待機関数を差し替えるテスト用）
+
+    stepsを渡すと、呼び出しごとにその値を順に返す。
+    """
+
+    def __init__(self, steps: Optional[Iterable[float]] = None) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+        self._steps = iter(steps) if steps is not None else None
+
+    def __call__(self) -> float:
+        if self._steps is not None:
+            self.now = next(self._steps)
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
 @pytest.fixture(autouse=True)
 def skip_license_check(request):
     """全テストでライセンスチェックをスキップ（ライセンステスト以外）"""
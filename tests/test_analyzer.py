@@ -301,3 +301,329 @@ class TestPythonAnalyzerEdgeCases:
         valid, error = analyzer.check_syntax(code)
         assert valid is False
         assert "Line" in error
+
+
+class TestPythonAstRules:
+    """ASTルール登録と構文木キャッシュのテスト"""
+
+    def test_single_parse_shared_by_helpers(self):
+        """同じ内容は一度だけパースされる"""
+        from unittest.mock import patch
+
+        from devbuddy.analyzers import python_ast
+        from devbuddy.core.generator import CodeTestGenerator
+
+        code = (
+            "class Shared:\n    pass\n\n"
+            "def shared_helper(a):\n    return a\n"
+        )
+        analyzer = PythonAnalyzer(AnalysisConfig(use_flake8=False))
+        generator = CodeTestGenerator(client=None, skip_license_check=True)
+
+        with patch.object(
+            python_ast.ast, "parse", wraps=python_ast.ast.parse
+        ) as mock_parse:
+            python_ast.get_tree_cache().clear()
+            analyzer.analyze(code)
+            assert analyzer.get_functions(code) == ["shared_helper"]
+            assert analyzer.get_classes(code) == ["Shared"]
+            assert analyzer.check_syntax(code) == (True, None)
+            functions = generator._extract_functions(code)
+
+        assert mock_parse.call_count == 1
+        assert [f.name for f in functions] == ["shared_helper"]
+
+    def test_syntax_error_cached(self):
+        """構文エラーもキャッシュされ同じ結果を返す"""
+        from devbuddy.analyzers.python_ast import TreeCache
+
+        cache = TreeCache()
+        for _ in range(2):
+            with pytest.raises(SyntaxError):
+                cache.parse("def broken(")
+
+        assert cache.misses == 1
+        assert cache.hits == 1
+
+    def test_tree_cache_evicts_oldest(self):
+        """上限を超えたら古い構文木から破棄"""
+        from devbuddy.analyzers.python_ast import TreeCache
+
+        cache = TreeCache(max_entries=2)
+        cache.parse("a = 1")
+        cache.parse("b = 2")
+        cache.parse("a = 1")
+        cache.parse("c = 3")
+        cache.parse("a = 1")
+
+        assert cache.misses == 3
+        assert cache.hits == 2
+
+    def test_register_custom_rule(self):
+        """インスタンスごとにルールを追加できる"""
+        import ast
+
+        from devbuddy.core.models import Issue
+
+        analyzer = PythonAnalyzer(AnalysisConfig(use_flake8=False))
+
+        @analyzer.rules.register(ast.Lambda)
+        def _check_lambda(node):
+            yield Issue(level="style", line=node.lineno, message="lambda")
+
+        issues = analyzer.analyze("f = lambda: 1\n")
+
+        assert [i.message for i in issues] == ["lambda"]
+        assert PythonAnalyzer().analyze("f = lambda: 1\n") == []
+
+
+class TestPythonAnalyzerBatch:
+    """flake8/mypyの一括実行のテスト"""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        """解析対象ファイル群"""
+        paths = []
+        for name in ("a.py", "b.py", "c.py"):
+            path = tmp_path / name
+            path.write_text("x = 1\n", encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def test_flake8_runs_once_and_demuxes(self, files):
+        """flake8を1回だけ起動し出力をファイルごとに振り分ける"""
+        from unittest.mock import MagicMock, patch
+
+        stdout = (
+            f"{files[0]}:1:1:F401:'os' imported but unused\n"
+            f"{files[2]}:3:80:E501:line too long (90 > 79 characters)\n"
+            f"{files[2]}:4:1:W291:trailing whitespace\n"
+        )
+        analyzer = PythonAnalyzer(
+            AnalysisConfig(ignore_codes=["W291"], flake8_jobs=4)
+        )
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run",
+            return_value=MagicMock(stdout=stdout),
+        ) as mock_run:
+            results = analyzer.analyze_files(files)
+
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args.args[0]
+        assert "--jobs=4" in cmd
+        assert [str(p) for p in files] == cmd[-3:]
+        assert [i.message for i in results[files[0]]] == [
+            "[F401] 'os' imported but unused"
+        ]
+        assert results[files[0]][0].level == "bug"
+        assert results[files[1]] == []
+        assert [i.line for i in results[files[2]]] == [3]
+
+    def test_mypy_runs_once_and_demuxes(self, files):
+        """mypyを1回だけ起動し出力をファイルごとに振り分ける"""
+        from unittest.mock import MagicMock, patch
+
+        stdout = (
+            f"{files[1]}:2:5: error: Incompatible types\n"
+            f"{files[1]}:2:5: note: See docs\n"
+        )
+        analyzer = PythonAnalyzer(
+            AnalysisConfig(use_flake8=False, use_mypy=True)
+        )
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run",
+            return_value=MagicMock(stdout=stdout),
+        ) as mock_run:
+            results = analyzer.analyze_files(files)
+
+        assert mock_run.call_count == 1
+        assert [i.message for i in results[files[1]]] == [
+            "[mypy] Incompatible types"
+        ]
+        assert results[files[0]] == results[files[2]] == []
+
+    def test_prefetch_avoids_per_file_runs(self, files):
+        """事前取得後のanalyzeはサブプロセスを起動しない"""
+        from unittest.mock import MagicMock, patch
+
+        stdout = f"{files[0]}:1:1:E999:SyntaxError\n"
+        analyzer = PythonAnalyzer()
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run",
+            return_value=MagicMock(stdout=stdout),
+        ) as mock_run:
+            analyzer.prefetch_external(files)
+            issues = analyzer.analyze("x = 1\n", files[0])
+            analyzer.analyze("x = 1\n", files[1])
+
+            assert mock_run.call_count == 1
+            assert [i.message for i in issues] == ["[E999] SyntaxError"]
+
+            # 取り出し済みのファイルは通常どおり実行
+            analyzer.analyze("x = 1\n", files[0])
+            assert mock_run.call_count == 2
+
+    def test_prefetch_discarded_when_file_changed(self, files):
+        """事前取得後に変更されたファイルは再解析"""
+        import os
+        from unittest.mock import MagicMock, patch
+
+        analyzer = PythonAnalyzer()
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run",
+            return_value=MagicMock(stdout=""),
+        ) as mock_run:
+            analyzer.prefetch_external(files)
+            stat = files[0].stat()
+            os.utime(
+                files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+            )
+            analyzer.analyze("x = 1\n", files[0])
+
+        assert mock_run.call_count == 2
+
+    def test_prefetch_skips_timed_out_files(self, files):
+        """タイムアウトしたファイルは保持せず、analyzeで個別に実行"""
+        import subprocess
+        from unittest.mock import MagicMock, patch
+
+        analyzer = PythonAnalyzer()
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run",
+            side_effect=[
+                subprocess.TimeoutExpired("flake8", 33),
+                MagicMock(stdout=f"{files[0]}:1:1:E999:SyntaxError\n"),
+            ],
+        ) as mock_run:
+            analyzer.prefetch_external(files)
+            issues = analyzer.analyze("x = 1\n", files[0])
+
+        assert mock_run.call_count == 2
+        assert [i.message for i in issues] == ["[E999] SyntaxError"]
+
+    def test_mypy_duplicate_module_split(self, tmp_path):
+        """同名モジュールでmypyが失敗したらディレクトリごとに実行"""
+        from unittest.mock import MagicMock, patch
+
+        paths = []
+        for directory in ("a", "b"):
+            (tmp_path / directory).mkdir()
+            path = tmp_path / directory / "conftest.py"
+            path.write_text("x = 1\n", encoding="utf-8")
+            paths.append(path)
+        duplicate = (
+            f'{paths[1]}: error: Duplicate module named "conftest" '
+            f'(also at "{paths[0]}")\n'
+        )
+        analyzer = PythonAnalyzer(
+            AnalysisConfig(use_flake8=False, use_mypy=True)
+        )
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run",
+            side_effect=[
+                MagicMock(stdout=duplicate),
+                MagicMock(stdout=f"{paths[0]}:1:5: error: Bad type\n"),
+                MagicMock(stdout=""),
+            ],
+        ) as mock_run:
+            results = analyzer.analyze_files(paths)
+
+        assert mock_run.call_count == 3
+        assert [i.message for i in results[paths[0]]] == [
+            "[mypy] Bad type"
+        ]
+        assert results[paths[1]] == []
+
+
+class TestPythonAnalyzerInProcess:
+    """インプロセスflake8バックエンドのテスト"""
+
+    @pytest.fixture
+    def analyzer(self):
+        """インプロセス実行のアナライザー"""
+        return PythonAnalyzer(AnalysisConfig(flake8_backend="inprocess"))
+
+    def test_invalid_backend(self):
+        """不明なバックエンド指定"""
+        with pytest.raises(ValueError, match="flake8_backend"):
+            AnalysisConfig(flake8_backend="daemon")
+
+    def test_checks_unsaved_buffer_without_subprocess(self, analyzer):
+        """ファイルなしのコードも検査しサブプロセスを起動しない"""
+        from unittest.mock import patch
+
+        code = "import os\n\n\ndef f():\n    return undefined_name\n"
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run"
+        ) as mock_run:
+            issues = analyzer.analyze(code)
+
+        mock_run.assert_not_called()
+        messages = [i.message for i in issues]
+        assert "[F401] 'os' imported but unused" in messages
+        assert "[F821] undefined name 'undefined_name'" in messages
+        assert all(i.level == "bug" for i in issues)
+
+    def test_pycodestyle_and_noqa(self, analyzer):
+        """E/Wコードの検出とnoqaによる抑制"""
+        analyzer.config.max_line_length = 20
+        code = (
+            "x = 'a long line of text'\n"
+            "y = 'another long line here'  # noqa: E501\n"
+            "z=1\n"
+        )
+
+        issues = analyzer.analyze(code)
+
+        assert [(i.line, i.message.split("]")[0]) for i in issues] == [
+            (1, "[E501"),
+            (3, "[E225"),
+        ]
+
+    def test_ignore_codes(self):
+        """無視リストのコードを除外"""
+        analyzer = PythonAnalyzer(
+            AnalysisConfig(flake8_backend="inprocess", ignore_codes=["F401"])
+        )
+
+        assert analyzer.analyze("import os\n") == []
+
+    def test_shared_tree_not_mutated(self, analyzer):
+        """pyflakesは共有キャッシュの構文木に属性を書き込まない"""
+        import ast
+
+        from devbuddy.analyzers.python_ast import parse_cached
+
+        code = "import os\n\n\ndef f():\n    return x\n"
+        tree = parse_cached(code)
+
+        issues = analyzer.analyze(code)
+
+        assert {i.message.split("]")[0] for i in issues} == {"[F401", "[F821"}
+        assert not any(
+            hasattr(node, "_pyflakes_parent") for node in ast.walk(tree)
+        )
+
+    def test_prefetch_skips_flake8_subprocess(self, tmp_path):
+        """インプロセス時は一括実行でもflake8を起動しない"""
+        from unittest.mock import patch
+
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n", encoding="utf-8")
+        analyzer = PythonAnalyzer(AnalysisConfig(flake8_backend="inprocess"))
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run"
+        ) as mock_run:
+            analyzer.prefetch_external([path])
+            results = analyzer.analyze_files([path])
+
+        mock_run.assert_not_called()
+        assert results[path] == []
@@ -0,0 +1,256 @@
+"""
+AsyncLLMClientと非同期エントリポイントのテスト
+"""
+
+import asyncio
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from devbuddy.core.fixer import BugFixer
+from devbuddy.core.generator import CodeTestGenerator
+from devbuddy.core.reviewer import CodeReviewer
+from devbuddy.llm.async_client import (
+    AsyncLLMClient,
+    BaseAsyncLLMClient,
+    MockAsyncLLMClient,
+    acomplete,
+)
+from devbuddy.llm.client import MockLLMClient
+
+
+class TestAsyncLLMClient:
+    """AsyncLLMClientテストクラス"""
+
+    def test_init_no_api_key_raises(self):
+        """APIキーなしでエラー"""
+        with patch.dict("os.environ", {"DEVBUDDY_API_KEY": ""}):
+            with pytest.raises(ValueError, match="API key is required"):
+                AsyncLLMClient(api_key="")
+
+    def test_detect_api_type(self):
+        """APIタイプ判定は同期版と同じ"""
+        assert AsyncLLMClient(api_key="sk-ant-x")._api_type == "claude"
+        assert AsyncLLMClient(api_key="sk-proj-x")._api_type == "openai"
+
+    def test_acomplete_claude(self):
+        """AsyncAnthropicで呼び出し"""
+        mock_anthropic = MagicMock()
+        mock_content = type("MockContent", (), {"text": "async response"})()
+        mock_message = type("MockMessage", (), {"content": [mock_content]})()
+        sdk_client = mock_anthropic.AsyncAnthropic.return_value
+        sdk_client.messages.create = AsyncMock(return_value=mock_message)
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            client = AsyncLLMClient(api_key="sk-ant-test123", timeout=5)
+
+            async def run():
+                first = await client.acomplete("prompt")
+                second = await client.acomplete_with_system("sys", "user")
+                return first, second
+
+            first, second = asyncio.run(run())
+
+            assert first == second == "async response"
+            assert mock_anthropic.AsyncAnthropic.call_count == 1
+            kwargs = mock_anthropic.AsyncAnthropic.call_args.kwargs
+            assert kwargs["timeout"] == 5
+            system_call = sdk_client.messages.create.call_args_list[1]
+            assert system_call.kwargs["system"] == [{
+                "type": "text",
+                "text": "sys",
+                "cache_control": {"type": "ephemeral"},
+            }]
+        finally:
+            del sys.modules["anthropic"]
+
+    def test_client_rebuilt_per_event_loop(self):
+        """asyncio.runごとに、そのループ用のSDKクライアントを使う"""
+        mock_anthropic = MagicMock()
+        mock_content = type("MockContent", (), {"text": "ok"})()
+        mock_message = type("MockMessage", (), {"content": [mock_content]})()
+        sdk_client = mock_anthropic.AsyncAnthropic.return_value
+        sdk_client.messages.create = AsyncMock(return_value=mock_message)
+        sdk_client.close = AsyncMock()
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            client = AsyncLLMClient(api_key="sk-ant-test123")
+
+            async def run(prompt):
+                return await client.acomplete(prompt)
+
+            assert asyncio.run(run("first")) == "ok"
+            assert asyncio.run(run("second")) == "ok"
+            assert mock_anthropic.AsyncAnthropic.call_count == 2
+
+            async def run_and_close():
+                await client.acomplete("third")
+                await client.aclose()
+
+            asyncio.run(run_and_close())
+            sdk_client.close.assert_awaited_once()
+            assert client._sdk_client is None
+        finally:
+            del sys.modules["anthropic"]
+
+    def test_acomplete_openai(self):
+        """AsyncOpenAIで呼び出し"""
+        mock_openai = MagicMock()
+        mock_message = type("MockMessage", (), {"content": None})()
+        mock_choice = type("MockChoice", (), {"message": mock_message})()
+        mock_response = type("MockResponse", (), {"choices": [mock_choice]})()
+        sdk_client = mock_openai.AsyncOpenAI.return_value
+        sdk_client.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+        sys.modules["openai"] = mock_openai
+
+        try:
+            client = AsyncLLMClient(api_key="sk-proj-test123")
+            response = asyncio.run(
+                client.acomplete_with_system("sys", "user")
+            )
+
+            assert response == ""
+            messages = sdk_client.chat.completions.create.call_args.kwargs[
+                "messages"
+            ]
+            assert messages[0] == {"role": "system", "content": "sys"}
+        finally:
+            del sys.modules["openai"]
+
+    def test_import_error(self):
+        """anthropic未インストール"""
+        old_anthropic = sys.modules.get("anthropic")
+        sys.modules["anthropic"] = None
+
+        try:
+            client = AsyncLLMClient(api_key="sk-ant-test123")
+            with pytest.raises(ImportError, match="anthropic"):
+                asyncio.run(client.acomplete("test"))
+        finally:
+            if old_anthropic:
+                sys.modules["anthropic"] = old_anthropic
+            elif "anthropic" in sys.modules:
+                del sys.modules["anthropic"]
+
+
+class TestMockAsyncLLMClient:
+    """MockAsyncLLMClientテストクラス"""
+
+    def test_keyword_response(self):
+        """キーワードマッチレスポンス"""
+        client = MockAsyncLLMClient(responses={"review": "Review response"})
+
+        assert asyncio.run(client.acomplete("please review")) == (
+            "Review response"
+        )
+        assert client.call_history == ["please review"]
+        assert isinstance(client, BaseAsyncLLMClient)
+
+    def test_concurrent_calls_overlap(self):
+        """遅延付きモックが並行実行される"""
+        client = MockAsyncLLMClient(delay=0.05)
+
+        async def run():
+            return await asyncio.gather(
+                *(client.acomplete(f"p{i}") for i in range(50))
+            )
+
+        start = time.perf_counter()
+        responses = asyncio.run(run())
+
+        assert len(responses) == 50
+        assert time.perf_counter() - start < 1.0
+
+    def test_acomplete_helper_with_sync_client(self):
+        """同期クライアントはスレッドで実行"""
+        client = MockLLMClient(responses={"x": "sync"})
+
+        assert asyncio.run(acomplete(client, "x")) == "sync"
+
+
+class TestAsyncEntryPoints:
+    """CodeReviewer/CodeTestGenerator/BugFixerの非同期API"""
+
+    def test_areview_files_ordered(self, tmp_path):
+        """多数ファイルを1ループでレビュー"""
+        files = []
+        for i in range(30):
+            path = tmp_path / f"m{i}.py"
+            path.write_text(f"x{i} = {i}\n", encoding="utf-8")
+            files.append(path)
+
+        client = MockAsyncLLMClient(
+            responses={"レビュー": "[BUG] Line 1: Async finding"},
+            delay=0.01,
+        )
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+
+        results = asyncio.run(reviewer.areview_files(files, concurrency=10))
+
+        assert [r.file_path for r in results] == files
+        assert all(
+            any(i.message == "Async finding" for i in r.issues)
+            for r in results
+        )
+
+    def test_areview_file_not_found(self, tmp_path):
+        """存在しないファイル"""
+        reviewer = CodeReviewer(client=MockAsyncLLMClient())
+
+        result = asyncio.run(reviewer.areview_file(tmp_path / "none.py"))
+
+        assert result.success is False
+        assert "Failed to read file" in result.error
+
+    def test_agenerate_tests(self, temp_python_file):
+        """非同期テスト生成"""
+        client = MockAsyncLLMClient(responses={
+            "テスト": "```python\ndef test_add():\n    assert True\n```",
+        })
+        generator = CodeTestGenerator(client=client, skip_license_check=True)
+
+        result = asyncio.run(generator.agenerate_tests(temp_python_file))
+
+        assert result.success is True
+        assert result.test_count == 1
+        assert "```" not in result.test_code
+
+    def test_agenerate_tests_function_not_found(self, temp_python_file):
+        """対象関数なし"""
+        generator = CodeTestGenerator(
+            client=MockAsyncLLMClient(), skip_license_check=True
+        )
+
+        result = asyncio.run(
+            generator.agenerate_tests(temp_python_file, "missing")
+        )
+
+        assert result.success is False
+        assert "not found" in result.error
+
+    @patch("devbuddy.core.fixer.subprocess.run")
+    def test_asuggest_fix(self, mock_run, tmp_path):
+        """非同期修正提案"""
+        test_file = tmp_path / "test_x.py"
+        test_file.write_text("def test_x():\n    assert 1 == 2\n")
+        mock_run.return_value = MagicMock(
+            returncode=1, stdout="1 failed", stderr=""
+        )
+        client = MockAsyncLLMClient(responses={
+            "バグ": "FILE: x.py\nLINE: 2\nDESCRIPTION: fix bug\n"
+            "ORIGINAL: 1 == 2\nREPLACEMENT: 1 == 1",
+        })
+        fixer = BugFixer(client=client, skip_license_check=True)
+
+        result = asyncio.run(fixer.asuggest_fix(test_file))
+
+        assert result.success is True
+        assert len(result.suggestions) == 1
+        assert result.suggestions[0].replacement == "1 == 1"
@@ -0,0 +1,166 @@
+"""
+ReviewBatcherのテスト
+"""
+
+import pytest
+
+from devbuddy.core.batcher import pack_batches, parse_batch_response
+from devbuddy.core.cache import ReviewCache
+from devbuddy.core.reviewer import CodeReviewer
+from devbuddy.llm.client import MockLLMClient
+
+
+class TestPackBatches:
+    """pack_batchesテストクラス"""
+
+    def test_respects_token_budget(self):
+        """合計が予算を超えないように詰める"""
+        sizes = [600, 300, 500, 200, 400]
+        batches = pack_batches(sizes, max_files=10, max_tokens=1000)
+
+        for batch in batches:
+            assert sum(sizes[i] for i in batch) <= 1000
+        assert sorted(i for b in batches for i in b) == list(range(5))
+        assert len(batches) == 2
+
+    def test_respects_max_files(self):
+        """1バッチのファイル数を制限"""
+        batches = pack_batches([1] * 7, max_files=3, max_tokens=1000)
+
+        assert [len(b) for b in batches] == [3, 3, 1]
+
+    def test_oversized_file_alone(self):
+        """予算を単独で超えるファイルは1ファイルのバッチ"""
+        batches = pack_batches([5000, 10, 10], max_tokens=100)
+
+        assert [0] in batches
+        assert [1, 2] in batches
+
+    def test_invalid_max_files(self):
+        """不正なmax_files"""
+        with pytest.raises(ValueError, match="max_files"):
+            pack_batches([1], max_files=0)
+
+
+class TestParseBatchResponse:
+    """parse_batch_responseテストクラス"""
+
+    def test_attributes_findings_to_files(self):
+        """File X Line N の行をファイルごとに振り分ける"""
+        response = (
+            "[BUG] File pkg/a.py Line 3: Division by zero\n"
+            "  Suggestion: Check the divisor\n"
+            "[STYLE] File `pkg/b.py` Line 1: Missing docstring\n"
+            "[WARNING] File unknown.py Line 2: Ignored\n"
+            "No issues found\n"
+        )
+        results = parse_batch_response(response, ["pkg/a.py", "pkg/b.py"])
+
+        assert [(i.level, i.line) for i in results["pkg/a.py"]] == [
+            ("bug", 3)
+        ]
+        assert results["pkg/a.py"][0].suggestion == "Check the divisor"
+        assert [i.message for i in results["pkg/b.py"]] == [
+            "Missing docstring"
+        ]
+
+    def test_matches_basename(self):
+        """一意に決まればファイル名の末尾でも照合"""
+        results = parse_batch_response(
+            "[INFO] File b.py Line 2: Note",
+            ["src/a.py", "src/b.py"],
+        )
+
+        assert len(results["src/b.py"]) == 1
+
+    def test_structured_response(self):
+        """構造化出力ではJSONのfileキーで振り分ける"""
+        response = (
+            '{"issues": [{"file": "pkg/a.py", "level": "bug", "line": 3, '
+            '"message": "Division by zero"}, {"file": "other.py", '
+            '"level": "info", "line": 1, "message": "Ignored"}]}'
+        )
+        results = parse_batch_response(
+            response, ["pkg/a.py", "pkg/b.py"], structured=True
+        )
+
+        assert [i.message for i in results["pkg/a.py"]] == [
+            "Division by zero"
+        ]
+        assert results["pkg/b.py"] == []
+
+    def test_ambiguous_name_dropped(self):
+        """曖昧なファイル名は捨てる"""
+        results = parse_batch_response(
+            "[INFO] File util.py Line 2: Note",
+            ["a/util.py", "b/util.py"],
+        )
+
+        assert results == {"a/util.py": [], "b/util.py": []}
+
+
+class TestReviewBatch:
+    """CodeReviewer.review_batchテストクラス"""
+
+    def test_one_request_for_batch(self, tmp_path):
+        """まとめて1回だけLLMを呼び、結果をファイルごとに返す"""
+        files = []
+        for name in ("a.py", "b.py", "c.py"):
+            path = tmp_path / name
+            path.write_text("x = 1\n", encoding="utf-8")
+            files.append(path)
+        client = MockLLMClient(responses={
+            "=== File:": f"[BUG] File {files[1]} Line 1: Bad value\n",
+        })
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+
+        results = reviewer.review_batch(files, severity="low")
+
+        assert len(client.call_history) == 1
+        assert [r.file_path for r in results] == files
+        assert [len(r.issues) for r in results] == [0, 1, 0]
+        assert results[1].issues[0].message == "Bad value"
+
+    def test_missing_file_reported(self, tmp_path):
+        """読めないファイルは失敗結果になり、他は続行"""
+        good = tmp_path / "good.py"
+        good.write_text("x = 1\n", encoding="utf-8")
+        reviewer = CodeReviewer(
+            client=MockLLMClient(), skip_license_check=True
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        results = reviewer.review_batch(
+            [tmp_path / "missing.py", good], severity="low"
+        )
+
+        assert results[0].success is False
+        assert results[1].success is True
+
+    def test_batch_results_cached_separately(self, tmp_path):
+        """まとめレビューの結果は単一ファイルのレビューに使わない"""
+        files = []
+        for name in ("a.py", "b.py"):
+            path = tmp_path / name
+            path.write_text(f"{name[0]} = 1\n", encoding="utf-8")
+            files.append(path)
+        client = MockLLMClient(responses={
+            "=== File:": f"[BUG] File {files[0]} Line 1: Bad value\n",
+        })
+        reviewer = CodeReviewer(
+            client=client,
+            cache=ReviewCache(cache_dir=tmp_path / "cache"),
+            skip_license_check=True,
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        reviewer.review_batch(files, severity="low")
+        again = reviewer.review_batch(files, severity="low")
+        single = reviewer.review_file(files[0], severity="low")
+
+        assert len(client.call_history) == 2
+        assert [r.ai_status for r in again] == ["cached", "cached"]
+        assert again[0].issues[0].message == "Bad value"
+        assert "=== File:" not in client.call_history[1]
+        assert single.ai_status == "ok"
@@ -0,0 +1,258 @@
+"""
+ReviewCacheのテスト
+"""
+
+import os
+
+import pytest
+
+from devbuddy.core.cache import ReviewCache
+from devbuddy.core.models import Issue
+from devbuddy.core.reviewer import CodeReviewer
+from devbuddy.llm.client import MockLLMClient
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """一時ディレクトリのキャッシュ"""
+    return ReviewCache(cache_dir=tmp_path / "cache")
+
+
+class TestReviewCache:
+    """ReviewCacheテストクラス"""
+
+    def test_make_key_depends_on_all_parts(self):
+        """キーは全要素に依存する"""
+        base = ReviewCache.make_key("x = 1", "medium", "1", "model-a")
+
+        assert base == ReviewCache.make_key("x = 1", "medium", "1", "model-a")
+        assert base != ReviewCache.make_key("x = 2", "medium", "1", "model-a")
+        assert base != ReviewCache.make_key("x = 1", "high", "1", "model-a")
+        assert base != ReviewCache.make_key("x = 1", "medium", "2", "model-a")
+        assert base != ReviewCache.make_key("x = 1", "medium", "1", "model-b")
+
+    def test_miss_then_hit(self, cache):
+        """ミス後に保存してヒット"""
+        key = ReviewCache.make_key("code", "medium", "1", "m")
+        issues = [
+            Issue(level="bug", line=3, message="Boom", suggestion="Fix"),
+        ]
+
+        assert cache.get(key) is None
+        cache.put(key, issues)
+
+        assert cache.get(key) == issues
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.writes == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        """別インスタンスからも読める"""
+        key = ReviewCache.make_key("code", "low", "1", "m")
+        ReviewCache(cache_dir=tmp_path).put(
+            key, [Issue(level="info", line=1, message="ok")]
+        )
+
+        issues = ReviewCache(cache_dir=tmp_path).get(key)
+
+        assert issues == [Issue(level="info", line=1, message="ok")]
+
+    def test_corrupt_entry_is_miss(self, cache):
+        """壊れたエントリはミス扱い"""
+        key = ReviewCache.make_key("code", "medium", "1", "m")
+        cache.cache_dir.mkdir(parents=True)
+        (cache.cache_dir / f"{key}.json").write_text("{not json")
+
+        assert cache.get(key) is None
+        assert cache.stats.misses == 1
+
+    def test_lru_eviction(self, tmp_path):
+        """上限超過で最終アクセスが古いものから削除"""
+        probe = ReviewCache(cache_dir=tmp_path / "probe")
+        probe.put("probe", [Issue(level="info", line=1, message="x")])
+        entry_size = probe.size_bytes()
+
+        cache = ReviewCache(
+            cache_dir=tmp_path / "cache", max_bytes=entry_size * 2
+        )
+        issue = [Issue(level="info", line=1, message="x")]
+        cache.put("a", issue)
+        cache.put("b", issue)
+        os.utime(cache.cache_dir / "a.json", (1, 1))
+        os.utime(cache.cache_dir / "b.json", (2, 2))
+        cache._index = None
+        cache.get("a")  # aを最近使用に
+
+        cache.put("c", issue)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.stats.evictions == 1
+
+    def test_clear(self, cache):
+        """全削除"""
+        cache.put("k", [])
+        cache.clear()
+
+        assert cache.get("k") is None
+        assert cache.size_bytes() == 0
+
+
+class TestReviewerCache:
+    """CodeReviewerのキャッシュ連携テスト"""
+
+    def test_second_review_skips_llm(self, cache, temp_python_file):
+        """同一内容の再レビューはLLMを呼ばない"""
+        client = MockLLMClient(responses={
+            "レビュー": "[BUG] Line 2: Cached finding",
+        })
+        reviewer = CodeReviewer(
+            client=client, skip_license_check=True, cache=cache
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        first = reviewer.review_file(temp_python_file)
+        second = reviewer.review_file(temp_python_file)
+
+        assert len(client.call_history) == 1
+        assert first.issues == second.issues
+        assert cache.stats.hits == 1
+
+    def test_changed_code_misses(self, cache, temp_python_file):
+        """内容が変われば再レビュー"""
+        client = MockLLMClient()
+        reviewer = CodeReviewer(
+            client=client, skip_license_check=True, cache=cache
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        reviewer.review_file(temp_python_file)
+        temp_python_file.write_text("x = 2\n", encoding="utf-8")
+        reviewer.review_file(temp_python_file)
+
+        assert len(client.call_history) == 2
+
+    def test_llm_error_not_cached(self, cache, temp_python_file):
+        """LLMエラー時はキャッシュしない"""
+
+        class FailingClient(MockLLMClient):
+            def complete(self, prompt: str) -> str:
+                raise RuntimeError("down")
+
+        reviewer = CodeReviewer(
+            client=FailingClient(), skip_license_check=True, cache=cache
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        reviewer.review_file(temp_python_file)
+
+        assert cache.stats.writes == 0
+
+
+class TestIncrementalReview:
+    """関数単位の差分レビューテスト"""
+
+    SOURCE = (
+        "import os\n"
+        "\n"
+        "\n"
+        "def first():\n"
+        "    return os.getcwd()\n"
+        "\n"
+        "\n"
+        "def second(value):\n"
+        "    return value * 2\n"
+    )
+
+    @pytest.fixture
+    def reviewer(self, cache):
+        reviewer = CodeReviewer(
+            client=MockLLMClient(), skip_license_check=True, cache=cache
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        return reviewer
+
+    def test_only_changed_unit_sent(self, reviewer, tmp_path):
+        """変更した関数だけをLLMに送る"""
+        path = tmp_path / "module.py"
+        path.write_text(self.SOURCE, encoding="utf-8")
+        reviewer.review_file(path, severity="low")
+
+        path.write_text(
+            self.SOURCE.replace("os.getcwd()", "os.getcwdb()"),
+            encoding="utf-8",
+        )
+        reviewer.review_file(path, severity="low")
+
+        history = reviewer.client.call_history
+        assert len(history) == 2
+        assert "os.getcwdb()" in history[1]
+        assert "value * 2" not in history[1]
+
+    def test_cached_findings_shifted(self, cache, tmp_path):
+        """変更のない単位の結果は新しい行番号にずらして再利用"""
+        client = MockLLMClient(responses={
+            "レビュー": "[BUG] Line 9: Doubling",
+        })
+        reviewer = CodeReviewer(
+            client=client, skip_license_check=True, cache=cache
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        path = tmp_path / "module.py"
+        path.write_text(self.SOURCE, encoding="utf-8")
+        reviewer.review_file(path, severity="low")
+
+        # first()に2行追加して second() を2行下げる
+        client.responses = {}
+        path.write_text(
+            self.SOURCE.replace(
+                "    return os.getcwd()\n",
+                "    cwd = os.getcwd()\n    print(cwd)\n    return cwd\n",
+            ),
+            encoding="utf-8",
+        )
+        result = reviewer.review_file(path, severity="low")
+
+        assert len(client.call_history) == 2
+        doubling = [i for i in result.issues if i.message == "Doubling"]
+        assert [i.line for i in doubling] == [11]
+
+    def test_moved_units_need_no_llm(self, cache, tmp_path):
+        """単位の並べ替えだけならLLMを呼ばない"""
+        client = MockLLMClient()
+        reviewer = CodeReviewer(
+            client=client, skip_license_check=True, cache=cache
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        path = tmp_path / "module.py"
+        path.write_text(self.SOURCE, encoding="utf-8")
+        reviewer.review_file(path, severity="low")
+
+        path.write_text(
+            "import os\n\n\ndef second(value):\n    return value * 2\n"
+            "\n\ndef first():\n    return os.getcwd()\n",
+            encoding="utf-8",
+        )
+        result = reviewer.review_file(path, severity="low")
+
+        assert len(client.call_history) == 1
+        assert result.success is True
+
+    def test_disabled(self, cache, tmp_path):
+        """incremental=Falseならファイル全体を再レビュー"""
+        client = MockLLMClient()
+        reviewer = CodeReviewer(
+            client=client,
+            skip_license_check=True,
+            cache=cache,
+            incremental=False,
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        path = tmp_path / "module.py"
+        path.write_text(self.SOURCE, encoding="utf-8")
+        reviewer.review_file(path, severity="low")
+        path.write_text(self.SOURCE + "\nX = 1\n", encoding="utf-8")
+        reviewer.review_file(path, severity="low")
+
+        assert "os.getcwd()" in client.call_history[1]
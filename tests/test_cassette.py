@@ -0,0 +1,225 @@
+"""
+CassetteLLMClient（LLM応答の記録・再生）のテスト
+"""
+
+import asyncio
+import gzip
+import random
+
+import pytest
+
+from devbuddy.core.reviewer import CodeReviewer
+from devbuddy.llm.async_client import MockAsyncLLMClient
+from devbuddy.llm.cassette import (
+    Cassette,
+    CassetteLLMClient,
+    CassetteMissError,
+)
+from devbuddy.llm.client import MockLLMClient
+
+from tests.conftest import FakeClock
+
+
+def _record(path, prompts, clock=None):
+    recorder = CassetteLLMClient(
+        path,
+        client=MockLLMClient(responses={"a": "answer a", "b": "answer b"}),
+        **({"clock": clock} if clock else {}),
+    )
+    return [recorder.complete(p) for p in prompts]
+
+
+class TestCassette:
+    """記録と再生のテストクラス"""
+
+    def test_round_trip(self, tmp_path):
+        """記録した応答をネットワーク無しで再生"""
+        path = tmp_path / "review.cassette.gz"
+        recorded = _record(path, ["prompt a", "prompt b"])
+
+        replay = CassetteLLMClient(path)
+
+        assert replay.recording is False
+        assert [replay.complete("prompt a"), replay.complete("prompt b")] == (
+            recorded
+        )
+
+    def test_file_is_compact(self, tmp_path):
+        """gzip圧縮され、プロンプト本文は保存しない"""
+        path = tmp_path / "review.cassette.gz"
+        _record(path, ["secret source code a"])
+
+        content = gzip.decompress(path.read_bytes()).decode("utf-8")
+
+        assert "answer a" in content
+        assert "secret source code" not in content
+
+    def test_system_prompt_is_part_of_key(self):
+        """システムプロンプトの有無・内容で別の記録になる"""
+        cassette = Cassette()
+        recorder = CassetteLLMClient(cassette, client=MockLLMClient())
+        recorder.complete_with_system("sys", "a")
+        replay = CassetteLLMClient(cassette)
+
+        assert replay.complete_with_system("sys", "a")
+        with pytest.raises(CassetteMissError):
+            replay.complete("a")
+        with pytest.raises(CassetteMissError):
+            replay.complete_with_system("other", "a")
+
+    def test_stream_with_system_shares_key(self):
+        """ストリーミングでもシステムプロンプトを分けたまま記録・再生する"""
+        cassette = Cassette()
+        inner = MockLLMClient(responses={"a": "streamed"})
+        recorder = CassetteLLMClient(cassette, client=inner)
+
+        assert list(
+            recorder.complete_stream_with_system("sys", "a")
+        ) == ["streamed"]
+        replay = CassetteLLMClient(cassette)
+
+        assert replay.complete_with_system("sys", "a") == "streamed"
+        assert list(
+            replay.complete_stream_with_system("sys", "a")
+        ) == ["streamed"]
+        with pytest.raises(CassetteMissError):
+            replay.complete("sys\n\na")
+
+    def test_repeated_prompt_replayed_in_order(self):
+        """同じプロンプトの記録は記録順に返す"""
+        cassette = Cassette()
+        client = MockLLMClient(responses={"p": "first"})
+        recorder = CassetteLLMClient(cassette, client=client)
+        recorder.complete("p")
+        client.set_response("p", "second")
+        recorder.complete("p")
+
+        replay = CassetteLLMClient(cassette)
+
+        assert [replay.complete("p") for _ in range(3)] == [
+            "first", "second", "first"
+        ]
+
+    def test_records_latency_and_model(self, tmp_path):
+        """応答時間とモデル名を記録"""
+        path = tmp_path / "c.gz"
+        inner = MockLLMClient()
+        inner.model = "strong-model"
+        recorder = CassetteLLMClient(
+            path, client=inner, clock=FakeClock([10.0, 12.5])
+        )
+        recorder.complete("x")
+
+        cassette = Cassette.load(path)
+
+        assert cassette.latencies == [2.5]
+        assert CassetteLLMClient(cassette).model == "strong-model"
+
+    def test_invalid_latency_mode(self):
+        """未知の応答時間モードはエラー"""
+        with pytest.raises(ValueError):
+            CassetteLLMClient(Cassette(), latency="fast")
+
+
+class TestReplayLatency:
+    """応答時間の再現テストクラス"""
+
+    def _cassette(self):
+        cassette = Cassette()
+        recorder = CassetteLLMClient(
+            cassette,
+            client=MockLLMClient(),
+            clock=FakeClock([0.0, 1.0, 0.0, 3.0]),
+        )
+        recorder.complete("fast")
+        recorder.complete("slow")
+        return cassette
+
+    def test_no_latency_by_default(self):
+        """デフォルトでは待たない"""
+        sleeps = []
+        replay = CassetteLLMClient(self._cassette(), sleep=sleeps.append)
+
+        replay.complete("slow")
+
+        assert sleeps == [0.0]
+
+    def test_recorded_latency(self):
+        """recordedはその応答の記録時間を倍率付きで待つ"""
+        sleeps = []
+        replay = CassetteLLMClient(
+            self._cassette(),
+            latency="recorded",
+            latency_scale=0.5,
+            sleep=sleeps.append,
+        )
+
+        replay.complete("slow")
+        replay.complete("fast")
+
+        assert sleeps == [1.5, 0.5]
+
+    def test_sampled_latency(self):
+        """sampledは記録全体の分布から選ぶ"""
+        sleeps = []
+        replay = CassetteLLMClient(
+            self._cassette(),
+            latency="sampled",
+            sleep=sleeps.append,
+            rng=random.Random(0),
+        )
+
+        for _ in range(20):
+            replay.complete("fast")
+
+        assert set(sleeps) == {1.0, 3.0}
+
+
+class TestCassetteAsync:
+    """非同期の記録・再生テストクラス"""
+
+    def test_async_round_trip(self):
+        """非同期クライアントの記録を非同期で再生"""
+        cassette = Cassette()
+        recorder = CassetteLLMClient(
+            cassette, client=MockAsyncLLMClient(responses={"q": "reply"})
+        )
+
+        async def run(client):
+            return await asyncio.gather(
+                client.acomplete("q"),
+                client.acomplete_with_system("sys", "q"),
+            )
+
+        recorded = asyncio.run(run(recorder))
+        replayed = asyncio.run(run(CassetteLLMClient(cassette)))
+
+        assert replayed == recorded == ["reply", "reply"]
+
+
+class TestCassetteReview:
+    """レビューの記録・再生テストクラス"""
+
+    def test_review_replays_offline(self, temp_python_file, tmp_path):
+        """記録したレビューを再生すると同じ指摘になる"""
+        path = tmp_path / "review.gz"
+        recorder = CassetteLLMClient(
+            path,
+            client=MockLLMClient(
+                responses={"レビュー": "[BUG] Line 2: Recorded finding\n"}
+            ),
+        )
+
+        def review(client):
+            reviewer = CodeReviewer(client=client, skip_license_check=True)
+            reviewer.analyzer.config.use_flake8 = False
+            return reviewer.review_file(temp_python_file)
+
+        recorded = review(recorder)
+        replayed = review(CassetteLLMClient(path))
+
+        assert replayed.ai_status == "ok"
+        assert [i.message for i in replayed.issues] == [
+            i.message for i in recorded.issues
+        ]
+        assert "Recorded finding" in [i.message for i in replayed.issues]
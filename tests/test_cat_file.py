@@ -0,0 +1,119 @@
+"""
+CatFileReader（常駐するgit cat-file --batch）のテスト
+"""
+
+import subprocess
+
+import pytest
+
+from devbuddy.integrations.cat_file import BlobCache, CatFileReader, GitObject
+
+
+def _blob(data: bytes) -> GitObject:
+    return GitObject(oid="0" * 40, type="blob", data=data)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """ファイルを1つコミットしたリポジトリ"""
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=tmp_path, check=True,
+            capture_output=True, text=True,
+        ).stdout.strip()
+
+    git("init", "-q")
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "empty.txt").write_text("")
+    git("add", ".")
+    git(
+        "-c", "user.name=t", "-c", "user.email=t@example.com",
+        "commit", "-qm", "init",
+    )
+    return tmp_path, git("rev-parse", "HEAD")
+
+
+class TestBlobCache:
+    """BlobCacheテストクラス"""
+
+    def test_evicts_least_recently_used(self):
+        """合計バイト数の上限を超えたら古い順に捨てる"""
+        cache = BlobCache(max_bytes=10)
+        cache.put("a", _blob(b"1234"))
+        cache.put("b", _blob(b"1234"))
+        cache.get("a")
+        cache.put("c", _blob(b"1234"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.size == 8
+
+    def test_oversized_not_cached(self):
+        """上限より大きいオブジェクトは保持しない"""
+        cache = BlobCache(max_bytes=3)
+        cache.put("a", _blob(b"1234"))
+
+        assert len(cache) == 0
+
+
+class TestCatFileReader:
+    """CatFileReaderテストクラス"""
+
+    def test_read_many_single_process(self, repo):
+        """多数の読み出しを1プロセスでパイプライン処理"""
+        path, head = repo
+        specs = [f"{head}:a.py", "HEAD:empty.txt", "HEAD:missing.py"] * 700
+
+        with CatFileReader(path) as reader:
+            objects = reader.read_many(specs)
+
+            assert reader.launches == 1
+        assert objects[0].data == b"x = 1\n"
+        assert objects[0].type == "blob"
+        assert objects[1].data == b""
+        assert objects[2] is None
+        assert len(objects) == len(specs)
+
+    def test_immutable_specs_cached(self, repo):
+        """コミットIDで指定した読み出しだけをキャッシュ"""
+        path, head = repo
+
+        with CatFileReader(path) as reader:
+            reader.read(f"{head}:a.py")
+            reader.read("HEAD:a.py")
+
+            assert len(reader.cache) == 1
+            assert reader.resolve("HEAD") == head
+            assert reader.resolve("no-such-branch") is None
+
+    def test_close_and_restart(self, repo):
+        """close()でプロセスを終了し、次の読み出しで起動し直す"""
+        path, _ = repo
+        reader = CatFileReader(path, max_cache_bytes=0)
+        reader.read("HEAD:a.py")
+        process = reader._process
+
+        reader.close()
+
+        assert process.poll() is not None
+        assert reader.read("HEAD:a.py").data == b"x = 1\n"
+        assert reader.launches == 2
+        reader.close()
+
+    def test_recovers_from_killed_process(self, repo):
+        """異常終了したプロセスは起動し直す"""
+        path, _ = repo
+        with CatFileReader(path) as reader:
+            reader.read("HEAD:a.py")
+            reader._process.kill()
+            reader._process.wait()
+
+            assert reader.read("HEAD:a.py").data == b"x = 1\n"
+            assert reader.launches == 2
+
+    def test_invalid_spec(self, repo):
+        """改行を含む指定は送らずNone"""
+        path, _ = repo
+        with CatFileReader(path) as reader:
+            assert reader.read("HEAD:a.py\nHEAD:a.py") is None
+            assert reader.launches == 0
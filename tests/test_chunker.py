@@ -0,0 +1,181 @@
+"""
+CodeChunkerのテスト
+"""
+
+from devbuddy.core.chunker import (
+    CodeChunk,
+    chunk_ranges,
+    enclosing_ranges,
+    estimate_tokens,
+    split_code,
+    split_units,
+)
+
+
+def _make_module(functions: int = 8, body_lines: int = 20) -> str:
+    """関数を並べた大きめのモジュールを生成"""
+    parts = ["import os", "from pathlib import Path", ""]
+    for i in range(functions):
+        parts.append("")
+        parts.append(f"def func_{i}(value):")
+        for j in range(body_lines):
+            parts.append(f"    value = value + {j}  # step {j} of func_{i}")
+        parts.append("    return value")
+    return "\n".join(parts) + "\n"
+
+
+class TestSplitCode:
+    """split_codeテストクラス"""
+
+    def test_small_code_not_split(self):
+        """予算内のコードは分割しない"""
+        assert split_code("x = 1\n", max_tokens=100) == []
+
+    def test_syntax_error_not_split(self):
+        """構文エラーのコードは分割しない"""
+        code = "def broken(\n" + "x = 1\n" * 500
+        assert split_code(code, max_tokens=50) == []
+
+    def test_split_at_function_boundaries(self):
+        """関数境界で分割し、全行を漏れなく覆う"""
+        code = _make_module()
+        lines = code.split("\n")
+        chunks = split_code(code, max_tokens=600)
+
+        assert len(chunks) > 1
+        assert chunks[0].start_line == 1
+        assert chunks[-1].end_line == len(lines)
+        for prev, chunk in zip(chunks, chunks[1:]):
+            assert chunk.start_line == prev.end_line + 1
+        for chunk in chunks:
+            target = lines[chunk.start_line - 1:chunk.end_line]
+            assert any(line.startswith("def ") for line in target)
+            assert estimate_tokens(chunk.code) <= 600
+
+    def test_header_has_imports_and_signatures(self):
+        """ヘッダにimportと他の関数のシグネチャを含む"""
+        code = _make_module()
+        chunk = split_code(code, max_tokens=600)[-1]
+        header = "\n".join(chunk.code.split("\n")[:chunk.header_lines])
+
+        assert "import os" in header
+        assert "def func_0(value):" in header
+        assert "step 3" not in header
+        assert "review target" in header
+
+    def test_large_class_split_at_methods(self):
+        """予算を超えるクラスはメソッド境界で分割"""
+        methods = "\n".join(
+            f"    def method_{i}(self):\n"
+            + "\n".join(f"        self.x = {j}  # padding" for j in range(20))
+            for i in range(6)
+        )
+        code = f"class Big:\n    '''Doc'''\n\n{methods}\n"
+        chunks = split_code(code, max_tokens=300)
+
+        assert len(chunks) > 1
+        assert "def method_5(self):" in chunks[0].code  # シグネチャのみ
+
+
+class TestCodeChunk:
+    """CodeChunk.to_file_lineテストクラス"""
+
+    def test_to_file_line(self):
+        """チャンク内の行番号を元ファイルの行番号に変換"""
+        chunk = CodeChunk(
+            code="", start_line=40, end_line=60, header_lines=5
+        )
+
+        assert chunk.to_file_line(3) is None  # ヘッダ
+        assert chunk.to_file_line(6) == 40
+        assert chunk.to_file_line(10) == 44
+        assert chunk.to_file_line(100) == 60  # 範囲外は末尾に丸める
+
+    def test_roundtrip_with_source_lines(self):
+        """変換後の行が元ファイルの同じ内容を指す"""
+        code = _make_module()
+        lines = code.split("\n")
+        for chunk in split_code(code, max_tokens=600):
+            chunk_lines = chunk.code.split("\n")
+            for index in range(chunk.header_lines, len(chunk_lines)):
+                file_line = chunk.to_file_line(index + 1)
+                assert lines[file_line - 1] == chunk_lines[index]
+
+
+class TestSplitUnits:
+    """split_units / chunk_rangesテストクラス"""
+
+    SOURCE = (
+        "import os\n"
+        "X = 1\n"
+        "\n"
+        "\n"
+        "def first():\n"
+        "    return os.getcwd()\n"
+        "\n"
+        "\n"
+        "class Second:\n"
+        "    pass\n"
+    )
+
+    def test_units_cover_file(self):
+        """定義ごと・連続する文ごとに単位を作る"""
+        units = split_units(self.SOURCE)
+
+        assert [(u.start_line, u.end_line) for u in units] == [
+            (1, 2), (3, 6), (7, 11),
+        ]
+
+    def test_fingerprint_ignores_position_and_comments(self):
+        """移動やコメントの変更ではフィンガープリントが変わらない"""
+        moved = "# header comment\n\n" + self.SOURCE.replace(
+            "def first():", "def first():  # entry"
+        )
+        before = [u.fingerprint for u in split_units(self.SOURCE)]
+        after = [u.fingerprint for u in split_units(moved)]
+
+        assert before == after
+
+    def test_fingerprint_changes_with_body(self):
+        """本体が変わればフィンガープリントも変わる"""
+        changed = self.SOURCE.replace("getcwd", "getcwdb")
+        before = split_units(self.SOURCE)
+        after = split_units(changed)
+
+        assert before[0].fingerprint == after[0].fingerprint
+        assert before[1].fingerprint != after[1].fingerprint
+
+    def test_chunk_ranges_only_given_lines(self):
+        """指定した範囲だけをレビュー対象にする"""
+        chunks = chunk_ranges(self.SOURCE, [(7, 11)])
+
+        assert len(chunks) == 1
+        assert chunks[0].start_line == 7
+        assert "os.getcwd()" not in chunks[0].code
+        assert "def first():" in chunks[0].code  # シグネチャはヘッダに含む
+
+    def test_enclosing_ranges(self):
+        """変更行を含む関数全体、関数外は前後の行を含む範囲"""
+        code = (
+            "import os\n"           # 1
+            "\n"
+            "\n"
+            "class Box:\n"          # 4
+            "    size = 1\n"        # 5
+            "\n"
+            "    def grow(self):\n"  # 7
+            "        def inner():\n"
+            "            return 2\n"  # 9
+            "        return inner()\n"
+            "\n"
+            "\n"
+            "def top():\n"          # 13
+            "    return os.sep\n"
+        )
+
+        assert enclosing_ranges(code, [9]) == [(7, 10)]
+        assert enclosing_ranges(code, [14, 13]) == [(13, 14)]
+        assert enclosing_ranges(code, [5], context=1) == [(4, 6)]
+        # 重なる範囲はまとめる
+        assert enclosing_ranges(code, [5, 9], context=1) == [(4, 10)]
+        assert enclosing_ranges("def broken(:\n", [1]) == []
@@ -3,10 +3,13 @@ CLIのテスト
 """
 
 import pytest
+from pathlib import Path
 from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 from devbuddy.cli import cli
+from devbuddy.core.models import Issue, ReviewResult
+from devbuddy.llm.client import TokenUsage
 
 
 class TestCLI:
@@ -99,6 +102,14 @@ class TestCLI:
 
             assert result.exit_code == 0
 
+    def test_mypy_daemon_status_stopped(self, runner, tmp_path):
+        """デーモン未起動時のstatus"""
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            result = runner.invoke(cli, ["mypy-daemon", "status"])
+
+            assert result.exit_code == 0
+            assert "stopped" in result.output
+
     def test_fix_command_help(self, runner):
         """fixコマンドヘルプ"""
         result = runner.invoke(cli, ["fix", "--help"])
@@ -157,6 +168,410 @@ class TestCLI:
 
             assert result.exit_code == 0
 
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_directory_with_jobs(
+        self, mock_reviewer_class, runner, tmp_path
+    ):
+        """--jobs指定で並列review"""
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_file.side_effect = lambda path, severity: (
+            ReviewResult(file_path=path)
+        )
+        mock_reviewer.review_batch.side_effect = lambda paths, severity: [
+            ReviewResult(file_path=path) for path in paths
+        ]
+        mock_reviewer_class.return_value = mock_reviewer
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            for name in ("b.py", "a.py", "c.py"):
+                with open(name, "w") as f:
+                    f.write("x = 1")
+
+            result = runner.invoke(
+                cli,
+                ["review", ".", "--jobs", "3", "--max-in-flight", "2",
+                 "-f", "json"],
+            )
+
+            assert result.exit_code == 0
+            # まとめレビューは既定で無効
+            assert mock_reviewer.review_file.call_count == 3
+            assert mock_reviewer.review_batch.call_count == 0
+            assert result.output.index("a.py") < result.output.index("c.py")
+
+            # review.batch_filesを指定すると小さなファイルをまとめる
+            with open(".devbuddy.yaml", "w") as f:
+                f.write("review:\n  batch_files: 8\n")
+            result = runner.invoke(cli, ["review", ".", "-f", "json"])
+
+            assert result.exit_code == 0
+            assert mock_reviewer.review_file.call_count == 3
+            assert mock_reviewer.review_batch.call_count == 1
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_stream(self, mock_reviewer_class, runner, tmp_path):
+        """--streamで問題を逐次表示"""
+        issue = Issue(level="bug", line=4, message="Streamed bug")
+
+        def review_streaming(path, on_issue, severity):
+            on_issue(issue)
+            return ReviewResult(file_path=path, issues=[issue])
+
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_file_streaming.side_effect = review_streaming
+        mock_reviewer_class.return_value = mock_reviewer
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            with open("test.py", "w") as f:
+                f.write("x = 1")
+
+            result = runner.invoke(cli, ["review", "test.py", "--stream"])
+
+            assert result.exit_code == 0
+            assert "test.py:[BUG] Line 4: Streamed bug" in result.output
+            assert "Summary: 1 bugs" in result.output
+            mock_reviewer.review_file.assert_not_called()
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_stdin(self, mock_reviewer_class, runner):
+        """PATHに - を指定すると標準入力をレビュー"""
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_code.side_effect = (
+            lambda code, path, severity: ReviewResult(file_path=path)
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+
+        result = runner.invoke(
+            cli,
+            ["review", "-", "--stdin-filename", "buf.py", "-f", "json"],
+            input="x = 1\n",
+        )
+
+        assert result.exit_code == 0
+        assert "buf.py" in result.output
+        args = mock_reviewer.review_code.call_args.args
+        assert args[0] == "x = 1\n"
+        assert mock_reviewer.analyzer.config.flake8_backend == "inprocess"
+        mock_reviewer.review_file.assert_not_called()
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_require_ai(self, mock_reviewer_class, runner):
+        """--require-aiはAIレビュー未実行なら終了コード2"""
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_code.side_effect = (
+            lambda code, path, severity: ReviewResult(
+                file_path=path, ai_status="unavailable", ai_error="down"
+            )
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+
+        lenient = runner.invoke(cli, ["review", "-"], input="x = 1\n")
+        strict = runner.invoke(
+            cli, ["review", "-", "--require-ai"], input="x = 1\n"
+        )
+
+        assert lenient.exit_code == 0
+        assert "AI review unavailable for 1 file(s)" in lenient.output
+        assert strict.exit_code == 2
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.LLMClient")
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_token_usage(
+        self, mock_reviewer_class, mock_client_class, runner
+    ):
+        """プロバイダが報告したトークン使用量とキャッシュ内訳を表示"""
+        mock_client_class.return_value.usage = TokenUsage(
+            requests=2, input_tokens=40, cache_write_tokens=900,
+            cache_read_tokens=900, output_tokens=25,
+        )
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_code.side_effect = (
+            lambda code, path, severity: ReviewResult(file_path=path)
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+
+        result = runner.invoke(cli, ["review", "-"], input="x = 1\n")
+
+        assert result.exit_code == 0
+        assert (
+            "Tokens: 1840 input (900 cached, 900 cache writes, "
+            "40 uncached), 25 output"
+        ) in result.output
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_model_routing(
+        self, mock_reviewer_class, runner, tmp_path
+    ):
+        """llm.routing.fast_modelを設定するとルーターを渡す"""
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_code.side_effect = (
+            lambda code, path, severity: ReviewResult(file_path=path)
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            with open(".devbuddy.yaml", "w") as f:
+                f.write(
+                    "llm:\n"
+                    "  routing:\n"
+                    "    fast_model: small-model\n"
+                    "    max_fast_lines: 80\n"
+                )
+            result = runner.invoke(cli, ["review", "-"], input="x = 1\n")
+
+        assert result.exit_code == 0
+        router = mock_reviewer_class.call_args.kwargs["router"]
+        assert router.policy.fast_model == "small-model"
+        assert router.policy.max_fast_lines == 80
+        default_client = mock_reviewer_class.call_args.kwargs["client"]
+        assert router.policy.strong_model == default_client.model
+        assert router.client_for(default_client.model) is default_client
+        assert router.client_for("small-model").model == "small-model"
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_routing_shares_rate_limiter(
+        self, mock_reviewer_class, runner, tmp_path
+    ):
+        """ルーティングした各モデルのクライアントで同じリミッターを使う"""
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_code.side_effect = (
+            lambda code, path, severity: ReviewResult(file_path=path)
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            with open(".devbuddy.yaml", "w") as f:
+                f.write(
+                    "llm:\n"
+                    "  requests_per_minute: 10\n"
+                    "  routing:\n"
+                    "    fast_model: small-model\n"
+                )
+            result = runner.invoke(cli, ["review", "-"], input="x = 1\n")
+            router = mock_reviewer_class.call_args.kwargs["router"]
+            fast_client = router.client_for("small-model")
+
+        assert result.exit_code == 0
+        default_client = mock_reviewer_class.call_args.kwargs["client"]
+        limiter = default_client.limiter
+        assert fast_client.limiter is limiter
+        # どちらのモデルへの送信も同じRPMのバケットから引かれる
+        default_client.client.complete = lambda prompt: "strong"
+        fast_client.client.complete = lambda prompt: "fast"
+        assert default_client.complete("a") == "strong"
+        assert fast_client.complete("b") == "fast"
+        assert limiter.stats().requests == 2
+        assert limiter.requests.available == pytest.approx(8, abs=0.1)
+
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_cassette_record_with_routing(
+        self, mock_reviewer_class, runner, tmp_path
+    ):
+        """ルーティングと記録を併用するとカセットを共有する"""
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_code.side_effect = (
+            lambda code, path, severity: ReviewResult(file_path=path)
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+        env = {
+            "DEVBUDDY_API_KEY": "test-key",
+            "DEVBUDDY_CASSETTE": str(tmp_path / "review.gz"),
+            "DEVBUDDY_CASSETTE_MODE": "record",
+        }
+
+        with patch.dict("os.environ", env, clear=True):
+            with runner.isolated_filesystem(temp_dir=tmp_path):
+                with open(".devbuddy.yaml", "w") as f:
+                    f.write("llm:\n  routing:\n    fast_model: small-model\n")
+                result = runner.invoke(
+                    cli, ["review", "-"], input="x = 1\n"
+                )
+            router = mock_reviewer_class.call_args.kwargs["router"]
+            fast_client = router.client_for("small-model")
+
+        assert result.exit_code == 0
+        default_client = mock_reviewer_class.call_args.kwargs["client"]
+        assert fast_client.recording is True
+        assert fast_client.cassette is default_client.cassette
+
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_cassette_replay(
+        self, mock_reviewer_class, runner, tmp_path
+    ):
+        """DEVBUDDY_CASSETTEの再生ではAPIキー無しで再生クライアントを使う"""
+        from devbuddy.llm.cassette import CassetteLLMClient
+
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_code.side_effect = (
+            lambda code, path, severity: ReviewResult(file_path=path)
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+        env = {
+            "DEVBUDDY_CASSETTE": str(tmp_path / "review.gz"),
+            "DEVBUDDY_CASSETTE_LATENCY": "recorded",
+        }
+
+        with patch.dict("os.environ", env, clear=True):
+            result = runner.invoke(cli, ["review", "-"], input="x = 1\n")
+
+        assert result.exit_code == 0
+        client = mock_reviewer_class.call_args.kwargs["client"]
+        assert isinstance(client, CassetteLLMClient)
+        assert client.recording is False
+        assert client.latency == "recorded"
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_diff(self, mock_reviewer_class, runner, tmp_path):
+        """--diffは作業ツリーの変更をreview_diff_hunksに渡す"""
+        import subprocess
+
+        received = []
+
+        def review_diff_hunks(file_diffs, severity, repo_root):
+            received.extend(file_diffs)
+            return [ReviewResult(file_path=repo_root / "app.py")]
+
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_diff_hunks.side_effect = review_diff_hunks
+        mock_reviewer_class.return_value = mock_reviewer
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            subprocess.run(["git", "init", "-q"], check=True)
+            Path("app.py").write_text("x = 1\n")
+            subprocess.run(["git", "add", "app.py"], check=True)
+            Path("app.py").write_text("x = 2\n")
+
+            result = runner.invoke(cli, ["review", ".", "--diff"])
+
+        assert result.exit_code == 0
+        assert [f.path for f in received] == ["app.py"]
+        assert received[0].changed_lines == [1]
+        call = mock_reviewer.review_diff_hunks.call_args
+        assert call.kwargs["repo_root"] == Path(".")
+        mock_reviewer.review_file.assert_not_called()
+
+    def _history_repo(self):
+        """a.py変更・b.py追加・c.py削除・d.py→e.pyの名前変更を含む履歴"""
+        import subprocess
+
+        def git(*args):
+            subprocess.run(
+                ["git", "-c", "user.name=t", "-c", "user.email=t@x",
+                 *args],
+                check=True, capture_output=True,
+            )
+
+        git("init", "-q")
+        for name in ("a.py", "c.py", "d.py", "notes.md"):
+            Path(name).write_text(f"# {name}\n" + "x = 1\n" * 10)
+        git("add", ".")
+        git("commit", "-qm", "base")
+        Path("a.py").write_text("# a.py\n" + "x = 2\n" * 10)
+        Path("b.py").write_text("y = 1\n")
+        Path("notes.md").write_text("changed\n")
+        git("rm", "-q", "c.py")
+        git("mv", "d.py", "e.py")
+        git("add", ".")
+        git("commit", "-qm", "change")
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_since(self, mock_reviewer_class, runner, tmp_path):
+        """--sinceは変更されたファイルだけをレビューし、削除は除く"""
+        reviewed = []
+
+        def review_batch(paths, severity):
+            reviewed.extend(p.as_posix() for p in paths)
+            return [ReviewResult(file_path=p) for p in paths]
+
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_file.side_effect = (
+            lambda path, severity: review_batch([path], severity)[0]
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            self._history_repo()
+            result = runner.invoke(
+                cli, ["review", ".", "--base", "HEAD~1", "-f", "json"]
+            )
+            unknown = runner.invoke(cli, ["review", ".", "--since", "nope"])
+
+        assert result.exit_code == 0
+        assert sorted(reviewed) == ["a.py", "b.py", "e.py"]
+        assert unknown.exit_code == 1
+        assert "Unknown revision: nope" in unknown.output
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_since_diff(self, mock_reviewer_class, runner, tmp_path):
+        """--since と --diff の併用は変更された関数のdiffを渡す"""
+        received = []
+
+        def review_diff_hunks(file_diffs, severity, repo_root):
+            received.extend(file_diffs)
+            return []
+
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_diff_hunks.side_effect = review_diff_hunks
+        mock_reviewer_class.return_value = mock_reviewer
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            self._history_repo()
+            result = runner.invoke(
+                cli, ["review", ".", "--since", "HEAD~1", "--diff"]
+            )
+
+        assert result.exit_code == 0
+        paths = {f.path: f for f in received}
+        assert set(paths) == {"a.py", "b.py", "c.py", "e.py"}
+        assert paths["e.py"].old_path == "d.py"
+        assert paths["c.py"].is_deleted
+
+    @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
+    @patch("devbuddy.cli.CodeReviewer")
+    def test_review_ignore_patterns(
+        self, mock_reviewer_class, runner, tmp_path
+    ):
+        """ignore_patterns・--exclude・.gitignoreで対象を絞り込む"""
+        reviewed = []
+
+        def review_batch(paths, severity):
+            reviewed.extend(p.as_posix() for p in paths)
+            return [ReviewResult(file_path=p) for p in paths]
+
+        mock_reviewer = MagicMock()
+        mock_reviewer.review_batch.side_effect = review_batch
+        mock_reviewer.review_file.side_effect = (
+            lambda path, severity: review_batch([path], severity)[0]
+        )
+        mock_reviewer_class.return_value = mock_reviewer
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            for name in ("app.py", "migrations/0001.py", "gen/api.py",
+                         "tmp/scratch.py", ".venv/site.py"):
+                Path(name).parent.mkdir(parents=True, exist_ok=True)
+                Path(name).write_text("x = 1\n")
+            Path(".gitignore").write_text("tmp/\n")
+            Path(".devbuddy.yaml").write_text(
+                "ignore_patterns:\n  - \"migrations/*\"\n"
+            )
+
+            result = runner.invoke(
+                cli, ["review", ".", "--exclude", "gen/*", "-f", "json"]
+            )
+
+        assert result.exit_code == 0
+        assert reviewed == ["app.py"]
+
     @patch.dict("os.environ", {"DEVBUDDY_API_KEY": "test-key"})
     @patch("devbuddy.cli.CodeReviewer")
     def test_review_no_python_files(
@@ -0,0 +1,212 @@
+"""
+SingleFlight（同時呼び出しの集約）のテスト
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from devbuddy.llm.async_client import AsyncLLMClient
+from devbuddy.llm.client import LLMClient
+from devbuddy.llm.coalesce import SingleFlight, prompt_key
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class BlockingCall:
+    """releaseされるまで戻らない呼び出し"""
+
+    def __init__(self, error: Exception | None = None):
+        self.release = threading.Event()
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, prompt: str) -> str:
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return f"response to {prompt}"
+
+
+def _run_threads(flight: SingleFlight, call: BlockingCall, keys: list[str]):
+    results: list[object] = [None] * len(keys)
+
+    def worker(i: int) -> None:
+        try:
+            results[i] = flight.do(keys[i], call, keys[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [
+        threading.Thread(target=worker, args=(i,)) for i in range(len(keys))
+    ]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestPromptKey:
+    """prompt_keyテストクラス"""
+
+    def test_model_and_parts(self):
+        """モデルと各要素の区切りがキーに反映される"""
+        assert prompt_key("m", None, "p") == prompt_key("m", None, "p")
+        assert prompt_key("m", None, "p") != prompt_key("other", None, "p")
+        assert prompt_key("m", "ab", "c") != prompt_key("m", "a", "bc")
+        assert prompt_key("m", None, "p") != prompt_key("m", "", "p")
+
+
+class TestSingleFlight:
+    """SingleFlightテストクラス"""
+
+    def test_threads_share_one_call(self):
+        """同じキーの同時呼び出しは1回だけ実行"""
+        flight = SingleFlight()
+        call = BlockingCall()
+
+        threads, results = _run_threads(flight, call, ["same"] * 8)
+        _wait_until(lambda: flight.shared == 7)
+        call.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert call.calls == 1
+        assert results == ["response to same"] * 8
+        assert flight.executed == 1
+        assert flight.in_flight == 0
+
+    def test_different_keys_run_separately(self):
+        """キーが違えば別々に実行"""
+        flight = SingleFlight()
+        call = BlockingCall()
+        call.release.set()
+
+        threads, results = _run_threads(flight, call, ["a", "b", "c"])
+        for thread in threads:
+            thread.join(5)
+
+        assert call.calls == 3
+        assert flight.shared == 0
+
+    def test_error_shared_then_retried(self):
+        """失敗は待っていた全員に共有され、次の呼び出しは再実行"""
+        flight = SingleFlight()
+        call = BlockingCall(error=ConnectionError("reset"))
+
+        threads, results = _run_threads(flight, call, ["k"] * 3)
+        _wait_until(lambda: flight.shared == 2)
+        call.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert call.calls == 1
+
+        call.error = None
+        assert flight.do("k", call, "k") == "response to k"
+        assert call.calls == 2
+
+    def test_async_tasks_share_one_call(self):
+        """asyncioタスクの同時呼び出しも1回にまとめる"""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch(prompt: str) -> str:
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            return prompt.upper()
+
+        async def run() -> list[str]:
+            return await asyncio.gather(
+                *(flight.ado("k", fetch, "abc") for _ in range(5))
+            )
+
+        assert asyncio.run(run()) == ["ABC"] * 5
+        assert len(calls) == 1
+        assert flight.shared == 4
+        assert flight.in_flight == 0
+
+    def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        """待っている1タスクのキャンセルは他に影響しない"""
+        flight = SingleFlight()
+
+        async def fetch() -> str:
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def run() -> str:
+            first = asyncio.ensure_future(flight.ado("k", fetch))
+            second = asyncio.ensure_future(flight.ado("k", fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(run()) == "done"
+
+
+class TestClientCoalescing:
+    """LLMClient/AsyncLLMClientへの組み込みテスト"""
+
+    def test_complete_coalesces_threads(self):
+        """同じプロンプトの同時completeは1回だけAPIを呼ぶ"""
+        client = LLMClient(api_key="sk-ant-test123")
+        call = BlockingCall()
+        client._complete_claude = call
+
+        threads = [
+            threading.Thread(target=client.complete, args=("review me",))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        _wait_until(lambda: client.inflight.shared == 3)
+        call.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert call.calls == 1
+
+    def test_model_is_part_of_key(self):
+        """モデルが違うクライアントの呼び出しはまとめない"""
+        flight = SingleFlight()
+        first = LLMClient(api_key="sk-ant-test123", model="model-a")
+        second = LLMClient(api_key="sk-ant-test123", model="model-b")
+        first.inflight = second.inflight = flight
+        call = BlockingCall()
+        call.release.set()
+        first._complete_claude = second._complete_claude = call
+
+        first.complete("p")
+        second.complete("p")
+
+        assert call.calls == 2
+
+    def test_acomplete_coalesces_tasks(self):
+        """同じプロンプトの同時acompleteは1回だけAPIを呼ぶ"""
+        client = AsyncLLMClient(api_key="sk-ant-test123")
+        calls = []
+
+        async def fake(system_prompt, user_prompt):
+            calls.append(user_prompt)
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        client._acomplete_claude = fake
+
+        async def run() -> list[str]:
+            return await asyncio.gather(
+                *(client.acomplete("same") for _ in range(3)),
+                client.acomplete_with_system("sys", "same"),
+            )
+
+        assert asyncio.run(run()) == ["ok"] * 4
+        assert calls == ["same", "same"]
@@ -0,0 +1,216 @@
+"""
+unified diffの解析と差分レビューのテスト
+"""
+
+from pathlib import Path
+
+from devbuddy.core.chunker import chunk_ranges
+from devbuddy.core.reviewer import CodeReviewer
+from devbuddy.integrations.diff import parse_unified_diff, unquote_path
+from devbuddy.llm.client import MockLLMClient
+
+DIFF = """diff --git a/src/app.py b/src/app.py
+index 1111111..2222222 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,4 +1,5 @@ import os
+ import os
+-x = 1
++x = 2
++y = 3
+
+ z = 4
+@@ -20 +21,0 @@ def run():
+-    gone()
+diff --git a/old.py b/new.py
+similarity index 95%
+rename from old.py
+rename to new.py
+diff --git a/removed.py b/removed.py
+deleted file mode 100644
+--- a/removed.py
++++ /dev/null
+@@ -1 +0,0 @@
+-print("bye")
+diff --git a/logo.png b/logo.png
+new file mode 100644
+Binary files /dev/null and b/logo.png differ
+"""
+
+SOURCE = """import os
+
+
+def first():
+    return os.getcwd()
+
+
+def second(value):
+    total = value * 2
+    return total
+
+
+def third():
+    return None
+"""
+
+
+class TestParseUnifiedDiff:
+    """parse_unified_diffテストクラス"""
+
+    def test_files_and_hunks(self):
+        """ファイル・ハンク・新側の行番号に分解"""
+        files = list(parse_unified_diff(DIFF))
+
+        assert [f.path for f in files] == [
+            "src/app.py", "new.py", "removed.py", "logo.png"
+        ]
+        app = files[0]
+        assert [(h.new_start, h.new_count) for h in app.hunks] == [
+            (1, 5), (21, 0)
+        ]
+        assert app.hunks[0].section == "import os"
+        assert app.hunks[0].added_lines == [2, 3]
+        assert (app.insertions, app.deletions) == (2, 2)
+        # 削除のみのハンクは削除位置
+        assert app.changed_lines == [2, 3, 21]
+
+    def test_file_status(self):
+        """名前変更・削除・新規・バイナリを判定"""
+        _, renamed, removed, binary = parse_unified_diff(DIFF)
+
+        assert renamed.is_rename and renamed.old_path == "old.py"
+        assert removed.is_deleted and removed.path == "removed.py"
+        assert binary.is_new and binary.binary
+
+    def test_streams_lines(self):
+        """行のイテラブルから1ファイルずつ返す"""
+        lines = iter(DIFF.splitlines(keepends=True))
+        files = parse_unified_diff(lines)
+
+        assert next(files).path == "src/app.py"
+        assert next(files).path == "new.py"
+
+    def test_quoted_path(self):
+        """引用符で囲まれた非ASCIIのパスを戻す"""
+        assert unquote_path('"b/\\346\\227\\245.py"') == "b/日.py"
+        assert unquote_path("b/plain.py") == "b/plain.py"
+
+
+class TestReviewDiff:
+    """CodeReviewer.review_diff/review_diff_hunksテストクラス"""
+
+    def _diff(self, path="pkg/mod.py"):
+        return (
+            f"diff --git a/{path} b/{path}\n"
+            f"--- a/{path}\n"
+            f"+++ b/{path}\n"
+            "@@ -9,2 +9,2 @@ def second(value):\n"
+            "-    total = value + 2\n"
+            "+    total = value * 2\n"
+            "     return total\n"
+            "diff --git a/gone.py b/gone.py\n"
+            "deleted file mode 100644\n"
+            "--- a/gone.py\n"
+            "+++ /dev/null\n"
+            "@@ -1 +0,0 @@\n"
+            "-x = 1\n"
+        )
+
+    def _reviewer(self, client):
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+        return reviewer
+
+    def test_reviews_only_enclosing_function(self, tmp_path):
+        """変更を含む関数だけを送り、実際のパスと新側の行番号で返す"""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text(SOURCE, encoding="utf-8")
+        chunk = chunk_ranges(SOURCE, [(8, 10)])[0]
+        client = MockLLMClient(responses={
+            "value * 2": (
+                f"[BUG] Line {chunk.header_lines + 2}: Check the factor\n"
+            ),
+        })
+
+        results = self._reviewer(client).review_diff_hunks(
+            self._diff(), severity="low", repo_root=tmp_path
+        )
+
+        assert [r.file_path for r in results] == [tmp_path / "pkg/mod.py"]
+        assert [(i.line, i.message) for i in results[0].issues] == [
+            (9, "Check the factor")
+        ]
+
+    def test_unchanged_functions_not_sent(self, tmp_path):
+        """変更の無い関数の本体はプロンプトに含めない"""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text(SOURCE, encoding="utf-8")
+        client = MockLLMClient()
+
+        self._reviewer(client).review_diff_hunks(
+            self._diff(), repo_root=tmp_path
+        )
+
+        assert len(client.call_history) == 1
+        prompt = client.call_history[0]
+        assert "total = value * 2" in prompt
+        assert "return os.getcwd()" not in prompt
+        assert "return None" not in prompt
+
+    def test_read_source(self):
+        """read_sourceで作業ツリー以外（インデックス等）の内容を使う"""
+        client = MockLLMClient()
+        read = []
+
+        def read_source(path):
+            read.append(path)
+            return SOURCE
+
+        results = self._reviewer(client).review_diff_hunks(
+            self._diff("a.py"), read_source=read_source
+        )
+
+        assert read == ["a.py"]
+        assert [str(r.file_path) for r in results] == ["a.py"]
+
+    def test_unreadable_file(self, tmp_path):
+        """読めないファイルはエラーの結果を返す"""
+        results = self._reviewer(MockLLMClient()).review_diff_hunks(
+            self._diff(), repo_root=tmp_path
+        )
+
+        assert results[0].success is False
+        assert "Failed to read file" in results[0].error
+
+    def test_review_diff_merges_results(self, tmp_path):
+        """review_diffはファイルごとの結果を1つにまとめて返す"""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text(SOURCE, encoding="utf-8")
+        chunk = chunk_ranges(SOURCE, [(8, 10)])[0]
+        client = MockLLMClient(responses={
+            "value * 2": (
+                f"[BUG] Line {chunk.header_lines + 2}: Check the factor\n"
+            ),
+        })
+
+        result = self._reviewer(client).review_diff(
+            self._diff() + self._diff("missing.py"),
+            severity="low",
+            repo_root=tmp_path,
+        )
+
+        assert result.file_path == Path("diff")
+        assert [(i.line, i.message) for i in result.issues] == [
+            (9, "pkg/mod.py: Check the factor")
+        ]
+        assert result.success is False
+        assert result.error.startswith("missing.py: Failed to read file")
+
+    def test_no_python_changes(self):
+        """Pythonファイルの変更が無ければ空"""
+        diff = DIFF.replace("src/app.py", "README.md")
+        client = MockLLMClient()
+
+        assert self._reviewer(client).review_diff_hunks(diff) == []
+        assert self._reviewer(client).review_diff(diff).issues == []
+        assert client.call_history == []
@@ -0,0 +1,142 @@
+"""
+FileDiscovery（レビュー対象ファイルの列挙）のテスト
+"""
+
+import subprocess
+
+import pytest
+
+from devbuddy.core.discovery import (
+    FileFilter,
+    GitIgnore,
+    discover_files,
+    match_glob,
+)
+
+
+def _touch(root, *paths):
+    for path in paths:
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("x = 1\n")
+
+
+def _names(root, paths):
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """.gitignore・依存ディレクトリ・複数言語を含むツリー"""
+    _touch(
+        tmp_path,
+        "app.py",
+        "pkg/core.py",
+        "pkg/generated/api.py",
+        "pkg/migrations/0001_init.py",
+        "web/index.ts",
+        "web/node_modules/lib/index.js",
+        ".venv/lib/site.py",
+        "build/lib/app.py",
+        "logs/keep.py",
+        "logs/debug.py",
+        "notes.txt",
+    )
+    (tmp_path / ".gitignore").write_text(
+        "# generated code\n/pkg/generated/\nlogs/*\n!logs/keep.py\n"
+    )
+    return tmp_path
+
+
+class TestMatchGlob:
+    """match_globテストクラス"""
+
+    def test_matches_at_any_depth(self):
+        """/で始まらないパターンは任意の階層から一致"""
+        assert match_glob("app/migrations/0001.py", "migrations/*")
+        assert match_glob("a/b/c.generated.py", "*.generated.py")
+        assert not match_glob("app/models.py", "migrations/*")
+
+    def test_anchored(self):
+        """/で始まるパターンはルートからのみ一致"""
+        assert match_glob("migrations/x.py", "/migrations/*")
+        assert not match_glob("app/migrations/x.py", "/migrations/*")
+
+
+class TestGitIgnore:
+    """GitIgnoreテストクラス"""
+
+    def test_rules(self):
+        """否定・ディレクトリ限定・ルート固定のパターン"""
+        ignore = GitIgnore("", ["*.log", "!keep.log", "out/", "/top.py"])
+
+        assert ignore.match("a/b.log", False) is True
+        assert ignore.match("keep.log", False) is False
+        assert ignore.match("out", True) is True
+        assert ignore.match("out", False) is None
+        assert ignore.match("top.py", False) is True
+        assert ignore.match("sub/top.py", False) is None
+
+    def test_nested_base(self):
+        """サブディレクトリの.gitignoreはその配下だけに適用"""
+        ignore = GitIgnore("pkg", ["tmp_*.py"])
+
+        assert ignore.match("pkg/tmp_a.py", False) is True
+        assert ignore.match("tmp_a.py", False) is None
+
+    def test_double_star(self):
+        """**は任意の階層に一致"""
+        ignore = GitIgnore("", ["docs/**/draft.py"])
+
+        assert ignore.match("docs/draft.py", False) is True
+        assert ignore.match("docs/a/b/draft.py", False) is True
+
+
+class TestDiscoverFiles:
+    """discover_filesテストクラス"""
+
+    def test_walk_honours_gitignore(self, tree):
+        """リポジトリ外では.gitignoreと既定の除外ディレクトリを守る"""
+        files = discover_files(tree, use_git=False)
+
+        assert _names(tree, files) == [
+            "app.py",
+            "logs/keep.py",
+            "pkg/core.py",
+            "pkg/migrations/0001_init.py",
+        ]
+
+    def test_languages_and_globs(self, tree):
+        """言語とinclude/excludeのglobで絞り込む"""
+        file_filter = FileFilter(
+            languages=("python", "typescript"),
+            exclude=["migrations/*, logs/*"],
+        )
+
+        files = discover_files(tree, file_filter, use_git=False)
+
+        assert _names(tree, files) == ["app.py", "pkg/core.py", "web/index.ts"]
+        only_pkg = FileFilter(include=["pkg/*"])
+        assert _names(
+            tree, discover_files(tree, only_pkg, use_git=False)
+        ) == ["pkg/core.py", "pkg/migrations/0001_init.py"]
+
+    def test_unknown_language(self):
+        """未対応の言語はエラー"""
+        with pytest.raises(ValueError, match="cobol"):
+            FileFilter(languages=("cobol",))
+
+    def test_git_ls_files(self, tree):
+        """リポジトリ内ではgit ls-filesで追跡中と未追跡のファイルを列挙"""
+        (tree / ".gitignore").write_text(
+            "/pkg/generated/\nlogs/*\n!logs/keep.py\n"
+            ".venv/\nbuild/\nnode_modules/\n"
+        )
+        subprocess.run(["git", "init", "-q"], cwd=tree, check=True)
+        subprocess.run(["git", "add", "app.py"], cwd=tree, check=True)
+        (tree / "app.py").unlink()
+
+        files = discover_files(tree, FileFilter(exclude=["migrations/*"]))
+
+        # 削除済みの追跡ファイルは除く
+        assert _names(tree, files) == ["logs/keep.py", "pkg/core.py"]
@@ -49,6 +49,19 @@ class TestTextFormatter:
         assert "0 bugs" in output
         assert "0 warnings" in output
 
+    def test_format_review_ai_unavailable(self):
+        """AIレビュー未実行のファイルを警告"""
+        formatter = TextFormatter()
+        results = [
+            ReviewResult(
+                file_path=Path("down.py"),
+                ai_status="unavailable",
+                ai_error="connection reset",
+            )
+        ]
+        output = formatter.format_review(results)
+        assert "AI review unavailable for down.py: connection reset" in output
+
     def test_format_testgen_success(self):
         """成功したテスト生成結果フォーマット"""
         formatter = TextFormatter()
@@ -162,6 +175,22 @@ class TestJSONFormatter:
         assert len(data["suggestions"]) == 1
         assert data["suggestions"][0]["file_path"] == "fix.py"
 
+    def test_format_review_ai_status(self):
+        """AIレビューの実行結果を出力"""
+        formatter = JSONFormatter()
+        results = [
+            ReviewResult(file_path=Path("a.py")),
+            ReviewResult(
+                file_path=Path("b.py"),
+                ai_status="unavailable",
+                ai_error="timeout",
+            ),
+        ]
+        data = json.loads(formatter.format_review(results))
+        assert data["results"][0]["ai_status"] == "ok"
+        assert data["results"][1]["ai_status"] == "unavailable"
+        assert data["results"][1]["ai_error"] == "timeout"
+
 
 class TestMarkdownFormatter:
     """MarkdownFormatterのテスト"""
@@ -2,6 +2,8 @@
 GitOperationsのテスト
 """
 
+import subprocess
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -135,6 +137,39 @@ class TestGitOperationsWithMock:
         call_args = mock_run.call_args[0][0]
         assert "--cached" in call_args
 
+    @patch("devbuddy.integrations.git.subprocess.run")
+    def test_get_changed_files_renames(self, mock_run, mock_git_repo):
+        """名前変更の検出・削除の除外・パス指定"""
+        mock_run.return_value = MagicMock(
+            stdout='new.py\n"\\346\\227\\245.py"\n',
+            returncode=0
+        )
+
+        ops = GitOperations(repo_path=mock_git_repo)
+        files = ops.get_changed_files(
+            commit="main", detect_renames=True, exclude_deleted=True,
+            paths=["src"],
+        )
+
+        assert files == ["new.py", "日.py"]
+        call_args = mock_run.call_args[0][0]
+        assert "--find-renames" in call_args
+        assert "--diff-filter=d" in call_args
+        assert call_args[-2:] == ["--", "src"]
+
+    @patch("devbuddy.integrations.git.subprocess.run")
+    def test_get_merge_base(self, mock_run, mock_git_repo):
+        """共通祖先の取得（失敗時はNone）"""
+        mock_run.return_value = MagicMock(stdout="abc123\n", returncode=0)
+        ops = GitOperations(repo_path=mock_git_repo)
+
+        assert ops.get_merge_base("main") == "abc123"
+        assert mock_run.call_args[0][0] == [
+            "git", "merge-base", "main", "HEAD"
+        ]
+        mock_run.return_value = MagicMock(stdout="", returncode=128)
+        assert ops.get_merge_base("nope") is None
+
     @patch("devbuddy.integrations.git.subprocess.run")
     def test_get_file_diff(self, mock_run, mock_git_repo):
         """ファイルdiff取得"""
@@ -234,34 +269,6 @@ class TestGitOperationsWithMock:
 
         assert result is False
 
-    @patch("devbuddy.integrations.git.subprocess.run")
-    def test_get_file_content_at_commit(self, mock_run, mock_git_repo):
-        """特定コミット時点のファイル内容"""
-        mock_run.return_value = MagicMock(
-            stdout="old content",
-            returncode=0
-        )
-
-        ops = GitOperations(repo_path=mock_git_repo)
-        content = ops.get_file_content_at_commit("file.py", "HEAD~1")
-
-        assert content == "old content"
-
-    @patch("devbuddy.integrations.git.subprocess.run")
-    def test_get_file_content_at_commit_not_found(
-        self, mock_run, mock_git_repo
-    ):
-        """存在しないファイル"""
-        mock_run.return_value = MagicMock(
-            stdout="",
-            returncode=128
-        )
-
-        ops = GitOperations(repo_path=mock_git_repo)
-        content = ops.get_file_content_at_commit("nonexistent.py")
-
-        assert content is None
-
     @patch("devbuddy.integrations.git.subprocess.run")
     def test_get_hooks_path(self, mock_run, mock_git_repo):
         """hooksパス取得"""
@@ -297,7 +304,7 @@ class TestGitOperationsWithMock:
     def test_get_diff(self, mock_run, mock_git_repo):
         """diff取得"""
         mock_run.return_value = MagicMock(
-            stdout="@@ -1 +1 @@\n-old\n+new",
+            stdout="1\t1\ta.py\0\0@@ -1 +1 @@\n-old\n+new",
             returncode=0
         )
 
@@ -305,7 +312,9 @@ class TestGitOperationsWithMock:
         diff = ops.get_diff()
 
         assert isinstance(diff, DiffInfo)
-        assert "@@ -1 +1 @@" in diff.content
+        assert diff.content == "@@ -1 +1 @@\n-old\n+new"
+        # 統計とパッチを1回のgit diffで取得
+        assert mock_run.call_count == 1
 
     @patch("devbuddy.integrations.git.subprocess.run")
     def test_get_diff_staged(self, mock_run, mock_git_repo):
@@ -342,20 +351,14 @@ class TestGitOperationsWithMock:
 
     @patch("devbuddy.integrations.git.subprocess.run")
     def test_get_diff_with_stat(self, mock_run, mock_git_repo):
-        """統計付きdiff取得"""
-        # diffコマンドとstatコマンドで異なる結果を返す
-        def mock_run_side_effect(args, **kwargs):
-            if "--stat" in args:
-                return MagicMock(
-                    stdout="3 files changed, 10 insertions(+), 5 deletions(-)",
-                    returncode=0
-                )
-            return MagicMock(
-                stdout="diff content",
-                returncode=0
-            )
-
-        mock_run.side_effect = mock_run_side_effect
+        """numstatから統計を集計（バイナリ・名前変更を含む）"""
+        mock_run.return_value = MagicMock(
+            stdout=(
+                "7\t3\ta.py\0-\t-\tlogo.png\0"
+                "3\t2\t\0old.py\0new.py\0\0diff content"
+            ),
+            returncode=0,
+        )
 
         ops = GitOperations(repo_path=mock_git_repo)
         diff = ops.get_diff()
@@ -363,6 +366,7 @@ class TestGitOperationsWithMock:
         assert diff.files_changed == 3
         assert diff.insertions == 10
         assert diff.deletions == 5
+        assert diff.content == "diff content"
 
     @patch("devbuddy.integrations.git.subprocess.run")
     def test_get_changed_files_with_commit(self, mock_run, mock_git_repo):
@@ -448,3 +452,93 @@ class TestGitOperationsWithMock:
             result = ops.install_pre_commit_hook("#!/bin/sh\necho test")
             # 失敗時はFalse
             assert result is False
+
+
+class TestIterDiff:
+    """GitOperations.iter_diffテストクラス（実際のgitを使用）"""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        def git(*args):
+            subprocess.run(
+                ["git", *args], cwd=tmp_path, check=True,
+                capture_output=True,
+            )
+
+        git("init", "-q")
+        (tmp_path / "app.py").write_text("a\nb\n")
+        (tmp_path / "old.py").write_text("q\n" * 20)
+        (tmp_path / "data.bin").write_bytes(b"\0bin")
+        git("add", ".")
+        git(
+            "-c", "user.name=t", "-c", "user.email=t@example.com",
+            "commit", "-qm", "init",
+        )
+        (tmp_path / "app.py").write_text("a\nB\nc\n")
+        git("mv", "old.py", "new.py")
+        (tmp_path / "new.py").write_text("q\n" * 20 + "r\n")
+        (tmp_path / "data.bin").write_bytes(b"\0bin2")
+        (tmp_path / "日本.py").write_text("x = 1\n")
+        git("add", "-A")
+        return GitOperations(repo_path=tmp_path)
+
+    def test_per_file_records(self, repo):
+        """ファイルごとのハンクと追加・削除数を返す"""
+        files = {f.path: f for f in repo.iter_diff(staged=True)}
+
+        assert set(files) == {"app.py", "new.py", "data.bin", "日本.py"}
+        app = files["app.py"]
+        assert (app.insertions, app.deletions) == (2, 1)
+        assert app.changed_lines == [2, 3]
+        assert files["new.py"].old_path == "old.py"
+        assert files["data.bin"].binary is True
+        assert files["日本.py"].is_new
+
+    def test_matches_get_diff(self, repo):
+        """get_diffの統計と一致"""
+        info = repo.get_diff(staged=True)
+        files = list(repo.iter_diff(staged=True))
+
+        assert info.files_changed == len(files) == 4
+        assert info.insertions == sum(f.insertions for f in files)
+        assert info.deletions == sum(f.deletions for f in files)
+        assert info.content.startswith("diff --git")
+
+    def test_large_diff_streamed(self, repo):
+        """パイプのバッファを超えるdiffも途中で止められる"""
+        big = "".join(f"line_{i} = {i}\n" for i in range(50000))
+        (repo.repo_path / "big.py").write_text(big)
+        subprocess.run(
+            ["git", "add", "big.py"], cwd=repo.repo_path, check=True
+        )
+
+        files = repo.iter_diff(staged=True)
+        first = next(files)
+        files.close()
+
+        assert first.path in {"app.py", "big.py"}
+
+    def test_no_changes(self, repo):
+        """変更が無ければ何も返さない"""
+        assert list(repo.iter_diff()) == []
+
+    def test_get_file_content_at_commit(self, repo):
+        """特定コミット時点・インデックスのファイル内容"""
+        with repo:
+            assert repo.get_file_content_at_commit("app.py") == "a\nb\n"
+            assert repo.get_file_content_at_commit("app.py", "") == (
+                "a\nB\nc\n"
+            )
+            assert repo.get_file_content_at_commit("nonexistent.py") is None
+            assert repo.get_file_content_at_commit("app.py", "nope") is None
+
+    def test_get_files_at_commit_one_process(self, repo):
+        """複数ファイルを1つのcat-fileプロセスで読む"""
+        with repo:
+            contents = repo.get_files_at_commit(["app.py", "old.py"])
+            repo.get_files_at_commit(["app.py"], "HEAD")
+
+            assert contents == {"app.py": "a\nb\n", "old.py": "q\n" * 20}
+            assert repo.objects.launches == 1
+            # コミットIDに解決した読み出しはLRUに入る
+            assert len(repo.objects.cache) == 2
@@ -157,6 +157,34 @@ class TestPatternAnalysis:
         assert console_issue is not None
         assert console_issue.line == 2
 
+    def test_multiple_rules_same_line_in_rule_order(self):
+        """1行に複数該当する場合はルール順に並ぶ"""
+        analyzer = JavaScriptAnalyzer()
+        code = "\n\nvar a = eval(x) == 1; // todo\r\nconst ok = 1;"
+        issues = analyzer._analyze_patterns(code)
+        assert [(i.line, i.message) for i in issues] == [
+            (3, "Potentially dangerous eval() usage"),
+            (3, "Non-strict equality (==) used"),
+            (3, "var keyword used"),
+            (3, "TODO/FIXME comment found"),
+        ]
+
+    def test_non_ascii_source(self):
+        """非ASCIIのコードでも大文字小文字を無視して検出"""
+        analyzer = JavaScriptAnalyzer()
+        code = "const 名前 = 'ü';\n// FixMe: 修正\nconsole.info(名前);"
+        issues = analyzer._analyze_patterns(code)
+        assert [(i.line, i.level) for i in issues] == [
+            (2, "info"),
+            (3, "info"),
+        ]
+
+    def test_no_candidate_lines(self):
+        """該当しうる行が無ければ空"""
+        analyzer = JavaScriptAnalyzer()
+        code = "const x = 1;\nlet y = x + 2;\n" * 100
+        assert analyzer._analyze_patterns(code) == []
+
 
 class TestSyntaxCheck:
     """構文チェックのテスト"""
@@ -304,6 +304,20 @@ class TestUsageLimits:
         with pytest.raises(UsageLimitError, match=err_msg):
             manager.check_review_limit()
 
+    def test_try_reserve_review(self, temp_dir):
+        """チェックと記録を同時に行い、解放で戻す"""
+        manager = LicenseManager(data_dir=temp_dir)
+        usage = manager.get_usage()
+        usage.reviews = 49
+        manager._save_usage()
+
+        assert manager.try_reserve_review() is True
+        with pytest.raises(UsageLimitError):
+            manager.try_reserve_review()
+        manager.release_review()
+
+        assert manager.get_usage().reviews == 49
+
     def test_check_file_size_within(self, temp_dir):
         """制限内のファイルサイズ"""
         manager = LicenseManager(data_dir=temp_dir)
@@ -456,3 +470,32 @@ class TestEnvironmentVariable:
                 license_key="DB-TEAM-explicit"
             )
             assert manager.license_key == "DB-TEAM-explicit"
+
+
+class TestParallelReservation:
+    """並列レビュー時の利用量確保テストクラス"""
+
+    def test_parallel_review_within_limit(self, tmp_path):
+        """--jobs並列でも上限を超えてレビューしない"""
+        from devbuddy.core.reviewer import CodeReviewer
+        from devbuddy.core.scheduler import ReviewScheduler
+        from devbuddy.llm.client import MockLLMClient
+
+        files = []
+        for i in range(8):
+            path = tmp_path / f"mod_{i}.py"
+            path.write_text(f"def f{i}():\n    return {i}\n")
+            files.append(path)
+        manager = LicenseManager(data_dir=tmp_path / ".devbuddy")
+        usage = manager.get_usage()
+        usage.reviews = 47  # Freeプラン: 50回/月
+        manager._save_usage()
+        reviewer = CodeReviewer(
+            client=MockLLMClient(), license_manager=manager
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        results = ReviewScheduler(reviewer, jobs=8).run(files)
+
+        assert sum(r.success for r in results) == 3
+        assert manager.get_usage().reviews == 50
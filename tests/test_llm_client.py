@@ -10,6 +10,7 @@ from devbuddy.llm.client import (
     LLMConfig,
     MockLLMClient,
     BaseLLMClient,
+    TokenUsage,
 )
 
 
@@ -381,3 +382,346 @@ class TestLLMClientCompleteWithSystem:
                 sys.modules["openai"] = old_openai
             elif "openai" in sys.modules:
                 del sys.modules["openai"]
+
+
+class TestPromptCaching:
+    """プロンプトキャッシュとトークン使用量のテスト"""
+
+    def test_claude_system_cache_control(self):
+        """Claudeのシステムプロンプトにcache_controlを付け、usageを記録"""
+        import sys
+        from unittest.mock import MagicMock
+
+        mock_anthropic = MagicMock()
+        usage = type("Usage", (), {
+            "input_tokens": 50,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 1200,
+            "output_tokens": 30,
+        })()
+        mock_content = type("MockContent", (), {"text": "ok"})()
+        mock_message = type(
+            "MockMessage", (), {"content": [mock_content], "usage": usage}
+        )()
+        mock_client = mock_anthropic.Anthropic.return_value
+        mock_client.messages.create.return_value = mock_message
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            client = LLMClient(api_key="sk-ant-test123")
+            client.complete_with_system("instructions", "code")
+            kwargs = mock_client.messages.create.call_args.kwargs
+        finally:
+            del sys.modules["anthropic"]
+
+        assert kwargs["system"] == [{
+            "type": "text",
+            "text": "instructions",
+            "cache_control": {"type": "ephemeral"},
+        }]
+        assert client.usage == TokenUsage(
+            requests=1,
+            input_tokens=50,
+            cache_read_tokens=1200,
+            output_tokens=30,
+        )
+        assert client.usage.cache_hit_ratio == pytest.approx(1200 / 1250)
+
+    def test_prompt_caching_disabled(self):
+        """prompt_cachingを無効にすると文字列のまま送る"""
+        client = LLMClient(api_key="sk-ant-test123")
+        client.config.prompt_caching = False
+
+        assert client._claude_system("instructions") == "instructions"
+
+    def test_openai_cached_tokens(self):
+        """OpenAIのcached_tokensをキャッシュ読み込みとして記録"""
+        import sys
+        from unittest.mock import MagicMock
+
+        details = type("Details", (), {"cached_tokens": 1024})()
+        usage = type("Usage", (), {
+            "prompt_tokens": 1100,
+            "completion_tokens": 20,
+            "prompt_tokens_details": details,
+        })()
+        mock_message = type("MockMessage", (), {"content": "ok"})()
+        mock_choice = type("MockChoice", (), {"message": mock_message})()
+        mock_response = type(
+            "MockResponse", (), {"choices": [mock_choice], "usage": usage}
+        )()
+        mock_openai = MagicMock()
+        mock_client = mock_openai.OpenAI.return_value
+        mock_client.chat.completions.create.return_value = mock_response
+        sys.modules["openai"] = mock_openai
+
+        try:
+            client = LLMClient(api_key="sk-proj-test123")
+            client.complete_with_system("instructions", "code")
+        finally:
+            del sys.modules["openai"]
+
+        assert client.usage.cache_read_tokens == 1024
+        assert client.usage.input_tokens == 76
+        assert client.usage.total_input_tokens == 1100
+
+    def test_stream_with_system(self):
+        """ストリーミングでもシステムプロンプトを分けて送る"""
+        import sys
+        from unittest.mock import MagicMock
+
+        mock_anthropic = MagicMock()
+        mock_client = mock_anthropic.Anthropic.return_value
+        messages = mock_client.messages
+        stream = messages.stream.return_value.__enter__.return_value
+        stream.text_stream = iter(["a", "b"])
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            client = LLMClient(api_key="sk-ant-test123")
+            chunks = list(
+                client.complete_stream_with_system("instructions", "code")
+            )
+            kwargs = mock_client.messages.stream.call_args.kwargs
+        finally:
+            del sys.modules["anthropic"]
+
+        assert chunks == ["a", "b"]
+        assert kwargs["system"][0]["text"] == "instructions"
+        assert kwargs["messages"] == [{"role": "user", "content": "code"}]
+
+    def test_base_with_system_fallback(self):
+        """システムプロンプト非対応のクライアントは連結して送る"""
+        client = MockLLMClient()
+
+        client.complete_with_system("instructions", "code")
+
+        assert client.call_history == ["instructions\n\ncode"]
+
+
+class TestLLMClientPooling:
+    """SDKクライアント再利用のテスト"""
+
+    def _mock_anthropic(self):
+        from unittest.mock import MagicMock
+
+        mock_anthropic = MagicMock()
+        mock_content = type("MockContent", (), {"text": "ok"})()
+        mock_message = type("MockMessage", (), {"content": [mock_content]})()
+        mock_client = mock_anthropic.Anthropic.return_value
+        mock_client.messages.create.return_value = mock_message
+        return mock_anthropic
+
+    def test_sdk_client_built_once(self):
+        """複数回の呼び出しでSDKクライアントを再利用"""
+        import sys
+
+        mock_anthropic = self._mock_anthropic()
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            client = LLMClient(api_key="sk-ant-test123")
+            client.complete("one")
+            client.complete("two")
+            client.complete_with_system("sys", "three")
+
+            assert mock_anthropic.Anthropic.call_count == 1
+        finally:
+            del sys.modules["anthropic"]
+
+    def test_timeout_and_pool_size_applied(self):
+        """タイムアウトとプールサイズがSDKに渡される"""
+        import sys
+
+        mock_anthropic = self._mock_anthropic()
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            client = LLMClient(
+                api_key="sk-ant-test123", timeout=15, max_connections=3
+            )
+            client.complete("prompt")
+
+            kwargs = mock_anthropic.Anthropic.call_args.kwargs
+            assert kwargs["timeout"] == 15
+            assert client.config.max_connections == 3
+            assert kwargs.get("http_client") is client._http_client
+        finally:
+            client.close()
+            del sys.modules["anthropic"]
+
+    def test_close_resets_client(self):
+        """close後は再生成される"""
+        import sys
+
+        mock_anthropic = self._mock_anthropic()
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            with LLMClient(api_key="sk-ant-test123") as client:
+                client.complete("one")
+            client.complete("two")
+
+            assert mock_anthropic.Anthropic.call_count == 2
+        finally:
+            client.close()
+            del sys.modules["anthropic"]
+
+    def test_http_client_pool_limits(self):
+        """httpxのクライアントにプール上限を指定"""
+        import httpx
+
+        client = LLMClient(api_key="sk-ant-test123", max_connections=3)
+        http_client = client._build_http_client()
+        try:
+            assert isinstance(http_client, httpx.Client)
+            pool = http_client._transport._pool
+            assert pool._max_connections == 3
+            assert pool._max_keepalive_connections == 3
+        finally:
+            http_client.close()
+
+    def test_close_closes_sdk_client(self):
+        """closeでSDKクライアントも閉じる"""
+        import sys
+
+        mock_anthropic = self._mock_anthropic()
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            client = LLMClient(api_key="sk-ant-test123")
+            client.complete("one")
+            client.close()
+
+            mock_anthropic.Anthropic.return_value.close.assert_called_once()
+            assert client._http_client is None
+        finally:
+            del sys.modules["anthropic"]
+
+    def test_openai_client_built_once(self):
+        """OpenAIクライアントも再利用"""
+        import sys
+        from unittest.mock import MagicMock
+
+        mock_openai = MagicMock()
+        mock_message = type("MockMessage", (), {"content": "ok"})()
+        mock_choice = type("MockChoice", (), {"message": mock_message})()
+        mock_response = type("MockResponse", (), {"choices": [mock_choice]})()
+        mock_client = mock_openai.OpenAI.return_value
+        mock_client.chat.completions.create.return_value = mock_response
+        sys.modules["openai"] = mock_openai
+
+        try:
+            client = LLMClient(api_key="sk-proj-test123")
+            client.complete("one")
+            client.complete_with_system("sys", "two")
+
+            assert mock_openai.OpenAI.call_count == 1
+        finally:
+            client.close()
+            del sys.modules["openai"]
+
+
+class TestLLMClientStream:
+    """complete_streamのテスト"""
+
+    def test_stream_claude(self):
+        """Claude APIのストリーミング"""
+        import sys
+        from unittest.mock import MagicMock
+
+        mock_anthropic = MagicMock()
+        mock_client = mock_anthropic.Anthropic.return_value
+        manager = mock_client.messages.stream.return_value
+        stream = manager.__enter__.return_value
+        stream.text_stream = iter(["[BUG] Li", "ne 1: x\n"])
+        sys.modules["anthropic"] = mock_anthropic
+
+        try:
+            client = LLMClient(api_key="sk-ant-test123")
+            chunks = list(client.complete_stream("prompt"))
+
+            assert chunks == ["[BUG] Li", "ne 1: x\n"]
+        finally:
+            del sys.modules["anthropic"]
+
+    def test_stream_openai(self):
+        """OpenAI APIのストリーミング"""
+        import sys
+        from unittest.mock import MagicMock
+
+        def chunk(content):
+            delta = type("Delta", (), {"content": content})()
+            choice = type("Choice", (), {"delta": delta})()
+            return type("Chunk", (), {"choices": [choice]})()
+
+        empty = type("Chunk", (), {"choices": []})()
+        mock_openai = MagicMock()
+        mock_client = mock_openai.OpenAI.return_value
+        mock_client.chat.completions.create.return_value = iter(
+            [chunk("a"), empty, chunk(None), chunk("b")]
+        )
+        sys.modules["openai"] = mock_openai
+
+        try:
+            client = LLMClient(api_key="sk-proj-test123")
+
+            assert list(client.complete_stream("prompt")) == ["a", "b"]
+            kwargs = mock_client.chat.completions.create.call_args.kwargs
+            assert kwargs["stream"] is True
+        finally:
+            del sys.modules["openai"]
+
+    def test_stream_openai_usage(self):
+        """OpenAIのストリーミングでも最後のusageチャンクを記録"""
+        import sys
+        from unittest.mock import MagicMock
+
+        delta = type("Delta", (), {"content": "ok"})()
+        choice = type("Choice", (), {"delta": delta})()
+        text = type("Chunk", (), {"choices": [choice], "usage": None})()
+        details = type("Details", (), {"cached_tokens": 1024})()
+        usage = type("Usage", (), {
+            "prompt_tokens": 1100,
+            "completion_tokens": 20,
+            "prompt_tokens_details": details,
+        })()
+        final = type("Chunk", (), {"choices": [], "usage": usage})()
+        mock_openai = MagicMock()
+        mock_client = mock_openai.OpenAI.return_value
+        mock_client.chat.completions.create.return_value = iter(
+            [text, final]
+        )
+        sys.modules["openai"] = mock_openai
+
+        try:
+            client = LLMClient(api_key="sk-proj-test123")
+
+            assert list(
+                client.complete_stream_with_system("instructions", "code")
+            ) == ["ok"]
+            kwargs = mock_client.chat.completions.create.call_args.kwargs
+            assert kwargs["stream_options"] == {"include_usage": True}
+        finally:
+            del sys.modules["openai"]
+
+        assert client.usage.requests == 1
+        assert client.usage.cache_read_tokens == 1024
+        assert client.usage.input_tokens == 76
+        assert client.usage.output_tokens == 20
+
+    def test_mock_stream_chunks(self):
+        """モックはchunk_sizeごとに分割"""
+        client = MockLLMClient(responses={"x": "abcdefg"}, chunk_size=3)
+
+        assert list(client.complete_stream("x")) == ["abc", "def", "g"]
+        assert client.call_history == ["x"]
+
+    def test_base_stream_fallback(self):
+        """非対応クライアントは全文を1回で返す"""
+
+        class PlainClient(BaseLLMClient):
+            def complete(self, prompt: str) -> str:
+                return "full"
+
+        assert list(PlainClient().complete_stream("p")) == ["full"]
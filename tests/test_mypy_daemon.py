@@ -0,0 +1,153 @@
+"""
+MypyDaemonのテスト
+"""
+
+import json
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from devbuddy.analyzers.mypy_daemon import MypyDaemon
+from devbuddy.analyzers.python_analyzer import AnalysisConfig, PythonAnalyzer
+
+
+def _completed(returncode=0, stdout="", stderr=""):
+    return MagicMock(returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """tmp_pathをルートとするデーモン"""
+    return MypyDaemon(root=tmp_path)
+
+
+class TestMypyDaemon:
+    """MypyDaemonテストクラス"""
+
+    def test_status_without_status_file(self, daemon):
+        """ステータスファイルが無ければ停止中"""
+        with patch("subprocess.run") as mock_run:
+            assert daemon.status().state == "stopped"
+        mock_run.assert_not_called()
+
+    def test_status_running(self, daemon):
+        """dmypy statusが成功すれば稼働中"""
+        daemon.status_file.write_text(json.dumps({"pid": 1}))
+
+        with patch(
+            "subprocess.run",
+            return_value=_completed(0, "Daemon is up and running"),
+        ) as mock_run:
+            status = daemon.status()
+
+        assert status.running
+        cmd = mock_run.call_args.args[0]
+        assert cmd[:3] == ["dmypy", "--status-file", str(daemon.status_file)]
+        assert mock_run.call_args.kwargs["cwd"] == daemon.root
+
+    def test_cleanup_stale_removes_files(self, daemon, tmp_path):
+        """接続できないデーモンの残骸を削除"""
+        socket_dir = tmp_path / "sockdir"
+        socket_dir.mkdir()
+        socket_path = socket_dir / "dmypy.sock"
+        socket_path.write_text("")
+        daemon.status_file.write_text(json.dumps({
+            "pid": 1, "connection_name": str(socket_path),
+        }))
+
+        with patch(
+            "subprocess.run",
+            return_value=_completed(
+                2, stderr="[Errno 111] Connection refused"
+            ),
+        ):
+            assert daemon.cleanup_stale() is True
+
+        assert not daemon.status_file.exists()
+        assert not socket_dir.exists()
+
+    def test_cleanup_keeps_busy_daemon(self, daemon):
+        """応答待ちのデーモンは削除しない"""
+        daemon.status_file.write_text(json.dumps({"pid": 1}))
+
+        with patch(
+            "subprocess.run",
+            side_effect=subprocess.TimeoutExpired("dmypy", 10),
+        ):
+            assert daemon.cleanup_stale() is False
+
+        assert daemon.status_file.exists()
+
+    def test_check_retries_after_stale_cleanup(self, daemon):
+        """残骸で失敗したら削除して再実行"""
+        daemon.status_file.write_text(json.dumps({"pid": 1}))
+        output = "a.py:1:1: error: Bad\n"
+
+        with patch("subprocess.run", side_effect=[
+            _completed(2, stderr="Connection refused"),  # run
+            _completed(2, stderr="Connection refused"),  # status
+            _completed(1, stdout=output),  # run（再試行）
+        ]) as mock_run:
+            assert daemon.check([Path("a.py")]) == output
+
+        assert mock_run.call_count == 3
+        assert "--no-error-summary" in mock_run.call_args.args[0]
+
+    def test_check_without_dmypy(self, daemon):
+        """dmypyが無ければNone"""
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            assert daemon.check([Path("a.py")]) is None
+
+    def test_stop_when_not_running(self, daemon):
+        """停止中なら何もしない"""
+        with patch("subprocess.run") as mock_run:
+            assert daemon.stop() is True
+        mock_run.assert_not_called()
+
+
+class TestAnalyzerDaemonMode:
+    """PythonAnalyzerのdaemonモード"""
+
+    def test_invalid_backend(self):
+        """不明なmypyバックエンド"""
+        with pytest.raises(ValueError, match="mypy_backend"):
+            AnalysisConfig(mypy_backend="server")
+
+    def test_uses_daemon_output(self, tmp_path):
+        """デーモンの出力をファイルに振り分け"""
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        analyzer = PythonAnalyzer(AnalysisConfig(
+            use_flake8=False, use_mypy=True, mypy_backend="daemon",
+        ))
+        analyzer._mypy_daemon = MypyDaemon(root=tmp_path)
+
+        with patch.object(
+            MypyDaemon, "check",
+            return_value="Daemon started\na.py:1:5: error: Bad type\n",
+        ), patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run"
+        ) as mock_run:
+            issues = analyzer._run_mypy(path)
+
+        mock_run.assert_not_called()
+        assert [i.message for i in issues] == ["[mypy] Bad type"]
+
+    def test_falls_back_to_cold_mypy(self, tmp_path):
+        """デーモンが使えなければ通常のmypyで実行"""
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        analyzer = PythonAnalyzer(AnalysisConfig(
+            use_flake8=False, use_mypy=True, mypy_backend="daemon",
+        ))
+
+        with patch.object(MypyDaemon, "check", return_value=None), patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run",
+            return_value=_completed(1, stdout=f"{path}:1:1: error: Cold\n"),
+        ) as mock_run:
+            issues = analyzer._run_mypy(path)
+
+        assert mock_run.call_args.args[0][0] == "mypy"
+        assert [i.message for i in issues] == ["[mypy] Cold"]
@@ -53,6 +53,26 @@ class TestPromptTemplates:
         assert "バグ" in prompt
         assert "重大" in prompt
 
+    def test_code_review_split(self, prompts):
+        """指示部分はコードを含まず、ファイル間で共通"""
+        system = prompts.code_review_system(severity="high")
+        user = prompts.code_review_user("x = 1")
+
+        assert "x = 1" not in system
+        assert "x = 1" in user
+        assert prompts.code_review_system(severity="high") == system
+        assert prompts.code_review("x = 1", severity="high") == (
+            f"{system}\n\n{user}"
+        )
+
+    def test_code_review_structured(self, prompts):
+        """構造化出力ではJSON形式を指示"""
+        system = prompts.code_review_system(structured=True)
+
+        assert '"issues"' in system
+        assert "[LEVEL] Line N" not in system
+        assert system != prompts.code_review_system()
+
     def test_diff_review(self, prompts):
         """diffレビュープロンプト"""
         diff = "@@ -1 +1 @@\n-old\n+new"
@@ -63,6 +83,28 @@ class TestPromptTemplates:
         assert "追加されたコード" in prompt
         assert "削除" in prompt
 
+    def test_batch_review(self, prompts):
+        """複数ファイルのまとめレビュープロンプト"""
+        prompt = prompts.batch_review(
+            [("a.py", "x = 1"), ("pkg/b.py", "y = 2")]
+        )
+
+        assert "=== File: a.py ===" in prompt
+        assert "=== File: pkg/b.py ===" in prompt
+        assert "[LEVEL] File ファイル名 Line N:" in prompt
+
+    def test_batch_review_shares_system_prompt(self, prompts):
+        """まとめレビューはcode_review_systemから作り、構造化出力に従う"""
+        system = prompts.code_review_system(structured=True, batch=True)
+        prompt = prompts.batch_review([("a.py", "x = 1")], structured=True)
+
+        assert prompt.startswith(system)
+        assert '"file": "ファイル名"' in prompt
+        assert "[LEVEL] File" not in prompt
+        assert prompts.code_review_system() in prompts.code_review(
+            "x = 1"
+        )
+
     def test_test_generation_basic(self, prompts):
         """テスト生成プロンプト（基本）"""
         func = FunctionInfo(
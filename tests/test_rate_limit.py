@@ -0,0 +1,288 @@
+"""
+RateLimiterのテスト
+"""
+
+import asyncio
+import random
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from devbuddy.llm.async_client import MockAsyncLLMClient
+from devbuddy.llm.client import BaseLLMClient, LLMClient, MockLLMClient
+from devbuddy.llm.rate_limit import (
+    AIMDController,
+    RateLimitedClient,
+    RateLimiter,
+    RateLimitError,
+    TokenBucket,
+    overload_retry_after,
+)
+from devbuddy.llm.resilience import Resilience
+
+from tests.conftest import FakeClock
+
+
+class FakeProvider(BaseLLMClient):
+    """RPM上限を超えると429を返すローカルの疑似プロバイダ
+
+    実際のプロバイダと同じく連続補充型のバケットで制限する。
+    """
+
+    def __init__(self, clock: FakeClock, rpm: int):
+        self.clock = clock
+        self.rpm = rpm
+        self.tokens = float(rpm)
+        self.updated = clock()
+        self.accepted = 0
+        self.rejected = 0
+
+    def complete(self, prompt: str) -> str:
+        now = self.clock()
+        rate = self.rpm / 60
+        self.tokens = min(self.rpm, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens < 1 - 1e-9:
+            self.rejected += 1
+            raise RateLimitError("429", retry_after=(1 - self.tokens) / rate)
+        self.tokens -= 1
+        self.accepted += 1
+        return "ok"
+
+
+class TestTokenBucket:
+    """TokenBucketテストクラス"""
+
+    def test_burst_then_wait(self):
+        """容量までは待たず、超過分は補充速度に応じて待つ"""
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=60, clock=clock)
+
+        assert all(bucket.reserve(1) == 0.0 for _ in range(60))
+        assert bucket.reserve(1) == pytest.approx(1.0)
+        assert bucket.reserve(1) == pytest.approx(2.0)
+
+    def test_refill(self):
+        """時間経過で補充される"""
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=600, clock=clock)
+        bucket.reserve(600)
+
+        clock.sleep(30)
+
+        assert bucket.available == pytest.approx(300)
+
+    def test_oversized_request_capped(self):
+        """容量を超える要求も有限時間で通す"""
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=100, clock=clock)
+        bucket.reserve(100)
+
+        assert bucket.reserve(10_000) == pytest.approx(60.0)
+
+
+class TestAIMDController:
+    """AIMDControllerテストクラス"""
+
+    def test_multiplicative_decrease(self):
+        """過負荷で半減し、クールダウン中は再減少しない"""
+        clock = FakeClock()
+        controller = AIMDController(initial=8, clock=clock)
+
+        assert controller.on_overload() is True
+        assert controller.limit == 4
+        assert controller.on_overload() is False
+        clock.sleep(2)
+        controller.on_overload()
+        assert controller.limit == 2
+
+    def test_additive_increase(self):
+        """成功でおおむね1往復ごとに+1"""
+        controller = AIMDController(initial=4, max_limit=5)
+
+        for _ in range(5):
+            controller.on_success()
+        assert controller.limit == 5
+        for _ in range(100):
+            controller.on_success()
+        assert controller.limit == 5
+
+    def test_min_limit(self):
+        """下限を下回らない"""
+        clock = FakeClock()
+        controller = AIMDController(initial=1, clock=clock)
+
+        controller.on_overload()
+
+        assert controller.limit == 1
+
+
+class TestRateLimiter:
+    """RateLimiterテストクラス"""
+
+    def test_rpm_avoids_provider_429(self):
+        """RPMを守れば疑似プロバイダが429を返さない"""
+        clock = FakeClock()
+        provider = FakeProvider(clock, rpm=10)
+        limiter = RateLimiter(
+            requests_per_minute=10, clock=clock, sleep=clock.sleep
+        )
+        client = RateLimitedClient(provider, limiter)
+
+        for _ in range(25):
+            assert client.complete("hello") == "ok"
+
+        assert provider.rejected == 0
+        assert clock.now >= 60 * 1.4
+        stats = limiter.stats()
+        assert stats.requests == 25
+        assert stats.max_wait > 0
+
+    def test_tpm_budget(self):
+        """推定プロンプトトークンでTPMを守る"""
+        clock = FakeClock()
+        limiter = RateLimiter(
+            tokens_per_minute=1000, clock=clock, sleep=clock.sleep
+        )
+        client = RateLimitedClient(MockLLMClient(), limiter)
+
+        client.complete("x" * 3996)  # 1000トークン
+        client.complete("x" * 1996)  # 500トークン
+
+        assert clock.now == pytest.approx(30.0)
+
+    def test_retry_after_pauses_sending(self):
+        """429のretry-afterまで送信を止め、同時実行数を下げる"""
+        clock = FakeClock()
+        provider = FakeProvider(clock, rpm=1)
+        limiter = RateLimiter(
+            max_concurrency=8, clock=clock, sleep=clock.sleep
+        )
+        client = RateLimitedClient(provider, limiter)
+
+        client.complete("first")
+        with pytest.raises(RateLimitError):
+            client.complete("second")
+
+        assert limiter.controller.limit == 4
+        assert limiter.stats().overloads == 1
+        assert client.complete("third") == "ok"
+        assert clock.now == pytest.approx(60.0)
+
+    def test_retried_overload_reported(self):
+        """LLMClient内で再試行された429もリミッターに報告する"""
+
+        class OverloadError(Exception):
+            status_code = 429
+            response = MagicMock(headers={"retry-after": "2"})
+
+        content = type("MockContent", (), {"text": "ok"})()
+        message = type("MockMessage", (), {"content": [content]})()
+        mock_anthropic = MagicMock()
+        mock_anthropic.Anthropic.return_value.messages.create.side_effect = [
+            OverloadError("429"), message,
+        ]
+        clock = FakeClock()
+        limiter = RateLimiter(
+            max_concurrency=8, clock=clock, sleep=clock.sleep
+        )
+        sys.modules["anthropic"] = mock_anthropic
+        try:
+            inner = LLMClient(
+                api_key="sk-ant-test123",
+                resilience=Resilience(
+                    clock=clock, sleep=clock.sleep, rng=random.Random(0)
+                ),
+            )
+            client = RateLimitedClient(inner, limiter)
+            assert client.complete("prompt") == "ok"
+        finally:
+            del sys.modules["anthropic"]
+
+        assert limiter.controller.limit == 4
+        assert limiter.stats().overloads == 1
+
+    def test_queue_depth(self):
+        """同時実行数の上限で待っているリクエスト数を公開"""
+        limiter = RateLimiter(max_concurrency=1)
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold() -> None:
+            with limiter.slot():
+                entered.set()
+                release.wait(5)
+
+        def wait_turn() -> None:
+            with limiter.slot():
+                pass
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        entered.wait(5)
+        waiter = threading.Thread(target=wait_turn)
+        waiter.start()
+        for _ in range(500):
+            if limiter.stats().queue_depth == 1:
+                break
+            threading.Event().wait(0.01)
+
+        stats = limiter.stats()
+        release.set()
+        holder.join(5)
+        waiter.join(5)
+
+        assert stats.queue_depth == 1
+        assert stats.in_flight == 1
+        assert limiter.stats().queue_depth == 0
+
+    def test_async_client(self):
+        """非同期クライアントもリミッター経由で呼び出す"""
+        limiter = RateLimiter(max_concurrency=2)
+        client = RateLimitedClient(MockAsyncLLMClient(delay=0.01), limiter)
+
+        async def run() -> list[str]:
+            return await asyncio.gather(
+                *(client.acomplete(f"p{i}") for i in range(5))
+            )
+
+        responses = asyncio.run(run())
+
+        assert len(responses) == 5
+        assert limiter.stats().requests == 5
+        assert limiter.stats().in_flight == 0
+
+    def test_delegates_attributes(self):
+        """model等の属性は包んだクライアントのものを返す"""
+        inner = MockLLMClient()
+        inner.model = "fake-model"
+        client = RateLimitedClient(inner, RateLimiter())
+
+        assert client.model == "fake-model"
+
+
+class TestOverloadRetryAfter:
+    """overload_retry_afterテストクラス"""
+
+    def test_sdk_status_error(self):
+        """SDK例外のstatus_codeとretry-afterヘッダを読む"""
+
+        class Response:
+            headers = {"retry-after": "7"}
+
+        class APIStatusError(Exception):
+            status_code = 429
+            response = Response()
+
+        assert overload_retry_after(APIStatusError()) == 7.0
+
+    def test_other_errors(self):
+        """過負荷以外はNone"""
+
+        class BadRequest(Exception):
+            status_code = 400
+
+        assert overload_retry_after(BadRequest()) is None
+        assert overload_retry_after(ValueError()) is None
@@ -0,0 +1,287 @@
+"""
+Resilience（リトライ・サーキットブレーカー）のテスト
+"""
+
+import asyncio
+import random
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from devbuddy.core.reviewer import CodeReviewer
+from devbuddy.llm.client import LLMClient, MockLLMClient
+from devbuddy.llm.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+    RetryPolicy,
+    is_retryable,
+)
+
+from tests.conftest import FakeClock
+
+
+class Flaky:
+    """指定回数だけ失敗してから成功する呼び出し"""
+
+    def __init__(self, failures: int, error: Exception):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, *args: object) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+class StatusError(Exception):
+    """SDKのAPIStatusError相当"""
+
+    def __init__(self, status_code: int, retry_after: object = None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = MagicMock(
+            headers={"retry-after": retry_after} if retry_after else {}
+        )
+
+
+def _resilience(clock, **kwargs):
+    return Resilience(
+        clock=clock, sleep=clock.sleep, rng=random.Random(0), **kwargs
+    )
+
+
+class TestRetry:
+    """リトライテストクラス"""
+
+    def test_retries_transient_errors(self):
+        """一時的なエラーは再試行して成功"""
+        clock = FakeClock()
+        call = Flaky(2, ConnectionError("reset"))
+
+        assert _resilience(clock).call(call) == "ok"
+        assert call.calls == 3
+        assert len(clock.sleeps) == 2
+
+    def test_no_retry_for_client_errors(self):
+        """400などは再試行しない"""
+        clock = FakeClock()
+        call = Flaky(1, StatusError(400))
+
+        with pytest.raises(StatusError):
+            _resilience(clock).call(call)
+        assert call.calls == 1
+
+    def test_gives_up_after_max_attempts(self):
+        """試行回数を使い切ったら最後のエラーを送出"""
+        clock = FakeClock()
+        call = Flaky(10, TimeoutError())
+
+        with pytest.raises(TimeoutError):
+            _resilience(clock, policy=RetryPolicy(max_attempts=4)).call(call)
+        assert call.calls == 4
+
+    def test_jittered_exponential_backoff(self):
+        """待ち時間は指数的に伸びる上限内でランダム"""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        rng = random.Random(1)
+
+        for attempt, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (6, 5.0)]:
+            delays = [policy.backoff(attempt, rng) for _ in range(50)]
+            assert all(0 <= d <= ceiling for d in delays)
+            assert max(delays) > ceiling / 2
+
+    def test_honours_retry_after(self):
+        """retry-afterより短くは待たない"""
+        clock = FakeClock()
+        call = Flaky(1, StatusError(429, retry_after="7"))
+
+        assert _resilience(clock).call(call) == "ok"
+        assert clock.sleeps[0] >= 7
+
+    def test_deadline(self):
+        """合計時間の上限を超える再試行はしない"""
+        clock = FakeClock()
+        call = Flaky(5, StatusError(529, retry_after="30"))
+        policy = RetryPolicy(max_attempts=5, deadline=45)
+
+        with pytest.raises(StatusError):
+            _resilience(clock, policy=policy).call(call)
+        assert call.calls == 2
+
+    def test_async_retry(self):
+        """非同期版も再試行する"""
+        clock = FakeClock()
+        flaky = Flaky(1, ConnectionError())
+
+        async def call() -> str:
+            return flaky()
+
+        resilience = Resilience(
+            policy=RetryPolicy(base_delay=0.001), clock=clock
+        )
+        assert asyncio.run(resilience.acall(call)) == "ok"
+        assert flaky.calls == 2
+
+    def test_is_retryable(self):
+        """再試行可否の判定"""
+
+        class APIConnectionError(Exception):
+            pass
+
+        assert is_retryable(APIConnectionError())
+        assert is_retryable(StatusError(503))
+        assert not is_retryable(StatusError(401))
+        assert not is_retryable(ValueError())
+        assert not is_retryable(CircuitOpenError(1))
+
+
+class TestCircuitBreaker:
+    """CircuitBreakerテストクラス"""
+
+    def test_opens_after_consecutive_failures(self):
+        """連続失敗でopenになり、即座に失敗する"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30,
+                                 clock=clock)
+        resilience = _resilience(
+            clock, policy=RetryPolicy(max_attempts=1), breaker=breaker
+        )
+        call = Flaky(10, ConnectionError())
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                resilience.call(call)
+        with pytest.raises(CircuitOpenError):
+            resilience.call(call)
+
+        assert breaker.state == "open"
+        assert call.calls == 2
+
+    def test_half_open_probe(self):
+        """reset_timeout経過後は1回だけ試し、成功でclosedに戻る"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10,
+                                 clock=clock)
+        breaker.record_failure()
+        clock.now = 11
+
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # 試行中は他を通さない
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        """試行が失敗すれば再びopen"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10,
+                                 clock=clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 11
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+
+    def test_client_errors_do_not_open(self):
+        """入力起因のエラーは障害として数えない"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+        resilience = _resilience(clock, breaker=breaker)
+
+        with pytest.raises(StatusError):
+            resilience.call(Flaky(1, StatusError(400)))
+
+        assert breaker.state == "closed"
+
+
+class TestLLMClientResilience:
+    """LLMClientへの組み込みテスト"""
+
+    def _mock_anthropic(self, side_effect):
+        mock_anthropic = MagicMock()
+        mock_client = mock_anthropic.Anthropic.return_value
+        mock_client.messages.create.side_effect = side_effect
+        return mock_anthropic
+
+    def test_complete_retries(self):
+        """completeは一時的なエラーを再試行し、SDKの再試行は無効化"""
+        content = type("MockContent", (), {"text": "ok"})()
+        message = type("MockMessage", (), {"content": [content]})()
+        mock_anthropic = self._mock_anthropic(
+            [ConnectionError("reset"), message]
+        )
+        sys.modules["anthropic"] = mock_anthropic
+        clock = FakeClock()
+
+        try:
+            client = LLMClient(
+                api_key="sk-ant-test123", resilience=_resilience(clock)
+            )
+            assert client.complete("prompt") == "ok"
+            kwargs = mock_anthropic.Anthropic.call_args.kwargs
+            assert kwargs["max_retries"] == 0
+        finally:
+            del sys.modules["anthropic"]
+
+        assert len(clock.sleeps) == 1
+
+    def test_stream_retries_before_first_chunk(self):
+        """ストリーミングは受信開始前の失敗のみ再試行"""
+        clock = FakeClock()
+        client = LLMClient(
+            api_key="sk-ant-test123", resilience=_resilience(clock)
+        )
+        attempts = []
+
+        def stream(prompt):
+            attempts.append(prompt)
+            if len(attempts) == 1:
+                raise ConnectionError("reset")
+            yield "a"
+            yield "b"
+
+        client._stream_claude = stream
+
+        assert list(client.complete_stream("p")) == ["a", "b"]
+        assert len(attempts) == 2
+
+
+class TestReviewResultAIStatus:
+    """ReviewResult.ai_statusテストクラス"""
+
+    def test_ok_when_no_findings(self, temp_python_file):
+        """指摘なしでもAIレビューは実行済み"""
+        reviewer = CodeReviewer(
+            client=MockLLMClient(responses={"レビュー": "No issues found"}),
+            skip_license_check=True,
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        result = reviewer.review_file(temp_python_file)
+
+        assert result.ai_status == "ok"
+        assert result.ai_available is True
+
+    def test_unavailable_on_llm_error(self, temp_python_file):
+        """LLMエラーはai_statusとai_errorに記録"""
+
+        class DownClient(MockLLMClient):
+            def complete(self, prompt: str) -> str:
+                raise CircuitOpenError(12)
+
+        reviewer = CodeReviewer(client=DownClient(), skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+
+        result = reviewer.review_file(temp_python_file)
+
+        assert result.success is True
+        assert result.ai_status == "unavailable"
+        assert "circuit open" in result.ai_error
+        assert result.ai_available is False
@@ -5,7 +5,13 @@ CodeReviewerのテスト
 import pytest
 from pathlib import Path
 
-from devbuddy.core.reviewer import CodeReviewer, Issue, ReviewResult
+from devbuddy.core.reviewer import (
+    CodeReviewer,
+    Issue,
+    IssueStreamParser,
+    ReviewResult,
+)
+from devbuddy.llm.client import MockLLMClient
 
 
 class TestCodeReviewer:
@@ -92,3 +98,300 @@ class TestCodeReviewer:
         """問題なしのサマリー"""
         summary = reviewer._generate_summary([])
         assert summary == "No issues found"
+
+
+class TestPromptPrefix:
+    """指示部分をシステムプロンプトとして送るテスト"""
+
+    def test_system_prompt_shared_across_files(self, tmp_path):
+        """指示部分はファイル間で同一、コードはユーザー側にのみ入る"""
+        calls = []
+
+        class RecordingClient(MockLLMClient):
+            def complete_with_system(self, system_prompt, user_prompt):
+                calls.append((system_prompt, user_prompt))
+                return "No issues found"
+
+        reviewer = CodeReviewer(
+            client=RecordingClient(), skip_license_check=True
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        for name, code in [("a.py", "a = 1\n"), ("b.py", "b = 2\n")]:
+            path = tmp_path / name
+            path.write_text(code, encoding="utf-8")
+            reviewer.review_file(path)
+
+        assert len(calls) == 2
+        assert calls[0][0] == calls[1][0]
+        assert "a = 1" in calls[0][1] and "a = 1" not in calls[0][0]
+        assert "b = 2" in calls[1][1]
+
+
+class TestStructuredOutput:
+    """構造化出力モードテストクラス"""
+
+    JSON_RESPONSE = (
+        '{"issues": [{"level": "bug", "line": 2, "message": "One", '
+        '"suggestion": "Fix"}, {"level": "warning", "line": 5, '
+        '"message": "Two"}]}'
+    )
+
+    def _reviewer(self, response):
+        client = MockLLMClient(responses={"JSON": response}, chunk_size=9)
+        reviewer = CodeReviewer(
+            client=client, skip_license_check=True, structured_output=True
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        return reviewer
+
+    def test_prompt_requests_json(self, temp_python_file):
+        """システムプロンプトでJSONを要求し、JSONとして解析"""
+        reviewer = self._reviewer(self.JSON_RESPONSE)
+
+        result = reviewer.review_file(temp_python_file)
+
+        assert '{"issues": []}' in reviewer.client.call_history[0]
+        assert [i.message for i in result.issues] == ["One", "Two"]
+        assert result.issues[0].suggestion == "Fix"
+
+    def test_truncated_response(self, temp_python_file):
+        """途中で切れた応答からも完成した指摘を回収"""
+        reviewer = self._reviewer(self.JSON_RESPONSE[:-30])
+
+        result = reviewer.review_file(temp_python_file)
+
+        assert [i.message for i in result.issues] == ["One"]
+
+    def test_streaming(self, temp_python_file):
+        """ストリーミングでも要素ごとに通知"""
+        reviewer = self._reviewer(self.JSON_RESPONSE)
+        seen = []
+
+        reviewer.review_file_streaming(temp_python_file, on_issue=seen.append)
+
+        assert [i.line for i in seen] == [2, 5]
+
+    def test_text_fallback(self, temp_python_file):
+        """JSONで回答されなかった場合はテキスト形式として解析"""
+        reviewer = self._reviewer("[BUG] Line 3: Plain\n  Suggestion: s\n")
+
+        result = reviewer.review_file(temp_python_file)
+
+        assert result.issues[0].message == "Plain"
+        assert result.issues[0].suggestion == "s"
+
+    def test_separate_cache_entries(self, temp_python_file, tmp_path):
+        """テキスト形式とJSON形式の結果は別々にキャッシュ"""
+        from devbuddy.core.cache import ReviewCache
+
+        cache = ReviewCache(cache_dir=tmp_path / "cache")
+        plain = CodeReviewer(
+            client=MockLLMClient(), skip_license_check=True, cache=cache
+        )
+        plain.analyzer.config.use_flake8 = False
+        plain.review_file(temp_python_file)
+        structured = self._reviewer(self.JSON_RESPONSE)
+        structured.cache = cache
+
+        result = structured.review_file(temp_python_file)
+
+        assert result.ai_status == "ok"
+
+
+class TestIssueStreamParser:
+    """IssueStreamParserテストクラス"""
+
+    def test_emits_on_line_completion(self):
+        """行が完成した時点でIssueを返す"""
+        parser = IssueStreamParser()
+
+        assert parser.feed("[BUG] Line 3: Div") == []
+        issues = parser.feed("ision by zero\n[WARN")
+        assert [(i.level, i.line) for i in issues] == [("bug", 3)]
+        assert issues[0].message == "Division by zero"
+
+        assert parser.feed("ING] Line 7: Unused\n  Suggestion: x\n") != []
+        assert parser.close() == []
+
+    def test_suggestion_attached(self):
+        """Suggestion行は直前のIssueに付ける（無関係な行の後は付けない）"""
+        parser = IssueStreamParser()
+
+        issues = parser.feed(
+            "[BUG] Line 5: A\n  Suggestion: fix it\n"
+            "noise\n  Suggestion: orphan\n[INFO] Line 9: B\n"
+        )
+
+        assert issues[0].suggestion == "fix it"
+        assert issues[1].suggestion is None
+
+    def test_close_flushes_last_line(self):
+        """末尾に改行がなくてもcloseで返す"""
+        parser = IssueStreamParser()
+        parser.feed("[STYLE] Line 1: Naming")
+
+        issues = parser.close()
+
+        assert len(issues) == 1
+        assert issues[0].level == "style"
+
+    def test_matches_batch_parser(self, mock_llm_client):
+        """一括パースと同じ結果"""
+        response = (
+            "[BUG] Line 5: A\n  Suggestion: fix\nnoise\n"
+            "[WARNING] Line x: bad\n[INFO] Line 9: B\n"
+        )
+        reviewer = CodeReviewer(client=mock_llm_client)
+        parser = IssueStreamParser()
+
+        streamed = []
+        for i in range(0, len(response), 4):
+            streamed.extend(parser.feed(response[i:i + 4]))
+        streamed.extend(parser.close())
+
+        assert streamed == reviewer._parse_ai_response(response)
+
+
+class TestReviewFileStreaming:
+    """review_file_streamingテストクラス"""
+
+    def test_issues_notified_progressively(self, temp_python_file):
+        """AIの問題が1件ずつ通知される"""
+        client = MockLLMClient(
+            responses={"レビュー": "[BUG] Line 2: One\n[WARNING] Line 5: Two\n"},
+            chunk_size=5,
+        )
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+        seen = []
+
+        result = reviewer.review_file_streaming(
+            temp_python_file, on_issue=seen.append
+        )
+
+        assert [i.message for i in seen] == ["One", "Two"]
+        assert result.issues == seen
+
+    def test_severity_filter_applied(self, temp_python_file):
+        """通知にも重要度フィルタが適用される"""
+        client = MockLLMClient(
+            responses={"レビュー": "[BUG] Line 2: One\n[STYLE] Line 5: Two\n"}
+        )
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+        seen = []
+
+        reviewer.review_file_streaming(
+            temp_python_file, on_issue=seen.append, severity="high"
+        )
+
+        assert [i.message for i in seen] == ["One"]
+
+    def test_stream_error_keeps_received(self, temp_python_file):
+        """途中でエラーが起きても通知済みの問題は残る"""
+
+        class BrokenStreamClient(MockLLMClient):
+            def complete_stream(self, prompt):
+                yield "[BUG] Line 1: Early\n"
+                raise RuntimeError("connection reset")
+
+        reviewer = CodeReviewer(
+            client=BrokenStreamClient(), skip_license_check=True
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        result = reviewer.review_file_streaming(
+            temp_python_file, on_issue=lambda issue: None
+        )
+
+        assert result.success is True
+        assert [i.message for i in result.issues] == ["Early"]
+
+
+class TestReviewCode:
+    """review_code（未保存のバッファ）テストクラス"""
+
+    def test_review_buffer_inprocess(self, tmp_path):
+        """ディスク上の内容ではなく渡したコードを解析"""
+        from unittest.mock import patch
+
+        on_disk = tmp_path / "buffer.py"
+        on_disk.write_text("x = 1\n", encoding="utf-8")
+        reviewer = CodeReviewer(
+            client=MockLLMClient(), skip_license_check=True
+        )
+        reviewer.analyzer.config.flake8_backend = "inprocess"
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run"
+        ) as mock_run:
+            result = reviewer.review_code(
+                "import os\n", on_disk, severity="low"
+            )
+
+        mock_run.assert_not_called()
+        assert result.file_path == on_disk
+        assert "[F401] 'os' imported but unused" in [
+            i.message for i in result.issues
+        ]
+
+
+class TestChunkedReview:
+    """大きなファイルの分割レビューテストクラス"""
+
+    @staticmethod
+    def _large_file(tmp_path):
+        parts = ["import os", ""]
+        for i in range(6):
+            parts.append("")
+            parts.append(f"def func_{i}(value):")
+            parts.extend(
+                f"    value = value + {j}  # func_{i}" for j in range(20)
+            )
+            parts.append("    return value")
+        path = tmp_path / "large.py"
+        path.write_text("\n".join(parts) + "\n", encoding="utf-8")
+        return path
+
+    def test_chunks_reviewed_separately(self, tmp_path):
+        """チャンクごとにLLMを呼び、行番号を元ファイルに戻す"""
+        path = self._large_file(tmp_path)
+        client = MockLLMClient()
+        reviewer = CodeReviewer(
+            client=client, skip_license_check=True, chunk_tokens=400
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        result = reviewer.review_file(path, severity="low")
+
+        assert result.success is True
+        assert len(client.call_history) > 1
+        # デフォルト応答の "Line 1" はヘッダ行なので除外される
+        assert "Code looks good" not in [i.message for i in result.issues]
+
+    def test_chunk_issue_line_remapped(self, tmp_path):
+        """チャンク内の行番号を元ファイルの行番号に変換"""
+        path = self._large_file(tmp_path)
+        lines = path.read_text(encoding="utf-8").split("\n")
+        reviewer = CodeReviewer(
+            client=MockLLMClient(), skip_license_check=True, chunk_tokens=400
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        from devbuddy.core.chunker import split_code
+
+        chunks = split_code(path.read_text(encoding="utf-8"), 400)
+        last = chunks[-1]
+        target_line = last.header_lines + 2
+        reviewer.client.set_response(
+            f"lines {last.start_line}-{last.end_line}",
+            f"[WARNING] Line {target_line}: Check this\n",
+        )
+
+        result = reviewer.review_file(path, severity="low")
+
+        issues = [i for i in result.issues if i.message == "Check this"]
+        assert len(issues) == 1
+        expected = last.start_line + 1
+        assert issues[0].line == expected
+        assert lines[expected - 1] == last.code.split("\n")[target_line - 1]
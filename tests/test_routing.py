@@ -0,0 +1,183 @@
+"""
+ModelRouter（複雑さによるモデル振り分け）のテスト
+"""
+
+from devbuddy.core.reviewer import CodeReviewer
+from devbuddy.llm.client import MockLLMClient
+from devbuddy.llm.routing import (
+    ModelRouter,
+    RoutingPolicy,
+    score_code,
+)
+
+SIMPLE = "VERSION = '1.0'\n\n\ndef name():\n    return 'devbuddy'\n"
+
+COMPLEX = """
+def classify(items, limit):
+    result = []
+    for item in items:
+        if item > limit and item % 2 == 0:
+            result.append(item)
+        elif item < 0 or item is None:
+            continue
+        while item > 10:
+            item //= 2
+    try:
+        return [x for x in result if x]
+    except TypeError:
+        return []
+"""
+
+
+def _policy(**kwargs):
+    return RoutingPolicy(fast_model="fast", strong_model="strong", **kwargs)
+
+
+def _router():
+    return ModelRouter(
+        _policy(max_fast_complexity=5),
+        lambda model: MockLLMClient(
+            responses={"レビュー": f"[INFO] Line 1: by {model}"}
+        ),
+    )
+
+
+class TestScoreCode:
+    """score_codeテストクラス"""
+
+    def test_simple(self):
+        """分岐の無いコードは関数の数だけ"""
+        score = score_code(SIMPLE)
+
+        assert score.lines == 5
+        assert score.complexity == 1
+        assert score.parsed is True
+
+    def test_branches_counted(self):
+        """分岐・ブール演算・内包表記を数える"""
+        # 関数1 + for + if/elif(2) + and/or(2) + while + 内包表記(1+if)
+        # + except
+        assert score_code(COMPLEX).complexity == 10
+
+    def test_syntax_error(self):
+        """構文エラーは解析不能として返す"""
+        assert score_code("def broken(:\n").parsed is False
+
+
+class TestRoutingPolicy:
+    """RoutingPolicyテストクラス"""
+
+    def test_choose(self):
+        """単純なファイルは高速モデル、複雑なファイルは高性能モデル"""
+        policy = _policy(max_fast_complexity=5)
+
+        assert policy.choose(SIMPLE) == "fast"
+        assert policy.choose(COMPLEX) == "strong"
+
+    def test_line_threshold(self):
+        """行数の上限を超えると高性能モデル"""
+        policy = _policy(max_fast_lines=3)
+
+        assert policy.choose(SIMPLE) == "strong"
+
+    def test_unparsable_goes_to_strong(self):
+        """解析できないコードは高性能モデル"""
+        assert _policy().choose("def broken(:\n") == "strong"
+
+
+class TestModelRouter:
+    """ModelRouterテストクラス"""
+
+    def test_client_per_model_reused(self):
+        """モデルごとにクライアントを1度だけ生成"""
+        created = []
+
+        def factory(model):
+            created.append(model)
+            return MockLLMClient()
+
+        router = ModelRouter(_policy(), factory)
+
+        assert router.client_for("fast") is router.client_for("fast")
+        router.client_for("strong")
+        assert created == ["fast", "strong"]
+        assert set(router.clients) == {"fast", "strong"}
+
+
+class TestReviewerRouting:
+    """CodeReviewerへの組み込みテスト"""
+
+    def _write(self, tmp_path, name, code):
+        path = tmp_path / name
+        path.write_text(code, encoding="utf-8")
+        return path
+
+    def _reviewer(self, router, **kwargs):
+        reviewer = CodeReviewer(
+            client=MockLLMClient(),
+            skip_license_check=True,
+            router=router,
+            **kwargs,
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        return reviewer
+
+    def test_routes_by_complexity(self, tmp_path):
+        """ファイルごとに選んだモデルで呼び出し、結果に記録"""
+        reviewer = self._reviewer(_router())
+
+        simple = reviewer.review_file(
+            self._write(tmp_path, "simple.py", SIMPLE), severity="low"
+        )
+        complex_ = reviewer.review_file(
+            self._write(tmp_path, "complex.py", COMPLEX), severity="low"
+        )
+
+        assert simple.model == "fast"
+        assert complex_.model == "strong"
+        assert [i.message for i in simple.issues] == ["by fast"]
+        assert [i.message for i in complex_.issues] == ["by strong"]
+        assert reviewer.client.call_history == []
+
+    def test_cache_key_per_model(self, tmp_path):
+        """モデルが変われば別のキャッシュエントリを使う"""
+        from devbuddy.core.cache import ReviewCache
+
+        path = self._write(tmp_path, "simple.py", SIMPLE)
+        cache = ReviewCache(cache_dir=tmp_path / "cache")
+        self._reviewer(_router(), cache=cache).review_file(path)
+
+        strict = ModelRouter(
+            _policy(max_fast_lines=1), lambda model: MockLLMClient()
+        )
+        result = self._reviewer(strict, cache=cache).review_file(path)
+
+        assert result.model == "strong"
+        assert result.ai_status == "ok"
+
+    def test_batch_split_by_model(self, tmp_path):
+        """まとめレビューは同じモデルのファイルだけをまとめる"""
+        router = _router()
+        reviewer = self._reviewer(router)
+        paths = [
+            self._write(tmp_path, "a.py", SIMPLE),
+            self._write(tmp_path, "b.py", "B = 2\n"),
+            self._write(tmp_path, "c.py", COMPLEX),
+        ]
+
+        results = reviewer.review_batch(paths)
+
+        assert [r.model for r in results] == ["fast", "fast", "strong"]
+        fast_calls = router.client_for("fast").call_history
+        assert len(fast_calls) == 1
+        assert "=== File:" in fast_calls[0]
+        assert len(router.client_for("strong").call_history) == 1
+
+    def test_without_router(self, temp_python_file):
+        """ルーター未使用時はclientのモデルを記録"""
+        client = MockLLMClient()
+        client.model = "default-model"
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+
+        assert reviewer.review_file(temp_python_file).model == "default-model"
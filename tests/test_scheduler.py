@@ -0,0 +1,195 @@
+"""
+ReviewSchedulerのテスト
+"""
+
+import threading
+import time
+
+import pytest
+
+from devbuddy.core.licensing import LicenseManager
+from devbuddy.core.models import ReviewResult
+from devbuddy.core.reviewer import CodeReviewer
+from devbuddy.core.scheduler import ReviewScheduler
+from devbuddy.llm.client import MockLLMClient
+
+
+class SlowMockLLMClient(MockLLMClient):
+    """同時実行数を記録する低速モック"""
+
+    def __init__(self, delay: float = 0.02):
+        super().__init__()
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str) -> str:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            return super().complete(prompt)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def python_files(tmp_path):
+    """レビュー対象ファイル群"""
+    files = []
+    for i in range(8):
+        path = tmp_path / f"mod_{i}.py"
+        path.write_text(f"def f{i}():\n    return {i}\n", encoding="utf-8")
+        files.append(path)
+    return files
+
+
+class TestReviewScheduler:
+    """ReviewSchedulerテストクラス"""
+
+    def test_invalid_jobs(self):
+        """不正なjobs指定"""
+        reviewer = CodeReviewer(client=MockLLMClient())
+        with pytest.raises(ValueError, match="jobs"):
+            ReviewScheduler(reviewer, jobs=0)
+        with pytest.raises(ValueError, match="max_in_flight"):
+            ReviewScheduler(reviewer, jobs=2, max_in_flight=0)
+
+    def test_empty_files(self):
+        """空のファイルリスト"""
+        reviewer = CodeReviewer(client=MockLLMClient())
+        assert ReviewScheduler(reviewer).run([]) == []
+
+    def test_results_keep_input_order(self, python_files):
+        """結果が入力順に並ぶ"""
+        reviewer = CodeReviewer(
+            client=SlowMockLLMClient(), skip_license_check=True
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        results = ReviewScheduler(reviewer, jobs=4).run(python_files)
+
+        assert [r.file_path for r in results] == python_files
+        assert all(r.success for r in results)
+
+    def test_max_in_flight_limits_llm_calls(self, python_files):
+        """同時LLMリクエスト数が上限を超えない"""
+        client = SlowMockLLMClient()
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+
+        ReviewScheduler(reviewer, jobs=8, max_in_flight=2).run(python_files)
+
+        assert len(client.call_history) == len(python_files)
+        assert client.peak <= 2
+        assert reviewer.llm_slots is None
+
+    def test_on_complete_called_per_file(self, python_files):
+        """完了コールバック"""
+        reviewer = CodeReviewer(
+            client=MockLLMClient(), skip_license_check=True
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        completed: list[ReviewResult] = []
+
+        ReviewScheduler(reviewer, jobs=3).run(
+            python_files, on_complete=completed.append
+        )
+
+        assert len(completed) == len(python_files)
+
+    def test_sequential_with_one_job(self, python_files):
+        """jobs=1では逐次実行"""
+        client = SlowMockLLMClient(delay=0)
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+
+        results = ReviewScheduler(reviewer, jobs=1).run(python_files)
+
+        assert len(results) == len(python_files)
+        assert client.peak == 1
+
+    def test_worker_exception_becomes_failed_result(self, python_files):
+        """ワーカー例外は失敗結果として返る"""
+
+        class BrokenReviewer(CodeReviewer):
+            def review_file(self, file_path, severity="medium"):
+                raise RuntimeError("boom")
+
+        reviewer = BrokenReviewer(client=MockLLMClient())
+        results = ReviewScheduler(reviewer, jobs=2).run(python_files[:2])
+
+        assert [r.success for r in results] == [False, False]
+        assert results[0].error == "boom"
+
+    def test_usage_recorded_once_per_file(self, python_files, tmp_path):
+        """並列実行でも利用量が正しく記録される"""
+        manager = LicenseManager(data_dir=tmp_path / ".devbuddy")
+        reviewer = CodeReviewer(
+            client=SlowMockLLMClient(delay=0.005),
+            license_manager=manager,
+        )
+        reviewer.analyzer.config.use_flake8 = False
+
+        ReviewScheduler(reviewer, jobs=8).run(python_files)
+
+        assert manager.get_usage().reviews == len(python_files)
+
+    def test_usage_released_on_failure(self, python_files, tmp_path):
+        """レビューが例外で失敗したら確保した利用量を戻す"""
+        manager = LicenseManager(data_dir=tmp_path / ".devbuddy")
+        reviewer = CodeReviewer(
+            client=MockLLMClient(), license_manager=manager
+        )
+        reviewer.analyzer.config.use_flake8 = False
+        reviewer._run_ai_review = lambda *args, **kwargs: 1 / 0
+
+        results = ReviewScheduler(reviewer, jobs=2).run(python_files[:2])
+
+        assert [r.success for r in results] == [False, False]
+        assert manager.get_usage().reviews == 0
+
+    def test_flake8_launched_once_per_run(self, python_files):
+        """flake8はファイル数によらず1回だけ起動"""
+        from unittest.mock import MagicMock, patch
+
+        reviewer = CodeReviewer(
+            client=MockLLMClient(), skip_license_check=True
+        )
+
+        with patch(
+            "devbuddy.analyzers.python_analyzer.subprocess.run",
+            return_value=MagicMock(stdout=""),
+        ) as mock_run:
+            results = ReviewScheduler(reviewer, jobs=4).run(python_files)
+
+        assert all(r.success for r in results)
+        assert mock_run.call_count == 1
+
+    def test_small_files_batched(self, python_files):
+        """小さなファイルはbatch_files単位で1リクエストにまとめる"""
+        client = SlowMockLLMClient(delay=0)
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+
+        results = ReviewScheduler(
+            reviewer, jobs=4, batch_files=3
+        ).run(python_files)
+
+        assert [r.file_path for r in results] == python_files
+        assert len(client.call_history) == 3  # 8ファイル → 3+3+2
+
+    def test_large_files_not_batched(self, python_files):
+        """予算を超えるファイルは個別にレビュー"""
+        client = SlowMockLLMClient(delay=0)
+        reviewer = CodeReviewer(client=client, skip_license_check=True)
+        reviewer.analyzer.config.use_flake8 = False
+
+        ReviewScheduler(
+            reviewer, jobs=2, batch_files=8, batch_tokens=1
+        ).run(python_files)
+
+        assert len(client.call_history) == len(python_files)
@@ -0,0 +1,103 @@
+"""
+構造化出力（JSON形式のレビュー応答）のテスト
+"""
+
+from devbuddy.core.structured_output import (
+    JsonIssueStreamParser,
+    issue_from_dict,
+    parse_json_issues,
+)
+
+RESPONSE = """{"issues": [
+  {"level": "bug", "line": 3, "message": "Division by zero",
+   "suggestion": "Check the divisor"},
+  {"level": "STYLE", "line": "7", "message": "Name } with [brackets]"}
+]}"""
+
+
+class TestParseJsonIssues:
+    """parse_json_issuesテストクラス"""
+
+    def test_full_response(self):
+        """完全なJSONはそのまま解析し、suggestionも取り込む"""
+        issues = parse_json_issues(RESPONSE)
+
+        assert [(i.level, i.line) for i in issues] == [
+            ("bug", 3), ("style", 7)
+        ]
+        assert issues[0].suggestion == "Check the divisor"
+        assert issues[1].message == "Name } with [brackets]"
+
+    def test_code_fence_and_bare_list(self):
+        """コードフェンス付き・配列のみの応答も受け付ける"""
+        fenced = f"```json\n{RESPONSE}\n```"
+        bare = '[{"level": "info", "line": 1, "message": "ok"}]'
+
+        assert len(parse_json_issues(fenced)) == 2
+        assert parse_json_issues(bare)[0].message == "ok"
+
+    def test_truncated_response_recovers_complete_items(self):
+        """途中で切れた応答から完成した要素だけを回収"""
+        truncated = RESPONSE[:RESPONSE.index('"Name')]
+
+        issues = parse_json_issues(truncated)
+
+        assert [i.message for i in issues] == ["Division by zero"]
+
+    def test_surrounding_prose(self):
+        """前後に説明文が付いた応答も解析"""
+        response = f"Here is my review:\n{RESPONSE}\nThanks!"
+
+        assert len(parse_json_issues(response)) == 2
+
+    def test_no_issues(self):
+        """空のissuesは空リスト"""
+        assert parse_json_issues('{"issues": []}') == []
+
+    def test_text_response_returns_none(self):
+        """JSONを含まない応答はNone（テキストとして解析させる）"""
+        assert parse_json_issues("[BUG] Line 1: Oops") is None
+        assert parse_json_issues("No issues found") is None
+
+    def test_invalid_items_skipped(self):
+        """必須項目が欠けた要素は捨て、他は残す"""
+        assert issue_from_dict({"level": "bug", "message": "no line"}) is None
+        assert issue_from_dict({"level": "fatal", "line": 1,
+                                "message": "unknown level"}) is None
+        assert issue_from_dict("text") is None
+        issue = issue_from_dict(
+            {"level": "warning", "line": 0, "message": "m", "suggestion": ""}
+        )
+        assert issue.line == 1
+        assert issue.suggestion is None
+
+
+class TestJsonIssueStreamParser:
+    """JsonIssueStreamParserテストクラス"""
+
+    def test_emits_each_completed_item(self):
+        """要素が完成するたびにIssueを返す"""
+        parser = JsonIssueStreamParser()
+        seen = []
+        for i in range(0, len(RESPONSE), 7):
+            seen.extend(parser.feed(RESPONSE[i:i + 7]))
+        seen.extend(parser.close())
+
+        assert [i.line for i in seen] == [3, 7]
+
+    def test_truncated_stream(self):
+        """途中で切れた要素は捨てる"""
+        parser = JsonIssueStreamParser()
+
+        issues = parser.feed(RESPONSE[:-20]) + parser.close()
+
+        assert [i.line for i in issues] == [3]
+
+    def test_text_fallback(self):
+        """JSONが無い応答はfallbackで解析"""
+        parser = JsonIssueStreamParser(fallback=lambda text: [text])
+
+        parser.feed("[BUG] Line 1: ")
+        parser.feed("Oops")
+
+        assert parser.close() == ["[BUG] Line 1: Oops"]
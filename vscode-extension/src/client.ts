@@ -151,7 +151,7 @@ export class DevBuddyClient {
                 stderr += data.toString();
             });
 
-            if (input) {
+            if (input !== undefined) {
                 proc.stdin.write(input);
                 proc.stdin.end();
             }
@@ -218,17 +218,16 @@ export class DevBuddyClient {
             });
         }
 
-        // CLI使用
+        // CLI使用（未保存のバッファも扱えるよう標準入力で渡す）
+        const stdinName = options.filePath
+            || `untitled.${this.getExtension(options.language)}`;
         const args: string[] = [
-            '--language', options.language,
-            '--severity', options.severity || 'medium'
+            '--severity', options.severity || 'medium',
+            '--stdin-filename', stdinName,
+            '-'
         ];
 
-        // 一時ファイルに書き込んでレビュー
-        const tmpFile = await this.writeTempFile(code, options.language);
-        args.push(tmpFile);
-
-        const output = await this.executeCli('review', args);
+        const output = await this.executeCli('review', args, code);
         return JSON.parse(output) as ReviewResult;
     }
 